@@ -26,8 +26,37 @@ def image_can_be_submitted_to_batch(
     Returns:
         True if the image can be submitted to the batch, False otherwise.
     """
+    remaining_capacity = get_remaining_batch_capacity(
+        batch_name=batch_name,
+        workspace_id=workspace_id,
+        dataset_id=dataset_id,
+        max_batch_images=max_batch_images,
+        api_key=api_key,
+    )
+    return remaining_capacity is None or remaining_capacity > 0
+
+
+def get_remaining_batch_capacity(
+    batch_name: str,
+    workspace_id: WorkspaceID,
+    dataset_id: DatasetID,
+    max_batch_images: Optional[int],
+    api_key: str,
+) -> Optional[int]:
+    """Get the number of images that can still be submitted to a batch.
+
+    Args:
+        batch_name: Name of the batch.
+        workspace_id: ID of the workspace.
+        dataset_id: ID of the dataset.
+        max_batch_images: Maximum number of images allowed in the batch.
+        api_key: API key to use for the request.
+
+    Returns:
+        Number of images that can be submitted, None if the batch size is not limited.
+    """
     if max_batch_images is None:
-        return True
+        return None
     labeling_batches = get_roboflow_labeling_batches(
         api_key=api_key,
         workspace_id=workspace_id,
@@ -38,7 +67,7 @@ def image_can_be_submitted_to_batch(
         batch_name=batch_name,
     )
     if matching_labeling_batch is None:
-        return max_batch_images > 0
+        return max(max_batch_images, 0)
     batch_images_under_labeling = 0
     if matching_labeling_batch["numJobs"] > 0:
         labeling_jobs = get_roboflow_labeling_jobs(
@@ -49,7 +78,7 @@ def image_can_be_submitted_to_batch(
             batch_id=matching_labeling_batch["id"],
         )
     total_batch_images = matching_labeling_batch["images"] + batch_images_under_labeling
-    return max_batch_images > total_batch_images
+    return max(max_batch_images - total_batch_images, 0)
 
 
 def get_matching_labeling_batch(
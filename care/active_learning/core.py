@@ -54,18 +54,8 @@ def execute_datapoint_registration(
     api_key: str,
     batch_name: str,
     inference_id: Optional[str] = None,
-) -> None:
+) -> bool:
     local_image_id = str(uuid4())
-    encoded_image, scaling_factor = prepare_image_to_registration(
-        image=image,
-        desired_size=configuration.max_image_size,
-        jpeg_compression_level=configuration.jpeg_compression_level,
-    )
-    prediction = adjust_prediction_to_client_scaling_factor(
-        prediction=prediction,
-        scaling_factor=scaling_factor,
-        prediction_type=prediction_type,
-    )
     matching_strategies_limits = OrderedDict(
         (strategy_name, configuration.strategies_limits[strategy_name])
         for strategy_name in matching_strategies
@@ -78,7 +68,27 @@ def execute_datapoint_registration(
     )
     if strategy_with_spare_credit is None:
         logger.debug(f"Limit on Active Learning strategy reached.")
-        return None
+        return False
+    # image is encoded only once credit is granted
+    try:
+        encoded_image, scaling_factor = prepare_image_to_registration(
+            image=image,
+            desired_size=configuration.max_image_size,
+            jpeg_compression_level=configuration.jpeg_compression_level,
+        )
+        prediction = adjust_prediction_to_client_scaling_factor(
+            prediction=prediction,
+            scaling_factor=scaling_factor,
+            prediction_type=prediction_type,
+        )
+    except Exception:
+        return_strategy_credit(
+            cache=cache,
+            workspace=configuration.workspace_id,
+            project=configuration.dataset_id,
+            strategy_name=strategy_with_spare_credit,
+        )
+        raise
     register_datapoint_at_roboflow(
         cache=cache,
         strategy_with_spare_credit=strategy_with_spare_credit,
@@ -91,6 +101,7 @@ def execute_datapoint_registration(
         batch_name=batch_name,
         inference_id=inference_id,
     )
+    return True
 
 
 def prepare_image_to_registration(
@@ -162,7 +173,8 @@ def register_datapoint_at_roboflow(
 def collect_tags(
     configuration: ActiveLearningConfiguration, sampling_strategy: str
 ) -> List[str]:
-    tags = ACTIVE_LEARNING_TAGS if ACTIVE_LEARNING_TAGS is not None else []
+    # copied, as tags are extended below
+    tags = list(ACTIVE_LEARNING_TAGS) if ACTIVE_LEARNING_TAGS is not None else []
     tags.extend(configuration.tags)
     tags.extend(configuration.strategies_tags[sampling_strategy])
     if configuration.persist_predictions:
@@ -138,3 +138,22 @@ class RoboflowProjectMetadata:
     workspace_id: WorkspaceID
     dataset_type: str
     active_learning_configuration: dict
+
+
+@dataclass(frozen=True)
+class RegistrationTask:
+    image: np.ndarray
+    prediction: Prediction
+    prediction_type: PredictionType
+    matching_strategies: List[str]
+    batch_name: str
+    inference_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RegistrationStatistics:
+    submitted: int
+    dropped: int
+    registered: int
+    rejected: int
+    failed: int
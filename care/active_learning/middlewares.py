@@ -1,6 +1,4 @@
-import queue
 from queue import Queue
-from threading import Thread
 from typing import Any, List, Optional
 
 from care.logger import logger
@@ -18,12 +16,20 @@ from care.active_learning.entities import (
     ActiveLearningConfiguration,
     Prediction,
     PredictionType,
+    RegistrationStatistics,
+    RegistrationTask,
+)
+from care.active_learning.registration import (
+    MAX_REGISTRATION_QUEUE_SIZE,
+    DatapointRegistrationPool,
 )
 from care.cache.base import BaseCache
+from care.env import (
+    ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE,
+    ACTIVE_LEARNING_REGISTRATION_WORKERS,
+)
 from care.utils.image_utils import load_image
 
-MAX_REGISTRATION_QUEUE_SIZE = 512
-
 
 class NullActiveLearningMiddleware:
     def register_batch(
@@ -150,6 +156,44 @@ class ActiveLearningMiddleware:
         disable_preproc_auto_orient: bool = False,
         inference_id=None,
     ) -> None:
+        task = self._sample(
+            inference_input=inference_input,
+            prediction=prediction,
+            prediction_type=prediction_type,
+            disable_preproc_auto_orient=disable_preproc_auto_orient,
+            inference_id=inference_id,
+        )
+        if task is None:
+            return None
+        if not image_can_be_submitted_to_batch(
+            batch_name=task.batch_name,
+            workspace_id=self._configuration.workspace_id,
+            dataset_id=self._configuration.dataset_id,
+            max_batch_images=self._configuration.max_batch_images,
+            api_key=self._api_key,
+        ):
+            logger.debug(f"Limit on Active Learning batch size reached.")
+            return None
+        execute_datapoint_registration(
+            cache=self._cache,
+            matching_strategies=task.matching_strategies,
+            image=task.image,
+            prediction=task.prediction,
+            prediction_type=task.prediction_type,
+            configuration=self._configuration,
+            api_key=self._api_key,
+            batch_name=task.batch_name,
+            inference_id=task.inference_id,
+        )
+
+    def _sample(
+        self,
+        inference_input: Any,
+        prediction: dict,
+        prediction_type: PredictionType,
+        disable_preproc_auto_orient: bool = False,
+        inference_id=None,
+    ) -> Optional[RegistrationTask]:
         if self._configuration is None:
             return None
         image, is_bgr = load_image(
@@ -166,25 +210,12 @@ class ActiveLearningMiddleware:
         )
         if len(matching_strategies) == 0:
             return None
-        batch_name = generate_batch_name(configuration=self._configuration)
-        if not image_can_be_submitted_to_batch(
-            batch_name=batch_name,
-            workspace_id=self._configuration.workspace_id,
-            dataset_id=self._configuration.dataset_id,
-            max_batch_images=self._configuration.max_batch_images,
-            api_key=self._api_key,
-        ):
-            logger.debug(f"Limit on Active Learning batch size reached.")
-            return None
-        execute_datapoint_registration(
-            cache=self._cache,
-            matching_strategies=matching_strategies,
+        return RegistrationTask(
             image=image,
             prediction=prediction,
             prediction_type=prediction_type,
-            configuration=self._configuration,
-            api_key=self._api_key,
-            batch_name=batch_name,
+            matching_strategies=matching_strategies,
+            batch_name=generate_batch_name(configuration=self._configuration),
             inference_id=inference_id,
         )
 
@@ -243,10 +274,22 @@ class ThreadingActiveLearningMiddleware(ActiveLearningMiddleware):
         configuration: ActiveLearningConfiguration,
         cache: BaseCache,
         task_queue: Queue,
+        workers: int = ACTIVE_LEARNING_REGISTRATION_WORKERS,
+        max_batch_size: int = ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE,
     ):
         super().__init__(api_key=api_key, configuration=configuration, cache=cache)
-        self._task_queue = task_queue
-        self._registration_thread: Optional[Thread] = None
+        self._registration_pool = DatapointRegistrationPool(
+            api_key=api_key,
+            configuration=configuration,
+            cache=cache,
+            task_queue=task_queue,
+            workers=workers,
+            max_batch_size=max_batch_size,
+        )
+
+    @property
+    def registration_statistics(self) -> RegistrationStatistics:
+        return self._registration_pool.statistics
 
     def register(
         self,
@@ -256,70 +299,31 @@ class ThreadingActiveLearningMiddleware(ActiveLearningMiddleware):
         disable_preproc_auto_orient: bool = False,
         inference_id=None,
     ) -> None:
-        logger.debug(f"Putting registration task into queue")
+        # only sampling runs here, the frame is encoded and uploaded by registration workers
         try:
-            self._task_queue.put_nowait(
-                (
-                    inference_input,
-                    prediction,
-                    prediction_type,
-                    disable_preproc_auto_orient,
-                )
-            )
-        except queue.Full:
-            logger.warning(
-                f"Dropping datapoint registered in Active Learning due to insufficient processing "
-                f"capabilities."
-            )
-
-    def start_registration_thread(self) -> None:
-        if self._registration_thread is not None:
-            logger.warning(f"Registration thread already started.")
-            return None
-        logger.debug("Staring registration thread")
-        self._registration_thread = Thread(target=self._consume_queue)
-        self._registration_thread.start()
-
-    def stop_registration_thread(self) -> None:
-        if self._registration_thread is None:
-            logger.warning("Registration thread is already stopped.")
-            return None
-        logger.debug("Stopping registration thread")
-        self._task_queue.put(None)
-        self._registration_thread.join()
-        if self._registration_thread.is_alive():
-            logger.warning(f"Registration thread stopping was unsuccessful.")
-        self._registration_thread = None
-
-    def _consume_queue(self) -> None:
-        queue_closed = False
-        while not queue_closed:
-            queue_closed = self._consume_queue_task()
-
-    def _consume_queue_task(self) -> bool:
-        logger.debug("Consuming registration task")
-        task = self._task_queue.get()
-        logger.debug("Received registration task")
-        if task is None:
-            logger.debug("Terminating registration thread")
-            self._task_queue.task_done()
-            return True
-        inference_input, prediction, prediction_type, disable_preproc_auto_orient = task
-        try:
-            self._execute_registration(
+            task = self._sample(
                 inference_input=inference_input,
                 prediction=prediction,
                 prediction_type=prediction_type,
                 disable_preproc_auto_orient=disable_preproc_auto_orient,
+                inference_id=inference_id,
             )
         except Exception as error:
-            # Error handling to be decided
             logger.warning(
-                f"Error in datapoint registration for Active Learning. Details: {error}. "
-                f"Error is suppressed in favour of normal operations of registration thread."
+                f"Error in datapoint sampling for Active Learning. Details: {error}. "
+                f"Error is suppressed in favour of normal operations of inference."
             )
-        self._task_queue.task_done()
-        return False
+            return None
+        if task is None:
+            return None
+        logger.debug(f"Putting registration task into queue")
+        self._registration_pool.submit(task=task)
+
+    def start_registration_thread(self) -> None:
+        self._registration_pool.start()
+
+    def stop_registration_thread(self) -> None:
+        self._registration_pool.stop()
 
     def __enter__(self) -> "ThreadingActiveLearningMiddleware":
         self.start_registration_thread()
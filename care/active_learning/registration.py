@@ -0,0 +1,215 @@
+"""
+Pool of threads registering Active Learning datapoints.
+
+Sampling runs on the caller thread and only keeps a reference to the frame. Downscaling,
+JPEG encoding, encoding of predictions and requests to Roboflow API are executed by
+workers, so that Active Learning does not add latency to the inference loop.
+
+Queue of tasks is bounded - datapoints submitted while it is full are dropped and counted,
+see `DatapointRegistrationPool.statistics`. Worker takes up to `max_batch_size` queued
+tasks at once and checks remaining capacity of labeling batch once per batch name,
+instead of once per datapoint.
+"""
+
+import queue
+from collections import OrderedDict
+from queue import Queue
+from threading import Lock, Thread
+from typing import List, Optional, Tuple
+
+from care.active_learning.accounting import get_remaining_batch_capacity
+from care.active_learning.core import execute_datapoint_registration
+from care.active_learning.entities import (
+    ActiveLearningConfiguration,
+    RegistrationStatistics,
+    RegistrationTask,
+)
+from care.cache.base import BaseCache
+from care.env import (
+    ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE,
+    ACTIVE_LEARNING_REGISTRATION_WORKERS,
+)
+from care.logger import logger
+
+MAX_REGISTRATION_QUEUE_SIZE = 512
+DROPS_LOGGING_INTERVAL = 100
+
+
+class DatapointRegistrationPool:
+    def __init__(
+        self,
+        api_key: str,
+        configuration: ActiveLearningConfiguration,
+        cache: BaseCache,
+        task_queue: Optional[Queue] = None,
+        workers: int = ACTIVE_LEARNING_REGISTRATION_WORKERS,
+        max_batch_size: int = ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE,
+    ):
+        """Workers registering datapoints selected by sampling.
+
+        Args:
+            api_key (str): Roboflow API key.
+            configuration (ActiveLearningConfiguration): Active Learning configuration.
+            cache (BaseCache): Cache holding usage of strategies limits.
+            task_queue (Optional[Queue]): Bounded queue of `RegistrationTask`, created with
+                `MAX_REGISTRATION_QUEUE_SIZE` slots if not given.
+            workers (int): Number of worker threads.
+            max_batch_size (int): Max number of tasks taken by a worker at once.
+        """
+        self._api_key = api_key
+        self._configuration = configuration
+        self._cache = cache
+        self._task_queue = (
+            task_queue if task_queue is not None else Queue(MAX_REGISTRATION_QUEUE_SIZE)
+        )
+        self._workers_number = max(workers, 1)
+        self._max_batch_size = max(max_batch_size, 1)
+        self._workers: List[Thread] = []
+        self._statistics_lock = Lock()
+        self._submitted = 0
+        self._dropped = 0
+        self._registered = 0
+        self._rejected = 0
+        self._failed = 0
+
+    @property
+    def statistics(self) -> RegistrationStatistics:
+        with self._statistics_lock:
+            return RegistrationStatistics(
+                submitted=self._submitted,
+                dropped=self._dropped,
+                registered=self._registered,
+                rejected=self._rejected,
+                failed=self._failed,
+            )
+
+    def submit(self, task: RegistrationTask) -> bool:
+        """Queues the task without blocking.
+
+        Returns:
+            bool: False if the task was dropped, as the queue is full.
+        """
+        try:
+            self._task_queue.put_nowait(task)
+        except queue.Full:
+            with self._statistics_lock:
+                self._dropped += 1
+                dropped = self._dropped
+            if dropped == 1 or dropped % DROPS_LOGGING_INTERVAL == 0:
+                logger.warning(
+                    "Dropping datapoint registered in Active Learning due to insufficient "
+                    f"processing capabilities. Datapoints dropped so far: {dropped}."
+                )
+            return False
+        with self._statistics_lock:
+            self._submitted += 1
+        return True
+
+    def start(self) -> None:
+        if self._workers:
+            logger.warning("Registration workers already started.")
+            return None
+        logger.debug("Starting %s registration workers", self._workers_number)
+        self._workers = [
+            Thread(target=self._run_worker, name=f"active-learning-registration-{i}")
+            for i in range(self._workers_number)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self) -> None:
+        """Stops workers once all tasks queued before are processed."""
+        if not self._workers:
+            logger.warning("Registration workers are already stopped.")
+            return None
+        logger.debug("Stopping registration workers")
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join()
+            if worker.is_alive():
+                logger.warning("Registration worker stopping was unsuccessful.")
+        self._workers = []
+
+    def _run_worker(self) -> None:
+        terminate = False
+        while not terminate:
+            tasks, terminate = self._take_tasks()
+            try:
+                self._register_batch(tasks=tasks)
+            finally:
+                for _ in range(len(tasks) + int(terminate)):
+                    self._task_queue.task_done()
+        logger.debug("Terminating registration worker")
+
+    def _take_tasks(self) -> Tuple[List[RegistrationTask], bool]:
+        tasks = []
+        task = self._task_queue.get()
+        while task is not None:
+            tasks.append(task)
+            if len(tasks) >= self._max_batch_size:
+                return tasks, False
+            try:
+                task = self._task_queue.get_nowait()
+            except queue.Empty:
+                return tasks, False
+        return tasks, True
+
+    def _register_batch(self, tasks: List[RegistrationTask]) -> None:
+        tasks_by_batch_name = OrderedDict()
+        for task in tasks:
+            tasks_by_batch_name.setdefault(task.batch_name, []).append(task)
+        for batch_name, batch_tasks in tasks_by_batch_name.items():
+            try:
+                remaining_capacity = get_remaining_batch_capacity(
+                    batch_name=batch_name,
+                    workspace_id=self._configuration.workspace_id,
+                    dataset_id=self._configuration.dataset_id,
+                    max_batch_images=self._configuration.max_batch_images,
+                    api_key=self._api_key,
+                )
+            except Exception as error:
+                self._count(failed=len(batch_tasks))
+                logger.warning(
+                    f"Error in datapoint registration for Active Learning. Details: {error}. "
+                    f"Error is suppressed in favour of normal operations of registration thread."
+                )
+                continue
+            if remaining_capacity is not None and remaining_capacity < len(batch_tasks):
+                logger.debug("Limit on Active Learning batch size reached.")
+                self._count(rejected=len(batch_tasks) - remaining_capacity)
+                batch_tasks = batch_tasks[:remaining_capacity]
+            for task in batch_tasks:
+                self._register(task=task)
+
+    def _register(self, task: RegistrationTask) -> None:
+        try:
+            registered = execute_datapoint_registration(
+                cache=self._cache,
+                matching_strategies=task.matching_strategies,
+                image=task.image,
+                prediction=task.prediction,
+                prediction_type=task.prediction_type,
+                configuration=self._configuration,
+                api_key=self._api_key,
+                batch_name=task.batch_name,
+                inference_id=task.inference_id,
+            )
+        except Exception as error:
+            self._count(failed=1)
+            # Error handling to be decided
+            logger.warning(
+                f"Error in datapoint registration for Active Learning. Details: {error}. "
+                f"Error is suppressed in favour of normal operations of registration thread."
+            )
+            return None
+        if registered:
+            self._count(registered=1)
+        else:
+            self._count(rejected=1)
+
+    def _count(self, registered: int = 0, rejected: int = 0, failed: int = 0) -> None:
+        with self._statistics_lock:
+            self._registered += registered
+            self._rejected += rejected
+            self._failed += failed
@@ -1,32 +1,225 @@
 import collections
+import sys
+import time
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Callable, Hashable, Iterator, List, Optional, Tuple
 
-from care.logger import logger
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class LRUCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+
+
+def estimate_size_in_bytes(value: Any) -> int:
+    """Estimates memory held by cached value.
+
+    numpy arrays and torch tensors (detected by duck-typing, to avoid importing torch)
+    are measured by their buffers, containers are measured recursively.
+    """
+    if hasattr(value, "nbytes") and not callable(value.nbytes):
+        return int(value.nbytes)
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return int(value.element_size() * value.nelement())
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size_in_bytes(e) for e in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size_in_bytes(k) + estimate_size_in_bytes(v)
+            for k, v in value.items()
+        )
+    return sys.getsizeof(value)
 
 
 class LRUCache:
-    def __init__(self, capacity=128):
-        self.capacity = capacity
-        self.cache = collections.OrderedDict()
+    def __init__(
+        self,
+        capacity: Optional[int] = 128,
+        max_size_bytes: Optional[int] = None,
+        sizer: Optional[Callable[[Any], int]] = None,
+        ttl: Optional[float] = None,
+    ):
+        """Thread-safe LRU cache bounded by number of entries and (optionally) bytes.
 
-    def set_max_size(self, capacity):
+        Args:
+            capacity (Optional[int]): Max number of entries, None means no limit.
+            max_size_bytes (Optional[int]): Max total size of values, as measured by `sizer`,
+                None means no limit.
+            sizer (Optional[Callable[[Any], int]]): Function measuring size of value, by default
+                `estimate_size_in_bytes(...)` is used when `max_size_bytes` is given.
+            ttl (Optional[float]): Time (in seconds) after which entry expires, None means never.
+        """
         self.capacity = capacity
-        self.enforce_size()
+        self.max_size_bytes = max_size_bytes
+        self.ttl = ttl
+        if sizer is None and max_size_bytes is not None:
+            sizer = estimate_size_in_bytes
+        self._sizer = sizer
+        # key -> (value, size, expires_at)
+        self.cache: "collections.OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = (
+            collections.OrderedDict()
+        )
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = RLock()
+
+    def set_max_size(self, capacity: Optional[int]) -> None:
+        with self._lock:
+            self.capacity = capacity
+            self.enforce_size()
 
-    def enforce_size(self):
-        while len(self.cache) > self.capacity:
-            self.cache.popitem(last=False)
+    def enforce_size(self) -> None:
+        with self._lock:
+            while self.cache and (
+                (self.capacity is not None and len(self.cache) > self.capacity)
+                or (
+                    self.max_size_bytes is not None
+                    and self._size_bytes > self.max_size_bytes
+                )
+            ):
+                _, (_, size, _) = self.cache.popitem(last=False)
+                self._size_bytes -= size
+                self._evictions += 1
 
-    def get(self, key):
-        try:
-            value = self.cache.pop(key)
-            self.cache[key] = value
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get(key)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
             return value
-        except KeyError:
-            return None
 
-    def set(self, key, value):
-        try:
-            self.cache.pop(key)
-        except KeyError:
+    def set(self, key: Hashable, value: Any) -> None:
+        size = self._sizer(value) if self._sizer is not None else 0
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._discard(key)
+            self.cache[key] = (value, size, expires_at)
+            self._size_bytes += size
             self.enforce_size()
-        self.cache[key] = value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get(key)
+            if value is _MISSING:
+                return default
+            self._discard(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cache.clear()
+            self._size_bytes = 0
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            self._remove_expired()
+            return list(self.cache.keys())
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        with self._lock:
+            self._remove_expired()
+            return [(key, entry[0]) for key, entry in self.cache.items()]
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def stats(self) -> LRUCacheStats:
+        with self._lock:
+            return LRUCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self.cache),
+                size_bytes=self._size_bytes,
+            )
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return False
+            if self._is_expired(entry):
+                self._expire(key)
+                return False
+            return True
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._get(key)
+            if value is _MISSING:
+                self._misses += 1
+                raise KeyError(key)
+            self._hits += 1
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            if key not in self.cache:
+                raise KeyError(key)
+            self._discard(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_expired()
+            return len(self.cache)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # iterating over snapshot, so that cache may be modified by the caller (or other threads)
+        return iter(self.keys())
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = RLock()
+
+    def _get(self, key: Hashable) -> Any:
+        entry = self.cache.get(key)
+        if entry is None:
+            return _MISSING
+        if self._is_expired(entry):
+            self._expire(key)
+            return _MISSING
+        self.cache.move_to_end(key)
+        return entry[0]
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
+
+    def _expire(self, key: Hashable) -> None:
+        self._discard(key)
+        self._expirations += 1
+
+    def _remove_expired(self) -> None:
+        if self.ttl is None:
+            return None
+        expired = [key for key, entry in self.cache.items() if self._is_expired(entry)]
+        for key in expired:
+            self._expire(key)
+
+    @staticmethod
+    def _is_expired(entry: Tuple[Any, int, Optional[float]]) -> bool:
+        expires_at = entry[2]
+        return expires_at is not None and time.monotonic() >= expires_at
@@ -43,8 +43,9 @@ class MemoryCache(BaseCache):
                 if v < now:
                     keys_to_delete.append(k)
             for k in keys_to_delete:
-                del self.cache[k]
-                del self.expires[k]
+                # key might have been deleted in the meantime
+                self.cache.pop(k, None)
+                self.expires.pop(k, None)
             keys_to_delete = []
             for k, v in self.zexpires.copy().items():
                 if v < now:
@@ -65,11 +66,11 @@ class MemoryCache(BaseCache):
         Returns:
             str: The value associated with the key, or None if the key does not exist or is expired.
         """
-        if key in self.expires:
-            if self.expires[key] < time.time():
-                del self.cache[key]
-                del self.expires[key]
-                return None
+        expires = self.expires.get(key)
+        if expires is not None and expires < time.time():
+            self.cache.pop(key, None)
+            self.expires.pop(key, None)
+            return None
         return self.cache.get(key)
 
     def set(self, key: str, value: str, expire: float = None):
@@ -85,6 +86,16 @@ class MemoryCache(BaseCache):
         if expire:
             self.expires[key] = expire + time.time()
 
+    def delete(self, key: str):
+        """
+        Removes the value associated with the given key, if present.
+
+        Args:
+            key (str): The key to remove.
+        """
+        self.cache.pop(key, None)
+        self.expires.pop(key, None)
+
     def zadd(self, key: str, value: Any, score: float, expire: float = None):
         """
         Adds a member with the specified score to the sorted set stored at key.
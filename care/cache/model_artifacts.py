@@ -1,17 +1,26 @@
 import errno
+import hashlib
 import json
 import os.path
 import re
 import shutil
+import threading
 import time
-from typing import List, Optional, Union
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Union
 
 from filelock import FileLock
 
-from care.env import ATOMIC_CACHE_WRITES_ENABLED, MODEL_CACHE_DIR
+from care.env import (
+    ATOMIC_CACHE_WRITES_ENABLED,
+    MODEL_CACHE_DIR,
+    ORT_OPTIMIZED_MODELS_CACHE_ENABLED,
+)
 from care.exceptions import ModelArtefactError
 from care.logger import logger
+from care.roboflow_api import download_file_from_url
 from care.utils.file_system import (
+    AtomicPath,
     dump_bytes,
     dump_bytes_atomic,
     dump_json,
@@ -20,8 +29,26 @@ from care.utils.file_system import (
     dump_text_lines_atomic,
     read_json,
     read_text_file,
+    sanitize_path_segment,
 )
 
+ORT_OPTIMIZED_MODELS_DIR = "ort_optimized"
+# Execution providers which compile (parts of) the graph into EP-specific nodes
+# cannot serialise optimised model into ONNX file - only listed ones are safe.
+ORT_OPTIMIZED_MODELS_CACHE_PROVIDERS = {
+    "CPUExecutionProvider",
+    "CUDAExecutionProvider",
+    "ROCMExecutionProvider",
+    "DmlExecutionProvider",
+}
+FILE_HASH_CHUNK_SIZE = 8 * 1024 * 1024
+# suffix of file memoizing hash of weights, next to the weights file
+FILE_HASH_SUFFIX = ".sha256.json"
+
+# downloads in progress, keyed by target path
+_downloads_in_progress: Dict[str, Future] = {}
+_downloads_lock = threading.Lock()
+
 
 def initialise_cache(model_id: Optional[str] = None) -> None:
     cache_dir = get_cache_dir(model_id=model_id)
@@ -95,6 +122,69 @@ def save_bytes_in_cache(
         )
 
 
+def download_file_to_cache(
+    url: str,
+    file: str,
+    model_id: Optional[str] = None,
+) -> str:
+    """Downloads file into cache, once for all concurrent callers.
+
+    Threads requesting the same cache file while it is being downloaded wait for the
+    in-flight download and share its outcome, including the error. Across processes,
+    download is serialised with file lock and skipped if another process has already
+    saved the file. Content is streamed to disk and atomically moved into place, see
+    `download_file_from_url(...)`.
+
+    Args:
+        url (str): URL of the file.
+        file (str): Name of the file in cache.
+        model_id (Optional[str]): Model id, determining cache directory.
+
+    Returns:
+        str: Path of the cached file.
+    """
+    cached_file_path = get_cache_file_path(file=file, model_id=model_id)
+    with _downloads_lock:
+        download = _downloads_in_progress.get(cached_file_path)
+        is_leader = download is None
+        if is_leader:
+            download = Future()
+            _downloads_in_progress[cached_file_path] = download
+    if not is_leader:
+        logger.debug(f"Waiting for in-flight download of {cached_file_path}")
+        return download.result()
+    try:
+        _download_file_under_lock(
+            url=url, cached_file_path=cached_file_path, file=file, model_id=model_id
+        )
+        download.set_result(cached_file_path)
+    except BaseException as error:
+        download.set_exception(error)
+        raise
+    finally:
+        with _downloads_lock:
+            del _downloads_in_progress[cached_file_path]
+    return cached_file_path
+
+
+def _download_file_under_lock(
+    url: str, cached_file_path: str, file: str, model_id: Optional[str]
+) -> None:
+    lock_dir = MODEL_CACHE_DIR + "/_file_locks"
+    os.makedirs(lock_dir, exist_ok=True)
+    lock_file = os.path.join(
+        lock_dir,
+        f"{sanitize_path_segment(model_id or 'default')}_{sanitize_path_segment(file)}.lock",
+    )
+    existed_before = os.path.isfile(cached_file_path)
+    # lock file is left in place, as other processes may be waiting on it
+    with FileLock(lock_file, timeout=120):
+        if not existed_before and os.path.isfile(cached_file_path):
+            logger.debug(f"File downloaded by another process: {cached_file_path}")
+            return None
+        download_file_from_url(url=url, path=cached_file_path)
+
+
 def save_json_in_cache(
     content: Union[dict, list],
     file: str,
@@ -238,6 +328,185 @@ def clear_cache(model_id: Optional[str] = None, delete_from_disk: bool = True) -
             pass  # Best effort cleanup
 
 
+def create_onnx_session_with_optimized_model_cache(
+    weights_path: str,
+    providers: List[Union[str, tuple]],
+    session_options: Any,
+    model_id: Optional[str] = None,
+) -> Any:
+    """Creates `onnxruntime.InferenceSession`, reusing ORT-optimised graph from cache.
+
+    On the first load, the session is created with `optimized_model_filepath` pointing to
+    temporary file that is atomically moved into cache (under file lock, so concurrent
+    processes optimise the graph once). Subsequent loads use the optimised model with
+    graph optimisations disabled. Cache entry is keyed by weights hash, ORT version,
+    execution providers and graph optimisation level. Weights hash is memoized next to
+    the weights (see `get_memoized_file_hash(...)`), so that cache hits do not read the
+    whole weights file.
+
+    Args:
+        weights_path (str): Path to ONNX weights.
+        providers (List[Union[str, tuple]]): Execution providers in priority order.
+        session_options (onnxruntime.SessionOptions): Session options to be used.
+        model_id (Optional[str]): Model id, determining cache directory.
+
+    Returns:
+        onnxruntime.InferenceSession: Created session.
+    """
+    import onnxruntime
+
+    if not ORT_OPTIMIZED_MODELS_CACHE_ENABLED or not _providers_support_optimized_models(
+        providers=providers
+    ):
+        return onnxruntime.InferenceSession(
+            weights_path, providers=providers, sess_options=session_options
+        )
+    optimized_model_path = get_cache_file_path(
+        file=os.path.join(
+            ORT_OPTIMIZED_MODELS_DIR,
+            get_ort_optimized_model_file_name(
+                weights_path=weights_path,
+                providers=providers,
+                graph_optimization_level=session_options.graph_optimization_level,
+            ),
+        ),
+        model_id=model_id,
+    )
+    session = _load_ort_optimized_model(
+        optimized_model_path=optimized_model_path,
+        providers=providers,
+        session_options=session_options,
+    )
+    if session is not None:
+        return session
+    lock_dir = MODEL_CACHE_DIR + "/_file_locks"
+    os.makedirs(lock_dir, exist_ok=True)
+    lock_file = os.path.join(
+        lock_dir,
+        f"{sanitize_path_segment(model_id or 'default')}_{ORT_OPTIMIZED_MODELS_DIR}.lock",
+    )
+    # lock file is left in place - removing it while another process waits on it would let
+    # a third one acquire a different lock on the re-created file
+    try:
+        with FileLock(lock_file, timeout=120):
+            # another process may have produced the entry while we were waiting
+            session = _load_ort_optimized_model(
+                optimized_model_path=optimized_model_path,
+                providers=providers,
+                session_options=session_options,
+            )
+            if session is not None:
+                return session
+            try:
+                with AtomicPath(optimized_model_path, allow_override=True) as temp_path:
+                    session_options.optimized_model_filepath = temp_path
+                    session = onnxruntime.InferenceSession(
+                        weights_path, providers=providers, sess_options=session_options
+                    )
+            finally:
+                session_options.optimized_model_filepath = ""
+            logger.debug(f"Optimised ONNX model saved in cache: {optimized_model_path}")
+            return session
+    except Exception as error:
+        logger.warning(
+            f"Could not use cache of optimised ONNX model for {weights_path}, "
+            f"creating session without it. Cause: {error}"
+        )
+        return onnxruntime.InferenceSession(
+            weights_path, providers=providers, sess_options=session_options
+        )
+
+
+def get_ort_optimized_model_file_name(
+    weights_path: str,
+    providers: List[Union[str, tuple]],
+    graph_optimization_level: Any,
+) -> str:
+    import onnxruntime
+
+    key = json.dumps(
+        {
+            "weights_hash": get_memoized_file_hash(path=weights_path),
+            "ort_version": onnxruntime.__version__,
+            "providers": providers,
+            "graph_optimization_level": str(graph_optimization_level),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.onnx"
+
+
+def get_memoized_file_hash(path: str) -> str:
+    """Returns SHA256 of the file, memoized in `<path>.sha256.json` together with size and
+    modification time of the file - hash is computed again only once the file changes."""
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    memo_path = f"{path}{FILE_HASH_SUFFIX}"
+    try:
+        memo = read_json(path=memo_path)
+        if {key: memo.get(key) for key in fingerprint} == fingerprint:
+            return memo["sha256"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    file_hash = get_file_hash(path=path)
+    try:
+        dump_json_atomic(
+            path=memo_path, content={**fingerprint, "sha256": file_hash}, allow_override=True
+        )
+    except OSError as error:
+        logger.debug(f"Could not memoize hash of {path}. Cause: {error}")
+    return file_hash
+
+
+def get_file_hash(path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(FILE_HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _providers_support_optimized_models(providers: List[Union[str, tuple]]) -> bool:
+    for provider in providers:
+        name = provider[0] if isinstance(provider, tuple) else provider
+        if name not in ORT_OPTIMIZED_MODELS_CACHE_PROVIDERS:
+            return False
+    return True
+
+
+def _load_ort_optimized_model(
+    optimized_model_path: str,
+    providers: List[Union[str, tuple]],
+    session_options: Any,
+) -> Optional[Any]:
+    import onnxruntime
+
+    if not os.path.isfile(optimized_model_path):
+        return None
+    original_optimization_level = session_options.graph_optimization_level
+    session_options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+    )
+    try:
+        session = onnxruntime.InferenceSession(
+            optimized_model_path, providers=providers, sess_options=session_options
+        )
+        logger.debug(f"Loaded optimised ONNX model from cache: {optimized_model_path}")
+        return session
+    except Exception as error:
+        logger.warning(
+            f"Could not load optimised ONNX model from cache {optimized_model_path} - "
+            f"entry will be rebuilt. Cause: {error}"
+        )
+        session_options.graph_optimization_level = original_optimization_level
+        try:
+            os.unlink(optimized_model_path)
+        except OSError:
+            pass
+        return None
+
+
 def get_cache_dir(model_id: Optional[str] = None) -> str:
     if model_id is not None:
         return os.path.join(MODEL_CACHE_DIR, model_id)
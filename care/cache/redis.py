@@ -103,6 +103,15 @@ class RedisCache(BaseCache):
             value = json.dumps(value)
         self.client.set(key, value, ex=expire)
 
+    def delete(self, key: str):
+        """
+        Removes the value associated with the given key, if present.
+
+        Args:
+            key (str): The key to remove.
+        """
+        self.client.delete(key)
+
     def zadd(self, key: str, value: Any, score: float, expire: float = None):
         """
         Adds a member with the specified score to the sorted set stored at key.
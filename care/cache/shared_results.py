@@ -0,0 +1,205 @@
+"""
+Cache of model results shared between InferencePipelines.
+
+Pipelines watching the same camera run identical model steps on identical frames.
+`SharedResultsCache` keeps serialised results under keys built from frame fingerprint,
+model and parameters - the first pipeline requesting given key computes the result, the
+others wait for it (single-flight) and receive their own deserialised copy.
+
+Results are stored in `BaseCache` - `MemoryCache` for pipelines running in a single
+process, `RedisCache` to share them across processes (then computation of the key is also
+guarded with Redis lock). Entries expire after `ttl` and the process keeps at most
+`max_bytes` of results written by itself, evicting the oldest ones first.
+"""
+
+import math
+import pickle
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from care.cache.base import BaseCache
+from care.cache.redis import RedisCache
+from care.env import (
+    SHARED_MODEL_RESULTS_MAX_BYTES,
+    SHARED_MODEL_RESULTS_TTL,
+    SHARED_MODEL_RESULTS_WAIT_TIMEOUT,
+)
+from care.logger import logger
+
+T = TypeVar("T")
+
+LOCK_KEY_SUFFIX = ":lock"
+
+
+class SharedResultsCache:
+    _instance: Optional["SharedResultsCache"] = None
+    _instance_lock = Lock()
+
+    @classmethod
+    def init(cls, cache: Optional[BaseCache] = None) -> "SharedResultsCache":
+        """Returns process-wide instance, creating it on the first call.
+
+        Cache given in subsequent calls is ignored. If not given, the default cache of
+        the process (`care.cache.cache`) is used.
+        """
+        if cls._instance is not None:
+            return cls._instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                if cache is None:
+                    from care.cache import cache as default_cache
+
+                    cache = default_cache
+                cls._instance = cls(cache=cache)
+            return cls._instance
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        ttl: float = SHARED_MODEL_RESULTS_TTL,
+        max_bytes: int = SHARED_MODEL_RESULTS_MAX_BYTES,
+        wait_timeout: float = SHARED_MODEL_RESULTS_WAIT_TIMEOUT,
+        distributed: Optional[bool] = None,
+    ):
+        """Single-flight cache of results, bounded by time and bytes.
+
+        Args:
+            cache (BaseCache): Cache storing serialised results.
+            ttl (float): Time (in seconds) after which results expire.
+            max_bytes (int): Max size of results written by the process - results larger
+                than that are not shared at all.
+            wait_timeout (float): Max time (in seconds) to wait for result computed by
+                another caller, before computing it on its own.
+            distributed (Optional[bool]): Flag deciding if computation should be guarded
+                with cache lock, as other processes share the cache. By default True for
+                `RedisCache`.
+        """
+        self._cache = cache
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._wait_timeout = wait_timeout
+        self._distributed = (
+            isinstance(cache, RedisCache) if distributed is None else distributed
+        )
+        self._in_flight: Dict[str, Future] = {}
+        # key -> (size, expiry) of results written by the process, oldest first
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._entries_bytes = 0
+        self._lock = Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._entries_bytes
+
+    def get_or_compute(self, key: str, compute: Callable[[], T]) -> T:
+        """Returns result stored under `key`, computing it with `compute()` if missing.
+
+        Concurrent callers asking for missing key wait for the first one to compute the
+        result. Error raised by `compute()` is propagated to all of them, but not cached.
+        """
+        payload = self._get_payload(key=key)
+        if payload is not None:
+            return pickle.loads(payload)
+        with self._lock:
+            computation = self._in_flight.get(key)
+            is_leader = computation is None
+            if is_leader:
+                computation = Future()
+                self._in_flight[key] = computation
+        if not is_leader:
+            return self._wait_for_result(
+                key=key, computation=computation, compute=compute
+            )
+        try:
+            result, payload = self._compute_once(key=key, compute=compute)
+            computation.set_result(payload)
+            return result
+        except BaseException as error:
+            computation.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _wait_for_result(self, key: str, computation: Future, compute: Callable[[], T]) -> T:
+        try:
+            payload = computation.result(timeout=self._wait_timeout)
+        except FutureTimeoutError:
+            logger.warning(
+                f"Timeout waiting for shared result {key} - computing it independently."
+            )
+            return compute()
+        if payload is None:
+            # result was too large to be shared
+            return compute()
+        return pickle.loads(payload)
+
+    def _compute_once(
+        self, key: str, compute: Callable[[], T]
+    ) -> Tuple[T, Optional[bytes]]:
+        if not self._distributed:
+            return self._compute_and_store(key=key, compute=compute)
+        try:
+            lock = self._cache.acquire_lock(
+                key=f"{key}{LOCK_KEY_SUFFIX}", expire=self._wait_timeout
+            )
+        except TimeoutError:
+            logger.warning(
+                f"Timeout waiting for lock of shared result {key} - computing it independently."
+            )
+            return self._compute_and_store(key=key, compute=compute)
+        try:
+            # another process may have produced the result while we were waiting
+            payload = self._get_payload(key=key)
+            if payload is not None:
+                return pickle.loads(payload), payload
+            return self._compute_and_store(key=key, compute=compute)
+        finally:
+            try:
+                lock.release()
+            except Exception as error:
+                logger.debug(f"Could not release lock of shared result {key}: {error}")
+
+    def _compute_and_store(
+        self, key: str, compute: Callable[[], T]
+    ) -> Tuple[T, Optional[bytes]]:
+        result = compute()
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self._max_bytes:
+            return result, None
+        self._cache.set(key, payload, expire=max(math.ceil(self._ttl), 1))
+        self._register_entry(key=key, size=len(payload))
+        return result, payload
+
+    def _get_payload(self, key: str) -> Optional[bytes]:
+        payload = self._cache.get(key)
+        if isinstance(payload, bytes):
+            return payload
+        return None
+
+    def _register_entry(self, key: str, size: int) -> None:
+        now = time.monotonic()
+        keys_to_evict = []
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._entries_bytes -= previous_entry[0]
+            self._entries[key] = (size, now + self._ttl)
+            self._entries_bytes += size
+            # all entries share ttl, so the oldest one expires first
+            while self._entries:
+                oldest_key, (oldest_size, expiry) = next(iter(self._entries.items()))
+                is_expired = expiry <= now
+                if not is_expired and self._entries_bytes <= self._max_bytes:
+                    break
+                self._entries.popitem(last=False)
+                self._entries_bytes -= oldest_size
+                if not is_expired:
+                    keys_to_evict.append(oldest_key)
+        for evicted_key in keys_to_evict:
+            self._cache.delete(evicted_key)
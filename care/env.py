@@ -112,6 +112,13 @@ OWLV2_MODEL_CACHE_SIZE = int(os.getenv("OWLV2_MODEL_CACHE_SIZE", 100))
 # OWLv2 CPU image cache size, default is 10000
 OWLV2_CPU_IMAGE_CACHE_SIZE = int(os.getenv("OWLV2_CPU_IMAGE_CACHE_SIZE", 1000))
 
+# Optional memory limit (in bytes) of OWLv2 image embeddings cache held on device, default is no limit
+OWLV2_IMAGE_CACHE_BYTES = (
+    int(os.getenv("OWLV2_IMAGE_CACHE_BYTES"))
+    if os.getenv("OWLV2_IMAGE_CACHE_BYTES")
+    else None
+)
+
 # OWLv2 compile model, default is True
 OWLV2_COMPILE_MODEL = str2bool(os.getenv("OWLV2_COMPILE_MODEL", True))
 
@@ -133,6 +140,9 @@ TINY_CACHE = str2bool(os.getenv("TINY_CACHE", True))
 # Maximum batch size for CLIP, default is 8
 CLIP_MAX_BATCH_SIZE = int(os.getenv("CLIP_MAX_BATCH_SIZE", 8))
 
+# Max number of CLIP image and text embeddings kept in cache (each), default is 1000, 0 disables caching
+CLIP_EMBEDDING_CACHE_SIZE = int(os.getenv("CLIP_EMBEDDING_CACHE_SIZE", 1000))
+
 # Class agnostic NMS flag, default is False
 CLASS_AGNOSTIC_NMS_ENV = "CLASS_AGNOSTIC_NMS"
 DEFAULT_CLASS_AGNOSTIC_NMS = False
@@ -392,6 +402,23 @@ SAM2_MAX_EMBEDDING_CACHE_SIZE = int(os.getenv("SAM2_MAX_EMBEDDING_CACHE_SIZE", 1
 SAM2_MAX_LOGITS_CACHE_SIZE = int(os.getenv("SAM2_MAX_LOGITS_CACHE_SIZE", 1000))
 DISABLE_SAM2_LOGITS_CACHE = str2bool(os.getenv("DISABLE_SAM2_LOGITS_CACHE", False))
 
+# Optional memory limits (in bytes) of SAM / SAM2 embedding caches, applied on top of the size limits
+SAM_MAX_EMBEDDING_CACHE_BYTES = (
+    int(os.getenv("SAM_MAX_EMBEDDING_CACHE_BYTES"))
+    if os.getenv("SAM_MAX_EMBEDDING_CACHE_BYTES")
+    else None
+)
+SAM2_MAX_EMBEDDING_CACHE_BYTES = (
+    int(os.getenv("SAM2_MAX_EMBEDDING_CACHE_BYTES"))
+    if os.getenv("SAM2_MAX_EMBEDDING_CACHE_BYTES")
+    else None
+)
+
+# Optional time-to-live (in seconds) of entries in embedding caches of core models, default is no expiry
+EMBEDDING_CACHE_TTL = (
+    float(os.getenv("EMBEDDING_CACHE_TTL")) if os.getenv("EMBEDDING_CACHE_TTL") else None
+)
+
 # SAM version ID, default is "vit_h"
 SAM_VERSION_ID = os.getenv("SAM_VERSION_ID", "vit_h")
 SAM2_VERSION_ID = os.getenv("SAM2_VERSION_ID", "hiera_large")
@@ -418,6 +445,11 @@ TENSORRT_CACHE_PATH = os.getenv("TENSORRT_CACHE_PATH", MODEL_CACHE_DIR)
 # Set TensorRT cache path
 os.environ["ORT_TENSORRT_CACHE_PATH"] = TENSORRT_CACHE_PATH
 
+# Flag to enable caching of ORT-optimised ONNX graphs in model cache, default is True
+ORT_OPTIMIZED_MODELS_CACHE_ENABLED = str2bool(
+    os.getenv("ORT_OPTIMIZED_MODELS_CACHE_ENABLED", "True")
+)
+
 # Version check mode, one of "once" or "continuous", default is "once"
 VERSION_CHECK_MODE = os.getenv("VERSION_CHECK_MODE", "once")
 
@@ -579,6 +611,20 @@ DOCKER_SOCKET_PATH: Optional[str] = os.getenv("DOCKER_SOCKET_PATH")
 
 ENABLE_WORKFLOWS_PROFILING = str2bool(os.getenv("ENABLE_WORKFLOWS_PROFILING", "False"))
 WORKFLOWS_PROFILER_BUFFER_SIZE = int(os.getenv("WORKFLOWS_PROFILER_BUFFER_SIZE", "64"))
+# Workflows profiler sampling: every N-th run and at most one run per interval (in seconds)
+WORKFLOWS_PROFILER_SAMPLE_EVERY_N_RUNS = int(
+    os.getenv("WORKFLOWS_PROFILER_SAMPLE_EVERY_N_RUNS", "1")
+)
+WORKFLOWS_PROFILER_MIN_SAMPLING_INTERVAL = float(
+    os.getenv("WORKFLOWS_PROFILER_MIN_SAMPLING_INTERVAL", "0.0")
+)
+# Sampled runs written per Chrome trace file (0 - single trace saved at pipeline end)
+WORKFLOWS_PROFILER_RUNS_PER_TRACE_FILE = int(
+    os.getenv("WORKFLOWS_PROFILER_RUNS_PER_TRACE_FILE", "0")
+)
+WORKFLOWS_PROFILER_MAX_TRACE_FILES = int(
+    os.getenv("WORKFLOWS_PROFILER_MAX_TRACE_FILES", "10")
+)
 WORKFLOWS_DEFINITION_CACHE_EXPIRY = int(
     os.getenv("WORKFLOWS_DEFINITION_CACHE_EXPIRY", 15 * 60)
 )
@@ -606,6 +652,54 @@ PRELOAD_MODELS = (
     os.getenv("PRELOAD_MODELS").split(",") if os.getenv("PRELOAD_MODELS") else None
 )
 
+# Preloading and warm-up of models referenced by workflows run in InferencePipeline
+WORKFLOWS_MODELS_PRELOADING_ENABLED = str2bool(
+    os.getenv("WORKFLOWS_MODELS_PRELOADING_ENABLED", "False")
+)
+WORKFLOWS_MODELS_PRELOADING_WORKERS = int(
+    os.getenv("WORKFLOWS_MODELS_PRELOADING_WORKERS", "4")
+)
+WORKFLOWS_MODELS_WARMUP_ITERATIONS = int(
+    os.getenv("WORKFLOWS_MODELS_WARMUP_ITERATIONS", "1")
+)
+WORKFLOWS_MODELS_WARMUP_BATCH_SIZES = (
+    [int(e) for e in os.getenv("WORKFLOWS_MODELS_WARMUP_BATCH_SIZES").split(",")]
+    if os.getenv("WORKFLOWS_MODELS_WARMUP_BATCH_SIZES")
+    else None
+)
+
+# Sharing of model instances between InferencePipelines running in the same process
+SHARED_MODELS_ENABLED = str2bool(os.getenv("SHARED_MODELS_ENABLED", "False"))
+
+# Dynamic batching of concurrent predictions against the same model
+MICRO_BATCHING_ENABLED = str2bool(os.getenv("MICRO_BATCHING_ENABLED", "False"))
+MICRO_BATCHING_MAX_BATCH_SIZE = int(
+    os.getenv(
+        "MICRO_BATCHING_MAX_BATCH_SIZE",
+        MAX_BATCH_SIZE if MAX_BATCH_SIZE != float("inf") else 16,
+    )
+)
+MICRO_BATCHING_MAX_WAIT = float(os.getenv("MICRO_BATCHING_MAX_WAIT", "0.005"))
+
+# Max number of compiled UQL expressions kept in memory (shared by all workflow blocks)
+UQL_COMPILER_CACHE_SIZE = int(os.getenv("UQL_COMPILER_CACHE_SIZE", "512"))
+
+# Max number of compiled workflows definitions kept in memory, 0 disables the cache
+WORKFLOWS_COMPILATION_CACHE_SIZE = int(
+    os.getenv("WORKFLOWS_COMPILATION_CACHE_SIZE", "16")
+)
+
+# Merging of duplicated steps of stateless blocks (same type, parameters and inputs) before
+# compilation of workflows, including ones run by inference pipelines
+WORKFLOWS_STEPS_DEDUPLICATION_ENABLED = str2bool(
+    os.getenv("WORKFLOWS_STEPS_DEDUPLICATION_ENABLED", "True")
+)
+
+# Max number of idle compiled engines kept for single workflow definition
+WORKFLOWS_COMPILATION_CACHE_MAX_IDLE_ENGINES = int(
+    os.getenv("WORKFLOWS_COMPILATION_CACHE_MAX_IDLE_ENGINES", "2")
+)
+
 LOAD_ENTERPRISE_BLOCKS = str2bool(os.getenv("LOAD_ENTERPRISE_BLOCKS", "False"))
 TRANSIENT_ROBOFLOW_API_ERRORS = set(
     int(e)
@@ -670,3 +764,79 @@ RFDETR_ONNX_MAX_RESOLUTION = int(os.getenv("RFDETR_ONNX_MAX_RESOLUTION", "1600")
 CONFIDENCE_LOWER_BOUND_OOM_PREVENTION = float(
     os.getenv("CONFIDENCE_LOWER_BOUND_OOM_PREVENTION", "0.01")
 )
+
+# Seconds after which unused EtherNet/IP sessions of PLC blocks are closed
+ETHERNET_IP_SESSION_IDLE_TIMEOUT = float(
+    os.getenv("ETHERNET_IP_SESSION_IDLE_TIMEOUT", "60.0")
+)
+
+# Seconds after which unused OPC UA sessions of OPC writer blocks are closed
+OPC_UA_SESSION_IDLE_TIMEOUT = float(os.getenv("OPC_UA_SESSION_IDLE_TIMEOUT", "300.0"))
+
+# Number of threads preparing and uploading Active Learning datapoints of a stream
+ACTIVE_LEARNING_REGISTRATION_WORKERS = int(
+    os.getenv("ACTIVE_LEARNING_REGISTRATION_WORKERS", "2")
+)
+
+# Max number of queued Active Learning datapoints taken by a worker at once
+ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE = int(
+    os.getenv("ACTIVE_LEARNING_REGISTRATION_BATCH_SIZE", "8")
+)
+
+# Max number of keep-alive connections per host kept by the shared HTTP session
+ROBOFLOW_API_HTTP_POOL_SIZE = int(os.getenv("ROBOFLOW_API_HTTP_POOL_SIZE", "16"))
+
+# Retries of requests to Roboflow API failed on transport level (connection refused or dropped)
+ROBOFLOW_API_HTTP_RETRIES = int(os.getenv("ROBOFLOW_API_HTTP_RETRIES", "3"))
+
+# Base of exponential, jittered backoff between transport level retries, in seconds
+ROBOFLOW_API_HTTP_BACKOFF_FACTOR = float(
+    os.getenv("ROBOFLOW_API_HTTP_BACKOFF_FACTOR", "0.5")
+)
+
+# Max number of Roboflow API responses kept for ETag revalidation
+ROBOFLOW_API_ETAG_CACHE_SIZE = int(os.getenv("ROBOFLOW_API_ETAG_CACHE_SIZE", "256"))
+
+# Attempts to resume interrupted download of model artifact with HTTP Range request
+MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS = int(
+    os.getenv("MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS", "3")
+)
+
+# Sharing of model steps results between InferencePipelines processing the same frames
+SHARED_MODEL_RESULTS_ENABLED = str2bool(
+    os.getenv("SHARED_MODEL_RESULTS_ENABLED", "False")
+)
+
+# Seconds for which shared model results are kept
+SHARED_MODEL_RESULTS_TTL = float(os.getenv("SHARED_MODEL_RESULTS_TTL", "10.0"))
+
+# Max size of serialised model results kept by the process, in bytes
+SHARED_MODEL_RESULTS_MAX_BYTES = int(
+    os.getenv("SHARED_MODEL_RESULTS_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Max time (in seconds) pipeline waits for result computed by another one
+SHARED_MODEL_RESULTS_WAIT_TIMEOUT = float(
+    os.getenv("SHARED_MODEL_RESULTS_WAIT_TIMEOUT", "30.0")
+)
+
+# Seconds for which per-frame detection summaries are kept by DetectionsStore
+DETECTIONS_STORE_RAW_RETENTION = float(
+    os.getenv("DETECTIONS_STORE_RAW_RETENTION", str(24 * 3600))
+)
+
+# Seconds for which minute rollups of detection summaries are kept by DetectionsStore
+DETECTIONS_STORE_MINUTE_ROLLUPS_RETENTION = float(
+    os.getenv("DETECTIONS_STORE_MINUTE_ROLLUPS_RETENTION", str(30 * 24 * 3600))
+)
+
+# Number of frames buffered by DetectionsStoreSink before being written as one batch
+DETECTIONS_STORE_SINK_BATCH_SIZE = int(
+    os.getenv("DETECTIONS_STORE_SINK_BATCH_SIZE", "900")
+)
+
+# Max number of video sources which state is kept by stateful care_steps v2 blocks
+CARE_STEPS_MAX_SOURCES_STATES = int(os.getenv("CARE_STEPS_MAX_SOURCES_STATES", "1024"))
+
+# Seconds after which state of video source not seen by stateful care_steps v2 block is dropped
+CARE_STEPS_SOURCE_STATE_TTL = float(os.getenv("CARE_STEPS_SOURCE_STATE_TTL", "3600"))
@@ -140,6 +140,44 @@ class ModelManager:
                 self._dispose_model_lock(model_id=resolved_identifier)
                 raise error
 
+    def register_model_instance(self, model_id: str, model: Model) -> None:
+        """Adds already initialised model (e.g. owned by `ModelHub`) to the manager.
+
+        Args:
+            model_id (str): The identifier under which the model is registered.
+            model (Model): The model instance.
+        """
+        model_lock = self._get_lock_for_a_model(model_id=model_id)
+        with acquire_with_timeout(lock=model_lock) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    f"Could not acquire lock for model with id={model_id}."
+                )
+            if model_id in self._models:
+                return None
+            logger.debug(f"ModelManager - registering model instance with model_id={model_id}")
+            self._models[model_id] = model
+
+    def detach_model(self, model_id: str) -> Optional[Model]:
+        """Removes a model from the manager without clearing its cache.
+
+        Args:
+            model_id (str): The identifier of the model.
+
+        Returns:
+            Optional[Model]: The detached model, None if the model was not loaded.
+        """
+        model_lock = self._get_lock_for_a_model(model_id=model_id)
+        with acquire_with_timeout(lock=model_lock) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    f"Could not acquire lock for model with id={model_id}."
+                )
+            model = self._models.pop(model_id, None)
+            if model is not None:
+                self._dispose_model_lock(model_id=model_id)
+            return model
+
     def check_for_model(self, model_id: str) -> None:
         """Checks whether the model with the given ID is in the manager.
 
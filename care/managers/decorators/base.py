@@ -155,6 +155,26 @@ class ModelManagerDecorator(ModelManager):
         """
         return self.model_manager.get_class_names(model_id)
 
+    def register_model_instance(self, model_id: str, model: Model) -> None:
+        """Adds already initialised model to the manager.
+
+        Args:
+            model_id (str): The identifier under which the model is registered.
+            model (Model): The model instance.
+        """
+        self.model_manager.register_model_instance(model_id, model)
+
+    def detach_model(self, model_id: str) -> Optional[Model]:
+        """Removes a model from the manager without clearing its cache.
+
+        Args:
+            model_id (str): The identifier of the model.
+
+        Returns:
+            Optional[Model]: The detached model, None if the model was not loaded.
+        """
+        return self.model_manager.detach_model(model_id)
+
     def remove(self, model_id: str, delete_from_disk: bool = True) -> Model:
         """Removes a model from the manager.
 
@@ -76,37 +76,7 @@ class WithFixedSizeCache(ModelManagerDecorator):
             self._refresh_model_position_in_a_queue(model_id=queue_id)
             return None
 
-        logger.debug(f"Current capacity of ModelManager: {len(self)}/{self.max_size}")
-        with acquire_with_timeout(
-            lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
-        ) as acquired:
-            if not acquired:
-                raise ModelManagerLockAcquisitionError(
-                    "Could not acquire lock on Model Manager state to add model from active models queue."
-                )
-            while self._key_queue and (
-                len(self) >= self.max_size
-                or (MEMORY_FREE_THRESHOLD and self.memory_pressure_detected())
-            ):
-                # To prevent flapping around the threshold, remove 3 models to make some space.
-                for _ in range(3):
-                    if not self._key_queue:
-                        logger.error(
-                            "Tried to remove model from cache even though key queue is already empty!"
-                            "(max_size: %s, len(self): %s, MEMORY_FREE_THRESHOLD: %s)",
-                            self.max_size,
-                            len(self),
-                            MEMORY_FREE_THRESHOLD,
-                        )
-                        break
-                    to_remove_model_id = self._key_queue.popleft()
-                    super().remove(
-                        to_remove_model_id, delete_from_disk=DISK_CACHE_CLEANUP
-                    )  # LRU model overflow cleanup may or maynot need the weights removed from disk
-                    logger.debug(f"Model {to_remove_model_id} successfully unloaded.")
-                gc.collect()
-            logger.debug(f"Marking new model {queue_id} as most recently used.")
-            self._key_queue.append(queue_id)
+        self._reserve_place_in_queue(queue_id=queue_id)
         try:
             return super().add_model(
                 model_id,
@@ -120,14 +90,24 @@ class WithFixedSizeCache(ModelManagerDecorator):
             logger.debug(
                 f"Could not initialise model {queue_id}. Removing from WithFixedSizeCache models queue."
             )
-            with acquire_with_timeout(
-                lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
-            ) as acquired:
-                if not acquired:
-                    raise ModelManagerLockAcquisitionError(
-                        "Could not acquire lock on Model Manager state to remove model from active models queue."
-                    )
-                self._safe_remove_model_from_queue(queue_id)
+            self._remove_from_queue(model_id=queue_id)
+            raise error
+
+    def register_model_instance(self, model_id: str, model: Model) -> None:
+        """Adds already initialised model, evicting the least recently used if the cache is full.
+
+        Args:
+            model_id (str): The identifier under which the model is registered.
+            model (Model): The model instance.
+        """
+        if model_id in self:
+            self._refresh_model_position_in_a_queue(model_id=model_id)
+            return None
+        self._reserve_place_in_queue(queue_id=model_id)
+        try:
+            return super().register_model_instance(model_id, model)
+        except Exception as error:
+            self._remove_from_queue(model_id=model_id)
             raise error
 
     def clear(self) -> None:
@@ -136,16 +116,13 @@ class WithFixedSizeCache(ModelManagerDecorator):
             self.remove(model_id)
 
     def remove(self, model_id: str, delete_from_disk: bool = True) -> Model:
-        with acquire_with_timeout(
-            lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
-        ) as acquired:
-            if not acquired:
-                raise ModelManagerLockAcquisitionError(
-                    "Could not acquire lock on Model Manager state to remove model from active models queue."
-                )
-            self._safe_remove_model_from_queue(model_id=model_id)
+        self._remove_from_queue(model_id=model_id)
         return super().remove(model_id, delete_from_disk=delete_from_disk)
 
+    def detach_model(self, model_id: str) -> Optional[Model]:
+        self._remove_from_queue(model_id=model_id)
+        return super().detach_model(model_id)
+
     async def infer_from_request(
         self, model_id: str, request: InferenceRequest, **kwargs
     ) -> InferenceResponse:
@@ -210,6 +187,49 @@ class WithFixedSizeCache(ModelManagerDecorator):
     ) -> str:
         return model_id if model_id_alias is None else model_id_alias
 
+    def _reserve_place_in_queue(self, queue_id: str) -> None:
+        logger.debug(f"Current capacity of ModelManager: {len(self)}/{self.max_size}")
+        with acquire_with_timeout(
+            lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
+        ) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    "Could not acquire lock on Model Manager state to add model from active models queue."
+                )
+            while self._key_queue and (
+                len(self) >= self.max_size
+                or (MEMORY_FREE_THRESHOLD and self.memory_pressure_detected())
+            ):
+                # To prevent flapping around the threshold, remove 3 models to make some space.
+                for _ in range(3):
+                    if not self._key_queue:
+                        logger.error(
+                            "Tried to remove model from cache even though key queue is already empty!"
+                            "(max_size: %s, len(self): %s, MEMORY_FREE_THRESHOLD: %s)",
+                            self.max_size,
+                            len(self),
+                            MEMORY_FREE_THRESHOLD,
+                        )
+                        break
+                    to_remove_model_id = self._key_queue.popleft()
+                    super().remove(
+                        to_remove_model_id, delete_from_disk=DISK_CACHE_CLEANUP
+                    )  # LRU model overflow cleanup may or maynot need the weights removed from disk
+                    logger.debug(f"Model {to_remove_model_id} successfully unloaded.")
+                gc.collect()
+            logger.debug(f"Marking new model {queue_id} as most recently used.")
+            self._key_queue.append(queue_id)
+
+    def _remove_from_queue(self, model_id: str) -> None:
+        with acquire_with_timeout(
+            lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
+        ) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    "Could not acquire lock on Model Manager state to remove model from active models queue."
+                )
+            self._safe_remove_model_from_queue(model_id=model_id)
+
     def _refresh_model_position_in_a_queue(self, model_id: str) -> None:
         with acquire_with_timeout(
             lock=self._queue_lock, timeout=HOT_MODELS_QUEUE_LOCK_ACQUIRE_TIMEOUT
@@ -0,0 +1,92 @@
+from threading import Lock
+from typing import Dict, Optional
+
+from care.env import MICRO_BATCHING_MAX_BATCH_SIZE, MICRO_BATCHING_MAX_WAIT
+from care.logger import logger
+from care.managers.base import ModelManager
+from care.managers.decorators.base import ModelManagerDecorator
+from care.models.utils.micro_batching import (
+    CoalescingPredictor,
+    install_coalescing_predictor,
+    uninstall_coalescing_predictor,
+)
+from care.registries.roboflow import ModelEndpointType
+
+
+class WithMicroBatching(ModelManagerDecorator):
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        max_batch_size: int = MICRO_BATCHING_MAX_BATCH_SIZE,
+        max_wait: float = MICRO_BATCHING_MAX_WAIT,
+    ):
+        """Decorator coalescing concurrent predictions against the same model.
+
+        Once model supporting dynamic batching is added, its `predict(...)` is routed through
+        `CoalescingPredictor` - concurrent requests (e.g. from workflow steps executed in parallel)
+        are queued and run as a single `predict(...)` call, once batch of `max_batch_size` elements
+        is collected or the oldest request waited `max_wait` seconds.
+
+        Args:
+            model_manager (ModelManager): Instance of a ModelManager.
+            max_batch_size (int, optional): Max number of images in coalesced batch.
+            max_wait (float, optional): Max time (in seconds) request waits for batch to be filled.
+        """
+        super().__init__(model_manager)
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._predictors: Dict[str, CoalescingPredictor] = {}
+        self._predictors_lock = Lock()
+
+    def add_model(
+        self,
+        model_id: str,
+        api_key: str,
+        model_id_alias: Optional[str] = None,
+        endpoint_type: ModelEndpointType = ModelEndpointType.ORT,
+        countinference: Optional[bool] = None,
+        service_secret: Optional[str] = None,
+    ) -> None:
+        super().add_model(
+            model_id,
+            api_key,
+            model_id_alias=model_id_alias,
+            endpoint_type=endpoint_type,
+            countinference=countinference,
+            service_secret=service_secret,
+        )
+        resolved_identifier = model_id if model_id_alias is None else model_id_alias
+        with self._predictors_lock:
+            if resolved_identifier in self._predictors:
+                return None
+            predictor = install_coalescing_predictor(
+                model=self.model_manager[resolved_identifier],
+                max_batch_size=self._max_batch_size,
+                max_wait=self._max_wait,
+                name=resolved_identifier,
+            )
+            if predictor is not None:
+                logger.debug(f"Micro-batching enabled for model {resolved_identifier}")
+                self._predictors[resolved_identifier] = predictor
+
+    def remove(self, model_id: str, delete_from_disk: bool = True) -> None:
+        with self._predictors_lock:
+            predictor = self._predictors.pop(model_id, None)
+            if predictor is not None and model_id in self:
+                uninstall_coalescing_predictor(
+                    model=self.model_manager[model_id], predictor=predictor
+                )
+        super().remove(model_id, delete_from_disk=delete_from_disk)
+
+    def dispose(self) -> None:
+        """Stops workers of all installed predictors - to be called when pipeline ends."""
+        with self._predictors_lock:
+            predictors, self._predictors = self._predictors, {}
+            for model_id, predictor in predictors.items():
+                logger.debug(f"Micro-batching disabled for model {model_id}")
+                if model_id in self:
+                    uninstall_coalescing_predictor(
+                        model=self.model_manager[model_id], predictor=predictor
+                    )
+                else:
+                    predictor.close()
@@ -0,0 +1,39 @@
+from care.entities.requests.inference import InferenceRequest
+from care.entities.responses.inference import InferenceResponse
+from care.managers.base import ModelManager
+from care.managers.decorators.base import ModelManagerDecorator
+from care.workflows.execution_engine.profiling.core import WorkflowsProfiler
+
+
+class WithWorkflowsProfiling(ModelManagerDecorator):
+    def __init__(self, model_manager: ModelManager, profiler: WorkflowsProfiler):
+        """Decorator recording model calls as spans of workflows profiler.
+
+        With sampling profiler, calls issued outside of sampled workflow runs are not timed.
+
+        Args:
+            model_manager (ModelManager): Instance of a ModelManager.
+            profiler (WorkflowsProfiler): Profiler receiving `model_inference` spans.
+        """
+        super().__init__(model_manager)
+        self._profiler = profiler
+
+    async def infer_from_request(
+        self, model_id: str, request: InferenceRequest, **kwargs
+    ) -> InferenceResponse:
+        with self._profiler.profile_execution_phase(
+            name="model_inference",
+            categories=["model_call"],
+            metadata={"model_id": model_id},
+        ):
+            return await super().infer_from_request(model_id, request, **kwargs)
+
+    def infer_from_request_sync(
+        self, model_id: str, request: InferenceRequest, **kwargs
+    ) -> InferenceResponse:
+        with self._profiler.profile_execution_phase(
+            name="model_inference",
+            categories=["model_call"],
+            metadata={"model_id": model_id},
+        ):
+            return super().infer_from_request_sync(model_id, request, **kwargs)
@@ -0,0 +1,102 @@
+import uuid
+from typing import Hashable, Optional
+
+from care.entities.requests.inference import InferenceRequest
+from care.entities.responses.inference import InferenceResponse
+from care.logger import logger
+from care.managers.base import ModelManager
+from care.managers.decorators.base import ModelManagerDecorator
+from care.managers.hub import ModelHub
+from care.models.utils.micro_batching import micro_batching_client
+from care.registries.roboflow import ModelEndpointType
+
+
+class WithSharedModels(ModelManagerDecorator):
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        hub: ModelHub,
+        client_id: Optional[Hashable] = None,
+    ):
+        """Decorator sourcing model instances from process-level `ModelHub`.
+
+        Models are acquired from the hub instead of being constructed, registered in the
+        wrapped manager as ready instances and released (not destroyed) when removed from
+        the manager. Inference issued through the
+        decorator is marked with `client_id`, which is used by the hub to fairly
+        interleave batched predictions of different clients.
+
+        Args:
+            model_manager (ModelManager): Instance of a ModelManager.
+            hub (ModelHub): Hub owning shared models.
+            client_id (Optional[Hashable]): Identifier of the client (pipeline), random if not given.
+        """
+        super().__init__(model_manager)
+        self._hub = hub
+        self._client_id = client_id if client_id is not None else str(uuid.uuid4())
+
+    @property
+    def client_id(self) -> Hashable:
+        return self._client_id
+
+    def add_model(
+        self,
+        model_id: str,
+        api_key: str,
+        model_id_alias: Optional[str] = None,
+        endpoint_type: ModelEndpointType = ModelEndpointType.ORT,
+        countinference: Optional[bool] = None,
+        service_secret: Optional[str] = None,
+    ) -> None:
+        resolved_identifier = model_id if model_id_alias is None else model_id_alias
+        if resolved_identifier in self:
+            return None
+        model = self._hub.acquire(
+            model_id=model_id,
+            api_key=api_key,
+            client_id=self._client_id,
+            model_id_alias=model_id_alias,
+            endpoint_type=endpoint_type,
+            countinference=countinference,
+            service_secret=service_secret,
+        )
+        try:
+            self.model_manager.register_model_instance(resolved_identifier, model)
+        except Exception as error:
+            self._hub.release(model_id=resolved_identifier, client_id=self._client_id)
+            raise error
+
+    def remove(self, model_id: str, delete_from_disk: bool = True) -> None:
+        # shared instance is detached, not cleared - other clients may still use it
+        if self.model_manager.detach_model(model_id) is None:
+            return None
+        self._hub.release(model_id=model_id, client_id=self._client_id)
+
+    def clear(self) -> None:
+        for model_id in list(self.keys()):
+            self.remove(model_id)
+
+    def dispose(self) -> None:
+        """Releases all models held by the client - to be called when pipeline ends."""
+        logger.debug(f"Releasing shared models held by client {self._client_id}")
+        self.clear()
+
+    async def infer_from_request(
+        self, model_id: str, request: InferenceRequest, **kwargs
+    ) -> InferenceResponse:
+        with micro_batching_client(self._client_id):
+            return await super().infer_from_request(model_id, request, **kwargs)
+
+    def infer_from_request_sync(
+        self, model_id: str, request: InferenceRequest, **kwargs
+    ) -> InferenceResponse:
+        with micro_batching_client(self._client_id):
+            return super().infer_from_request_sync(model_id, request, **kwargs)
+
+    def infer_only(self, model_id: str, request, img_in, img_dims, batch_size=None):
+        with micro_batching_client(self._client_id):
+            return super().infer_only(model_id, request, img_in, img_dims, batch_size)
+
+    def predict(self, model_id: str, *args, **kwargs):
+        with micro_batching_client(self._client_id):
+            return super().predict(model_id, *args, **kwargs)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import weakref
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from care.cache.shared_results import SharedResultsCache
+from care.entities.requests.inference import InferenceRequest
+from care.entities.responses.inference import InferenceResponse
+from care.managers.base import ModelManager
+from care.managers.decorators.base import ModelManagerDecorator
+
+# fields of request which do not influence the result
+NON_RESULT_REQUEST_FIELDS = {
+    "id",
+    "image",
+    "api_key",
+    "usage_billable",
+    "start",
+    "source",
+    "source_info",
+    "disable_model_monitoring",
+}
+SHARED_RESULTS_KEY_PREFIX = "shared_model_results"
+
+
+class WithSharedResults(ModelManagerDecorator):
+    def __init__(self, model_manager: ModelManager, results_cache: SharedResultsCache):
+        """Decorator sharing results of predictions on identical frames between pipelines.
+
+        Result of request made against in-memory images is stored in `results_cache` under
+        key made of frames fingerprints, model id and parameters of the request - the other
+        pipelines (or steps) making the same request get the result without running the
+        model. Fingerprint is a digest of image content, as independent decoders of the same
+        stream assign their own frame ids - it is computed once per frame. Requests against
+        images given by reference (URL, file, base64) bypass the cache.
+
+        Args:
+            model_manager (ModelManager): Instance of a ModelManager.
+            results_cache (SharedResultsCache): Cache of results, shared by pipelines.
+        """
+        super().__init__(model_manager)
+        self._results_cache = results_cache
+
+    def infer_from_request_sync(
+        self, model_id: str, request: InferenceRequest, **kwargs
+    ) -> InferenceResponse:
+        key = build_shared_results_key(model_id=model_id, request=request)
+        if key is None:
+            return super().infer_from_request_sync(model_id, request, **kwargs)
+        return self._results_cache.get_or_compute(
+            key=key,
+            compute=lambda: super(WithSharedResults, self).infer_from_request_sync(
+                model_id, request, **kwargs
+            ),
+        )
+
+
+def build_shared_results_key(model_id: str, request: InferenceRequest) -> Optional[str]:
+    images = getattr(request, "image", None)
+    if images is None:
+        return None
+    if not isinstance(images, list):
+        images = [images]
+    fingerprints = []
+    for image in images:
+        value = _get_numpy_image(image=image)
+        if value is None:
+            return None
+        fingerprints.append(FRAMES_FINGERPRINTS.get(image=value))
+    try:
+        parameters = json.dumps(
+            request.dict(exclude=NON_RESULT_REQUEST_FIELDS),
+            sort_keys=True,
+            default=str,
+        )
+    except (TypeError, ValueError):
+        return None
+    key_hash = hashlib.sha256(parameters.encode("utf-8"))
+    for fingerprint in fingerprints:
+        key_hash.update(fingerprint)
+    return f"{SHARED_RESULTS_KEY_PREFIX}:{model_id}:{key_hash.hexdigest()}"
+
+
+def _get_numpy_image(image) -> Optional[np.ndarray]:
+    if isinstance(image, dict):
+        image_type, value = image.get("type"), image.get("value")
+    else:
+        image_type, value = getattr(image, "type", None), getattr(image, "value", None)
+    if image_type != "numpy_object" or not isinstance(value, np.ndarray):
+        return None
+    return value
+
+
+class FramesFingerprints:
+    def __init__(self):
+        """Digests of frames content, memoized for as long as the frame is alive.
+
+        Frames are assumed not to be modified in place once passed to the workflow, as
+        workflow blocks treat their input images as immutable.
+        """
+        self._fingerprints: Dict[int, Tuple[weakref.ref, bytes]] = {}
+
+    def get(self, image: np.ndarray) -> bytes:
+        image_id = id(image)
+        entry = self._fingerprints.get(image_id)
+        if entry is not None and entry[0]() is image:
+            return entry[1]
+        fingerprint = compute_frame_fingerprint(image=image)
+        reference = weakref.ref(image, self._create_finalizer(image_id=image_id))
+        self._fingerprints[image_id] = (reference, fingerprint)
+        return fingerprint
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _create_finalizer(self, image_id: int):
+        # called while the frame is deallocated, before its id can be reused - no lock
+        # is taken, as the callback may run in a thread interrupted while holding one
+        def finalize(reference: weakref.ref) -> None:
+            entry = self._fingerprints.get(image_id)
+            if entry is not None and entry[0] is reference:
+                self._fingerprints.pop(image_id, None)
+
+        return finalize
+
+
+def compute_frame_fingerprint(image: np.ndarray) -> bytes:
+    # sha256 is hardware accelerated on most CPUs, faster than md5 and blake2b
+    digest = hashlib.sha256()
+    digest.update(f"{image.dtype.str}:{image.shape}".encode("utf-8"))
+    digest.update(memoryview(np.ascontiguousarray(image)).cast("B"))
+    return digest.digest()
+
+
+FRAMES_FINGERPRINTS = FramesFingerprints()
@@ -0,0 +1,147 @@
+"""Process-level hub of models shared by multiple InferencePipelines.
+
+Each `InferencePipeline.init_with_workflow(...)` builds its own model manager, so running
+several pipelines in one process (e.g. one per ward) would load the same weights many
+times. Pipelines that opt into sharing (see `WithSharedModels` decorator) acquire model
+instances from `ModelHub` instead - the hub keeps single, reference-counted instance per
+model and coalesces concurrent predictions issued by different pipelines into batched
+model executions, serving pipelines round-robin.
+"""
+
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Set
+
+from care.env import MICRO_BATCHING_MAX_BATCH_SIZE, MICRO_BATCHING_MAX_WAIT
+from care.exceptions import ModelManagerLockAcquisitionError
+from care.logger import logger
+from care.managers.base import Model, ModelManager, acquire_with_timeout
+from care.models.utils.micro_batching import (
+    CoalescingPredictor,
+    install_coalescing_predictor,
+    uninstall_coalescing_predictor,
+)
+from care.registries.base import ModelRegistry
+from care.registries.roboflow import ModelEndpointType
+
+
+class ModelHub:
+    _instance: Optional["ModelHub"] = None
+    _instance_lock = Lock()
+
+    @classmethod
+    def init(
+        cls,
+        model_registry: ModelRegistry,
+        max_batch_size: int = MICRO_BATCHING_MAX_BATCH_SIZE,
+        max_wait: float = MICRO_BATCHING_MAX_WAIT,
+    ) -> "ModelHub":
+        """Returns process-wide hub, creating it on the first call.
+
+        Registry and batching configuration given in subsequent calls are ignored - all
+        pipelines sharing models must resolve them in the same way.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(
+                    model_manager=ModelManager(model_registry=model_registry),
+                    max_batch_size=max_batch_size,
+                    max_wait=max_wait,
+                )
+            return cls._instance
+
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        max_batch_size: int = MICRO_BATCHING_MAX_BATCH_SIZE,
+        max_wait: float = MICRO_BATCHING_MAX_WAIT,
+    ):
+        self._model_manager = model_manager
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._references: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._predictors: Dict[str, CoalescingPredictor] = {}
+        self._state_lock = Lock()
+        self._models_locks: Dict[str, Lock] = {}
+
+    def acquire(
+        self,
+        model_id: str,
+        api_key: str,
+        client_id: Hashable,
+        model_id_alias: Optional[str] = None,
+        endpoint_type: ModelEndpointType = ModelEndpointType.ORT,
+        countinference: Optional[bool] = None,
+        service_secret: Optional[str] = None,
+    ) -> Model:
+        """Loads the model (if not loaded yet) and registers reference held by client.
+
+        Returns:
+            Model: Instance of the model shared by all clients.
+        """
+        resolved_identifier = model_id if model_id_alias is None else model_id_alias
+        with acquire_with_timeout(
+            lock=self._get_lock_for_a_model(model_id=resolved_identifier)
+        ) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    f"Could not acquire lock for shared model with id={resolved_identifier}."
+                )
+            self._model_manager.add_model(
+                model_id=model_id,
+                api_key=api_key,
+                model_id_alias=model_id_alias,
+                endpoint_type=endpoint_type,
+                countinference=countinference,
+                service_secret=service_secret,
+            )
+            model = self._model_manager[resolved_identifier]
+            self._references[resolved_identifier].add(client_id)
+            if resolved_identifier not in self._predictors:
+                predictor = install_coalescing_predictor(
+                    model=model,
+                    max_batch_size=self._max_batch_size,
+                    max_wait=self._max_wait,
+                    name=resolved_identifier,
+                )
+                if predictor is not None:
+                    self._predictors[resolved_identifier] = predictor
+            logger.debug(
+                f"ModelHub - model {resolved_identifier} acquired, "
+                f"references: {len(self._references[resolved_identifier])}"
+            )
+            return model
+
+    def release(self, model_id: str, client_id: Hashable) -> None:
+        """Drops reference held by client - model is unloaded once it is not referenced."""
+        with acquire_with_timeout(
+            lock=self._get_lock_for_a_model(model_id=model_id)
+        ) as acquired:
+            if not acquired:
+                raise ModelManagerLockAcquisitionError(
+                    f"Could not acquire lock for shared model with id={model_id}."
+                )
+            references = self._references.get(model_id)
+            if references is None:
+                return None
+            references.discard(client_id)
+            if references:
+                return None
+            del self._references[model_id]
+            predictor = self._predictors.pop(model_id, None)
+            if predictor is not None:
+                uninstall_coalescing_predictor(
+                    model=self._model_manager[model_id], predictor=predictor
+                )
+            logger.debug(f"ModelHub - model {model_id} not referenced anymore, removing.")
+            self._model_manager.remove(model_id, delete_from_disk=False)
+
+    def reference_count(self, model_id: str) -> int:
+        return len(self._references.get(model_id, ()))
+
+    def _get_lock_for_a_model(self, model_id: str) -> Lock:
+        with self._state_lock:
+            if model_id not in self._models_locks:
+                self._models_locks[model_id] = Lock()
+            return self._models_locks[model_id]
+
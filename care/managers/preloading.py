@@ -0,0 +1,252 @@
+"""Preloading and warm-up of models referenced by workflow definitions.
+
+`ModelManager.add_model(...)` is called lazily by workflow steps, so the first frames
+processed by a freshly started pipeline wait for weights download and ONNX session
+creation. Functions in this module scan workflow definition up-front, load all
+statically referenced models in parallel and run warm-up inferences on synthetic
+inputs, so that the pipeline is ready before it starts consuming video.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from care.env import (
+    MAX_BATCH_SIZE,
+    WORKFLOWS_MODELS_PRELOADING_WORKERS,
+    WORKFLOWS_MODELS_WARMUP_ITERATIONS,
+)
+from care.logger import logger
+from care.managers.base import ModelManager
+from care.models.base import Model
+
+MODEL_ID_PROPERTY = "model_id"
+INPUTS_SELECTOR_PREFIX = "$inputs."
+DEFAULT_WARMUP_INPUT_SIZE = (640, 640)
+
+
+@dataclass
+class ModelPreloadingResult:
+    model_id: str
+    loaded: bool
+    load_duration: float
+    warmup_duration: float = 0.0
+    warmed_up_batch_sizes: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+    warmup_error: Optional[str] = None
+
+
+@dataclass
+class ModelsPreloadingReport:
+    results: List[ModelPreloadingResult]
+    total_duration: float
+
+    @property
+    def ready(self) -> bool:
+        return all(result.loaded for result in self.results)
+
+    @property
+    def failed_models(self) -> List[str]:
+        return [result.model_id for result in self.results if not result.loaded]
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "total_duration": self.total_duration,
+            "models": [asdict(result) for result in self.results],
+        }
+
+
+def find_models_in_workflow_definition(
+    workflow_definition: dict,
+    workflows_parameters: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Statically discovers identifiers of models used by workflow steps.
+
+    Steps may declare `model_id` as literal or as `$inputs.<name>` selector - the latter
+    is resolved against runtime parameters (if given) or input default value. Selectors
+    pointing to outputs of other steps cannot be resolved before execution and are
+    skipped.
+
+    Args:
+        workflow_definition (dict): Workflow definition.
+        workflows_parameters (Optional[Dict[str, Any]]): Runtime parameters of workflow.
+
+    Returns:
+        List[str]: Unique model identifiers, in order of appearance.
+    """
+    if workflows_parameters is None:
+        workflows_parameters = {}
+    inputs_values = {
+        workflow_input.get("name"): workflow_input.get("default_value")
+        for workflow_input in workflow_definition.get("inputs", [])
+    }
+    inputs_values.update(workflows_parameters)
+    model_ids = []
+    for step in workflow_definition.get("steps", []):
+        model_id = _resolve_model_id(
+            value=step.get(MODEL_ID_PROPERTY), inputs_values=inputs_values
+        )
+        if model_id is not None and model_id not in model_ids:
+            model_ids.append(model_id)
+    return model_ids
+
+
+def _resolve_model_id(value: Any, inputs_values: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    if value.startswith(INPUTS_SELECTOR_PREFIX):
+        value = inputs_values.get(value[len(INPUTS_SELECTOR_PREFIX) :])
+        if not isinstance(value, str):
+            return None
+    if value.startswith("$"):
+        return None
+    return value
+
+
+def preload_models(
+    model_manager: ModelManager,
+    model_ids: List[str],
+    api_key: Optional[str],
+    warmup_iterations: int = WORKFLOWS_MODELS_WARMUP_ITERATIONS,
+    warmup_batch_sizes: Iterable[int] = (1,),
+    max_workers: int = WORKFLOWS_MODELS_PRELOADING_WORKERS,
+) -> ModelsPreloadingReport:
+    """Loads given models into model manager in parallel and warms them up.
+
+    Failures are not raised - they are reported in returned report, as steps of
+    the workflow would attempt to load the model again once they are executed.
+
+    Args:
+        model_manager (ModelManager): Model manager used later on by the workflow.
+        model_ids (List[str]): Identifiers of models to be loaded.
+        api_key (Optional[str]): API key used to load the models.
+        warmup_iterations (int): Number of warm-up inferences per batch size (0 disables warm-up).
+        warmup_batch_sizes (Iterable[int]): Batch sizes expected to be used against the models.
+        max_workers (int): Number of threads loading models.
+
+    Returns:
+        ModelsPreloadingReport: Loading and warm-up outcome for each model.
+    """
+    start = time.perf_counter()
+    warmup_batch_sizes = sorted(set(warmup_batch_sizes))
+    if not model_ids:
+        return ModelsPreloadingReport(results=[], total_duration=0.0)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(
+            executor.map(
+                lambda model_id: _preload_model(
+                    model_manager=model_manager,
+                    model_id=model_id,
+                    api_key=api_key,
+                    warmup_iterations=warmup_iterations,
+                    warmup_batch_sizes=warmup_batch_sizes,
+                ),
+                model_ids,
+            )
+        )
+    report = ModelsPreloadingReport(
+        results=results, total_duration=time.perf_counter() - start
+    )
+    for result in results:
+        if result.loaded:
+            logger.info(
+                f"Model {result.model_id} preloaded in {result.load_duration:.3f}s, "
+                f"warm-up for batch sizes {result.warmed_up_batch_sizes} "
+                f"took {result.warmup_duration:.3f}s"
+            )
+        else:
+            logger.warning(f"Could not preload model {result.model_id}: {result.error}")
+    logger.info(
+        f"Models preloading finished in {report.total_duration:.3f}s - ready: {report.ready}"
+    )
+    return report
+
+
+def _preload_model(
+    model_manager: ModelManager,
+    model_id: str,
+    api_key: Optional[str],
+    warmup_iterations: int,
+    warmup_batch_sizes: List[int],
+) -> ModelPreloadingResult:
+    load_start = time.perf_counter()
+    try:
+        model_manager.add_model(model_id=model_id, api_key=api_key)
+    except Exception as error:
+        return ModelPreloadingResult(
+            model_id=model_id,
+            loaded=False,
+            load_duration=time.perf_counter() - load_start,
+            error=f"{type(error).__name__}: {error}",
+        )
+    result = ModelPreloadingResult(
+        model_id=model_id,
+        loaded=True,
+        load_duration=time.perf_counter() - load_start,
+    )
+    if warmup_iterations <= 0:
+        return result
+    warmup_start = time.perf_counter()
+    try:
+        result.warmed_up_batch_sizes = warm_up_model(
+            model=model_manager[model_id],
+            batch_sizes=warmup_batch_sizes,
+            iterations=warmup_iterations,
+        )
+    except Exception as error:
+        logger.warning(f"Warm-up of model {model_id} failed: {error}")
+        result.warmup_error = f"{type(error).__name__}: {error}"
+    result.warmup_duration = time.perf_counter() - warmup_start
+    return result
+
+
+def warm_up_model(model: Model, batch_sizes: List[int], iterations: int) -> List[int]:
+    """Runs inferences on synthetic images, for each batch size model can accept.
+
+    Args:
+        model (Model): Loaded model exposing `infer(...)` method.
+        batch_sizes (List[int]): Requested batch sizes.
+        iterations (int): Number of inferences per batch size.
+
+    Returns:
+        List[int]: Batch sizes that model was warmed up with.
+    """
+    height, width = _get_model_input_size(model=model)
+    image = (np.random.rand(height, width, 3) * 255).astype(np.uint8)
+    warmed_up_batch_sizes = _resolve_warmup_batch_sizes(
+        model=model, batch_sizes=batch_sizes
+    )
+    for batch_size in warmed_up_batch_sizes:
+        model_input = image if batch_size == 1 else [image] * batch_size
+        for _ in range(iterations):
+            model.infer(model_input, usage_inference_test_run=True)
+    return warmed_up_batch_sizes
+
+
+def _get_model_input_size(model: Model) -> Tuple[int, int]:
+    height = getattr(model, "img_size_h", None)
+    width = getattr(model, "img_size_w", None)
+    if isinstance(height, int) and isinstance(width, int):
+        return height, width
+    input_size = getattr(model, "input_size", None)
+    if input_size is not None and len(input_size) == 2:
+        return int(input_size[0]), int(input_size[1])
+    return DEFAULT_WARMUP_INPUT_SIZE
+
+
+def _resolve_warmup_batch_sizes(model: Model, batch_sizes: List[int]) -> List[int]:
+    # models without dynamic batching split inputs into chunks of the same,
+    # static batch size - warming them up with bigger batches brings nothing
+    if not getattr(model, "batching_enabled", False):
+        return [1]
+    return sorted(
+        {
+            min(batch_size, MAX_BATCH_SIZE)
+            for batch_size in batch_sizes
+            if batch_size > 0
+        }
+    )
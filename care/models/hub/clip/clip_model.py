@@ -1,3 +1,4 @@
+import hashlib
 from threading import Lock
 from time import perf_counter
 from typing import Any, Dict, List, Tuple, Union
@@ -7,6 +8,8 @@ import numpy as np
 import onnxruntime
 from PIL import Image
 
+from care.cache.lru_cache import LRUCache
+from care.env import CLIP_EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL
 from inference.core.entities.requests.clip import (
     ClipCompareRequest,
     ClipImageEmbeddingRequest,
@@ -46,6 +49,8 @@ class Clip(OnnxRoboflowCoreModel):
         textual_onnx_session (onnxruntime.InferenceSession): ONNX Runtime session for textual inference.
         resolution (int): The resolution of the input image.
         clip_preprocess (function): Function to preprocess the image.
+        image_embedding_cache (LRUCache): Cache of image embeddings keyed by hash of preprocessed image.
+        text_embedding_cache (LRUCache): Cache of text embeddings keyed by text.
     """
 
     def __init__(
@@ -84,6 +89,12 @@ class Clip(OnnxRoboflowCoreModel):
         self.resolution = self.visual_onnx_session.get_inputs()[0].shape[2]
 
         self.clip_preprocess = clip.clip._transform(self.resolution)
+        self.image_embedding_cache = LRUCache(
+            capacity=CLIP_EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL
+        )
+        self.text_embedding_cache = LRUCache(
+            capacity=CLIP_EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL
+        )
         self.log(f"CLIP model loaded in {perf_counter() - t1:.2f} seconds")
         self.task_type = "embedding"
 
@@ -196,6 +207,7 @@ class Clip(OnnxRoboflowCoreModel):
 
         Notes:
             The function measures performance using perf_counter and also has support for ONNX session to get embeddings.
+            Embeddings are cached (keyed by hash of preprocessed image), only images not found in cache are embedded.
         """
         t1 = perf_counter()
 
@@ -205,13 +217,21 @@ class Clip(OnnxRoboflowCoreModel):
                     f"The maximum number of images that can be embedded at once is {CLIP_MAX_BATCH_SIZE}"
                 )
             imgs = [self.preproc_image(i) for i in image]
-            img_in = np.concatenate(imgs, axis=0)
         else:
-            img_in = self.preproc_image(image)
-
-        onnx_input_image = {self.visual_onnx_session.get_inputs()[0].name: img_in}
-        with self._visual_session_lock:
-            return self.visual_onnx_session.run(None, onnx_input_image)[0]
+            imgs = [self.preproc_image(image)]
+
+        cache_keys = [hashlib.md5(img.tobytes()).hexdigest() for img in imgs]
+        embeddings = [self.image_embedding_cache.get(key) for key in cache_keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            img_in = np.concatenate([imgs[i] for i in missing], axis=0)
+            onnx_input_image = {self.visual_onnx_session.get_inputs()[0].name: img_in}
+            with self._visual_session_lock:
+                computed = self.visual_onnx_session.run(None, onnx_input_image)[0]
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding.copy()
+                self.image_embedding_cache[cache_keys[i]] = embeddings[i]
+        return np.stack(embeddings, axis=0)
 
     def predict(self, img_in: np.ndarray, **kwargs) -> Tuple[np.ndarray]:
         onnx_input_image = {self.visual_onnx_session.get_inputs()[0].name: img_in}
@@ -260,23 +280,28 @@ class Clip(OnnxRoboflowCoreModel):
 
         Notes:
             The function utilizes an ONNX session to compute embeddings and measures the embedding time with perf_counter.
+            Embeddings are cached, only texts not found in cache are embedded.
         """
         if isinstance(text, list):
             texts = text
         else:
             texts = [text]
-        results = []
-        for texts_batch in create_batches(
-            sequence=texts, batch_size=CLIP_MAX_BATCH_SIZE
+        results = [self.text_embedding_cache.get(t) for t in texts]
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        for missing_batch in create_batches(
+            sequence=missing, batch_size=CLIP_MAX_BATCH_SIZE
         ):
+            texts_batch = [texts[i] for i in missing_batch]
             tokenized_batch = clip.tokenize(texts_batch).numpy().astype(np.int32)
             onnx_input_text = {
                 self.textual_onnx_session.get_inputs()[0].name: tokenized_batch
             }
             with self._textual_session_lock:
                 embeddings = self.textual_onnx_session.run(None, onnx_input_text)[0]
-            results.append(embeddings)
-        return np.concatenate(results, axis=0)
+            for i, embedding in zip(missing_batch, embeddings):
+                results[i] = embedding.copy()
+                self.text_embedding_cache[texts[i]] = results[i]
+        return np.stack(results, axis=0)
 
     def make_embed_text_response(self, embeddings: np.ndarray) -> ClipEmbeddingResponse:
         """
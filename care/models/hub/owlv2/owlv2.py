@@ -16,6 +16,8 @@ from filelock import FileLock
 from transformers import Owlv2ForObjectDetection, Owlv2Processor
 from transformers.models.owlv2.modeling_owlv2 import box_iou
 
+from care.cache.lru_cache import LRUCache
+from care.env import EMBEDDING_CACHE_TTL, OWLV2_IMAGE_CACHE_BYTES
 from inference.core import logger
 from inference.core.cache.model_artifacts import save_bytes_in_cache
 from inference.core.entities.requests.inference import ObjectDetectionInferenceRequest
@@ -74,25 +76,6 @@ def to_corners(box):
     return torch.stack([x1, y1, x2, y2], dim=-1)
 
 
-from collections import OrderedDict
-
-
-class LimitedSizeDict(OrderedDict):
-    def __init__(self, *args, **kwds):
-        self.size_limit = kwds.pop("size_limit", None)
-        OrderedDict.__init__(self, *args, **kwds)
-        self._check_size_limit()
-
-    def __setitem__(self, key, value):
-        OrderedDict.__setitem__(self, key, value)
-        self._check_size_limit()
-
-    def _check_size_limit(self):
-        if self.size_limit is not None:
-            while len(self) > self.size_limit:
-                self.popitem(last=False)
-
-
 class Owlv2Singleton:
     _instances = weakref.WeakValueDictionary()
 
@@ -399,15 +382,17 @@ class OwlV2(RoboflowInferenceModel):
 
     def reset_cache(self):
         # each entry should be on the order of 300*4KB, so 1000 is 400MB of CUDA memory
-        self.image_embed_cache = LimitedSizeDict(size_limit=OWLV2_IMAGE_CACHE_SIZE)
-        # no need for limit here, as we're only storing on CPU
-        self.cpu_image_embed_cache = LimitedSizeDict(
-            size_limit=CPU_IMAGE_EMBED_CACHE_SIZE
+        self.image_embed_cache = LRUCache(
+            capacity=OWLV2_IMAGE_CACHE_SIZE,
+            max_size_bytes=OWLV2_IMAGE_CACHE_BYTES,
+            ttl=EMBEDDING_CACHE_TTL,
         )
+        # no need for limit here, as we're only storing on CPU
+        self.cpu_image_embed_cache = LRUCache(capacity=CPU_IMAGE_EMBED_CACHE_SIZE)
         # each entry should be on the order of 10 bytes, so 1000 is 10KB
-        self.image_size_cache = LimitedSizeDict(size_limit=OWLV2_IMAGE_CACHE_SIZE)
+        self.image_size_cache = LRUCache(capacity=OWLV2_IMAGE_CACHE_SIZE)
         # entry size will vary depending on the number of samples, but 10 should be safe
-        self.class_embeddings_cache = LimitedSizeDict(size_limit=OWLV2_MODEL_CACHE_SIZE)
+        self.class_embeddings_cache = LRUCache(capacity=OWLV2_MODEL_CACHE_SIZE)
 
     def draw_predictions(
         self,
@@ -440,10 +425,9 @@ class OwlV2(RoboflowInferenceModel):
         pass
 
     def get_image_embeds(self, image_hash: Hash) -> Optional[torch.Tensor]:
-        if image_hash in self.image_embed_cache:
-            return self.image_embed_cache[image_hash]
-        elif image_hash in self.cpu_image_embed_cache:
-            tensors = self.cpu_image_embed_cache[image_hash]
+        if (tensors := self.image_embed_cache.get(image_hash)) is not None:
+            return tensors
+        elif (tensors := self.cpu_image_embed_cache.get(image_hash)) is not None:
             tensors = tuple(t.to(DEVICE) for t in tensors)
             return tensors
         else:
@@ -715,11 +699,7 @@ class OwlV2(RoboflowInferenceModel):
             if return_image_embeds:
                 # Return a dummy empty dict as the second value
                 # or extract it from CPU cache if available
-                return_image_embeds_dict = {}
-                for image_hash in self.cpu_image_embed_cache:
-                    return_image_embeds_dict[image_hash] = self.cpu_image_embed_cache[
-                        image_hash
-                    ]
+                return_image_embeds_dict = dict(self.cpu_image_embed_cache.items())
                 return class_embeddings_dict, return_image_embeds_dict
             else:
                 return class_embeddings_dict
@@ -1023,13 +1003,14 @@ class SerializedOwlV2(RoboflowInferenceModel):
     def save_small_model_without_image_embeds(
         self, save_dir: str = os.path.join(MODEL_CACHE_DIR, "owl-v2-serialized-data")
     ):
-        self.owlv2.cpu_image_embed_cache = LimitedSizeDict(
-            size_limit=CPU_IMAGE_EMBED_CACHE_SIZE
+        self.owlv2.cpu_image_embed_cache = LRUCache(
+            capacity=CPU_IMAGE_EMBED_CACHE_SIZE
         )
+        # plain dict is saved, so that artefact can be loaded without care package
         return self.save_model(
             self.huggingface_id,
             self.roboflow_id,
             self.train_data_dict,
-            self.owlv2.cpu_image_embed_cache,
+            {},
             save_dir,
         )
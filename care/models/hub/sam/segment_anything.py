@@ -11,6 +11,8 @@ import torch
 from segment_anything import SamPredictor, sam_model_registry
 from shapely.geometry import Polygon as ShapelyPolygon
 
+from care.cache.lru_cache import LRUCache
+from care.env import EMBEDDING_CACHE_TTL, SAM_MAX_EMBEDDING_CACHE_BYTES
 from inference.core.entities.requests.inference import InferenceRequestImage
 from inference.core.entities.requests.sam import (
     SamEmbeddingRequest,
@@ -34,11 +36,8 @@ class SegmentAnything(RoboflowCoreModel):
         sam: The segmentation model.
         predictor: The predictor for the segmentation model.
         ort_session: ONNX runtime inference session.
-        embedding_cache: Cache for embeddings.
-        image_size_cache: Cache for image sizes.
-        embedding_cache_keys: Keys for the embedding cache.
-        low_res_logits_cache: Cache for low resolution logits.
-        segmentation_cache_keys: Keys for the segmentation cache.
+        embedding_cache: LRU cache of embeddings and sizes of embedded images.
+        low_res_logits_cache: LRU cache for low resolution logits.
     """
 
     def __init__(self, *args, model_id: str = f"sam/{SAM_VERSION_ID}", **kwargs):
@@ -63,12 +62,14 @@ class SegmentAnything(RoboflowCoreModel):
             ],
         )
         self._state_lock = Lock()
-        self.embedding_cache = {}
-        self.image_size_cache = {}
-        self.embedding_cache_keys = []
-
-        self.low_res_logits_cache = {}
-        self.segmentation_cache_keys = []
+        self.embedding_cache = LRUCache(
+            capacity=SAM_MAX_EMBEDDING_CACHE_SIZE,
+            max_size_bytes=SAM_MAX_EMBEDDING_CACHE_BYTES,
+            ttl=EMBEDDING_CACHE_TTL,
+        )
+        self.low_res_logits_cache = LRUCache(
+            capacity=SAM_MAX_EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL
+        )
         self.task_type = "unsupervised-segmentation"
 
     def get_infer_bucket_file_list(self) -> List[str]:
@@ -96,30 +97,22 @@ class SegmentAnything(RoboflowCoreModel):
 
         Notes:
             - Embeddings and image sizes are cached to improve performance on repeated requests for the same image.
-            - The cache has a maximum size defined by SAM_MAX_EMBEDDING_CACHE_SIZE. When the cache exceeds this size,
-              the oldest entries are removed.
+            - The cache has a maximum size defined by SAM_MAX_EMBEDDING_CACHE_SIZE (and optionally
+              SAM_MAX_EMBEDDING_CACHE_BYTES). When the cache exceeds this size, the least recently used
+              entries are removed.
 
         Example:
             >>> img_array = ... # some image array
             >>> embed_image(img_array, image_id="sample123")
             (array([...]), (224, 224))
         """
-        if image_id and image_id in self.embedding_cache:
-            return (
-                self.embedding_cache[image_id],
-                self.image_size_cache[image_id],
-            )
+        if image_id and (cached := self.embedding_cache.get(image_id)) is not None:
+            return cached
         img_in = self.preproc_image(image)
         self.predictor.set_image(img_in)
         embedding = self.predictor.get_image_embedding().cpu().numpy()
         if image_id:
-            self.embedding_cache[image_id] = embedding
-            self.image_size_cache[image_id] = img_in.shape[:2]
-            self.embedding_cache_keys.append(image_id)
-            if len(self.embedding_cache_keys) > SAM_MAX_EMBEDDING_CACHE_SIZE:
-                cache_key = self.embedding_cache_keys.pop(0)
-                del self.embedding_cache[cache_key]
-                del self.image_size_cache[cache_key]
+            self.embedding_cache[image_id] = (embedding, img_in.shape[:2])
         return (embedding, img_in.shape[:2])
 
     def infer_from_request(self, request: SamInferenceRequest):
@@ -271,10 +264,11 @@ class SegmentAnything(RoboflowCoreModel):
         if has_mask_input:
             if (
                 image_id
-                and image_id in self.low_res_logits_cache
                 and use_mask_input_cache
+                and (cached_logits := self.low_res_logits_cache.get(image_id))
+                is not None
             ):
-                mask_input = self.low_res_logits_cache[image_id]
+                mask_input = cached_logits
             elif not mask_input and (
                 not image_id or image_id not in self.low_res_logits_cache
             ):
@@ -310,11 +304,6 @@ class SegmentAnything(RoboflowCoreModel):
         masks, _, low_res_logits = self.ort_session.run(None, ort_inputs)
         if image_id:
             self.low_res_logits_cache[image_id] = low_res_logits
-            if image_id not in self.segmentation_cache_keys:
-                self.segmentation_cache_keys.append(image_id)
-            if len(self.segmentation_cache_keys) > SAM_MAX_EMBEDDING_CACHE_SIZE:
-                cache_key = self.segmentation_cache_keys.pop(0)
-                del self.low_res_logits_cache[cache_key]
         masks = masks[0]
         low_res_masks = low_res_logits[0]
 
@@ -17,6 +17,8 @@ sam2.utils.misc.get_sdp_backends = lambda z: [
 from sam2.build_sam import build_sam2
 from sam2.sam2_image_predictor import SAM2ImagePredictor
 
+from care.cache.lru_cache import LRUCache
+from care.env import EMBEDDING_CACHE_TTL, SAM2_MAX_EMBEDDING_CACHE_BYTES
 from inference.core.entities.requests.inference import InferenceRequestImage
 from inference.core.entities.requests.sam2 import (
     Sam2EmbeddingRequest,
@@ -57,9 +59,8 @@ class SegmentAnything2(RoboflowCoreModel):
         sam: The segmentation model.
         predictor: The predictor for the segmentation model.
         ort_session: ONNX runtime inference session.
-        embedding_cache: Cache for embeddings.
-        image_size_cache: Cache for image sizes.
-        embedding_cache_keys: Keys for the embedding cache.
+        embedding_cache: LRU cache of embeddings and sizes of embedded images.
+        low_res_logits_cache: LRU cache of low resolution logits keyed by image and prompt set.
 
     """
 
@@ -92,11 +93,14 @@ class SegmentAnything2(RoboflowCoreModel):
 
         self.predictor = SAM2ImagePredictor(self.sam)
 
-        self.embedding_cache = {}
-        self.image_size_cache = {}
-        self.embedding_cache_keys = []
-        self.low_res_logits_cache: Dict[Tuple[str, str], LogitsCacheType] = {}
-        self.low_res_logits_cache_keys = []
+        self.embedding_cache = LRUCache(
+            capacity=embedding_cache_size,
+            max_size_bytes=SAM2_MAX_EMBEDDING_CACHE_BYTES,
+            ttl=EMBEDDING_CACHE_TTL,
+        )
+        self.low_res_logits_cache = LRUCache(
+            capacity=low_res_logits_cache_size, ttl=EMBEDDING_CACHE_TTL
+        )
         self._state_lock = Lock()
         self.task_type = "unsupervised-segmentation"
 
@@ -130,45 +134,30 @@ class SegmentAnything2(RoboflowCoreModel):
 
         Notes:
             - Embeddings and image sizes are cached to improve performance on repeated requests for the same image.
-            - The cache has a maximum size defined by SAM2_MAX_CACHE_SIZE. When the cache exceeds this size,
-              the oldest entries are removed.
+            - The cache has a maximum size defined by SAM2_MAX_EMBEDDING_CACHE_SIZE (and optionally
+              SAM2_MAX_EMBEDDING_CACHE_BYTES). When the cache exceeds this size, the least recently used
+              entries are removed.
 
         Example:
             >>> img_array = ... # some image array
             >>> embed_image(img_array, image_id="sample123")
             (array([...]), (224, 224))
         """
-        if image_id and image_id in self.embedding_cache:
-            return (
-                self.embedding_cache[image_id],
-                self.image_size_cache[image_id],
-                image_id,
-            )
+        if image_id and (cached := self.embedding_cache.get(image_id)) is not None:
+            return (*cached, image_id)
 
         img_in = self.preproc_image(image)
         if image_id is None:
             image_id = hashlib.md5(img_in.tobytes()).hexdigest()[:12]
 
-        if image_id in self.embedding_cache:
-            return (
-                self.embedding_cache[image_id],
-                self.image_size_cache[image_id],
-                image_id,
-            )
+        if (cached := self.embedding_cache.get(image_id)) is not None:
+            return (*cached, image_id)
 
         with torch.inference_mode():
             self.predictor.set_image(img_in)
             embedding_dict = self.predictor._features
 
-        self.embedding_cache[image_id] = embedding_dict
-        self.image_size_cache[image_id] = img_in.shape[:2]
-        if image_id in self.embedding_cache_keys:
-            self.embedding_cache_keys.remove(image_id)
-        self.embedding_cache_keys.append(image_id)
-        if len(self.embedding_cache_keys) > self.embedding_cache_size:
-            cache_key = self.embedding_cache_keys.pop(0)
-            del self.embedding_cache[cache_key]
-            del self.image_size_cache[cache_key]
+        self.embedding_cache[image_id] = (embedding_dict, img_in.shape[:2])
         return (embedding_dict, img_in.shape[:2], image_id)
 
     def infer_from_request(self, request: Sam2InferenceRequest):
@@ -335,12 +324,6 @@ class SegmentAnything2(RoboflowCoreModel):
             "logits": logits,
             "prompt_set": prompt_set,
         }
-        if prompt_id in self.low_res_logits_cache_keys:
-            self.low_res_logits_cache_keys.remove(prompt_id)
-        self.low_res_logits_cache_keys.append(prompt_id)
-        if len(self.low_res_logits_cache_keys) > self.low_res_logits_cache_size:
-            cache_key = self.low_res_logits_cache_keys.pop(0)
-            del self.low_res_logits_cache[cache_key]
 
 
 def hash_prompt_set(image_id: str, prompt_set: Sam2PromptSet) -> Tuple[str, str]:
@@ -353,7 +336,7 @@ def hash_prompt_set(image_id: str, prompt_set: Sam2PromptSet) -> Tuple[str, str]
 def maybe_load_low_res_logits_from_cache(
     image_id: str,
     prompt_set: Sam2PromptSet,
-    cache: Dict[Tuple[str, str], LogitsCacheType],
+    cache: LRUCache,
 ) -> Optional[np.ndarray]:
     "Loads prior masks from the cache by searching over possibel prior prompts."
     prompts = prompt_set.prompts
@@ -366,13 +349,13 @@ def maybe_load_low_res_logits_from_cache(
 def find_prior_prompt_in_cache(
     initial_prompt_set: Sam2PromptSet,
     image_id: str,
-    cache: Dict[Tuple[str, str], LogitsCacheType],
+    cache: LRUCache,
 ) -> Optional[np.ndarray]:
     """
     Performs search over the cache to see if prior used prompts are subset of this one.
     """
 
-    logits_for_image = [cache[k] for k in cache if k[0] == image_id]
+    logits_for_image = [v for k, v in cache.items() if k[0] == image_id]
     maxed_size = 0
     best_match: Optional[np.ndarray] = None
     desired_size = initial_prompt_set.num_points() - 1
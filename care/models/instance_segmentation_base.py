@@ -16,12 +16,10 @@ from care.models.utils.validate import (
 )
 from care.nms import w_np_non_max_suppression
 from care.utils.postprocess import (
-    masks2poly,
+    MASK_DECODE_MODES,
+    decode_instance_masks_batch,
     post_process_bboxes,
     post_process_polygons,
-    process_mask_accurate,
-    process_mask_fast,
-    process_mask_tradeoff,
 )
 
 DEFAULT_CONFIDENCE = 0.4
@@ -137,41 +135,42 @@ class InstanceSegmentationBaseOnnxRoboflowInferenceModel(OnnxRoboflowInferenceMo
         img_in_shape = preprocess_return_metadata["im_shape"]
 
         predictions = [np.array(p) for p in predictions]
+        has_detections = any(pred.size > 0 for pred in predictions)
+        if has_detections:
+            if mask_decode_mode not in MASK_DECODE_MODES:
+                raise InvalidMaskDecodeArgument(
+                    f"Invalid mask_decode_mode: {mask_decode_mode}. Must be one of ['accurate', 'fast', 'tradeoff']"
+                )
+            if mask_decode_mode == "tradeoff" and not 0 <= tradeoff_factor <= 1:
+                raise InvalidMaskDecodeArgument(
+                    f"Invalid tradeoff_factor: {tradeoff_factor}. Must be in [0.0, 1.0]"
+                )
+        decoded_masks = [None] * len(predictions)
+        if has_detections:
+            # masks of all images are decoded at once, directly into polygons
+            decoded_masks = decode_instance_masks_batch(
+                protos=protos,
+                masks_in=[
+                    pred[:, 7:] if pred.size > 0 else np.zeros((0, self.num_masks))
+                    for pred in predictions
+                ],
+                bboxes=[
+                    pred[:, :4] if pred.size > 0 else np.zeros((0, 4))
+                    for pred in predictions
+                ],
+                shape=img_in_shape[2:],
+                mask_decode_mode=mask_decode_mode,
+                tradeoff_factor=tradeoff_factor,
+                output_format="polygon",
+            )
 
-        for pred, proto, img_dim in zip(
-            predictions, protos, preprocess_return_metadata["img_dims"]
+        for pred, image_decoded_masks, img_dim in zip(
+            predictions, decoded_masks, preprocess_return_metadata["img_dims"]
         ):
             if pred.size == 0:
                 masks.append([])
                 continue
-            if mask_decode_mode == "accurate":
-                batch_masks = process_mask_accurate(
-                    proto, pred[:, 7:], pred[:, :4], img_in_shape[2:]
-                )
-                output_mask_shape = img_in_shape[2:]
-            elif mask_decode_mode == "tradeoff":
-                if not 0 <= tradeoff_factor <= 1:
-                    raise InvalidMaskDecodeArgument(
-                        f"Invalid tradeoff_factor: {tradeoff_factor}. Must be in [0.0, 1.0]"
-                    )
-                batch_masks = process_mask_tradeoff(
-                    proto,
-                    pred[:, 7:],
-                    pred[:, :4],
-                    img_in_shape[2:],
-                    tradeoff_factor,
-                )
-                output_mask_shape = batch_masks.shape[1:]
-            elif mask_decode_mode == "fast":
-                batch_masks = process_mask_fast(
-                    proto, pred[:, 7:], pred[:, :4], img_in_shape[2:]
-                )
-                output_mask_shape = batch_masks.shape[1:]
-            else:
-                raise InvalidMaskDecodeArgument(
-                    f"Invalid mask_decode_mode: {mask_decode_mode}. Must be one of ['accurate', 'fast', 'tradeoff']"
-                )
-            polys = masks2poly(batch_masks)
+            polys, output_mask_shape = image_decoded_masks
             pred[:, :4] = post_process_bboxes(
                 [pred[:, :4]],
                 infer_shape,
@@ -44,6 +44,7 @@ class LocalONNXModel(Model):
         input_size: Tuple of (height, width)
         input_name: Name of ONNX input tensor
         output_names: Names of ONNX output tensors
+        batching_enabled: Whether ONNX input has dynamic batch dimension
     """
 
     def __init__(
@@ -84,6 +85,9 @@ class LocalONNXModel(Model):
         self.input_name = self.session.get_inputs()[0].name
         self.output_names = [output.name for output in self.session.get_outputs()]
 
+        # Symbolic batch dimension means session accepts batches of any size
+        self.batching_enabled = not isinstance(self.session.get_inputs()[0].shape[0], int)
+
         logger.info(
             f"LocalONNXModel initialized: {model_id} "
             f"(input_size={self.input_size}, "
@@ -235,7 +239,8 @@ class LocalONNXModel(Model):
         """Run ONNX inference on preprocessed image.
 
         Args:
-            preprocessed_image: Preprocessed image (1, C, H, W), float32
+            preprocessed_image: Preprocessed image (N, C, H, W), float32 - N > 1 only
+                for models with dynamic batch dimension
 
         Returns:
             List of output tensors from ONNX model
@@ -47,10 +47,13 @@ from inference.core.cache.model_artifacts import (
     initialise_cache,
     load_json_from_cache,
     load_text_file_from_cache,
-    save_bytes_in_cache,
     save_json_in_cache,
     save_text_lines_in_cache,
 )
+from care.cache.model_artifacts import (
+    create_onnx_session_with_optimized_model_cache,
+    download_file_to_cache,
+)
 from inference.core.devices.utils import GLOBAL_DEVICE_ID
 from inference.core.entities.requests.inference import (
     InferenceRequest,
@@ -317,6 +320,12 @@ class RoboflowInferenceModel(Model):
         try:
             lock = FileLock(lock_file, timeout=120)  # 120 second timeout for downloads
             with lock:
+                if are_all_files_cached(
+                    files=self.get_all_required_infer_bucket_file(),
+                    model_id=self.endpoint,
+                ):
+                    # downloaded by another model instance while waiting for the lock
+                    return None
                 if self.version_id is not None:
                     api_data = get_roboflow_model_data(
                         api_key=self.api_key,
@@ -348,11 +357,7 @@ class RoboflowInferenceModel(Model):
                     environment = get_from_url(
                         api_data["environment"], verify_content_length=True
                     )
-                    model_weights_response = get_from_url(
-                        api_data["model"],
-                        json_response=False,
-                        verify_content_length=True,
-                    )
+                    model_weights_url = api_data["model"]
                 else:
                     api_data = get_roboflow_instant_model_data(
                         api_key=self.api_key,
@@ -372,11 +377,7 @@ class RoboflowInferenceModel(Model):
                         raise ModelArtefactError(
                             "Could not find `environment` key in roboflow API model description response."
                         )
-                    model_weights_response = get_from_url(
-                        api_data["modelFiles"]["ort"]["model"],
-                        json_response=False,
-                        verify_content_length=True,
-                    )
+                    model_weights_url = api_data["modelFiles"]["ort"]["model"]
                     environment = api_data["environment"]
                     if "classes" in api_data:
                         save_text_lines_in_cache(
@@ -385,8 +386,8 @@ class RoboflowInferenceModel(Model):
                             model_id=self.endpoint,
                         )
 
-                save_bytes_in_cache(
-                    content=model_weights_response.content,
+                download_file_to_cache(
+                    url=model_weights_url,
                     file=self.weights_file,
                     model_id=self.endpoint,
                 )
@@ -692,10 +693,9 @@ class RoboflowCoreModel(RoboflowInferenceModel):
         for weights_url_key in api_data["weights"]:
             weights_url = api_data["weights"][weights_url_key]
             t1 = perf_counter()
-            model_weights_response = get_from_url(weights_url, json_response=False)
             filename = weights_url.split("?")[0].split("/")[-1]
-            save_bytes_in_cache(
-                content=model_weights_response.content,
+            download_file_to_cache(
+                url=weights_url,
                 file=filename,
                 model_id=self.endpoint,
             )
@@ -921,11 +921,19 @@ class OnnxRoboflowInferenceModel(RoboflowInferenceModel):
                     session_options.graph_optimization_level = (
                         onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
                     )
-                self.onnx_session = onnxruntime.InferenceSession(
-                    self.cache_file(self.weights_file),
-                    providers=providers,
-                    sess_options=session_options,
-                )
+                if self.load_weights:
+                    self.onnx_session = create_onnx_session_with_optimized_model_cache(
+                        weights_path=self.cache_file(self.weights_file),
+                        providers=providers,
+                        session_options=session_options,
+                        model_id=self.endpoint,
+                    )
+                else:
+                    self.onnx_session = onnxruntime.InferenceSession(
+                        self.cache_file(self.weights_file),
+                        providers=providers,
+                        sess_options=session_options,
+                    )
             except Exception as e:
                 self.clear_cache()
                 raise ModelArtefactError(
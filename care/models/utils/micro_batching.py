@@ -0,0 +1,245 @@
+"""Coalescing of concurrent `predict(...)` calls into batched model executions.
+
+When many threads (workflow steps, pipelines) run the same model at once, each of them
+would normally trigger a separate `session.run(...)`. `CoalescingPredictor` puts incoming
+inputs into per-client queues, forms batches (round-robin across clients, so that a busy
+client cannot starve the others) up to `max_batch_size` elements or until `max_wait`
+deadline passes, runs one prediction and scatters results back through futures.
+"""
+
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Generator, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from care.logger import logger
+
+DEFAULT_CLIENT_ID = "default"
+
+_current_client_id: ContextVar[Hashable] = ContextVar(
+    "micro_batching_client_id", default=DEFAULT_CLIENT_ID
+)
+
+
+@contextmanager
+def micro_batching_client(client_id: Hashable) -> Generator[None, None, None]:
+    """Marks predictions requested within the context as issued by given client."""
+    token = _current_client_id.set(client_id)
+    try:
+        yield None
+    finally:
+        _current_client_id.reset(token)
+
+
+class _PendingPrediction:
+    __slots__ = ("img_in", "future", "enqueued_at")
+
+    def __init__(self, img_in: np.ndarray):
+        self.img_in = img_in
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return self.img_in.shape[0]
+
+
+class CoalescingPredictor:
+    def __init__(
+        self,
+        predict: Callable[..., Sequence[np.ndarray]],
+        max_batch_size: int,
+        max_wait: float,
+        name: str = "model",
+    ):
+        """Wraps `predict(img_in)` function of a model with dynamic batching.
+
+        Args:
+            predict (Callable[..., Sequence[np.ndarray]]): Function accepting batch of preprocessed
+                inputs (first dimension is batch) and returning sequence of arrays with batch as the
+                first dimension.
+            max_batch_size (int): Max number of elements in coalesced batch.
+            max_wait (float): Max time (in seconds) the oldest queued input waits for batch to fill.
+            name (str): Name used in logs and worker thread name.
+        """
+        self._predict = predict
+        self._max_batch_size = max(int(max_batch_size), 1)
+        self._max_wait = max(max_wait, 0.0)
+        self._name = name
+        self._queues: "OrderedDict[Hashable, Deque[_PendingPrediction]]" = (
+            OrderedDict()
+        )
+        self._condition = Condition()
+        self._stopped = False
+        self._worker = Thread(
+            target=self._run, name=f"coalescing-predictor-{name}", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    def predict(self, img_in: Any, **kwargs) -> Sequence[np.ndarray]:
+        if (
+            kwargs
+            or not isinstance(img_in, np.ndarray)
+            or img_in.ndim == 0
+            or img_in.shape[0] >= self._max_batch_size
+        ):
+            # nothing to gain from coalescing (or input cannot be concatenated)
+            return self._predict(img_in, **kwargs)
+        pending = _PendingPrediction(img_in=img_in)
+        client_id = _current_client_id.get()
+        with self._condition:
+            if self._stopped:
+                pending = None
+            else:
+                if client_id not in self._queues:
+                    self._queues[client_id] = deque()
+                self._queues[client_id].append(pending)
+                self._condition.notify()
+        if pending is None:
+            return self._predict(img_in)
+        return pending.future.result()
+
+    def close(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                return None
+            self._execute_batch(batch=batch)
+
+    def _collect_batch(self) -> List[_PendingPrediction]:
+        with self._condition:
+            while not self._stopped and not self._queues:
+                self._condition.wait()
+            if not self._queues:
+                return []
+            deadline = self._oldest_enqueue_time() + self._max_wait
+            while (
+                not self._stopped
+                and self._queued_elements() < self._max_batch_size
+                and time.monotonic() < deadline
+            ):
+                self._condition.wait(timeout=max(deadline - time.monotonic(), 0.0))
+            return self._dequeue_round_robin()
+
+    def _dequeue_round_robin(self) -> List[_PendingPrediction]:
+        batch, batch_size = [], 0
+        reference_shape, reference_dtype = None, None
+        progress = True
+        while progress and batch_size < self._max_batch_size:
+            progress = False
+            for client_id in list(self._queues.keys()):
+                queue = self._queues[client_id]
+                candidate = queue[0]
+                if reference_shape is None:
+                    reference_shape = candidate.img_in.shape[1:]
+                    reference_dtype = candidate.img_in.dtype
+                if (
+                    candidate.img_in.shape[1:] != reference_shape
+                    or candidate.img_in.dtype != reference_dtype
+                    or batch_size + candidate.size > self._max_batch_size
+                ):
+                    continue
+                batch.append(queue.popleft())
+                batch_size += candidate.size
+                progress = True
+                if not queue:
+                    del self._queues[client_id]
+                else:
+                    # served client goes to the end of the line
+                    self._queues.move_to_end(client_id)
+                if batch_size >= self._max_batch_size:
+                    break
+        return batch
+
+    def _execute_batch(self, batch: List[_PendingPrediction]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [self._predict(batch[0].img_in)]
+            else:
+                batch_input = np.concatenate([p.img_in for p in batch], axis=0)
+                results = scatter_batch_predictions(
+                    predictions=self._predict(batch_input),
+                    sizes=[p.size for p in batch],
+                )
+        except Exception as error:
+            logger.debug(f"Coalesced prediction for {self._name} failed: {error}")
+            for pending in batch:
+                pending.future.set_exception(error)
+            return None
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
+
+    def _queued_elements(self) -> int:
+        return sum(p.size for queue in self._queues.values() for p in queue)
+
+    def _oldest_enqueue_time(self) -> float:
+        return min(queue[0].enqueued_at for queue in self._queues.values())
+
+
+def scatter_batch_predictions(
+    predictions: Sequence[Any], sizes: List[int]
+) -> List[Sequence[Any]]:
+    """Splits outputs of batched prediction into results for each of coalesced inputs.
+
+    Outputs which first dimension does not match the batch size (e.g. shared prototypes)
+    are passed to each of the results as they are.
+    """
+    total = sum(sizes)
+    results: List[List[Any]] = [[] for _ in sizes]
+    for output in predictions:
+        split_possible = (
+            isinstance(output, np.ndarray) and output.ndim > 0 and output.shape[0] == total
+        )
+        offset = 0
+        for result, size in zip(results, sizes):
+            result.append(output[offset : offset + size] if split_possible else output)
+            offset += size
+    result_type = tuple if isinstance(predictions, tuple) else list
+    return [result_type(result) for result in results]
+
+
+def supports_micro_batching(model: Any) -> bool:
+    """Checks if model accepts batches of arbitrary size in `predict(...)`."""
+    return bool(getattr(model, "batching_enabled", False))
+
+
+def install_coalescing_predictor(
+    model: Any, max_batch_size: int, max_wait: float, name: str = "model"
+) -> Optional[CoalescingPredictor]:
+    """Routes `predict(...)` calls of model instance through `CoalescingPredictor`.
+
+    Returns:
+        Optional[CoalescingPredictor]: Installed predictor, or None if model does not
+            support dynamic batching or already has predictor installed.
+    """
+    if not supports_micro_batching(model) or "predict" in vars(model):
+        return None
+    predictor = CoalescingPredictor(
+        predict=model.predict,
+        max_batch_size=max_batch_size,
+        max_wait=max_wait,
+        name=name,
+    )
+    # instance attribute shadows class method, so `model.infer(...)` goes through predictor
+    model.predict = predictor.predict
+    return predictor
+
+
+def uninstall_coalescing_predictor(model: Any, predictor: CoalescingPredictor) -> None:
+    predictor.close()
+    vars(model).pop("predict", None)
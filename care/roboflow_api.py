@@ -33,6 +33,7 @@ from care.env import (
     API_BASE_URL,
     INTERNAL_WEIGHTS_URL_SUFFIX,
     MD5_VERIFICATION_ENABLED,
+    MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS,
     MODEL_CACHE_DIR,
     MODELS_CACHE_AUTH_CACHE_MAX_SIZE,
     MODELS_CACHE_AUTH_CACHE_TTL,
@@ -64,6 +65,7 @@ from care.exceptions import (
     WorkspaceLoadError,
 )
 from care.utils.file_system import sanitize_path_segment
+from care.utils.http_client import ETagCache, get_http_session
 from care.utils.requests import (
     api_key_safe_raise_for_status,
     api_key_safe_raise_for_status_aiohttp,
@@ -79,6 +81,16 @@ MODEL_TYPE_DEFAULTS = {
 PROJECT_TASK_TYPE_KEY = "project_task_type"
 MODEL_TYPE_KEY = "model_type"
 
+# responses of workflow specifications and model metadata, revalidated with ETag
+ROBOFLOW_API_ETAG_CACHE = ETagCache()
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX = ".validator"
+CONTENT_RANGE_PATTERN = re.compile(
+    r"^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+|\*)$"
+)
+
 NOT_FOUND_ERROR_MESSAGE = (
     "Could not find requested Roboflow resource. Check that the provided dataset and "
     "version are correct, and check that the provided Roboflow API key has the correct permissions."
@@ -266,7 +278,7 @@ def add_custom_metadata(
         url=f"{API_BASE_URL}/{workspace_id}/inference-stats/metadata",
         params=[("api_key", api_key), ("nocache", "true")],
     )
-    response = requests.post(
+    response = get_http_session().post(
         url=api_url,
         json={
             "data": [
@@ -378,7 +390,9 @@ def get_roboflow_model_data(
             url=f"{api_base_url}/{endpoint_type.value}/{model_id}",
             params=params,
         )
-        api_data = _get_from_url(url=api_url, verify_content_length=True)
+        api_data = _get_from_url(
+            url=api_url, verify_content_length=True, revalidate=True
+        )
         cache.set(
             api_data_cache_key,
             api_data,
@@ -425,7 +439,9 @@ def get_roboflow_instant_model_data(
             url=f"{api_base_url}/getWeights",
             params=params,
         )
-        api_data = _get_from_url(url=api_url, verify_content_length=True)
+        api_data = _get_from_url(
+            url=api_url, verify_content_length=True, revalidate=True
+        )
         cache.set(
             api_data_cache_key,
             api_data,
@@ -516,7 +532,7 @@ def register_image_at_roboflow(
     headers = build_roboflow_api_headers(
         explicit_headers={"Content-Type": m.content_type},
     )
-    response = requests.post(
+    response = get_http_session().post(
         url=wrapped_url,
         data=m,
         headers=headers,
@@ -559,7 +575,7 @@ def annotate_image_at_roboflow(
     headers = build_roboflow_api_headers(
         explicit_headers={"Content-Type": "text/plain"},
     )
-    response = requests.post(
+    response = get_http_session().post(
         wrapped_url,
         data=annotation_content,
         headers=headers,
@@ -717,7 +733,7 @@ def get_workflow_specification(
             params=params,
         )
         try:
-            response = _get_from_url(url=api_url)
+            response = _get_from_url(url=api_url, revalidate=True)
             if USE_FILE_CACHE_FOR_WORKFLOWS_DEFINITIONS:
                 cache_workflow_response(
                     workspace_id=workspace_id,
@@ -833,11 +849,19 @@ def _get_from_url(
     url: str,
     json_response: bool = True,
     verify_content_length: bool = False,
+    revalidate: bool = False,
 ) -> Union[Response, dict]:
+    # revalidation only applies to JSON payloads, they are decoded again from cached body
+    cached_entry = (
+        ROBOFLOW_API_ETAG_CACHE.get(url) if revalidate and json_response else None
+    )
+    headers = build_roboflow_api_headers()
+    if cached_entry is not None:
+        headers = {**(headers or {}), "If-None-Match": cached_entry[0]}
     try:
-        response = requests.get(
+        response = get_http_session().get(
             wrap_url(url),
-            headers=build_roboflow_api_headers(),
+            headers=headers,
             timeout=ROBOFLOW_API_REQUEST_TIMEOUT,
         )
 
@@ -853,20 +877,15 @@ def _get_from_url(
         if response.status_code in TRANSIENT_ROBOFLOW_API_ERRORS:
             raise RetryRequestError(message=str(error), inner_error=error) from error
         raise error
+    if cached_entry is not None and response.status_code == 304:
+        return json.loads(cached_entry[1])
 
-    if MD5_VERIFICATION_ENABLED and "x-goog-hash" in response.headers:
-        x_goog_hash = response.headers["x-goog-hash"]
-        md5_part = None
-        for part in x_goog_hash.split(","):
-            if part.strip().startswith("md5="):
-                md5_part = part.strip()[4:]
-                break
-        if md5_part is not None:
-            md5_from_header = base64.b64decode(md5_part)
-            if md5_from_header != hashlib.md5(response.content).digest():
-                raise RoboflowAPIUnsuccessfulRequestError(
-                    "MD5 hash does not match MD5 received from x-goog-hash header"
-                )
+    md5_from_header = _get_md5_from_x_goog_hash(response=response)
+    if MD5_VERIFICATION_ENABLED and md5_from_header is not None:
+        if md5_from_header != hashlib.md5(response.content).digest():
+            raise RoboflowAPIUnsuccessfulRequestError(
+                "MD5 hash does not match MD5 received from x-goog-hash header"
+            )
 
     if verify_content_length:
         content_length = str(response.headers.get("Content-Length"))
@@ -884,10 +903,228 @@ def _get_from_url(
             raise RoboflowAPIUnsuccessfulRequestError(error)
 
     if json_response:
-        return response.json()
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        if revalidate and etag:
+            ROBOFLOW_API_ETAG_CACHE.put(url=url, etag=etag, content=response.content)
+        return payload
+    return response
+
+
+def _get_md5_from_x_goog_hash(response: Response) -> Optional[bytes]:
+    x_goog_hash = response.headers.get("x-goog-hash")
+    if x_goog_hash is None:
+        return None
+    for part in x_goog_hash.split(","):
+        if part.strip().startswith("md5="):
+            return base64.b64decode(part.strip()[4:])
+    return None
+
+
+@wrap_roboflow_api_errors()
+def download_file_from_url(url: str, path: str) -> None:
+    """Streams file under `url` into `path`, without buffering it in memory.
+
+    Content is written into `<path>.part` and moved into `path` with `os.replace(...)` once
+    complete and verified, so that readers never observe partial file. Interrupted transfer
+    is resumed with `Range` request guarded by `If-Range`, up to
+    `MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS` times - partial file is kept if all of them
+    fail, so that the next call resumes it. Size is verified against `Content-Length` /
+    `Content-Range` and MD5 against `x-goog-hash` header, if `MD5_VERIFICATION_ENABLED`.
+    Responses with `TRANSIENT_ROBOFLOW_API_ERRORS` statuses are retried as other Roboflow
+    API requests are.
+
+    Args:
+        url (str): URL of the file.
+        path (str): Target path, overridden if exists.
+    """
+    partial_path = f"{path}{PARTIAL_DOWNLOAD_SUFFIX}"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for attempt in range(MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS + 1):
+        try:
+            _download_into_partial_file(url=url, partial_path=partial_path)
+            break
+        except RetryRequestError as error:
+            if attempt >= MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS:
+                raise error
+            logger.warning(
+                "Download of %s interrupted (%s) - resuming from %s bytes.",
+                path,
+                error,
+                _get_file_size(path=partial_path),
+            )
+    os.replace(partial_path, path)
+    _remove_file(path=f"{partial_path}{PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX}")
+
+
+@backoff.on_exception(
+    backoff.constant,
+    exception=RetryRequestError,
+    max_tries=TRANSIENT_ROBOFLOW_API_ERRORS_RETRIES,
+    interval=TRANSIENT_ROBOFLOW_API_ERRORS_RETRY_INTERVAL,
+)
+def _open_download_stream(
+    url: str, explicit_headers: Optional[Dict[str, str]]
+) -> Response:
+    try:
+        response = get_http_session().get(
+            wrap_url(url),
+            headers=build_roboflow_api_headers(explicit_headers=explicit_headers),
+            stream=True,
+            timeout=ROBOFLOW_API_REQUEST_TIMEOUT,
+        )
+    except (ConnectionError, Timeout, requests.exceptions.ConnectionError) as error:
+        if RETRY_CONNECTION_ERRORS_TO_ROBOFLOW_API:
+            raise RetryRequestError(
+                message="Connectivity error", inner_error=error
+            ) from error
+        raise error
+    if response.status_code in TRANSIENT_ROBOFLOW_API_ERRORS:
+        with response:
+            try:
+                api_key_safe_raise_for_status(response=response)
+            except Exception as error:
+                raise RetryRequestError(message=str(error), inner_error=error) from error
     return response
 
 
+def _download_into_partial_file(url: str, partial_path: str) -> None:
+    validator_path = f"{partial_path}{PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX}"
+    offset, validator = _get_resumable_download_state(
+        partial_path=partial_path, validator_path=validator_path
+    )
+    explicit_headers = None
+    if offset > 0:
+        explicit_headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+    try:
+        response = _open_download_stream(url=url, explicit_headers=explicit_headers)
+    except RetryRequestError as error:
+        # transient errors were already retried - they do not count as interruptions
+        raise error.inner_error
+    with response:
+        if response.status_code == 416:
+            # partial file does not match the remote one - starting from scratch
+            _discard_partial_download(partial_path=partial_path)
+            raise RetryRequestError(
+                message="Requested range not satisfiable",
+                inner_error=ConnectionError("Could not resume download."),
+            )
+        api_key_safe_raise_for_status(response=response)
+        if response.status_code == 206:
+            content_range = _parse_content_range(response=response)
+            if content_range is None or content_range[0] != offset:
+                _discard_partial_download(partial_path=partial_path)
+                raise RetryRequestError(
+                    message="Unexpected Content-Range in response",
+                    inner_error=ConnectionError("Could not resume download."),
+                )
+            expected_size = content_range[1]
+            mode = "ab"
+        else:
+            offset, mode = 0, "wb"
+            content_length = response.headers.get("Content-Length")
+            expected_size = int(content_length) if content_length else None
+            _save_download_validator(response=response, validator_path=validator_path)
+        md5_from_header = _get_md5_from_x_goog_hash(response=response)
+        md5 = None
+        if MD5_VERIFICATION_ENABLED and md5_from_header is not None:
+            md5 = _get_file_md5(path=partial_path) if offset > 0 else hashlib.md5()
+        try:
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    if md5 is not None:
+                        md5.update(chunk)
+        except (
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.ConnectionError,
+            Timeout,
+        ) as error:
+            raise RetryRequestError(
+                message=str(error),
+                inner_error=ConnectionError("Download interrupted."),
+            ) from error
+    downloaded_size = _get_file_size(path=partial_path)
+    if expected_size is not None and downloaded_size < expected_size:
+        raise RetryRequestError(
+            message=f"Received {downloaded_size} out of {expected_size} bytes",
+            inner_error=ConnectionError("Download interrupted."),
+        )
+    if expected_size is not None and downloaded_size != expected_size:
+        _discard_partial_download(partial_path=partial_path)
+        raise RoboflowAPIUnsuccessfulRequestError(
+            "Content-Length header does not match response content length"
+        )
+    if md5 is not None and md5.digest() != md5_from_header:
+        _discard_partial_download(partial_path=partial_path)
+        raise RoboflowAPIUnsuccessfulRequestError(
+            "MD5 hash does not match MD5 received from x-goog-hash header"
+        )
+
+
+def _get_resumable_download_state(
+    partial_path: str, validator_path: str
+) -> Tuple[int, Optional[str]]:
+    offset = _get_file_size(path=partial_path)
+    if offset == 0:
+        return 0, None
+    try:
+        with open(validator_path) as f:
+            validator = f.read().strip()
+    except OSError:
+        validator = ""
+    if not validator:
+        # without validator we cannot tell if remote file changed in the meantime
+        _discard_partial_download(partial_path=partial_path)
+        return 0, None
+    return offset, validator
+
+
+def _save_download_validator(response: Response, validator_path: str) -> None:
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+    if not validator or validator.startswith("W/"):
+        # weak ETags are not allowed in If-Range
+        _remove_file(path=validator_path)
+        return None
+    with open(validator_path, "w") as f:
+        f.write(validator)
+
+
+def _parse_content_range(response: Response) -> Optional[Tuple[int, Optional[int]]]:
+    match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+    if match is None:
+        return None
+    total_size = match.group("total")
+    return int(match.group("start")), int(total_size) if total_size != "*" else None
+
+
+def _get_file_md5(path: str) -> "hashlib._Hash":
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return md5
+
+
+def _discard_partial_download(partial_path: str) -> None:
+    _remove_file(path=partial_path)
+    _remove_file(path=f"{partial_path}{PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX}")
+
+
+def _get_file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
 def _add_params_to_url(url: str, params: List[Tuple[str, str]]) -> str:
     if len(params) == 0:
         return url
@@ -908,7 +1145,7 @@ def send_inference_results_to_model_monitoring(
         url=f"{API_BASE_URL}/{workspace_id}/inference-stats",
         params=[("api_key", api_key)],
     )
-    response = requests.post(
+    response = get_http_session().post(
         url=api_url,
         json=inference_data,
         headers=build_roboflow_api_headers(),
@@ -953,7 +1190,7 @@ def post_to_roboflow_api(
 
     headers = build_roboflow_api_headers()
 
-    response = requests.post(
+    response = get_http_session().post(
         url=wrapped_url,
         json=payload,
         headers=headers,
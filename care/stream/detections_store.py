@@ -0,0 +1,469 @@
+"""
+Embedded time-series store of per-source detection summaries and alarm transitions.
+
+Pipelines append batches of per-frame summaries column by column - timestamps and one
+array per metric (e.g. number of detections, number of detections of given class). Each
+batch is kept as a segment of raw columns (encoded numpy buffers, one row per batch instead
+of one row per frame) and is downsampled on write into minute and hour rollups (count, sum,
+min and max of each metric per bucket), upserted into the rollups table.
+
+Metrics are sparse - metric missing in a batch is zero for its frames. Number of frames per
+bucket is rolled up separately (as `FRAMES_METRIC`), so that rollups of metric count every
+frame of the bucket, no matter in which batches the metric was present.
+
+Raw segments and minute rollups are removed once older than their retention (measured
+against the latest appended timestamp, so that replayed or synthetic data is not dropped
+on write), hour rollups are kept. Data is stored in SQLite database in WAL mode, so that
+dashboards query it while pipelines write.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterable, List, Optional, Union
+
+import numpy as np
+
+from care.env import (
+    DETECTIONS_STORE_MINUTE_ROLLUPS_RETENTION,
+    DETECTIONS_STORE_RAW_RETENTION,
+)
+from care.stream.entities import AlarmTransition, DetectionsSeries, RollupSeries
+from care.utils.sqlite_wrapper import get_connection_pool
+
+MINUTE = 60
+HOUR = 3600
+ROLLUP_RESOLUTIONS = {"minute": MINUTE, "hour": HOUR}
+TIMESTAMPS_DTYPE = np.float64
+METRICS_DTYPE = np.float32
+# data time (in seconds) between checks of retention
+RETENTION_CHECK_INTERVAL = 600
+# reserved metric holding number of frames in rollup buckets
+FRAMES_METRIC = "_frames"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS segments (
+        id INTEGER PRIMARY KEY,
+        source_id TEXT NOT NULL,
+        start_timestamp REAL NOT NULL,
+        end_timestamp REAL NOT NULL,
+        size INTEGER NOT NULL,
+        timestamps BLOB NOT NULL
+    )""",
+    """CREATE INDEX IF NOT EXISTS segments_by_source
+        ON segments (source_id, end_timestamp)""",
+    """CREATE TABLE IF NOT EXISTS segment_columns (
+        segment_id INTEGER NOT NULL,
+        metric TEXT NOT NULL,
+        metric_values BLOB NOT NULL,
+        PRIMARY KEY (segment_id, metric)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS rollups (
+        source_id TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        resolution INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        value_count INTEGER NOT NULL,
+        value_sum REAL NOT NULL,
+        value_min REAL NOT NULL,
+        value_max REAL NOT NULL,
+        PRIMARY KEY (source_id, metric, resolution, bucket)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS alarm_transitions (
+        source_id TEXT NOT NULL,
+        alarm TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        active INTEGER NOT NULL,
+        PRIMARY KEY (source_id, alarm, timestamp)
+    ) WITHOUT ROWID""",
+    """CREATE INDEX IF NOT EXISTS alarm_transitions_by_time
+        ON alarm_transitions (source_id, timestamp)""",
+]
+
+UPSERT_ROLLUP_QUERY = """
+    INSERT INTO rollups (
+        source_id, metric, resolution, bucket, value_count, value_sum, value_min, value_max
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source_id, metric, resolution, bucket) DO UPDATE SET
+        value_count = value_count + excluded.value_count,
+        value_sum = value_sum + excluded.value_sum,
+        value_min = MIN(value_min, excluded.value_min),
+        value_max = MAX(value_max, excluded.value_max)
+"""
+
+
+# metric rollups completed against frames of the bucket - frames without the metric are zeros
+SELECT_ROLLUPS_QUERY = """
+    SELECT
+        frames.bucket,
+        frames.value_count,
+        COALESCE(metric.value_sum, 0),
+        CASE
+            WHEN metric.value_count IS NULL THEN 0
+            WHEN metric.value_count < frames.value_count THEN MIN(metric.value_min, 0)
+            ELSE metric.value_min
+        END,
+        CASE
+            WHEN metric.value_count IS NULL THEN 0
+            WHEN metric.value_count < frames.value_count THEN MAX(metric.value_max, 0)
+            ELSE metric.value_max
+        END
+    FROM rollups AS frames
+    LEFT JOIN rollups AS metric
+        ON metric.source_id = frames.source_id
+        AND metric.resolution = frames.resolution
+        AND metric.bucket = frames.bucket
+        AND metric.metric = ?
+    WHERE frames.source_id = ? AND frames.metric = ? AND frames.resolution = ?
+        AND frames.bucket >= ? AND frames.bucket <= ?
+    ORDER BY frames.bucket
+"""
+
+
+class DetectionsStore:
+    def __init__(
+        self,
+        db_file_path: str,
+        raw_retention: Optional[float] = DETECTIONS_STORE_RAW_RETENTION,
+        minute_rollups_retention: Optional[float] = DETECTIONS_STORE_MINUTE_ROLLUPS_RETENTION,
+    ):
+        """Time-series store of detection summaries, backed by SQLite file.
+
+        Args:
+            db_file_path (str): Path of database file, created if not exists.
+            raw_retention (Optional[float]): Seconds for which raw per-frame summaries are
+                kept, None means forever.
+            minute_rollups_retention (Optional[float]): Seconds for which minute rollups are
+                kept, None means forever.
+        """
+        self._db_file_path = db_file_path
+        self._raw_retention = raw_retention
+        self._minute_rollups_retention = minute_rollups_retention
+        self._latest_timestamp: Optional[float] = None
+        self._retention_checked_at: Optional[float] = None
+        directory = os.path.dirname(os.path.abspath(db_file_path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def append(
+        self,
+        source_id: str,
+        timestamps: Union[np.ndarray, List[float]],
+        metrics: Dict[str, Union[np.ndarray, List[float]]],
+    ) -> None:
+        """Appends batch of per-frame summaries of given source.
+
+        Args:
+            source_id (str): Identifier of the source (e.g. camera).
+            timestamps (Union[np.ndarray, List[float]]): Unix timestamps of frames.
+            metrics (Dict[str, Union[np.ndarray, List[float]]]): Values of metrics, each
+                with one value per frame.
+        """
+        timestamps = np.asarray(timestamps, dtype=TIMESTAMPS_DTYPE)
+        if timestamps.size == 0:
+            return None
+        columns = {}
+        for metric, values in metrics.items():
+            values = np.asarray(values, dtype=METRICS_DTYPE)
+            if values.shape != timestamps.shape:
+                raise ValueError(
+                    f"Metric {metric} has {values.size} values for {timestamps.size} timestamps."
+                )
+            columns[metric] = values
+        if FRAMES_METRIC in columns:
+            raise ValueError(f"Metric name {FRAMES_METRIC} is reserved.")
+        if np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+            columns = {metric: values[order] for metric, values in columns.items()}
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "INSERT INTO segments (source_id, start_timestamp, end_timestamp, size, timestamps) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    source_id,
+                    float(timestamps[0]),
+                    float(timestamps[-1]),
+                    int(timestamps.size),
+                    timestamps.tobytes(),
+                ),
+            )
+            segment_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO segment_columns (segment_id, metric, metric_values) VALUES (?, ?, ?)",
+                [
+                    (segment_id, metric, values.tobytes())
+                    for metric, values in columns.items()
+                ],
+            )
+            connection.executemany(
+                UPSERT_ROLLUP_QUERY,
+                _compute_rollups(
+                    source_id=source_id, timestamps=timestamps, columns=columns
+                ),
+            )
+            self._register_timestamp(
+                connection=connection, timestamp=float(timestamps[-1])
+            )
+
+    def append_alarm_transitions(
+        self,
+        source_id: str,
+        alarm: str,
+        timestamps: Iterable[float],
+        active: Iterable[bool],
+    ) -> None:
+        """Records moments in which alarm of given source was raised or cleared."""
+        rows = [
+            (source_id, alarm, float(timestamp), int(bool(is_active)))
+            for timestamp, is_active in zip(timestamps, active)
+        ]
+        if not rows:
+            return None
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO alarm_transitions (source_id, alarm, timestamp, active) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def query_raw(
+        self,
+        source_id: str,
+        start: float,
+        end: float,
+        metrics: Optional[List[str]] = None,
+    ) -> DetectionsSeries:
+        """Returns per-frame summaries of the source with timestamps within [start, end]."""
+        with self._connection() as connection:
+            segments = connection.execute(
+                "SELECT id, timestamps FROM segments "
+                "WHERE source_id = ? AND end_timestamp >= ? AND start_timestamp <= ? "
+                "ORDER BY start_timestamp",
+                (source_id, start, end),
+            ).fetchall()
+            segments_ids = [segment_id for segment_id, _ in segments]
+            columns_rows = _select_segments_columns(
+                connection=connection, segments_ids=segments_ids, metrics=metrics
+            )
+        columns_by_segment: Dict[int, Dict[str, bytes]] = {}
+        metrics_names = [] if metrics is None else list(metrics)
+        for segment_id, metric, values in columns_rows:
+            columns_by_segment.setdefault(segment_id, {})[metric] = values
+            if metrics is None and metric not in metrics_names:
+                metrics_names.append(metric)
+        timestamps_chunks = []
+        metrics_chunks = {metric: [] for metric in metrics_names}
+        for segment_id, timestamps_blob in segments:
+            timestamps = np.frombuffer(timestamps_blob, dtype=TIMESTAMPS_DTYPE)
+            mask = (timestamps >= start) & (timestamps <= end)
+            timestamps_chunks.append(timestamps[mask])
+            segment_columns = columns_by_segment.get(segment_id, {})
+            for metric in metrics_names:
+                blob = segment_columns.get(metric)
+                if blob is None:
+                    values = np.zeros(timestamps.shape, dtype=METRICS_DTYPE)
+                else:
+                    values = np.frombuffer(blob, dtype=METRICS_DTYPE)
+                metrics_chunks[metric].append(values[mask])
+        return DetectionsSeries(
+            source_id=source_id,
+            timestamps=_concatenate(timestamps_chunks, dtype=TIMESTAMPS_DTYPE),
+            metrics={
+                metric: _concatenate(chunks, dtype=METRICS_DTYPE)
+                for metric, chunks in metrics_chunks.items()
+            },
+        )
+
+    def query_rollups(
+        self,
+        source_id: str,
+        metric: str,
+        start: float,
+        end: float,
+        resolution: Union[str, int] = "minute",
+    ) -> RollupSeries:
+        """Returns rollups of the metric for buckets overlapping [start, end]. Frames of
+        the bucket without the metric count as zeros.
+
+        Args:
+            resolution (Union[str, int]): "minute", "hour" or width of bucket in seconds.
+        """
+        resolution = ROLLUP_RESOLUTIONS.get(resolution, resolution)
+        if resolution not in ROLLUP_RESOLUTIONS.values():
+            raise ValueError(
+                f"Unknown rollup resolution {resolution}, use one of {list(ROLLUP_RESOLUTIONS)}."
+            )
+        with self._connection() as connection:
+            rows = connection.execute(
+                SELECT_ROLLUPS_QUERY,
+                (
+                    metric,
+                    source_id,
+                    FRAMES_METRIC,
+                    resolution,
+                    int(start // resolution * resolution),
+                    end,
+                ),
+            ).fetchall()
+        table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        return RollupSeries(
+            source_id=source_id,
+            metric=metric,
+            resolution=resolution,
+            buckets=table[:, 0].astype(np.int64),
+            count=table[:, 1].astype(np.int64),
+            sum=table[:, 2],
+            min=table[:, 3],
+            max=table[:, 4],
+        )
+
+    def query_alarm_transitions(
+        self,
+        source_id: str,
+        start: float,
+        end: float,
+        alarm: Optional[str] = None,
+    ) -> List[AlarmTransition]:
+        query = (
+            "SELECT alarm, timestamp, active FROM alarm_transitions "
+            "WHERE source_id = ? AND timestamp >= ? AND timestamp <= ?"
+        )
+        parameters = [source_id, start, end]
+        if alarm is not None:
+            query += " AND alarm = ?"
+            parameters.append(alarm)
+        with self._connection() as connection:
+            rows = connection.execute(f"{query} ORDER BY timestamp", parameters)
+            return [
+                AlarmTransition(
+                    source_id=source_id,
+                    alarm=alarm_name,
+                    timestamp=timestamp,
+                    active=bool(active),
+                )
+                for alarm_name, timestamp, active in rows
+            ]
+
+    def list_sources(self) -> List[str]:
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT DISTINCT source_id FROM rollups WHERE resolution = ? ORDER BY source_id",
+                (HOUR,),
+            ).fetchall()
+        return [source_id for source_id, in rows]
+
+    def enforce_retention(self, now: Optional[float] = None) -> None:
+        """Removes raw segments and minute rollups older than their retention.
+
+        Args:
+            now (Optional[float]): Reference timestamp, the latest appended one by default.
+        """
+        if now is None:
+            now = self._latest_timestamp
+        if now is None:
+            return None
+        with self._connection() as connection:
+            self._enforce_retention(connection=connection, now=now)
+
+    def close(self) -> None:
+        get_connection_pool(self._db_file_path).close_all()
+
+    @contextmanager
+    def _connection(self) -> Generator[sqlite3.Connection, None, None]:
+        connection = get_connection_pool(self._db_file_path).get_connection()
+        # commits on success, rolls back on error
+        with connection:
+            yield connection
+
+    def _register_timestamp(self, connection: sqlite3.Connection, timestamp: float) -> None:
+        if self._latest_timestamp is None or timestamp > self._latest_timestamp:
+            self._latest_timestamp = timestamp
+        if (
+            self._retention_checked_at is not None
+            and self._latest_timestamp - self._retention_checked_at
+            < RETENTION_CHECK_INTERVAL
+        ):
+            return None
+        self._retention_checked_at = self._latest_timestamp
+        self._enforce_retention(connection=connection, now=self._latest_timestamp)
+
+    def _enforce_retention(self, connection: sqlite3.Connection, now: float) -> None:
+        if self._raw_retention is not None:
+            cutoff = now - self._raw_retention
+            connection.execute(
+                "DELETE FROM segment_columns WHERE segment_id IN "
+                "(SELECT id FROM segments WHERE end_timestamp < ?)",
+                (cutoff,),
+            )
+            connection.execute("DELETE FROM segments WHERE end_timestamp < ?", (cutoff,))
+        if self._minute_rollups_retention is not None:
+            connection.execute(
+                "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                (MINUTE, now - self._minute_rollups_retention),
+            )
+
+
+def _compute_rollups(
+    source_id: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray]
+) -> List[tuple]:
+    rows = []
+    for resolution in ROLLUP_RESOLUTIONS.values():
+        buckets = (timestamps // resolution).astype(np.int64) * resolution
+        # timestamps are sorted, so are buckets
+        bucket_starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[bucket_starts, buckets.size])
+        bucket_values = buckets[bucket_starts].tolist()
+        counts = counts.tolist()
+        rows.extend(
+            (source_id, FRAMES_METRIC, resolution, bucket, count, count, 1.0, 1.0)
+            for bucket, count in zip(bucket_values, counts)
+        )
+        for metric, values in columns.items():
+            values = values.astype(np.float64)
+            sums = np.add.reduceat(values, bucket_starts).tolist()
+            minimums = np.minimum.reduceat(values, bucket_starts).tolist()
+            maximums = np.maximum.reduceat(values, bucket_starts).tolist()
+            rows.extend(
+                zip(
+                    [source_id] * len(counts),
+                    [metric] * len(counts),
+                    [resolution] * len(counts),
+                    bucket_values,
+                    counts,
+                    sums,
+                    minimums,
+                    maximums,
+                )
+            )
+    return rows
+
+
+def _select_segments_columns(
+    connection: sqlite3.Connection,
+    segments_ids: List[int],
+    metrics: Optional[List[str]],
+) -> List[tuple]:
+    rows = []
+    # stays below default limit of SQLite variables
+    chunk_size = 500
+    for i in range(0, len(segments_ids), chunk_size):
+        chunk = segments_ids[i : i + chunk_size]
+        query = (
+            "SELECT segment_id, metric, metric_values FROM segment_columns "
+            f"WHERE segment_id IN ({', '.join('?' * len(chunk))})"
+        )
+        parameters = list(chunk)
+        if metrics is not None:
+            query += f" AND metric IN ({', '.join('?' * len(metrics))})"
+            parameters.extend(metrics)
+        rows.extend(connection.execute(query, parameters).fetchall())
+    return rows
+
+
+def _concatenate(chunks: List[np.ndarray], dtype: np.dtype) -> np.ndarray:
+    if not chunks:
+        return np.empty((0,), dtype=dtype)
+    return np.concatenate(chunks)
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Union
 
+import numpy as np
+
 from care.env import (
     CLASS_AGNOSTIC_NMS_ENV,
     DEFAULT_CLASS_AGNOSTIC_NMS,
@@ -120,6 +122,37 @@ class PipelineStateReport:
     sources_metadata: List[SourceMetadata]
 
 
+@dataclass(frozen=True)
+class DetectionsSeries:
+    source_id: str
+    timestamps: np.ndarray
+    metrics: Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class RollupSeries:
+    source_id: str
+    metric: str
+    resolution: int
+    buckets: np.ndarray
+    count: np.ndarray
+    sum: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / np.maximum(self.count, 1)
+
+
+@dataclass(frozen=True)
+class AlarmTransition:
+    source_id: str
+    alarm: str
+    timestamp: float
+    active: bool
+
+
 InferenceHandler = Callable[[List[VideoFrame]], List[AnyPrediction]]
 SinkHandler = Optional[
     Union[
@@ -12,6 +12,7 @@ from care.active_learning.middlewares import (
     ThreadingActiveLearningMiddleware,
 )
 from care.cache import cache
+from care.cache.shared_results import SharedResultsCache
 from care.env import (
     ACTIVE_LEARNING_ENABLED,
     API_KEY,
@@ -22,8 +23,18 @@ from care.env import (
     LOCAL_MODELS_DIR,
     LOCAL_MODELS_ENABLED,
     MAX_ACTIVE_MODELS,
+    MICRO_BATCHING_ENABLED,
     PREDICTIONS_QUEUE_SIZE,
+    SHARED_MODEL_RESULTS_ENABLED,
+    SHARED_MODELS_ENABLED,
+    WORKFLOWS_MODELS_PRELOADING_ENABLED,
+    WORKFLOWS_MODELS_WARMUP_BATCH_SIZES,
+    WORKFLOWS_MODELS_WARMUP_ITERATIONS,
     WORKFLOWS_PROFILER_BUFFER_SIZE,
+    WORKFLOWS_PROFILER_MAX_TRACE_FILES,
+    WORKFLOWS_PROFILER_MIN_SAMPLING_INTERVAL,
+    WORKFLOWS_PROFILER_RUNS_PER_TRACE_FILE,
+    WORKFLOWS_PROFILER_SAMPLE_EVERY_N_RUNS,
 )
 from care.exceptions import CannotInitialiseModelError, MissingApiKeyError
 from care.camera.entities import (
@@ -58,13 +69,23 @@ from care.stream.watchdog import (
 )
 from care.managers.active_learning import BackgroundTaskActiveLearningManager
 from care.managers.decorators.fixed_size_cache import WithFixedSizeCache
+from care.managers.decorators.micro_batching import WithMicroBatching
+from care.managers.decorators.profiling import WithWorkflowsProfiling
+from care.managers.decorators.shared_models import WithSharedModels
+from care.managers.decorators.shared_results import WithSharedResults
+from care.managers.hub import ModelHub
+from care.managers.preloading import (
+    find_models_in_workflow_definition,
+    preload_models,
+)
 from care.registries.roboflow import RoboflowModelRegistry
 from care.registries.local import LocalModelRegistry
 from care.registries.composite import CompositeModelRegistry
 from care.utils.function import experimental
 from care.workflows.execution_engine.profiling.core import (
-    BaseWorkflowsProfiler,
     NullWorkflowsProfiler,
+    SamplingWorkflowsProfiler,
+    profiled,
 )
 from care.models.aliases import resolve_roboflow_model_alias
 from care.models.utils import ROBOFLOW_MODEL_TYPES, get_model
@@ -77,6 +98,7 @@ INFERENCE_THREAD_STARTED_EVENT = "INFERENCE_THREAD_STARTED"
 INFERENCE_THREAD_FINISHED_EVENT = "INFERENCE_THREAD_FINISHED"
 INFERENCE_COMPLETED_EVENT = "INFERENCE_COMPLETED"
 INFERENCE_ERROR_EVENT = "INFERENCE_ERROR"
+MODELS_PRELOADED_EVENT = "MODELS_PRELOADED"
 
 
 class SinkMode(Enum):
@@ -489,6 +511,12 @@ class InferencePipeline:
         serialize_results: bool = False,
         predictions_queue_size: int = PREDICTIONS_QUEUE_SIZE,
         decoding_buffer_size: int = DEFAULT_BUFFER_SIZE,
+        preload_workflow_models: bool = WORKFLOWS_MODELS_PRELOADING_ENABLED,
+        models_warmup_iterations: int = WORKFLOWS_MODELS_WARMUP_ITERATIONS,
+        models_warmup_batch_sizes: Optional[List[int]] = WORKFLOWS_MODELS_WARMUP_BATCH_SIZES,
+        use_shared_models: bool = SHARED_MODELS_ENABLED,
+        use_micro_batching: bool = MICRO_BATCHING_ENABLED,
+        use_shared_results: bool = SHARED_MODEL_RESULTS_ENABLED,
     ) -> "InferencePipeline":
         """
         This class creates the abstraction for making inferences from given workflow against video stream.
@@ -559,7 +587,10 @@ class InferencePipeline:
             profiling_directory (str): Directory where workflows profiler traces will be dumped. To enable profiling
                 export `ENABLE_WORKFLOWS_PROFILING=True` environmental variable. You may specify number of workflow
                 runs in a buffer with environmental variable `WORKFLOWS_PROFILER_BUFFER_SIZE=n` - making last `n`
-                frames to be present in buffer on processing end.
+                frames to be present in buffer on processing end. To keep profiling on in production, sample
+                runs with `WORKFLOWS_PROFILER_SAMPLE_EVERY_N_RUNS` / `WORKFLOWS_PROFILER_MIN_SAMPLING_INTERVAL` and
+                let profiler write Chrome Trace Event files (rotated, up to `WORKFLOWS_PROFILER_MAX_TRACE_FILES`)
+                every `WORKFLOWS_PROFILER_RUNS_PER_TRACE_FILE` sampled runs.
             use_workflow_definition_cache (bool): Controls usage of cache for workflow definitions. Set this to False
                 when you frequently modify definition saved in Roboflow app and want to fetch the
                 newest version for the request. Only applies for Workflows definitions saved on Roboflow platform.
@@ -569,10 +600,33 @@ class InferencePipeline:
                 default value is taken from INFERENCE_PIPELINE_PREDICTIONS_QUEUE_SIZE env variable
             decoding_buffer_size (int): size of video source decoding buffer
                 default value is taken from VIDEO_SOURCE_BUFFER_SIZE env variable
+            preload_workflow_models (bool): Flag to decide if models referenced by workflow steps should be loaded
+                (in parallel) before the pipeline starts consuming video, instead of lazily on the first frame.
+                Default value is taken from WORKFLOWS_MODELS_PRELOADING_ENABLED env variable (disabled by
+                default). Outcome is reported with `MODELS_PRELOADED` status update.
+            models_warmup_iterations (int): Number of warm-up inferences on synthetic inputs run against each
+                preloaded model for each expected batch size. Set 0 to disable warm-up. Default value is taken
+                from WORKFLOWS_MODELS_WARMUP_ITERATIONS env variable.
+            models_warmup_batch_sizes (Optional[List[int]]): Batch sizes to warm-up models with. If not given -
+                batch of single image and batch matching number of video sources are used.
+            use_shared_models (bool): Flag to decide if model instances should be taken from process-level
+                `ModelHub` shared with other pipelines that opted in - instead of being loaded separately
+                for this pipeline. Concurrent predictions of pipelines against the same model are coalesced
+                into batches. Default value is taken from SHARED_MODELS_ENABLED env variable.
+            use_micro_batching (bool): Flag to decide if concurrent predictions against the same model issued
+                within the pipeline (e.g. by workflow steps run in parallel) should be coalesced into batches.
+                Default value is taken from MICRO_BATCHING_ENABLED env variable, batching is tuned with
+                MICRO_BATCHING_MAX_BATCH_SIZE and MICRO_BATCHING_MAX_WAIT env variables.
+            use_shared_results (bool): Flag to decide if results of model steps should be shared with other
+                pipelines that opted in and process identical frames (e.g. watching the same camera) - the first
+                pipeline requesting prediction computes it, the others wait for it. Results are kept in the
+                process cache (Redis if configured) for SHARED_MODEL_RESULTS_TTL seconds, up to
+                SHARED_MODEL_RESULTS_MAX_BYTES. Default value is taken from SHARED_MODEL_RESULTS_ENABLED env variable.
 
         Other ENV variables involved in low-level configuration:
         * INFERENCE_PIPELINE_PREDICTIONS_QUEUE_SIZE - size of buffer for predictions that are ready for dispatching
         * INFERENCE_PIPELINE_RESTART_ATTEMPT_DELAY - delay for restarts on stream connection drop
+        * WORKFLOWS_MODELS_PRELOADING_WORKERS - number of threads loading models in preloading phase
 
         Returns: Instance of InferencePipeline
 
@@ -585,8 +639,13 @@ class InferencePipeline:
                 from Roboflow API is needed
         """
         if ENABLE_WORKFLOWS_PROFILING:
-            profiler = BaseWorkflowsProfiler.init(
-                max_runs_in_buffer=WORKFLOWS_PROFILER_BUFFER_SIZE
+            profiler = SamplingWorkflowsProfiler.init(
+                max_runs_in_buffer=WORKFLOWS_PROFILER_BUFFER_SIZE,
+                sample_every_n_runs=WORKFLOWS_PROFILER_SAMPLE_EVERY_N_RUNS,
+                min_sampling_interval=WORKFLOWS_PROFILER_MIN_SAMPLING_INTERVAL,
+                traces_directory=profiling_directory,
+                runs_per_trace_file=WORKFLOWS_PROFILER_RUNS_PER_TRACE_FILE,
+                max_trace_files=WORKFLOWS_PROFILER_MAX_TRACE_FILES,
             )
         else:
             profiler = NullWorkflowsProfiler.init()
@@ -605,7 +664,8 @@ class InferencePipeline:
                 WorkflowRunner,
             )
             from inference.core.roboflow_api import get_workflow_specification
-            from inference.core.workflows.execution_engine.core import ExecutionEngine
+
+            from care.workflows.execution_engine.core import ExecutionEngine
 
             if workflow_specification is None:
                 if api_key is None:
@@ -659,10 +719,48 @@ class InferencePipeline:
             model_manager = BackgroundTaskActiveLearningManager(
                 model_registry=model_registry, cache=cache
             )
+            shared_models_manager = None
+            if use_shared_models:
+                shared_models_manager = WithSharedModels(
+                    model_manager,
+                    hub=ModelHub.init(model_registry=model_registry),
+                )
+                model_manager = shared_models_manager
+            micro_batching_manager = None
+            if use_micro_batching:
+                micro_batching_manager = WithMicroBatching(model_manager)
+                model_manager = micro_batching_manager
+            if ENABLE_WORKFLOWS_PROFILING:
+                model_manager = WithWorkflowsProfiling(model_manager, profiler=profiler)
+            if use_shared_results:
+                model_manager = WithSharedResults(
+                    model_manager, results_cache=SharedResultsCache.init(cache=cache)
+                )
             model_manager = WithFixedSizeCache(
                 model_manager,
                 max_size=MAX_ACTIVE_MODELS,
             )
+            preloading_report = None
+            if preload_workflow_models:
+                if models_warmup_batch_sizes is None:
+                    sources_number = (
+                        len(video_reference) if isinstance(video_reference, list) else 1
+                    )
+                    models_warmup_batch_sizes = [1, sources_number]
+                with profiler.profile_execution_phase(
+                    name="models_preloading",
+                    categories=["inference_package_operation"],
+                ):
+                    preloading_report = preload_models(
+                        model_manager=model_manager,
+                        model_ids=find_models_in_workflow_definition(
+                            workflow_definition=workflow_specification,
+                            workflows_parameters=workflows_parameters,
+                        ),
+                        api_key=api_key,
+                        warmup_iterations=models_warmup_iterations,
+                        warmup_batch_sizes=models_warmup_batch_sizes,
+                    )
             if workflow_init_parameters is None:
                 workflow_init_parameters = {}
             thread_pool_executor = ThreadPoolExecutor(
@@ -693,14 +791,24 @@ class InferencePipeline:
                 f"Could not initialise workflow processing due to lack of dependencies required. "
                 f"Please provide an issue report under https://github.com/roboflow/inference/issues"
             ) from error
+        if ENABLE_WORKFLOWS_PROFILING and on_prediction is not None:
+            on_prediction = profiled(
+                on_prediction,
+                profiler=profiler,
+                name="sink",
+                categories=["sink_operation"],
+            )
         on_pipeline_end_closure = partial(
             on_pipeline_end,
             thread_pool_executor=thread_pool_executor,
             cancel_thread_pool_tasks_on_exit=cancel_thread_pool_tasks_on_exit,
             profiler=profiler,
             profiling_directory=profiling_directory,
+            shared_models_manager=shared_models_manager,
+            micro_batching_manager=micro_batching_manager,
+            execution_engine=execution_engine,
         )
-        return cls.init_with_custom_logic(
+        pipeline = cls.init_with_custom_logic(
             video_reference=video_reference,
             on_video_frame=on_video_frame,
             on_prediction=on_prediction,
@@ -716,6 +824,17 @@ class InferencePipeline:
             predictions_queue_size=predictions_queue_size,
             decoding_buffer_size=decoding_buffer_size,
         )
+        if preloading_report is not None:
+            # emitted once handlers list is complete, so that watchdog receives the report
+            send_inference_pipeline_status_update(
+                severity=(
+                    UpdateSeverity.INFO if preloading_report.ready else UpdateSeverity.WARNING
+                ),
+                event_type=MODELS_PRELOADED_EVENT,
+                payload=preloading_report.to_dict(),
+                status_update_handlers=pipeline._status_update_handlers,
+            )
+        return pipeline
 
     @classmethod
     def init_with_custom_logic(
@@ -3,6 +3,7 @@ import socket
 from collections import deque
 from datetime import datetime
 from functools import partial
+from threading import Lock
 from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 import cv2
@@ -13,6 +14,8 @@ from supervision.annotators.base import BaseAnnotator
 from care.logger import logger
 from care.active_learning.middlewares import ActiveLearningMiddleware
 from care.camera.entities import VideoFrame
+from care.env import DETECTIONS_STORE_SINK_BATCH_SIZE
+from care.stream.detections_store import DetectionsStore
 from care.stream.entities import SinkHandler
 from care.stream.utils import wrap_in_list
 from care.utils.drawing import create_tiles
@@ -568,3 +571,184 @@ class InMemoryBufferSink:
         self,
     ) -> Tuple[List[Optional[dict]], List[Optional[VideoFrame]]]:
         return self._buffer.popleft()
+
+
+DEFAULT_SOURCE_ID = "default_source"
+
+
+class DetectionsStoreSink:
+    @classmethod
+    def init(
+        cls,
+        db_file_path: str,
+        predictions_field: str = "predictions",
+        alarms: Optional[Dict[str, Callable[[Dict[str, float]], bool]]] = None,
+        batch_size: int = DETECTIONS_STORE_SINK_BATCH_SIZE,
+    ) -> "DetectionsStoreSink":
+        """
+        Creates `InferencePipeline` predictions sink writing per-frame detection summaries and
+        alarm transitions into embedded time-series store (see `DetectionsStore`), which keeps
+        minute and hour rollups queried by dashboards.
+
+        Args:
+            db_file_path (str): Path of the store database file.
+            predictions_field (str): Field of prediction holding detections - list of dicts of
+                model predictions or `sv.Detections` of workflow output.
+            alarms (Optional[Dict[str, Callable[[Dict[str, float]], bool]]]): Alarms, by name -
+                predicates telling if alarm is active given summary of frame. Moments of
+                raising and clearing alarms are recorded.
+            batch_size (int): Number of frames buffered before being written as one batch.
+
+        Returns: Initialized object of `DetectionsStoreSink` class.
+
+        Example:
+            ```python
+            sink = DetectionsStoreSink.init(
+                db_file_path="./detections.db",
+                alarms={"crowd": lambda summary: summary.get("detections/person", 0) > 10},
+            )
+            pipeline = InferencePipeline.init(
+                model_id="your-model/3",
+                video_reference="rtsp://camera",
+                on_prediction=sink.on_prediction,
+            )
+            pipeline.start()
+            pipeline.join()
+            sink.close()
+            ```
+        """
+        return cls(
+            store=DetectionsStore(db_file_path=db_file_path),
+            predictions_field=predictions_field,
+            alarms=alarms,
+            batch_size=batch_size,
+        )
+
+    def __init__(
+        self,
+        store: DetectionsStore,
+        predictions_field: str,
+        alarms: Optional[Dict[str, Callable[[Dict[str, float]], bool]]],
+        batch_size: int,
+    ):
+        self._store = store
+        self._predictions_field = predictions_field
+        self._alarms = alarms or {}
+        self._batch_size = max(batch_size, 1)
+        self._lock = Lock()
+        self._timestamps: Dict[str, List[float]] = {}
+        self._metrics: Dict[str, Dict[str, List[float]]] = {}
+        self._buffered_frames = 0
+        self._alarms_states: Dict[Tuple[str, str], bool] = {}
+        self._transitions: Dict[Tuple[str, str], List[Tuple[float, bool]]] = {}
+
+    @property
+    def store(self) -> DetectionsStore:
+        return self._store
+
+    def on_prediction(
+        self,
+        predictions: Union[dict, List[Optional[dict]]],
+        video_frame: Union[VideoFrame, List[Optional[VideoFrame]]],
+    ) -> None:
+        predictions = wrap_in_list(element=predictions)
+        video_frame = wrap_in_list(element=video_frame)
+        with self._lock:
+            for prediction, frame in zip(predictions, video_frame):
+                if prediction is None or frame is None:
+                    continue
+                source_id = (
+                    str(frame.source_id)
+                    if frame.source_id is not None
+                    else DEFAULT_SOURCE_ID
+                )
+                timestamp = frame.frame_timestamp.timestamp()
+                summary = summarise_detections(
+                    prediction=prediction, predictions_field=self._predictions_field
+                )
+                self._buffer_summary(
+                    source_id=source_id, timestamp=timestamp, summary=summary
+                )
+                self._update_alarms(
+                    source_id=source_id, timestamp=timestamp, summary=summary
+                )
+            if self._buffered_frames >= self._batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _buffer_summary(
+        self, source_id: str, timestamp: float, summary: Dict[str, float]
+    ) -> None:
+        timestamps = self._timestamps.setdefault(source_id, [])
+        metrics = self._metrics.setdefault(source_id, {})
+        for metric in summary:
+            if metric not in metrics:
+                # metric not seen before in the batch - zero for previous frames
+                metrics[metric] = [0.0] * len(timestamps)
+        timestamps.append(timestamp)
+        for metric, values in metrics.items():
+            values.append(summary.get(metric, 0.0))
+        self._buffered_frames += 1
+
+    def _update_alarms(
+        self, source_id: str, timestamp: float, summary: Dict[str, float]
+    ) -> None:
+        for alarm, is_active in self._alarms.items():
+            active = bool(is_active(summary))
+            key = (source_id, alarm)
+            if self._alarms_states.get(key, False) != active:
+                self._alarms_states[key] = active
+                self._transitions.setdefault(key, []).append((timestamp, active))
+
+    def _flush(self) -> None:
+        timestamps, self._timestamps = self._timestamps, {}
+        metrics, self._metrics = self._metrics, {}
+        transitions, self._transitions = self._transitions, {}
+        self._buffered_frames = 0
+        try:
+            for source_id, source_timestamps in timestamps.items():
+                self._store.append(
+                    source_id=source_id,
+                    timestamps=source_timestamps,
+                    metrics=metrics[source_id],
+                )
+            for (source_id, alarm), alarm_transitions in transitions.items():
+                self._store.append_alarm_transitions(
+                    source_id=source_id,
+                    alarm=alarm,
+                    timestamps=[timestamp for timestamp, _ in alarm_transitions],
+                    active=[active for _, active in alarm_transitions],
+                )
+        except Exception as error:
+            logger.warning(f"Could not write detections summaries into store: {error}")
+
+
+def summarise_detections(
+    prediction: dict, predictions_field: str = "predictions"
+) -> Dict[str, float]:
+    """Counts detections of the frame - in total and per class - and finds max confidence."""
+    detections = prediction.get(predictions_field)
+    if isinstance(detections, dict):
+        # serialised workflow output
+        detections = detections.get("predictions")
+    if isinstance(detections, sv.Detections):
+        class_names = detections.data.get("class_name", [])
+        confidences = detections.confidence
+    elif isinstance(detections, list):
+        class_names = [detection.get("class") for detection in detections]
+        confidences = [detection.get("confidence", 0.0) for detection in detections]
+    else:
+        return {}
+    summary = {"detections": float(len(detections))}
+    for class_name in class_names:
+        metric = f"detections/{class_name}"
+        summary[metric] = summary.get(metric, 0.0) + 1.0
+    if confidences is not None and len(confidences) > 0:
+        summary["max_confidence"] = float(np.max(confidences))
+    return summary
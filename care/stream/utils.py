@@ -14,7 +14,13 @@ from care.camera.video_source import (
     BufferFillingStrategy,
     VideoSource,
 )
-from care.workflows.execution_engine.profiling.core import WorkflowsProfiler
+from care.managers.decorators.micro_batching import WithMicroBatching
+from care.managers.decorators.shared_models import WithSharedModels
+from care.workflows.execution_engine.core import ExecutionEngine
+from care.workflows.execution_engine.profiling.core import (
+    SamplingWorkflowsProfiler,
+    WorkflowsProfiler,
+)
 
 T = TypeVar("T")
 
@@ -110,17 +116,29 @@ def on_pipeline_end(
     cancel_thread_pool_tasks_on_exit: bool,
     profiler: WorkflowsProfiler,
     profiling_directory: str,
+    shared_models_manager: Optional[WithSharedModels] = None,
+    micro_batching_manager: Optional[WithMicroBatching] = None,
+    execution_engine: Optional[ExecutionEngine] = None,
 ) -> None:
     if ENABLE_WORKFLOWS_PROFILING:
-        save_workflows_profiler_trace(
-            directory=profiling_directory,
-            profiler_trace=profiler.export_trace(),
-        )
+        if isinstance(profiler, SamplingWorkflowsProfiler):
+            profiler.flush_trace()
+        else:
+            save_workflows_profiler_trace(
+                directory=profiling_directory,
+                profiler_trace=profiler.export_trace(),
+            )
     try:
         thread_pool_executor.shutdown(cancel_futures=cancel_thread_pool_tasks_on_exit)
     except TypeError:
         # we must support Python 3.8 which do not support `cancel_futures`
         thread_pool_executor.shutdown()
+    if execution_engine is not None:
+        execution_engine.release()
+    if micro_batching_manager is not None:
+        micro_batching_manager.dispose()
+    if shared_models_manager is not None:
+        shared_models_manager.dispose()
 
 
 def save_workflows_profiler_trace(
@@ -0,0 +1,211 @@
+"""
+Low-overhead usage counters.
+
+Recording usage happens on the inference hot path, once per request or frame. Instead of
+updating shared usage dict under a lock, every thread accumulates cumulative counters in
+its own dict. Collector thread periodically harvests all threads: it copies each dict
+(atomic under the GIL), reads cumulative values and reports difference against values
+seen at previous harvest. Writers never take a lock after their first call, and nothing
+is serialized or hashed until harvest.
+
+Counters of a thread are only ever modified by that thread, so `+=` on them cannot lose
+updates - collector only reads. Counters of finished threads are dropped once harvested.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# api key, category, resource id
+UsageKey = Tuple[str, str, str]
+
+# positions in per-thread counters list
+_CALLS = 0
+_FRAMES = 1
+_SOURCE_DURATION = 2
+_EXECUTION_DURATION = 3
+_TIMESTAMP_START = 4
+_TIMESTAMP_STOP = 5
+_GENERATION = 6
+_FPS = 7
+_DETAILS = 8
+_ATTRIBUTES = 9
+
+
+@dataclass
+class UsageDelta:
+    calls: int
+    frames: int
+    source_duration: float
+    execution_duration: float
+    timestamp_start: int
+    timestamp_stop: int
+    fps: float
+    resource_details: Optional[Dict[str, Any]]
+    attributes: Optional[Tuple[Any, ...]]
+
+
+class UsageCounters:
+    def __init__(self):
+        self._local = threading.local()
+        self._registry_lock = threading.Lock()
+        self._registry: List[Tuple[threading.Thread, Dict[UsageKey, list]]] = []
+        # id of thread counters -> usage key -> (calls, frames, source duration, execution duration)
+        self._harvested: Dict[int, Dict[UsageKey, Tuple[int, int, float, float]]] = {}
+        self._generation = 0
+
+    def add(
+        self,
+        key: UsageKey,
+        frames: int,
+        source_duration: float,
+        execution_duration: float,
+        fps: float,
+        resource_details: Optional[Dict[str, Any]] = None,
+        attributes: Optional[Tuple[Any, ...]] = None,
+    ) -> None:
+        """Accumulates single call in counters of the current thread.
+
+        `resource_details` and `attributes` set to None keep values recorded by previous
+        calls for the same key.
+        """
+        try:
+            counters = self._local.counters
+        except AttributeError:
+            counters = self._register()
+        now = time.time_ns()
+        entry = counters.get(key)
+        if entry is None:
+            counters[key] = [
+                1,
+                frames,
+                source_duration,
+                execution_duration,
+                now,
+                now,
+                self._generation,
+                fps,
+                resource_details,
+                attributes,
+            ]
+            return
+        if entry[_GENERATION] != self._generation:
+            # first call since previous harvest
+            entry[_GENERATION] = self._generation
+            entry[_TIMESTAMP_START] = now
+        entry[_FRAMES] += frames
+        entry[_SOURCE_DURATION] += source_duration
+        entry[_EXECUTION_DURATION] += execution_duration
+        entry[_TIMESTAMP_STOP] = now
+        entry[_FPS] = fps
+        if resource_details is not None:
+            entry[_DETAILS] = resource_details
+        if attributes is not None:
+            entry[_ATTRIBUTES] = attributes
+        # incremented last - values of a call harvested before its increment are
+        # reported together with the next harvest
+        entry[_CALLS] += 1
+
+    def harvest(self) -> Dict[UsageKey, UsageDelta]:
+        """Returns usage accumulated by all threads since previous harvest.
+
+        Must be called from single thread at a time.
+        """
+        self._generation += 1
+        with self._registry_lock:
+            registry = list(self._registry)
+        deltas: Dict[UsageKey, UsageDelta] = {}
+        finished = []
+        for thread, counters in registry:
+            # thread must be checked before reading, so that its last calls are not lost
+            alive = thread.is_alive()
+            harvested = self._harvested.setdefault(id(counters), {})
+            for key, entry in counters.copy().items():
+                entry = entry[:]
+                previous = harvested.get(key, (0, 0, 0.0, 0.0))
+                if entry[_CALLS] == previous[0]:
+                    continue
+                harvested[key] = (
+                    entry[_CALLS],
+                    entry[_FRAMES],
+                    entry[_SOURCE_DURATION],
+                    entry[_EXECUTION_DURATION],
+                )
+                delta = UsageDelta(
+                    calls=entry[_CALLS] - previous[0],
+                    frames=entry[_FRAMES] - previous[1],
+                    source_duration=entry[_SOURCE_DURATION] - previous[2],
+                    execution_duration=entry[_EXECUTION_DURATION] - previous[3],
+                    timestamp_start=entry[_TIMESTAMP_START],
+                    timestamp_stop=entry[_TIMESTAMP_STOP],
+                    fps=entry[_FPS],
+                    resource_details=entry[_DETAILS],
+                    attributes=entry[_ATTRIBUTES],
+                )
+                _merge_delta(deltas=deltas, key=key, delta=delta)
+            if not alive:
+                finished.append(counters)
+        if finished:
+            with self._registry_lock:
+                self._registry = [
+                    (thread, counters)
+                    for thread, counters in self._registry
+                    if not any(counters is f for f in finished)
+                ]
+            for counters in finished:
+                self._harvested.pop(id(counters), None)
+        return deltas
+
+    def _register(self) -> Dict[UsageKey, list]:
+        counters: Dict[UsageKey, list] = {}
+        self._local.counters = counters
+        with self._registry_lock:
+            self._registry.append((threading.current_thread(), counters))
+        return counters
+
+
+def _merge_delta(
+    deltas: Dict[UsageKey, UsageDelta], key: UsageKey, delta: UsageDelta
+) -> None:
+    existing = deltas.get(key)
+    if existing is None:
+        deltas[key] = delta
+        return
+    latest = delta if delta.timestamp_stop >= existing.timestamp_stop else existing
+    deltas[key] = UsageDelta(
+        calls=existing.calls + delta.calls,
+        frames=existing.frames + delta.frames,
+        source_duration=existing.source_duration + delta.source_duration,
+        execution_duration=existing.execution_duration + delta.execution_duration,
+        timestamp_start=min(existing.timestamp_start, delta.timestamp_start),
+        timestamp_stop=latest.timestamp_stop,
+        fps=latest.fps,
+        resource_details=latest.resource_details or existing.resource_details,
+        attributes=latest.attributes or existing.attributes,
+    )
+
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable equivalent of JSON-like value, raises TypeError for unhashable leaves."""
+    value_type = value.__class__
+    # type is kept as True, 1 and 1.0 are equal but serialized differently
+    if value_type in _SCALAR_TYPES:
+        return value_type, value
+    if isinstance(value, dict):
+        return dict, tuple(
+            sorted(
+                (k, v.__class__, v) if v.__class__ in _SCALAR_TYPES else (k, freeze(v))
+                for k, v in value.items()
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        item_types = set(map(type, value))
+        if len(item_types) == 1 and item_types <= _SCALAR_TYPES:
+            return list, item_types.pop(), tuple(value)
+        return list, tuple(freeze(v) for v in value)
+    hash(value)
+    return value_type, value
@@ -15,6 +15,7 @@ from typing import (
     Callable,
     DefaultDict,
     Dict,
+    Hashable,
     List,
     Literal,
     Optional,
@@ -44,6 +45,7 @@ try:
 except ImportError:
     execution_id = None
 
+from .accounting import UsageCounters, freeze
 from .config import TelemetrySettings, get_telemetry_settings
 from .decorator_helpers import (
     get_model_id_from_kwargs,
@@ -74,6 +76,9 @@ from .utils import collect_func_params
 T = TypeVar("T")
 P = ParamSpec("P")
 
+RESOURCE_HASHES_CACHE_SIZE = 4096
+_resource_hashes: Dict[Hashable, str] = {}
+
 
 class UsageCollector:
     _lock = Lock()
@@ -100,9 +105,7 @@ class UsageCollector:
         self._exec_session_id = f"{time.time_ns()}_{uuid4().hex[:4]}"
 
         self._settings: TelemetrySettings = get_telemetry_settings()
-        self._usage: APIKeyUsage = self.empty_usage_dict(
-            exec_session_id=self._exec_session_id
-        )
+        self._usage_counters = UsageCounters()
 
         self._hashed_api_keys: Dict[APIKey, APIKeyHash] = {}
         self._api_keys_hashing_enabled = True
@@ -218,12 +221,22 @@ class UsageCollector:
                     api_key_hash = sha256_hash(api_key)
                 else:
                     api_key_hash = api_key
-            self._hashed_api_keys[api_key] = api_key_hash
+                self._hashed_api_keys[api_key] = api_key_hash
         return api_key_hash
 
     @staticmethod
     def _calculate_resource_hash(resource_details: Dict[str, Any]) -> str:
-        return sha256_hash(json.dumps(resource_details, sort_keys=True))
+        try:
+            frozen_details = freeze(resource_details)
+        except TypeError:
+            return sha256_hash(json.dumps(resource_details, sort_keys=True))
+        resource_hash = _resource_hashes.get(frozen_details)
+        if resource_hash is None:
+            resource_hash = sha256_hash(json.dumps(resource_details, sort_keys=True))
+            if len(_resource_hashes) >= RESOURCE_HASHES_CACHE_SIZE:
+                _resource_hashes.clear()
+            _resource_hashes[frozen_details] = resource_hash
+        return resource_hash
 
     def _enqueue_payload(self, payload: UsagePayload):
         logger.debug("Enqueuing usage payload")
@@ -353,53 +366,44 @@ class UsageCollector:
         roboflow_service_name: Optional[str] = None,
         roboflow_internal_secret: Optional[str] = None,
     ):
-        source = str(source) if source else ""
         try:
             frames = int(frames)
         except Exception:
             frames = 0
-        api_key_hash = self._calculate_api_key_hash(api_key=api_key)
         if not resource_id and resource_details:
             resource_id = UsageCollector._calculate_resource_hash(resource_details)
-        with self._resource_details_lock:
-            resource_details = self._resource_details.get(api_key, {}).get(
-                (category, resource_id), {}
-            )
-        with self._system_info_lock:
-            ip_address_hash = self._system_info["ip_address_hash"]
-            is_gpu_available = self._system_info["is_gpu_available"]
-            hostname = self._system_info["hostname"]
-        with UsageCollector._lock:
-            source_usage = self._usage[api_key_hash][f"{category}:{resource_id}"]
-            if not source_usage["timestamp_start"]:
-                source_usage["timestamp_start"] = time.time_ns()
-            source_usage["timestamp_stop"] = time.time_ns()
-            source_usage["processed_frames"] += frames if not inference_test_run else 0
-            source_usage["source_duration"] += (
-                frames / fps if fps and not inference_test_run else 0
+        if not resource_details or not isinstance(resource_details, dict):
+            # keep details recorded earlier for the resource
+            resource_details = None
+        if inference_test_run:
+            frames, source_duration = 0, 0
+        else:
+            source_duration = frames / fps if fps else 0
+        if not (
+            roboflow_service_name
+            and roboflow_service_name != "external"
+            and roboflow_internal_secret
+        ):
+            roboflow_service_name, roboflow_internal_secret = None, None
+        exec_session_id = None
+        if execution_id is not None:
+            exec_session_id = execution_id.get()
+        attributes = None
+        if roboflow_service_name or exec_session_id:
+            attributes = (
+                roboflow_service_name,
+                roboflow_internal_secret,
+                exec_session_id,
             )
-            source_usage["fps"] = fps if isinstance(fps, numbers.Number) else 0
-            source_usage["category"] = category
-            source_usage["resource_id"] = resource_id
-            source_usage["resource_details"] = json.dumps(resource_details)
-            source_usage["api_key_hash"] = api_key_hash
-            source_usage["hostname"] = hostname
-            source_usage["ip_address_hash"] = ip_address_hash
-            source_usage["is_gpu_available"] = is_gpu_available
-            source_usage["execution_duration"] += execution_duration
-            if (
-                roboflow_service_name
-                and roboflow_service_name != "external"
-                and roboflow_internal_secret
-            ):
-                source_usage["roboflow_service_name"] = roboflow_service_name
-                source_usage["roboflow_internal_secret"] = roboflow_internal_secret
-
-            exec_session_id = None
-            if execution_id is not None:
-                exec_session_id = execution_id.get()
-            if exec_session_id:
-                source_usage["exec_session_id"] = exec_session_id
+        self._usage_counters.add(
+            key=(api_key, category, resource_id),
+            frames=frames,
+            source_duration=source_duration,
+            execution_duration=execution_duration,
+            fps=fps if isinstance(fps, numbers.Number) else 0,
+            resource_details=resource_details,
+            attributes=attributes,
+        )
 
     def record_usage(
         self,
@@ -418,12 +422,6 @@ class UsageCollector:
         if not api_key:
             return
         self.record_system_info()
-        self.record_resource_details(
-            category=category,
-            resource_details=resource_details,
-            resource_id=resource_id,
-            api_key=api_key,
-        )
         self._update_usage_payload(
             source=source,
             category=category,
@@ -491,11 +489,43 @@ class UsageCollector:
         self._enqueue_usage_payload()
 
     def _enqueue_usage_payload(self):
-        if not self._usage:
-            return
         with UsageCollector._lock:
-            self._enqueue_payload(payload=self._usage)
-            self._usage = self.empty_usage_dict(exec_session_id=self._exec_session_id)
+            usage_deltas = self._usage_counters.harvest()
+        if not usage_deltas:
+            return
+        usage = self.empty_usage_dict(exec_session_id=self._exec_session_id)
+        system_info = self._system_info
+        for (api_key, category, resource_id), delta in usage_deltas.items():
+            api_key_hash = self._calculate_api_key_hash(api_key=api_key)
+            resource_details = delta.resource_details
+            if resource_details is None:
+                with self._resource_details_lock:
+                    resource_details = self._resource_details.get(api_key, {}).get(
+                        (category, resource_id), {}
+                    )
+            roboflow_service_name, roboflow_internal_secret, exec_session_id = (
+                delta.attributes or (None, None, None)
+            )
+            source_usage = usage[api_key_hash][f"{category}:{resource_id}"]
+            source_usage["timestamp_start"] = delta.timestamp_start
+            source_usage["timestamp_stop"] = delta.timestamp_stop
+            source_usage["processed_frames"] = delta.frames
+            source_usage["source_duration"] = delta.source_duration
+            source_usage["fps"] = delta.fps
+            source_usage["category"] = category
+            source_usage["resource_id"] = resource_id
+            source_usage["resource_details"] = json.dumps(resource_details)
+            source_usage["api_key_hash"] = api_key_hash
+            source_usage["hostname"] = system_info["hostname"]
+            source_usage["ip_address_hash"] = system_info["ip_address_hash"]
+            source_usage["is_gpu_available"] = system_info["is_gpu_available"]
+            source_usage["execution_duration"] = delta.execution_duration
+            if roboflow_service_name:
+                source_usage["roboflow_service_name"] = roboflow_service_name
+                source_usage["roboflow_internal_secret"] = roboflow_internal_secret
+            if exec_session_id:
+                source_usage["exec_session_id"] = exec_session_id
+        self._enqueue_payload(payload=usage)
 
     def _usage_sender(self):
         while True:
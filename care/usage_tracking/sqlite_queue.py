@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from care.env import MODEL_CACHE_DIR
 from care.logger import logger
-from care.utils.sqlite_wrapper import SQLiteWrapper
+from care.utils.sqlite_wrapper import BufferedSQLiteWriter, SQLiteWrapper
 
 
 class SQLiteQueue(SQLiteWrapper):
@@ -14,6 +14,7 @@ class SQLiteQueue(SQLiteWrapper):
         db_file_path: str = os.path.join(MODEL_CACHE_DIR, "usage.db"),
         table_name: str = "usage",
         sqlite_connection: Optional[sqlite3.Connection] = None,
+        buffered_writes: bool = False,
     ):
         self._col_name = "payload"
 
@@ -23,10 +24,18 @@ class SQLiteQueue(SQLiteWrapper):
             columns={self._col_name: "TEXT NOT NULL"},
             connection=sqlite_connection,
         )
+        # payloads put without explicit connection are written through, unless
+        # batching was requested - then rows wait in buffer flushed on size, time or exit
+        self._writer: Optional[BufferedSQLiteWriter] = None
+        if buffered_writes:
+            self._writer = BufferedSQLiteWriter(wrapper=self)
 
     def put(self, payload: Any, sqlite_connection: Optional[sqlite3.Connection] = None):
-        payload_str = json.dumps(payload)
+        payload_str = json.dumps(payload, separators=(",", ":"))
         try:
+            if sqlite_connection is None and self._writer is not None:
+                self._writer.put(row={self._col_name: payload_str})
+                return None
             self.insert(
                 row={self._col_name: payload_str},
                 connection=sqlite_connection,
@@ -35,11 +44,20 @@ class SQLiteQueue(SQLiteWrapper):
         except Exception:
             pass
 
+    def _flush_buffered_payloads(self):
+        if self._writer is None:
+            return None
+        try:
+            self._writer.flush()
+        except Exception as exc:
+            logger.debug("Failed to store buffered payloads - %s", exc)
+
     @staticmethod
     def full() -> bool:
         return False
 
     def empty(self, sqlite_connection: Optional[sqlite3.Connection] = None) -> bool:
+        self._flush_buffered_payloads()
         try:
             return self.count(connection=sqlite_connection) == 0
         except Exception:
@@ -48,6 +66,7 @@ class SQLiteQueue(SQLiteWrapper):
     def get_nowait(
         self, sqlite_connection: Optional[sqlite3.Connection] = None
     ) -> List[Dict[str, Any]]:
+        self._flush_buffered_payloads()
         try:
             sqlite_payloads = self.flush(connection=sqlite_connection, limit=100)
         except Exception:
@@ -9,6 +9,9 @@ lock = Lock()
 
 
 def get_signature(func: Callable[[Any], Any]) -> inspect.Signature:
+    signature = signatures.get(func)
+    if signature is not None:
+        return signature
     with lock:
         if func not in signatures:
             signatures[func] = inspect.signature(func)
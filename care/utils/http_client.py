@@ -0,0 +1,124 @@
+"""
+Shared HTTP session for requests to Roboflow API.
+
+Module-level `requests.get(...)` / `requests.post(...)` open a new session for every call,
+so each request pays for TCP and TLS handshakes. `get_http_session()` returns process-wide
+session keeping keep-alive connections in a pool.
+
+Requests failed on transport level (connection refused or dropped before the response)
+are retried with exponential, jittered backoff. Requests which might have reached the
+server are retried only for idempotent methods.
+
+`ETagCache` keeps validators and bodies of responses, so that repeated GET requests can be
+sent with `If-None-Match` and answered with `304 Not Modified` instead of full payload.
+"""
+
+import os
+import random
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from care.env import (
+    ROBOFLOW_API_ETAG_CACHE_SIZE,
+    ROBOFLOW_API_HTTP_BACKOFF_FACTOR,
+    ROBOFLOW_API_HTTP_POOL_SIZE,
+    ROBOFLOW_API_HTTP_RETRIES,
+)
+
+
+class JitteredRetry(Retry):
+    """`Retry` with full jitter applied to exponential backoff."""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+def build_retry(retries: int, backoff_factor: float) -> Retry:
+    return JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        # HTTP errors are handled by callers
+        status=0,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        backoff_factor=backoff_factor,
+        raise_on_status=False,
+    )
+
+
+def create_http_session(
+    pool_size: int = ROBOFLOW_API_HTTP_POOL_SIZE,
+    retries: int = ROBOFLOW_API_HTTP_RETRIES,
+    backoff_factor: float = ROBOFLOW_API_HTTP_BACKOFF_FACTOR,
+) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=build_retry(retries=retries, backoff_factor=backoff_factor),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Returns session shared by the process, created again in forked children."""
+    global _session, _session_pid
+    if _session is not None and _session_pid == os.getpid():
+        return _session
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = create_http_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def close_http_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class ETagCache:
+    def __init__(self, max_size: int = ROBOFLOW_API_ETAG_CACHE_SIZE):
+        """LRU cache of response bodies with their ETag, keyed by URL."""
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, etag: str, content: bytes) -> None:
+        if self._max_size <= 0:
+            return None
+        with self._lock:
+            self._entries[url] = (etag, content)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,5 +1,6 @@
+import math
 from copy import deepcopy
-from typing import Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -429,6 +430,308 @@ def crop_mask(masks: np.ndarray, boxes: np.ndarray) -> np.ndarray:
     return masks
 
 
+MASK_DECODE_MODES = ("accurate", "tradeoff", "fast")
+MASK_OUTPUT_FORMATS = ("polygon", "rle", "mask")
+MASK_THRESHOLD = 0.5
+
+
+def decode_instance_masks(
+    protos: np.ndarray,
+    masks_in: np.ndarray,
+    bboxes: np.ndarray,
+    shape: Tuple[int, int],
+    mask_decode_mode: str = "accurate",
+    tradeoff_factor: float = 0.0,
+    output_format: str = "polygon",
+) -> Tuple[Union[List[Any], np.ndarray], Tuple[int, int]]:
+    """Decodes instance masks of single image - see `decode_instance_masks_batch(...)`."""
+    results = decode_instance_masks_batch(
+        protos=protos[None],
+        masks_in=[masks_in],
+        bboxes=[bboxes],
+        shape=shape,
+        mask_decode_mode=mask_decode_mode,
+        tradeoff_factor=tradeoff_factor,
+        output_format=output_format,
+    )
+    return results[0]
+
+
+def decode_instance_masks_batch(
+    protos: np.ndarray,
+    masks_in: List[np.ndarray],
+    bboxes: List[np.ndarray],
+    shape: Tuple[int, int],
+    mask_decode_mode: str = "accurate",
+    tradeoff_factor: float = 0.0,
+    output_format: str = "polygon",
+) -> List[Tuple[Union[List[Any], np.ndarray], Tuple[int, int]]]:
+    """Decodes instance masks for batch of images, without dense full-resolution masks.
+
+    Produces the same masks as `process_mask_accurate(...)`, `process_mask_tradeoff(...)`
+    and `process_mask_fast(...)` (up to floating point differences on mask boundaries), but
+    prototypes are combined, passed through sigmoid and resized only within the box of each
+    detection (plus margin required by bilinear interpolation) - instead of the whole frame
+    for every detection. Interpolation tables are shared by all images in the batch.
+
+    Args:
+        protos (np.ndarray): Prototype masks of shape (B, C, H, W), any float dtype (only
+            the regions used are converted into float32).
+        masks_in (List[np.ndarray]): Masks coefficients (N, C) for each image.
+        bboxes (List[np.ndarray]): Boxes (N, 4) for each image, in coordinates of `shape`.
+        shape (Tuple[int, int]): Shape of model input image.
+        mask_decode_mode (str): One of "accurate", "tradeoff", "fast".
+        tradeoff_factor (float): Tradeoff factor for "tradeoff" mode.
+        output_format (str): One of:
+            "polygon" - the largest external contour of each mask (as by `masks2poly(...)`),
+            "rle" - uncompressed, column-major (COCO) run-length encoding of each mask,
+            "mask" - dense boolean masks of shape (N, H, W).
+
+    Returns:
+        List[Tuple[Union[List[Any], np.ndarray], Tuple[int, int]]]: For each image - decoded
+            masks and shape of the masks coordinates space.
+    """
+    if mask_decode_mode not in MASK_DECODE_MODES:
+        raise PostProcessingError(
+            f"Invalid mask_decode_mode: {mask_decode_mode}. Must be one of {list(MASK_DECODE_MODES)}"
+        )
+    if output_format not in MASK_OUTPUT_FORMATS:
+        raise PostProcessingError(
+            f"Invalid output_format: {output_format}. Must be one of {list(MASK_OUTPUT_FORMATS)}"
+        )
+    _, _, mh, mw = protos.shape
+    source_window, output_shape, boxes_scale = _get_masks_decoding_geometry(
+        protos_shape=(mh, mw),
+        shape=shape,
+        mask_decode_mode=mask_decode_mode,
+        tradeoff_factor=tradeoff_factor,
+    )
+    top, left, source_h, source_w = source_window
+    resize_needed = output_shape != (source_h, source_w)
+    rows_table = _linear_interpolation_table(source_h, output_shape[0])
+    columns_table = _linear_interpolation_table(source_w, output_shape[1])
+    results = []
+    for image_protos, image_masks_in, image_bboxes in zip(protos, masks_in, bboxes):
+        image_protos = image_protos[:, top : top + source_h, left : left + source_w]
+        decoded = []
+        for mask_in, box in zip(image_masks_in, image_bboxes):
+            box_window = _get_box_window(
+                box=box, scale=boxes_scale, output_shape=output_shape
+            )
+            if box_window is None:
+                box_mask = None
+            elif resize_needed:
+                box_mask = _decode_resized_box_mask(
+                    protos=image_protos,
+                    mask_in=mask_in,
+                    box_window=box_window,
+                    rows_table=rows_table,
+                    columns_table=columns_table,
+                )
+            else:
+                box_mask = _decode_box_mask(
+                    protos=image_protos, mask_in=mask_in, box_window=box_window
+                )
+            decoded.append(
+                _format_box_mask(
+                    box_mask=box_mask,
+                    box_window=box_window,
+                    output_shape=output_shape,
+                    output_format=output_format,
+                )
+            )
+        if output_format == "mask":
+            decoded = (
+                np.stack(decoded)
+                if decoded
+                else np.zeros((0,) + output_shape, dtype=bool)
+            )
+        results.append((decoded, output_shape))
+    return results
+
+
+def _get_masks_decoding_geometry(
+    protos_shape: Tuple[int, int],
+    shape: Tuple[int, int],
+    mask_decode_mode: str,
+    tradeoff_factor: float,
+) -> Tuple[Tuple[int, int, int, int], Tuple[int, int], Tuple[float, float]]:
+    # mirrors geometry of `preprocess_segmentation_masks(...)` and `process_mask_*(...)`
+    mh, mw = protos_shape
+    ih, iw = shape
+    gain = min(mh / ih, mw / iw)
+    pad = (mw - iw * gain) / 2, (mh - ih * gain) / 2
+    top, left = int(pad[1]), int(pad[0])
+    bottom, right = int(mh - pad[1]), int(mw - pad[0])
+    source_h, source_w = bottom - top, right - left
+    if mask_decode_mode == "accurate":
+        return (top, left, source_h, source_w), (ih, iw), (1.0, 1.0)
+    if mask_decode_mode == "fast":
+        return (top, left, source_h, source_w), (source_h, source_w), (mw / iw, mh / ih)
+    if tradeoff_factor == 0:
+        output_shape = (source_h, source_w)
+    else:
+        h = int(mh * (1 - tradeoff_factor) + ih * tradeoff_factor)
+        w = int(mw * (1 - tradeoff_factor) + iw * tradeoff_factor)
+        # `process_mask_tradeoff(...)` passes (h, w) as cv2 dsize, which is (width, height)
+        output_shape = (w, h)
+    return (
+        (top, left, source_h, source_w),
+        output_shape,
+        (output_shape[1] / iw, output_shape[0] / ih),
+    )
+
+
+def _linear_interpolation_table(
+    source_size: int, target_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # source indices and weights as computed by cv2.resize(..., INTER_LINEAR) for float images
+    scale = source_size / target_size
+    coordinates = ((np.arange(target_size) + 0.5) * scale - 0.5).astype(np.float32)
+    first = np.floor(coordinates).astype(np.int64)
+    weights = coordinates - first
+    before_start = first < 0
+    first[before_start] = 0
+    weights[before_start] = 0
+    after_end = first >= source_size - 1
+    first[after_end] = source_size - 1
+    weights[after_end] = 0
+    second = np.minimum(first + 1, source_size - 1)
+    return first, second, weights.astype(np.float32)
+
+
+def _get_box_window(
+    box: np.ndarray,
+    scale: Tuple[float, float],
+    output_shape: Tuple[int, int],
+) -> Optional[Tuple[int, int, int, int]]:
+    # pixels (u, v) with x1 <= u < x2 and y1 <= v < y2 - as kept by `crop_mask(...)`
+    x1, y1, x2, y2 = (float(c) for c in box[:4])
+    x1, x2 = x1 * scale[0], x2 * scale[0]
+    y1, y2 = y1 * scale[1], y2 * scale[1]
+    u0 = max(math.ceil(x1), 0)
+    u1 = min(math.ceil(x2), output_shape[1])
+    v0 = max(math.ceil(y1), 0)
+    v1 = min(math.ceil(y2), output_shape[0])
+    if u0 >= u1 or v0 >= v1:
+        return None
+    return v0, v1, u0, u1
+
+
+def _decode_box_mask(
+    protos: np.ndarray,
+    mask_in: np.ndarray,
+    box_window: Tuple[int, int, int, int],
+) -> np.ndarray:
+    v0, v1, u0, u1 = box_window
+    values = _sigmoid_of_protos_product(
+        protos=protos[:, v0:v1, u0:u1], mask_in=mask_in
+    )
+    return values >= MASK_THRESHOLD
+
+
+def _decode_resized_box_mask(
+    protos: np.ndarray,
+    mask_in: np.ndarray,
+    box_window: Tuple[int, int, int, int],
+    rows_table: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    columns_table: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> np.ndarray:
+    v0, v1, u0, u1 = box_window
+    rows_first, rows_second, rows_weights = (t[v0:v1] for t in rows_table)
+    columns_first, columns_second, columns_weights = (t[u0:u1] for t in columns_table)
+    r0, r1 = rows_first[0], rows_second[-1] + 1
+    c0, c1 = columns_first[0], columns_second[-1] + 1
+    values = _sigmoid_of_protos_product(
+        protos=protos[:, r0:r1, c0:c1], mask_in=mask_in
+    )
+    # separable bilinear interpolation - horizontal pass, then vertical, as in cv2.resize(...)
+    values = (
+        values[:, columns_first - c0] * (1 - columns_weights)
+        + values[:, columns_second - c0] * columns_weights
+    )
+    values = (
+        values[rows_first - r0] * (1 - rows_weights)[:, None]
+        + values[rows_second - r0] * rows_weights[:, None]
+    )
+    return values >= MASK_THRESHOLD
+
+
+def _sigmoid_of_protos_product(protos: np.ndarray, mask_in: np.ndarray) -> np.ndarray:
+    c, h, w = protos.shape
+    product = mask_in.astype(np.float32) @ protos.reshape((c, -1)).astype(np.float32)
+    return sigmoid(product).reshape((h, w))
+
+
+def _format_box_mask(
+    box_mask: Optional[np.ndarray],
+    box_window: Optional[Tuple[int, int, int, int]],
+    output_shape: Tuple[int, int],
+    output_format: str,
+) -> Any:
+    if output_format == "mask":
+        mask = np.zeros(output_shape, dtype=bool)
+        if box_mask is not None:
+            v0, v1, u0, u1 = box_window
+            mask[v0:v1, u0:u1] = box_mask
+        return mask
+    if output_format == "rle":
+        return box_mask_to_rle(
+            box_mask=box_mask, box_window=box_window, shape=output_shape
+        )
+    if box_mask is None or not box_mask.any():
+        return np.zeros((0, 2), dtype=np.float32)
+    v0, _, u0, _ = box_window
+    contours = cv2.findContours(
+        box_mask.view(np.uint8),
+        cv2.RETR_EXTERNAL,
+        cv2.CHAIN_APPROX_SIMPLE,
+        offset=(int(u0), int(v0)),
+    )[0]
+    longest_contour = contours[np.array([len(x) for x in contours]).argmax()]
+    return np.array(longest_contour).reshape(-1, 2).astype("float32")
+
+
+def box_mask_to_rle(
+    box_mask: Optional[np.ndarray],
+    box_window: Optional[Tuple[int, int, int, int]],
+    shape: Tuple[int, int],
+) -> Dict[str, Any]:
+    """Encodes mask given by its box region into COCO (column-major) uncompressed RLE.
+
+    Args:
+        box_mask (Optional[np.ndarray]): Boolean mask of box region, None for empty mask.
+        box_window (Optional[Tuple[int, int, int, int]]): Box region (top, bottom, left, right).
+        shape (Tuple[int, int]): Shape (H, W) of the whole mask.
+
+    Returns:
+        Dict[str, Any]: RLE in format {"size": [H, W], "counts": [...]}, counts start with
+            the length of background run.
+    """
+    h, w = shape
+    if box_mask is None or not box_mask.any():
+        return {"size": [h, w], "counts": [h * w]}
+    v0, _, u0, _ = box_window
+    # columns of box mask, padded with background, so that runs never span columns here
+    columns = np.zeros((box_mask.shape[1], box_mask.shape[0] + 2), dtype=np.int8)
+    columns[:, 1:-1] = box_mask.T
+    transitions = np.diff(columns, axis=1)
+    starts_columns, starts_rows = np.nonzero(transitions == 1)
+    ends_columns, ends_rows = np.nonzero(transitions == -1)
+    starts = (u0 + starts_columns) * h + v0 + starts_rows
+    ends = (u0 + ends_columns) * h + v0 + ends_rows
+    # runs ending at the bottom of one column and starting at the top of the next are joined
+    continued = ends[:-1] == starts[1:]
+    starts = starts[np.concatenate([[True], ~continued])]
+    ends = ends[np.concatenate([~continued, [True]])]
+    boundaries = np.empty(2 * len(starts) + 2, dtype=np.int64)
+    boundaries[0] = 0
+    boundaries[1:-1:2] = starts
+    boundaries[2:-1:2] = ends
+    boundaries[-1] = h * w
+    return {"size": [h, w], "counts": np.diff(boundaries).tolist()}
+
+
 def post_process_polygons(
     origin_shape: Tuple[int, int],
     polys: List[List[Tuple[float, float]]],
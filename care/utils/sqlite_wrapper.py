@@ -1,6 +1,11 @@
+import atexit
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, List, Optional
 
 from care.logger import logger
 
@@ -8,6 +13,88 @@ ColName = str
 ColType = str
 ColValue = str
 
+SQLITE_BUSY_TIMEOUT = 5.0
+
+
+class _ThreadConnection:
+    def __init__(self, connection: sqlite3.Connection):
+        """Connection owned by single thread. Closed by `close()`, or once holder is
+        collected - thread-local storage of the thread is cleared when thread ends."""
+        self.connection = connection
+        self.close = weakref.finalize(self, _close_connection, connection)
+
+
+def _close_connection(connection: sqlite3.Connection) -> None:
+    try:
+        connection.close()
+    except sqlite3.Error as exc:
+        logger.debug("Failed to close sqlite connection - %s", exc)
+
+
+class SQLiteConnectionPool:
+    def __init__(self, db_file_path: str, timeout: float = SQLITE_BUSY_TIMEOUT):
+        """Long-lived connections to single database file, one per thread.
+
+        Connections are switched to WAL journal with `synchronous=NORMAL` - readers do not
+        block writer and commits do not wait for fsync of the database file. Connection
+        lives as long as its thread - pool holds connections of finished threads only
+        through weak references, so they get closed.
+
+        Args:
+            db_file_path (str): Path of database file.
+            timeout (float): Seconds to wait for locks held by other connections.
+        """
+        self._db_file_path = db_file_path
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._pid = os.getpid()
+
+    def get_connection(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # connections must not be shared with forked process
+            with self._lock:
+                self._local = threading.local()
+                self._connections = weakref.WeakSet()
+                self._pid = os.getpid()
+        thread_connection = getattr(self._local, "connection", None)
+        if thread_connection is None:
+            connection = sqlite3.connect(
+                self._db_file_path, timeout=self._timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            thread_connection = _ThreadConnection(connection=connection)
+            self._local.connection = thread_connection
+            with self._lock:
+                self._connections.add(thread_connection)
+        return thread_connection.connection
+
+    def open_connections(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections, self._connections = list(self._connections), weakref.WeakSet()
+            self._local = threading.local()
+        for thread_connection in connections:
+            thread_connection.close()
+
+
+_CONNECTION_POOLS: Dict[str, SQLiteConnectionPool] = {}
+_CONNECTION_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(db_file_path: str) -> SQLiteConnectionPool:
+    with _CONNECTION_POOLS_LOCK:
+        pool = _CONNECTION_POOLS.get(db_file_path)
+        if pool is None:
+            pool = SQLiteConnectionPool(db_file_path=db_file_path)
+            _CONNECTION_POOLS[db_file_path] = pool
+        return pool
+
 
 class SQLiteWrapper:
     def __init__(
@@ -27,19 +114,24 @@ class SQLiteWrapper:
 
         if not connection:
             os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
-            connection: sqlite3.Connection = sqlite3.connect(db_file_path, timeout=1)
-            self.create_table(connection=connection)
-            connection.close()
-        else:
-            self.create_table(connection=connection)
+        self.create_table(connection=connection)
+
+    @contextmanager
+    def _pooled_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        connection = get_connection_pool(self._db_file_path).get_connection()
+        try:
+            yield connection
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        if connection.in_transaction:
+            connection.commit()
 
     def create_table(self, connection: Optional[sqlite3.Connection] = None):
         if not connection:
-            connection: sqlite3.Connection = sqlite3.connect(
-                self._db_file_path, timeout=1
-            )
-            self._create_table(connection=connection)
-            connection.close()
+            with self._pooled_connection() as connection:
+                self._create_table(connection=connection)
         else:
             self._create_table(connection=connection)
 
@@ -67,13 +159,10 @@ class SQLiteWrapper:
     ):
         if not connection and not cursor:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                self._insert(
-                    row=row, connection=connection, with_exclusive=with_exclusive
-                )
-                connection.close()
+                with self._pooled_connection() as connection:
+                    self._insert(
+                        row=row, connection=connection, with_exclusive=with_exclusive
+                    )
             except Exception as exc:
                 logger.debug(
                     "Failed to store '%s' in %s - %s", row, self._tbl_name, exc
@@ -134,6 +223,59 @@ class SQLiteWrapper:
         if cursor_needs_closing:
             cursor.close()
 
+    def insert_many(
+        self,
+        rows: List[Dict[ColName, ColValue]],
+        connection: Optional[sqlite3.Connection] = None,
+    ):
+        """Inserts rows in single transaction, rows with the same columns go through one
+        `executemany` call."""
+        if not rows:
+            return None
+        if not connection:
+            try:
+                with self._pooled_connection() as connection:
+                    self._insert_many(rows=rows, connection=connection)
+            except Exception as exc:
+                logger.debug(
+                    "Failed to store %s rows in %s - %s", len(rows), self._tbl_name, exc
+                )
+                raise exc
+        else:
+            self._insert_many(rows=rows, connection=connection)
+
+    def _insert_many(
+        self, rows: List[Dict[ColName, ColValue]], connection: sqlite3.Connection
+    ):
+        rows_by_columns: Dict[tuple, List[list]] = {}
+        for row in rows:
+            if not set(row.keys()).issubset(self._columns.keys()):
+                logger.debug(
+                    "Cannot store '%s' in %s, requested column names do not match with table columns",
+                    row,
+                    self._tbl_name,
+                )
+                raise ValueError("Columns mismatch")
+            columns = tuple(k for k in row.keys() if k != "id")
+            rows_by_columns.setdefault(columns, []).append([row[k] for k in columns])
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for columns, values in rows_by_columns.items():
+                sql_insert = f"""INSERT INTO {self._tbl_name} ({', '.join(columns)})
+                        VALUES ({', '.join(['?'] * len(columns))});
+                    """
+                cursor.executemany(sql_insert, values)
+            connection.commit()
+        except Exception as exc:
+            logger.debug("Failed to store rows in %s - %s", self._tbl_name, exc)
+            if connection.in_transaction:
+                connection.rollback()
+            raise exc
+        finally:
+            cursor.close()
+
     def count(
         self,
         connection: Optional[sqlite3.Connection] = None,
@@ -142,13 +284,10 @@ class SQLiteWrapper:
     ) -> int:
         if not connection and not cursor:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                count = self._count(
-                    connection=connection, with_exclusive=with_exclusive
-                )
-                connection.close()
+                with self._pooled_connection() as connection:
+                    count = self._count(
+                        connection=connection, with_exclusive=with_exclusive
+                    )
             except Exception as exc:
                 logger.debug("Failed to obtain records count - %s", exc)
                 raise exc
@@ -207,13 +346,10 @@ class SQLiteWrapper:
     ) -> List[Dict[str, Any]]:
         if not connection and not cursor:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                rows = self._select(
-                    connection=connection, with_exclusive=with_exclusive, limit=limit
-                )
-                connection.close()
+                with self._pooled_connection() as connection:
+                    rows = self._select(
+                        connection=connection, with_exclusive=with_exclusive, limit=limit
+                    )
             except Exception as exc:
                 logger.debug("Failed to obtain records - %s", exc)
                 raise exc
@@ -284,11 +420,8 @@ class SQLiteWrapper:
     ) -> List[Dict[str, Any]]:
         if not connection:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                rows = self._flush(connection=connection, limit=limit)
-                connection.close()
+                with self._pooled_connection() as connection:
+                    rows = self._flush(connection=connection, limit=limit)
             except Exception as exc:
                 logger.debug("Failed to flush db - %s", exc)
                 raise exc
@@ -327,13 +460,10 @@ class SQLiteWrapper:
     ) -> List[Dict[str, Any]]:
         if not connection and not cursor:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                deleted = self._delete(
-                    rows=rows, connection=connection, with_exclusive=with_exclusive
-                )
-                connection.close()
+                with self._pooled_connection() as connection:
+                    deleted = self._delete(
+                        rows=rows, connection=connection, with_exclusive=with_exclusive
+                    )
             except Exception as exc:
                 logger.debug("Failed to obtain records - %s", exc)
                 raise exc
@@ -415,11 +545,8 @@ class SQLiteWrapper:
     ) -> List[Dict[str, Any]]:
         if not connection:
             try:
-                connection: sqlite3.Connection = sqlite3.connect(
-                    self._db_file_path, timeout=1
-                )
-                payloads = self._refresh(rows=rows, connection=connection)
-                connection.close()
+                with self._pooled_connection() as connection:
+                    payloads = self._refresh(rows=rows, connection=connection)
             except Exception as exc:
                 logger.debug("Failed to flush db - %s", exc)
                 raise exc
@@ -462,3 +589,101 @@ class SQLiteWrapper:
             raise exc
 
         return rows
+
+
+class BufferedSQLiteWriter:
+    def __init__(
+        self,
+        wrapper: SQLiteWrapper,
+        max_rows: int = 256,
+        max_delay: float = 1.0,
+        max_buffered_rows: int = 10_000,
+    ):
+        """Buffers rows and inserts them in batches.
+
+        Buffer is flushed when it holds `max_rows` rows, by background thread once the
+        oldest buffered row waited `max_delay` seconds, and at interpreter exit. Rows
+        buffered when process is killed are lost - call `flush()` where they must be
+        persisted. Rows of failed flushes are kept for the next one, up to
+        `max_buffered_rows` - the oldest rows are dropped above that.
+
+        Args:
+            wrapper (SQLiteWrapper): Table rows are inserted into.
+            max_rows (int): Number of buffered rows triggering flush.
+            max_delay (float): Max seconds row can wait in buffer.
+            max_buffered_rows (int): Max number of rows kept while database fails.
+        """
+        self._wrapper = wrapper
+        self._max_rows = max_rows
+        self._max_delay = max_delay
+        self._max_buffered_rows = max(max_buffered_rows, max_rows)
+        self._buffer: List[Dict[ColName, ColValue]] = []
+        self._oldest_row_at: Optional[float] = None
+        self._buffer_lock = threading.Lock()
+        # serialises flushes, so rows are inserted in the order they were put
+        self._flush_lock = threading.Lock()
+        self._condition = threading.Condition(self._buffer_lock)
+        self._stopped = False
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="sqlite-buffered-writer", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def put(self, row: Dict[ColName, ColValue]):
+        with self._buffer_lock:
+            if not self._buffer:
+                self._oldest_row_at = time.monotonic()
+                self._condition.notify()
+            self._buffer.append(row)
+            flush_needed = len(self._buffer) >= self._max_rows
+        if flush_needed:
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+                self._oldest_row_at = None
+            if not rows:
+                return None
+            try:
+                self._wrapper.insert_many(rows=rows)
+            except Exception:
+                with self._buffer_lock:
+                    self._buffer = rows + self._buffer
+                    dropped = len(self._buffer) - self._max_buffered_rows
+                    if dropped > 0:
+                        self._buffer = self._buffer[dropped:]
+                        logger.warning(
+                            "Dropped %s rows buffered for %s - database keeps failing",
+                            dropped,
+                            self._wrapper._tbl_name,
+                        )
+                    self._oldest_row_at = time.monotonic()
+                raise
+
+    def close(self):
+        atexit.unregister(self.close)
+        with self._buffer_lock:
+            self._stopped = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+
+    def _flush_periodically(self):
+        while True:
+            with self._buffer_lock:
+                while not self._stopped and self._oldest_row_at is None:
+                    self._condition.wait()
+                if self._stopped:
+                    return None
+                delay = self._oldest_row_at + self._max_delay - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(timeout=delay)
+                    continue
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.debug("Failed to flush buffered rows - %s", exc)
+                time.sleep(self._max_delay)
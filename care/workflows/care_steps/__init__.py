@@ -10,11 +10,17 @@ To use these blocks, set the WORKFLOWS_PLUGINS environment variable:
 from typing import List, Type
 
 from care.workflows.care_steps.prototypes.block import WorkflowBlock
-from care.workflows.care_steps.sinks import MQTTWriterSinkBlockV1
+from care.workflows.care_steps.sinks import (
+    MQTTWriterSinkBlockV1,
+    MQTTWriterSinkBlockV2,
+)
 from care.workflows.care_steps.transformations import (
     DetectionsCountBlockV1,
+    DetectionsCountBlockV2,
     PredictionAlarmBlockV1,
+    PredictionAlarmBlockV2,
     ConditionalAlarmBlockV1,
+    ConditionalAlarmBlockV2,
 )
 
 
@@ -31,11 +37,15 @@ def load_blocks() -> List[Type[WorkflowBlock]]:
     return [
         # Sinks
         MQTTWriterSinkBlockV1,
+        MQTTWriterSinkBlockV2,
 
         # Transformations
         DetectionsCountBlockV1,
+        DetectionsCountBlockV2,
         PredictionAlarmBlockV1,
+        PredictionAlarmBlockV2,
         ConditionalAlarmBlockV1,
+        ConditionalAlarmBlockV2,
 
         # Agregar otros blocks aquí cuando los implementes:
         # PLCModbusSinkBlockV1,
@@ -47,7 +57,11 @@ def load_blocks() -> List[Type[WorkflowBlock]]:
 __all__ = [
     "load_blocks",
     "MQTTWriterSinkBlockV1",
+    "MQTTWriterSinkBlockV2",
     "DetectionsCountBlockV1",
+    "DetectionsCountBlockV2",
     "PredictionAlarmBlockV1",
+    "PredictionAlarmBlockV2",
     "ConditionalAlarmBlockV1",
+    "ConditionalAlarmBlockV2",
 ]
@@ -0,0 +1,598 @@
+"""Compiler of UQL definitions into flat Python functions.
+
+`build_eval_function(...)` produces tree of `functools.partial(...)` closures which is walked
+on every evaluation. This module generates source code of a single function instead:
+
+* operands that do not depend on evaluation parameters (static values, optionally passed
+  through pure operations) and statements comparing such operands are folded into constants,
+* comparisons with Python equivalents are inlined,
+* statements within `and` / `or` groups are ordered by estimated cost and short-circuited,
+* compiled functions are memoized by structural hash of the definition, so identical
+  expressions used by different blocks share the code.
+
+Errors raised during evaluation are reported the same way as by `build_eval_function(...)`.
+The only intended difference is short-circuiting - statements which result cannot change the
+outcome of a group are not evaluated (and therefore cannot raise).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from care.cache.lru_cache import LRUCache
+from care.env import UQL_COMPILER_CACHE_SIZE
+from care.logger import logger
+from care.workflows.care_steps.common.query_language.evaluation_engine.core import (
+    BINARY_OPERATORS,
+    UNARY_OPERATORS,
+    build_eval_function,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.enums import (
+    StatementsGroupsOperator,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    TYPE_PARAMETER_NAME,
+    BinaryStatement,
+    DynamicOperand,
+    OperationDefinition,
+    StatementGroup,
+    StaticOperand,
+    UnaryStatement,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.types import (
+    T,
+    V,
+)
+from inference.core.workflows.core_steps.common.query_language.errors import (
+    EvaluationEngineError,
+    RoboflowQueryLanguageError,
+    UndeclaredSymbolError,
+)
+
+StatementDefinition = Union[BinaryStatement, UnaryStatement, StatementGroup]
+
+# operations which result depends only on the input value - safe to be evaluated at compile time
+PURE_OPERATIONS = {
+    "StringToLowerCase",
+    "StringToUpperCase",
+    "LookupTable",
+    "ToNumber",
+    "NumberRound",
+    "ToString",
+    "ToBoolean",
+    "StringSubSequence",
+    "StringMatches",
+    "SequenceLength",
+    "SequenceElementsCount",
+    "SequenceAggregate",
+    "NumericSequenceAggregate",
+    "Multiply",
+    "Divide",
+    "TimestampToISOFormat",
+}
+
+# rough, relative costs used to order statements in groups
+DEFAULT_OPERATION_COST = 2
+OPERATIONS_COSTS = {
+    "DetectionsFilter": 50,
+    "SequenceApply": 20,
+    "SequenceMap": 10,
+    "DetectionsToDictionary": 30,
+    "ConvertImageToJPEG": 100,
+    "ConvertImageToBase64": 100,
+    "ConvertDictionaryToJSON": 20,
+    "PickDetectionsByParentClass": 30,
+    "DetectionsRename": 20,
+    "SortDetections": 10,
+    "DetectionsOffset": 10,
+    "DetectionsShift": 10,
+}
+DEFAULT_OPERATOR_COST = 1
+OPERATORS_COSTS = {
+    "(Detection) in zone": 20,
+    "any in (Sequence)": 5,
+    "all in (Sequence)": 5,
+}
+
+INLINE_BINARY_OPERATORS = {
+    "==": "({left} == {right})",
+    "(Number) ==": "({left} == {right})",
+    "!=": "({left} != {right})",
+    "(Number) !=": "({left} != {right})",
+    "(Number) >": "({left} > {right})",
+    "(Number) >=": "({left} >= {right})",
+    "(Number) <": "({left} < {right})",
+    "(Number) <=": "({left} <= {right})",
+    "(String) startsWith": "{left}.startswith({right})",
+    "(String) endsWith": "{left}.endswith({right})",
+    "(String) contains": "({right} in {left})",
+    "in (Sequence)": "({left} in {right})",
+}
+
+INLINE_UNARY_OPERATORS = {
+    "Exists": "({operand} is not None)",
+    "DoesNotExist": "({operand} is None)",
+    "(Boolean) is True": "({operand} is True)",
+    "(Boolean) is False": "({operand} is False)",
+    "(Sequence) is empty": "(len({operand}) == 0)",
+    "(Sequence) is not empty": "(len({operand}) > 0)",
+}
+
+# Python parser limits indentation depth - deeper groups are evaluated by `build_eval_function(...)`
+MAX_GENERATED_CODE_DEPTH = 64
+
+_COMPILED_EXPRESSIONS_CACHE = LRUCache(capacity=UQL_COMPILER_CACHE_SIZE)
+
+
+@dataclass
+class _Constant:
+    value: Any
+    cost: int = 0
+
+
+@dataclass
+class _Variable:
+    name: str
+    cost: int = 1
+
+
+@dataclass
+class _DynamicValue:
+    source: Union[_Constant, _Variable]
+    operations: Callable[[Any, Dict[str, Any]], Any]
+    cost: int
+
+
+_Operand = Union[_Constant, _Variable, _DynamicValue]
+
+
+@dataclass
+class _Comparison:
+    operands: List[_Operand]
+    operator_type: str
+    operator: Callable[..., bool]
+    operator_parameters: Dict[str, Any]
+    negate: bool
+    operation_type: str
+    execution_context: str
+
+    @property
+    def cost(self) -> int:
+        return sum(o.cost for o in self.operands) + OPERATORS_COSTS.get(
+            self.operator_type, DEFAULT_OPERATOR_COST
+        )
+
+
+@dataclass
+class _Group:
+    operator: StatementsGroupsOperator
+    statements: List[Union[_Constant, _Comparison, "_Group"]] = field(
+        default_factory=list
+    )
+
+    @property
+    def cost(self) -> int:
+        return sum(s.cost for s in self.statements)
+
+
+_Node = Union[_Constant, _Comparison, _Group]
+
+
+class _CompilationNotPossibleError(Exception):
+    pass
+
+
+def compile_statement(
+    definition: StatementDefinition,
+    execution_context: str = "<root>",
+) -> Callable[[Dict[str, T]], bool]:
+    """Compiles UQL statement into function evaluating it against given parameters.
+
+    Drop-in replacement of `build_eval_function(...)`, compiled functions are memoized.
+    """
+    cache_key = _get_cache_key(
+        kind="statement", definition=definition, execution_context=execution_context
+    )
+    if cache_key is not None:
+        compiled = _COMPILED_EXPRESSIONS_CACHE.get(cache_key)
+        if compiled is not None:
+            return compiled
+    try:
+        node = _fold_statement(
+            definition=definition, execution_context=execution_context
+        )
+        if _get_depth(node) > MAX_GENERATED_CODE_DEPTH:
+            raise _CompilationNotPossibleError("statement nested too deep")
+        compiled = _generate_statement_function(node=node)
+    except _CompilationNotPossibleError as error:
+        logger.debug(
+            f"UQL statement in context {execution_context} evaluated without compilation: {error}"
+        )
+        compiled = build_eval_function(
+            definition=definition, execution_context=execution_context
+        )
+    if cache_key is not None:
+        _COMPILED_EXPRESSIONS_CACHE[cache_key] = compiled
+    return compiled
+
+
+def compile_operations_chain(
+    operations: List[OperationDefinition],
+    execution_context: str = "<root>",
+) -> Callable[[T, Dict[str, Any]], V]:
+    """Compiles UQL operations chain into single function - replacement of `build_operations_chain(...)`."""
+    # local import to avoid circular dependency of modules with operations and evaluation
+    from care.workflows.care_steps.common.query_language.operations.core import (
+        build_operation,
+        identity,
+    )
+
+    if not len(operations):
+        return identity
+    cache_key = _get_cache_key(
+        kind="operations",
+        definition=operations,
+        execution_context=execution_context,
+    )
+    if cache_key is not None:
+        compiled = _COMPILED_EXPRESSIONS_CACHE.get(cache_key)
+        if compiled is not None:
+            return compiled
+    namespace = {}
+    lines = ["def compiled_uql_operations(value, global_parameters):"]
+    for operation_id, operation_definition in enumerate(operations):
+        function_name = f"operation_{operation_id}"
+        namespace[function_name] = build_operation(
+            operation_definition=operation_definition,
+            execution_context=f"{execution_context}[{operation_id}]",
+        )
+        lines.append(
+            f"    value = {function_name}(value, global_parameters=global_parameters)"
+        )
+    lines.append("    return value")
+    compiled = _build_function(
+        source="\n".join(lines),
+        namespace=namespace,
+        function_name="compiled_uql_operations",
+    )
+    if cache_key is not None:
+        _COMPILED_EXPRESSIONS_CACHE[cache_key] = compiled
+    return compiled
+
+
+def clear_compiled_expressions_cache() -> None:
+    _COMPILED_EXPRESSIONS_CACHE.clear()
+
+
+def get_definition_hash(
+    definition: Union[StatementDefinition, List[OperationDefinition]],
+) -> str:
+    """Computes structural hash of UQL definition (independent of objects identity)."""
+    if isinstance(definition, list):
+        serialised = [d.model_dump(mode="json") for d in definition]
+    else:
+        serialised = definition.model_dump(mode="json")
+    return hashlib.sha256(
+        json.dumps(serialised, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _get_cache_key(
+    kind: str,
+    definition: Union[StatementDefinition, List[OperationDefinition]],
+    execution_context: str,
+) -> Optional[Tuple[str, str, str]]:
+    try:
+        return kind, get_definition_hash(definition=definition), execution_context
+    except (TypeError, ValueError):
+        # definition holds values which cannot be serialised - it is not cached
+        return None
+
+
+def _fold_statement(
+    definition: StatementDefinition,
+    execution_context: str,
+) -> _Node:
+    if isinstance(definition, BinaryStatement):
+        return _fold_comparison(
+            operands_definitions=[definition.left_operand, definition.right_operand],
+            operator_type=definition.comparator.type,
+            operator=BINARY_OPERATORS[definition.comparator.type],
+            operator_definition=definition.comparator,
+            negate=definition.negate,
+            operation_type=definition.type,
+            execution_context=execution_context,
+        )
+    if isinstance(definition, UnaryStatement):
+        return _fold_comparison(
+            operands_definitions=[definition.operand],
+            operator_type=definition.operator.type,
+            operator=UNARY_OPERATORS[definition.operator.type],
+            operator_definition=definition.operator,
+            negate=definition.negate,
+            operation_type=definition.type,
+            execution_context=execution_context,
+        )
+    if not definition.statements:
+        # error about empty group is to be reported at evaluation time
+        raise _CompilationNotPossibleError("empty statements group")
+    group = _Group(operator=definition.operator)
+    for statement_id, statement in enumerate(definition.statements):
+        node = _fold_statement(
+            definition=statement,
+            execution_context=f"{execution_context}.statements[{statement_id}]",
+        )
+        if isinstance(node, _Group) and node.operator is group.operator:
+            # (a and (b and c)) == (a and b and c)
+            group.statements.extend(node.statements)
+        else:
+            group.statements.append(node)
+    return _simplify_group(group=group)
+
+
+def _simplify_group(group: _Group) -> _Node:
+    absorbing = group.operator is StatementsGroupsOperator.OR
+    statements = []
+    for statement in group.statements:
+        if not isinstance(statement, _Constant):
+            statements.append(statement)
+            continue
+        if bool(statement.value) is absorbing:
+            # `True or ...` / `False and ...` - result is known
+            return statement
+        # neutral element is skipped
+    if not statements:
+        return _Constant(value=not absorbing)
+    if len(statements) == 1:
+        return statements[0]
+    # stable sort - statements with equal cost keep the order from definition
+    return _Group(
+        operator=group.operator,
+        statements=sorted(statements, key=lambda s: s.cost),
+    )
+
+
+def _fold_comparison(
+    operands_definitions: List[Union[StaticOperand, DynamicOperand]],
+    operator_type: str,
+    operator: Callable[..., bool],
+    operator_definition: Any,
+    negate: bool,
+    operation_type: str,
+    execution_context: str,
+) -> Union[_Constant, _Comparison]:
+    operator_parameters = {
+        a: getattr(operator_definition, a)
+        for a in type(operator_definition).model_fields
+        if a != TYPE_PARAMETER_NAME
+    }
+    comparison = _Comparison(
+        operands=[
+            _fold_operand(definition=d, execution_context=execution_context)
+            for d in operands_definitions
+        ],
+        operator_type=operator_type,
+        operator=operator,
+        operator_parameters=operator_parameters,
+        negate=negate,
+        operation_type=operation_type,
+        execution_context=execution_context,
+    )
+    if not all(isinstance(o, _Constant) for o in comparison.operands):
+        return comparison
+    try:
+        result = operator(
+            *(o.value for o in comparison.operands), **operator_parameters
+        )
+    except Exception:
+        # error is to be raised at evaluation time, as it would be without compilation
+        return comparison
+    return _Constant(value=not result if negate else result)
+
+
+def _fold_operand(
+    definition: Union[StaticOperand, DynamicOperand],
+    execution_context: str,
+) -> _Operand:
+    if isinstance(definition, StaticOperand):
+        source = _Constant(value=definition.value)
+    else:
+        source = _Variable(name=definition.operand_name)
+    if not definition.operations:
+        return source
+    operations = compile_operations_chain(
+        operations=definition.operations,
+        execution_context=f"{execution_context}.operations",
+    )
+    if isinstance(source, _Constant) and all(
+        o.type in PURE_OPERATIONS for o in definition.operations
+    ):
+        try:
+            return _Constant(value=operations(source.value, global_parameters={}))
+        except Exception:
+            # error is to be raised at evaluation time, as it would be without compilation
+            pass
+    operations_cost = sum(
+        OPERATIONS_COSTS.get(o.type, DEFAULT_OPERATION_COST)
+        for o in definition.operations
+    )
+    return _DynamicValue(
+        source=source, operations=operations, cost=source.cost + operations_cost
+    )
+
+
+def _get_depth(node: _Node) -> int:
+    if not isinstance(node, _Group):
+        return 1
+    # each but the first statement in group is generated one indentation level deeper
+    return max(i + _get_depth(s) for i, s in enumerate(node.statements))
+
+
+@dataclass
+class _StatementCodeGenerator:
+    namespace: Dict[str, Any] = field(default_factory=dict)
+    lines: List[str] = field(default_factory=list)
+    contexts: List[Tuple[str, str]] = field(default_factory=list)
+
+    def bind(self, value: Any, prefix: str) -> str:
+        name = f"{prefix}_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, line: str, indent: int) -> None:
+        self.lines.append("    " * indent + line)
+
+    def generate(self, node: _Node, indent: int) -> None:
+        if isinstance(node, _Constant):
+            self.emit(f"result = {self.bind(node.value, 'constant')}", indent)
+        elif isinstance(node, _Comparison):
+            self.generate_comparison(node=node, indent=indent)
+        else:
+            self.generate_group(node=node, indent=indent)
+
+    def generate_group(self, node: _Group, indent: int) -> None:
+        condition = (
+            "if result:"
+            if node.operator is StatementsGroupsOperator.AND
+            else "if not result:"
+        )
+        self.generate(node=node.statements[0], indent=indent)
+        for statement in node.statements[1:]:
+            self.emit(condition, indent)
+            indent += 1
+            self.generate(node=statement, indent=indent)
+
+    def generate_comparison(self, node: _Comparison, indent: int) -> None:
+        self.emit(f"context_id = {len(self.contexts)}", indent)
+        self.contexts.append((node.operation_type, node.execution_context))
+        operands_names = []
+        for operand_id, operand in enumerate(node.operands):
+            operand_name = f"operand_{operand_id}"
+            self.emit(
+                f"{operand_name} = {self.operand_expression(operand, indent)}", indent
+            )
+            operands_names.append(operand_name)
+        inline_templates = (
+            INLINE_BINARY_OPERATORS if len(operands_names) == 2 else INLINE_UNARY_OPERATORS
+        )
+        if node.operator_type in inline_templates and not node.operator_parameters:
+            if len(operands_names) == 2:
+                expression = inline_templates[node.operator_type].format(
+                    left=operands_names[0], right=operands_names[1]
+                )
+            else:
+                expression = inline_templates[node.operator_type].format(
+                    operand=operands_names[0]
+                )
+        else:
+            operator_name = self.bind(node.operator, "operator")
+            parameters_name = self.bind(node.operator_parameters, "parameters")
+            expression = (
+                f"{operator_name}({', '.join(operands_names)}, **{parameters_name})"
+            )
+        if node.negate:
+            expression = f"not {expression}"
+        self.emit(f"result = {expression}", indent)
+
+    def operand_expression(self, operand: _Operand, indent: int) -> str:
+        if isinstance(operand, _Constant):
+            return self.bind(operand.value, "constant")
+        if isinstance(operand, _Variable):
+            name_literal = repr(operand.name)
+            self.emit(f"if {name_literal} not in values:", indent)
+            self.emit(f"raise_undeclared_symbol({name_literal})", indent + 1)
+            return f"values[{name_literal}]"
+        source = self.operand_expression(operand.source, indent)
+        operations_name = self.bind(operand.operations, "operations")
+        return f"{operations_name}({source}, global_parameters=values)"
+
+
+def _generate_statement_function(node: _Node) -> Callable[[Dict[str, T]], bool]:
+    generator = _StatementCodeGenerator()
+    generator.generate(node=node, indent=2)
+    contexts = tuple(generator.contexts)
+    generator.namespace.update(
+        {
+            "UndeclaredSymbolError": UndeclaredSymbolError,
+            "RoboflowQueryLanguageError": RoboflowQueryLanguageError,
+            "raise_undeclared_symbol": _raise_undeclared_symbol,
+            "wrap_undeclared_symbol_error": _bind_error_wrapper(
+                _wrap_undeclared_symbol_error, contexts
+            ),
+            "wrap_evaluation_error": _bind_error_wrapper(
+                _wrap_evaluation_error, contexts
+            ),
+        }
+    )
+    source = "\n".join(
+        [
+            "def compiled_uql_statement(values):",
+            "    context_id = -1",
+            "    try:",
+            *generator.lines,
+            "        return result",
+            "    except UndeclaredSymbolError as error:",
+            "        raise wrap_undeclared_symbol_error(error, context_id) from error",
+            "    except RoboflowQueryLanguageError:",
+            "        raise",
+            "    except Exception as error:",
+            "        raise wrap_evaluation_error(error, context_id) from error",
+        ]
+    )
+    return _build_function(
+        source=source,
+        namespace=generator.namespace,
+        function_name="compiled_uql_statement",
+    )
+
+
+def _build_function(
+    source: str, namespace: Dict[str, Any], function_name: str
+) -> Callable:
+    code = compile(source, filename=f"<{function_name}>", mode="exec")
+    exec(code, namespace)
+    function = namespace[function_name]
+    function.__uql_source__ = source
+    return function
+
+
+def _bind_error_wrapper(
+    wrapper: Callable[[Exception, str, str], Exception],
+    contexts: Tuple[Tuple[str, str], ...],
+) -> Callable[[Exception, int], Exception]:
+    def wrap(error: Exception, context_id: int) -> Exception:
+        operation_type, execution_context = (
+            contexts[context_id] if context_id >= 0 else ("StatementGroup", "<root>")
+        )
+        return wrapper(error, operation_type, execution_context)
+
+    return wrap
+
+
+def _raise_undeclared_symbol(operand_name: str) -> None:
+    raise UndeclaredSymbolError(
+        public_message=f"Encountered undefined symbol `{operand_name}`",
+        context="unknown",
+    )
+
+
+def _wrap_undeclared_symbol_error(
+    error: UndeclaredSymbolError, operation_type: str, execution_context: str
+) -> Exception:
+    return UndeclaredSymbolError(
+        public_message=f"Attempted to execute evaluation of type: {operation_type} in context {execution_context}, "
+        f"but encountered error: {error.public_message}",
+        context=f"step_execution | roboflow_query_language_evaluation | {execution_context}",
+    )
+
+
+def _wrap_evaluation_error(
+    error: Exception, operation_type: str, execution_context: str
+) -> Exception:
+    return EvaluationEngineError(
+        public_message=f"Attempted to execute evaluation of type: {operation_type} in context {execution_context}, "
+        f"but encountered error: {error}",
+        context=f"step_execution | roboflow_query_language_evaluation | {execution_context}",
+        inner_error=error,
+    )
@@ -130,7 +130,7 @@ def create_static_operand_builder(
     execution_context: str,
 ) -> Callable[[Dict[str, T]], V]:
     # local import to avoid circular dependency of modules with operations and evaluation
-    from inference.core.workflows.core_steps.common.query_language.operations.core import (
+    from care.workflows.care_steps.common.query_language.operations.core import (
         build_operations_chain,
     )
 
@@ -158,7 +158,7 @@ def create_dynamic_operand_builder(
     execution_context: str,
 ) -> Callable[[Dict[str, T]], V]:
     # local import to avoid circular dependency of modules with operations and evaluation
-    from inference.core.workflows.core_steps.common.query_language.operations.core import (
+    from care.workflows.care_steps.common.query_language.operations.core import (
         build_operations_chain,
     )
 
@@ -0,0 +1,444 @@
+"""Columnar compilation of detections filters.
+
+`filter_detections(...)` evaluates filter expression separately for each detection, which
+is slow for crowded frames. For filters referencing only simple detection properties,
+compared against values that do not depend on the detection, the expression can be
+computed as single boolean mask over `sv.Detections` arrays. `build_detections_mask_function(...)`
+returns such a function (or None if the definition cannot be compiled this way). At runtime,
+whenever operands turn out not to fit columnar evaluation, mask function returns None and the
+caller is expected to fall back into per-detection evaluation - which is also responsible for
+reporting errors in the same way as before.
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import shapely
+import supervision as sv
+from inference.core.workflows.core_steps.common.query_language.entities.enums import (
+    DetectionsProperty,
+    StatementsGroupsOperator,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    DEFAULT_OPERAND_NAME,
+    BinaryStatement,
+    DynamicOperand,
+    ExtractDetectionProperty,
+    StatementGroup,
+    StaticOperand,
+    UnaryStatement,
+)
+
+from care.workflows.care_steps.common.query_language.evaluation_engine.core import (
+    create_operand_builder,
+)
+
+MaskFunction = Callable[[sv.Detections, Dict[str, Any]], np.ndarray]
+ColumnExtractor = Callable[[sv.Detections], Optional[np.ndarray]]
+OperandFunction = Callable[[sv.Detections, Dict[str, Any]], Any]
+
+# operations which result may differ for each evaluation, making operand not constant
+NON_DETERMINISTIC_OPERATIONS = {"RandomNumber"}
+
+
+class ColumnarEvaluationNotPossibleError(Exception):
+    pass
+
+
+def _as_float64(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    # per-detection path compares Python floats (`.item()`), comparing float32 arrays directly
+    # against Python scalars would be done in float32 and yield different results on boundaries
+    if values is None:
+        return None
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.floating):
+        return values.astype(np.float64)
+    return values
+
+
+def _extract_class_names(detections: sv.Detections) -> Optional[np.ndarray]:
+    class_names = detections.data.get("class_name")
+    if class_names is None:
+        return None
+    class_names = np.asarray(class_names)
+    if class_names.shape != (len(detections),):
+        return None
+    return class_names
+
+
+def _extract_box_area(detections: sv.Detections) -> np.ndarray:
+    xyxy = detections.xyxy
+    return _as_float64((xyxy[:, 3] - xyxy[:, 1]) * (xyxy[:, 2] - xyxy[:, 0]))
+
+
+def _extract_center(detections: sv.Detections) -> Tuple[np.ndarray, np.ndarray]:
+    xyxy = detections.xyxy
+    return (
+        xyxy[:, 0] + (xyxy[:, 2] - xyxy[:, 0]) / 2,
+        xyxy[:, 1] + (xyxy[:, 3] - xyxy[:, 1]) / 2,
+    )
+
+
+COLUMNS_EXTRACTORS: Dict[DetectionsProperty, ColumnExtractor] = {
+    DetectionsProperty.CONFIDENCE: lambda d: _as_float64(d.confidence),
+    DetectionsProperty.CLASS_ID: lambda d: d.class_id,
+    DetectionsProperty.CLASS_NAME: _extract_class_names,
+    DetectionsProperty.X_MIN: lambda d: _as_float64(d.xyxy[:, 0]),
+    DetectionsProperty.Y_MIN: lambda d: _as_float64(d.xyxy[:, 1]),
+    DetectionsProperty.X_MAX: lambda d: _as_float64(d.xyxy[:, 2]),
+    DetectionsProperty.Y_MAX: lambda d: _as_float64(d.xyxy[:, 3]),
+    DetectionsProperty.SIZE: _extract_box_area,
+}
+
+POINTS_EXTRACTORS: Dict[
+    DetectionsProperty, Callable[[sv.Detections], Tuple[np.ndarray, np.ndarray]]
+] = {
+    DetectionsProperty.CENTER: _extract_center,
+    DetectionsProperty.TOP_LEFT: lambda d: (d.xyxy[:, 0], d.xyxy[:, 1]),
+    DetectionsProperty.TOP_RIGHT: lambda d: (d.xyxy[:, 2], d.xyxy[:, 1]),
+    DetectionsProperty.BOTTOM_LEFT: lambda d: (d.xyxy[:, 0], d.xyxy[:, 3]),
+    DetectionsProperty.BOTTOM_RIGHT: lambda d: (d.xyxy[:, 2], d.xyxy[:, 3]),
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(
+        value, (bool, np.bool_)
+    )
+
+
+def _is_numeric_column(column: np.ndarray) -> bool:
+    return np.issubdtype(column.dtype, np.number) and not np.issubdtype(
+        column.dtype, np.bool_
+    )
+
+
+def _is_string_column(column: np.ndarray) -> bool:
+    if np.issubdtype(column.dtype, np.str_):
+        return True
+    return column.dtype == object and all(isinstance(e, str) for e in column)
+
+
+def _ensure_comparable(column: np.ndarray, value: Any) -> None:
+    if isinstance(value, np.ndarray):
+        # other column - both must be of the same kind
+        if _is_numeric_column(column) and _is_numeric_column(value):
+            return None
+        if _is_string_column(column) and _is_string_column(value):
+            return None
+        raise ColumnarEvaluationNotPossibleError()
+    if _is_numeric_column(column) and _is_number(value):
+        return None
+    if _is_string_column(column) and isinstance(value, str):
+        return None
+    raise ColumnarEvaluationNotPossibleError()
+
+
+def _ordering(operator: Callable[[Any, Any], np.ndarray]) -> Callable:
+    def compare(a: Any, b: Any) -> np.ndarray:
+        for operand in (a, b):
+            if isinstance(operand, np.ndarray):
+                if not _is_numeric_column(operand):
+                    raise ColumnarEvaluationNotPossibleError()
+            elif not _is_number(operand):
+                raise ColumnarEvaluationNotPossibleError()
+        return operator(a, b)
+
+    return compare
+
+
+def _string_operation(
+    operator: Callable[[np.ndarray, str], np.ndarray]
+) -> Callable[[Any, Any], np.ndarray]:
+    def apply(a: Any, b: Any) -> np.ndarray:
+        if (
+            not isinstance(a, np.ndarray)
+            or not _is_string_column(a)
+            or not isinstance(b, str)
+        ):
+            raise ColumnarEvaluationNotPossibleError()
+        return operator(a.astype(str), b)
+
+    return apply
+
+
+def _is_in_sequence(a: Any, b: Any) -> np.ndarray:
+    if not isinstance(a, np.ndarray) or not isinstance(b, (list, tuple, set)):
+        raise ColumnarEvaluationNotPossibleError()
+    elements = list(b)
+    if _is_numeric_column(a) and all(_is_number(e) for e in elements):
+        return np.isin(a, np.array(elements, dtype=np.float64))
+    if _is_string_column(a) and all(isinstance(e, str) for e in elements):
+        return np.isin(a.astype(str), np.array(elements, dtype=str))
+    raise ColumnarEvaluationNotPossibleError()
+
+
+def _equality(operator: Callable[[Any, Any], np.ndarray]) -> Callable:
+    def compare(a: Any, b: Any) -> np.ndarray:
+        if isinstance(a, np.ndarray):
+            _ensure_comparable(column=a, value=b)
+        elif isinstance(b, np.ndarray):
+            _ensure_comparable(column=b, value=a)
+        else:
+            raise ColumnarEvaluationNotPossibleError()
+        return operator(a, b)
+
+    return compare
+
+
+COLUMNAR_BINARY_OPERATORS: Dict[str, Callable[[Any, Any], np.ndarray]] = {
+    # operators (not ufuncs) are used, as they handle string and object arrays in all numpy versions
+    "==": _equality(lambda a, b: a == b),
+    "(Number) ==": _equality(lambda a, b: a == b),
+    "!=": _equality(lambda a, b: a != b),
+    "(Number) !=": _equality(lambda a, b: a != b),
+    "(Number) >": _ordering(lambda a, b: a > b),
+    "(Number) >=": _ordering(lambda a, b: a >= b),
+    "(Number) <": _ordering(lambda a, b: a < b),
+    "(Number) <=": _ordering(lambda a, b: a <= b),
+    "(String) startsWith": _string_operation(np.char.startswith),
+    "(String) endsWith": _string_operation(np.char.endswith),
+    "(String) contains": _string_operation(lambda a, b: np.char.find(a, b) >= 0),
+    "in (Sequence)": _is_in_sequence,
+}
+
+COLUMNAR_COMBINERS = {
+    StatementsGroupsOperator.AND: np.logical_and,
+    StatementsGroupsOperator.OR: np.logical_or,
+}
+
+
+def build_detections_mask_function(
+    definition: Union[BinaryStatement, UnaryStatement, StatementGroup],
+    execution_context: str = "<root>",
+) -> Optional[MaskFunction]:
+    """Compiles filter definition into function computing boolean mask over detections.
+
+    Returns:
+        Optional[MaskFunction]: Function accepting detections and global parameters, returning
+            mask (or raising `ColumnarEvaluationNotPossibleError`), None if definition uses
+            properties or operators without columnar equivalent.
+    """
+    try:
+        return _build_mask_function(
+            definition=definition, execution_context=execution_context
+        )
+    except ColumnarEvaluationNotPossibleError:
+        return None
+
+
+def evaluate_detections_mask(
+    mask_function: MaskFunction,
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+) -> Optional[np.ndarray]:
+    """Computes filter mask, returning None if columnar evaluation is not possible for given input."""
+    try:
+        mask = mask_function(detections, global_parameters)
+    except Exception:
+        # any problem is handled by per-detection evaluation, which reports errors properly
+        return None
+    if not isinstance(mask, np.ndarray) or mask.shape != (len(detections),):
+        return None
+    return mask.astype(bool)
+
+
+def _build_mask_function(
+    definition: Union[BinaryStatement, UnaryStatement, StatementGroup],
+    execution_context: str,
+) -> MaskFunction:
+    if isinstance(definition, BinaryStatement):
+        return _build_binary_mask_function(
+            definition=definition, execution_context=execution_context
+        )
+    if isinstance(definition, StatementGroup):
+        if not definition.statements or definition.operator not in COLUMNAR_COMBINERS:
+            raise ColumnarEvaluationNotPossibleError()
+        statements_functions = [
+            _build_mask_function(
+                definition=statement,
+                execution_context=f"{execution_context}.statements[{statement_id}]",
+            )
+            for statement_id, statement in enumerate(definition.statements)
+        ]
+        return partial(
+            _compound_mask,
+            statements_functions=statements_functions,
+            combiner=COLUMNAR_COMBINERS[definition.operator],
+        )
+    raise ColumnarEvaluationNotPossibleError()
+
+
+def _compound_mask(
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+    statements_functions: List[MaskFunction],
+    combiner: Callable[[np.ndarray, np.ndarray], np.ndarray],
+) -> np.ndarray:
+    result = statements_functions[0](detections, global_parameters)
+    for fun in statements_functions[1:]:
+        result = combiner(result, fun(detections, global_parameters))
+    return result
+
+
+def _build_binary_mask_function(
+    definition: BinaryStatement,
+    execution_context: str,
+) -> MaskFunction:
+    comparator_type = definition.comparator.type
+    if comparator_type == "(Detection) in zone":
+        return _build_zone_mask_function(
+            definition=definition, execution_context=execution_context
+        )
+    if comparator_type not in COLUMNAR_BINARY_OPERATORS:
+        raise ColumnarEvaluationNotPossibleError()
+    left_operand = _build_operand_function(
+        definition=definition.left_operand,
+        columns_extractors=COLUMNS_EXTRACTORS,
+        execution_context=execution_context,
+    )
+    right_operand = _build_operand_function(
+        definition=definition.right_operand,
+        columns_extractors=COLUMNS_EXTRACTORS,
+        execution_context=execution_context,
+    )
+    if not (
+        _references_detection(definition.left_operand)
+        or _references_detection(definition.right_operand)
+    ):
+        # statement does not depend on detection - nothing to vectorise
+        raise ColumnarEvaluationNotPossibleError()
+    return partial(
+        _binary_mask,
+        left_operand=left_operand,
+        operator=COLUMNAR_BINARY_OPERATORS[comparator_type],
+        right_operand=right_operand,
+        negate=definition.negate,
+    )
+
+
+def _binary_mask(
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+    left_operand: OperandFunction,
+    operator: Callable[[Any, Any], np.ndarray],
+    right_operand: OperandFunction,
+    negate: bool,
+) -> np.ndarray:
+    result = operator(
+        left_operand(detections, global_parameters),
+        right_operand(detections, global_parameters),
+    )
+    if negate:
+        result = np.logical_not(result)
+    return result
+
+
+def _build_zone_mask_function(
+    definition: BinaryStatement,
+    execution_context: str,
+) -> MaskFunction:
+    if not hasattr(shapely, "contains_xy") or not _references_detection(
+        definition.left_operand
+    ):
+        raise ColumnarEvaluationNotPossibleError()
+    points = _build_operand_function(
+        definition=definition.left_operand,
+        columns_extractors=POINTS_EXTRACTORS,
+        execution_context=execution_context,
+    )
+    if _references_detection(definition.right_operand):
+        raise ColumnarEvaluationNotPossibleError()
+    zone = _build_operand_function(
+        definition=definition.right_operand,
+        columns_extractors={},
+        execution_context=execution_context,
+    )
+    return partial(_zone_mask, points=points, zone=zone, negate=definition.negate)
+
+
+def _zone_mask(
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+    points: OperandFunction,
+    zone: OperandFunction,
+    negate: bool,
+) -> np.ndarray:
+    xs, ys = points(detections, global_parameters)
+    zone_points = zone(detections, global_parameters)
+    polygon = shapely.geometry.Polygon(
+        [(zone_point[0], zone_point[1]) for zone_point in zone_points]
+    )
+    result = shapely.contains_xy(polygon, xs, ys)
+    if negate:
+        result = np.logical_not(result)
+    return result
+
+
+def _references_detection(definition: Union[StaticOperand, DynamicOperand]) -> bool:
+    return (
+        isinstance(definition, DynamicOperand)
+        and definition.operand_name == DEFAULT_OPERAND_NAME
+    )
+
+
+def _build_operand_function(
+    definition: Union[StaticOperand, DynamicOperand],
+    columns_extractors: Dict[DetectionsProperty, Callable[[sv.Detections], Any]],
+    execution_context: str,
+) -> OperandFunction:
+    if _references_detection(definition):
+        if (
+            len(definition.operations) != 1
+            or not isinstance(definition.operations[0], ExtractDetectionProperty)
+            or definition.operations[0].property_name not in columns_extractors
+        ):
+            raise ColumnarEvaluationNotPossibleError()
+        return partial(
+            _column_operand,
+            extractor=columns_extractors[definition.operations[0].property_name],
+        )
+    if _uses_non_deterministic_operations(definition):
+        raise ColumnarEvaluationNotPossibleError()
+    operand_builder = create_operand_builder(
+        definition=definition, execution_context=execution_context
+    )
+    return partial(_constant_operand, operand_builder=operand_builder)
+
+
+def _column_operand(
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+    extractor: Callable[[sv.Detections], Any],
+) -> Any:
+    column = extractor(detections)
+    if column is None:
+        raise ColumnarEvaluationNotPossibleError()
+    return column
+
+
+def _constant_operand(
+    detections: sv.Detections,
+    global_parameters: Dict[str, Any],
+    operand_builder: Callable[[Dict[str, Any]], Any],
+) -> Any:
+    return operand_builder(global_parameters)
+
+
+def _uses_non_deterministic_operations(
+    definition: Union[StaticOperand, DynamicOperand]
+) -> bool:
+    return _contains_operation_type(
+        value=definition.model_dump(), types=NON_DETERMINISTIC_OPERATIONS
+    )
+
+
+def _contains_operation_type(value: Any, types: set) -> bool:
+    if isinstance(value, dict):
+        if value.get("type") in types:
+            return True
+        return any(_contains_operation_type(v, types) for v in value.values())
+    if isinstance(value, list):
+        return any(_contains_operation_type(v, types) for v in value)
+    return False
@@ -1,6 +1,17 @@
 from functools import partial
 from typing import Any, Callable, Dict, List, Optional
 
+from care.workflows.care_steps.common.query_language.evaluation_engine.vectorized import (
+    build_detections_mask_function,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.base import (
+    filter_detections,
+    offset_detections,
+    pick_detections_by_parent_class,
+    rename_detections,
+    select_detections,
+    shift_detections,
+)
 from inference.core.workflows.core_steps.common.query_language.entities.operations import (
     TYPE_PARAMETER_NAME,
     DetectionsFilter,
@@ -27,12 +38,6 @@ from inference.core.workflows.core_steps.common.query_language.operations.detect
 from inference.core.workflows.core_steps.common.query_language.operations.detections.base import (
     detections_to_dictionary,
     extract_detections_property,
-    filter_detections,
-    offset_detections,
-    pick_detections_by_parent_class,
-    rename_detections,
-    select_detections,
-    shift_detections,
     sort_detections,
 )
 from inference.core.workflows.core_steps.common.query_language.operations.dictionaries.base import (
@@ -165,15 +170,19 @@ def build_detections_filter_operation(
     execution_context: str,
 ) -> Callable[[T], V]:
     # local import to avoid circular dependency of modules with operations and evaluation
-    from inference.core.workflows.core_steps.common.query_language.evaluation_engine.core import (
-        build_eval_function,
+    from care.workflows.care_steps.common.query_language.evaluation_engine.compiler import (
+        compile_statement,
     )
 
-    filtering_fun = build_eval_function(
+    filtering_fun = compile_statement(
+        definition=definition.filter_operation,
+        execution_context=execution_context,
+    )
+    mask_fun = build_detections_mask_function(
         definition=definition.filter_operation,
         execution_context=execution_context,
     )
-    return partial(filter_detections, filtering_fun=filtering_fun)
+    return partial(filter_detections, filtering_fun=filtering_fun, mask_fun=mask_fun)
 
 
 REGISTERED_SIMPLE_OPERATIONS = {
@@ -1,10 +1,21 @@
-from copy import copy, deepcopy
-from typing import Any, Callable, Dict, List, Union
+from copy import copy
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import numpy as np
 import supervision as sv
 from supervision import Position
 
+from care.workflows.care_steps.common.query_language.evaluation_engine.vectorized import (
+    MaskFunction,
+    evaluate_detections_mask,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.containment import (
+    NO_PARENT,
+    assign_detections_to_parents,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.copy_on_write import (
+    copy_detections_on_write,
+)
 from inference.core.workflows.core_steps.common.query_language.entities.enums import (
     DetectionsProperty,
     DetectionsSelectionMode,
@@ -83,6 +94,7 @@ def filter_detections(
     detections: Any,
     filtering_fun: Callable[[Dict[str, Any]], bool],
     global_parameters: Dict[str, Any],
+    mask_fun: Optional[MaskFunction] = None,
 ) -> sv.Detections:
     if not isinstance(detections, sv.Detections):
         value_as_str = safe_stringify(value=detections)
@@ -91,6 +103,14 @@ def filter_detections(
             f"got {value_as_str} of type {type(detections)}",
             context="step_execution | roboflow_query_language_evaluation",
         )
+    if mask_fun is not None and len(detections) > 0:
+        mask = evaluate_detections_mask(
+            mask_function=mask_fun,
+            detections=detections,
+            global_parameters=global_parameters,
+        )
+        if mask is not None:
+            return detections[mask]
     local_parameters = copy(global_parameters)
     result = []
     for detection in detections:
@@ -110,9 +130,9 @@ def offset_detections(
             f"got {value_as_str} of type {type(value)}",
             context="step_execution | roboflow_query_language_evaluation",
         )
-    detections_copy = deepcopy(value)
-    detections_copy.xyxy += [-offset_x / 2, -offset_y / 2, offset_x / 2, offset_y / 2]
-    return detections_copy
+    xyxy = value.xyxy.copy()
+    xyxy += [-offset_x / 2, -offset_y / 2, offset_x / 2, offset_y / 2]
+    return copy_detections_on_write(value, xyxy=xyxy)
 
 
 def shift_detections(value: Any, shift_x: int, shift_y: int, **kwargs) -> sv.Detections:
@@ -123,14 +143,14 @@ def shift_detections(value: Any, shift_x: int, shift_y: int, **kwargs) -> sv.Det
             f"got {value_as_str} of type {type(value)}",
             context="step_execution | roboflow_query_language_evaluation",
         )
-    detections_copy = deepcopy(value)
-    detections_copy.xyxy += [shift_x, shift_y, shift_x, shift_y]
-    return detections_copy
+    xyxy = value.xyxy.copy()
+    xyxy += [shift_x, shift_y, shift_x, shift_y]
+    return copy_detections_on_write(value, xyxy=xyxy)
 
 
 def select_top_confidence_detection(detections: sv.Detections) -> sv.Detections:
     if len(detections) == 0:
-        return deepcopy(detections)
+        return copy_detections_on_write(detections)
     confidence = detections.confidence
     max_value = confidence.max()
     index = np.argwhere(confidence == max_value)[0].item()
@@ -157,13 +177,13 @@ def select_rightmost_detection(detections: sv.Detections) -> sv.Detections:
 
 def select_first_detection(detections: sv.Detections) -> sv.Detections:
     if len(detections) == 0:
-        return deepcopy(detections)
+        return copy_detections_on_write(detections)
     return detections[0]
 
 
 def select_last_detection(detections: sv.Detections) -> sv.Detections:
     if len(detections) == 0:
-        return deepcopy(detections)
+        return copy_detections_on_write(detections)
     return detections[-1]
 
 
@@ -289,9 +309,8 @@ def rename_detections(
             f"got {value_as_str} of type {type(strict)}",
             context="step_execution | roboflow_query_language_evaluation",
         )
-    detections_copy = deepcopy(detections)
-    original_class_names = detections_copy.data.get("class_name", []).tolist()
-    original_class_ids = detections_copy.class_id.tolist()
+    original_class_names = detections.data.get("class_name", []).tolist()
+    original_class_ids = detections.class_id.tolist()
     new_class_names = []
     new_class_ids = []
     if strict:
@@ -315,9 +334,11 @@ def rename_detections(
         new_class_id = new_class_mapping[new_class_name]
         new_class_names.append(new_class_name)
         new_class_ids.append(new_class_id)
-    detections_copy.data["class_name"] = np.array(new_class_names, dtype=object)
-    detections_copy.class_id = np.array(new_class_ids, dtype=int)
-    return detections_copy
+    return copy_detections_on_write(
+        detections,
+        data={"class_name": np.array(new_class_names, dtype=object)},
+        class_id=np.array(new_class_ids, dtype=int),
+    )
 
 
 def _ensure_all_classes_covered_in_new_mapping(
@@ -410,28 +431,12 @@ def _pick_detections_by_parent_class(
     class_names = detections.data.get("class_name")
     if class_names is None or len(class_names) == 0:
         return sv.Detections.empty()
-    if not isinstance(class_names, np.ndarray):
-        class_names = np.array(class_names)
-    parent_mask = class_names == parent_class
-    parent_detections = detections[parent_mask]
-    if len(parent_detections) == 0:
+    parent_mask, parent_indices = assign_detections_to_parents(
+        detections=detections, parent_class=parent_class
+    )
+    if not parent_mask.any():
         return sv.Detections.empty()
+    parent_detections = detections[parent_mask]
     dependent_detections = detections[~parent_mask]
-    dependent_detections_anchors = dependent_detections.get_anchors_coordinates(
-        anchor=Position.CENTER
-    )
-    dependent_detections_to_keep = set()
-    for detection_idx, anchor in enumerate(dependent_detections_anchors):
-        for parent_detection_box in parent_detections.xyxy:
-            if _is_point_within_box(point=anchor, box=parent_detection_box):
-                dependent_detections_to_keep.add(detection_idx)
-                continue
-    detections_to_keep_list = sorted(list(dependent_detections_to_keep))
-    filtered_dependent_detections = dependent_detections[detections_to_keep_list]
+    filtered_dependent_detections = dependent_detections[parent_indices != NO_PARENT]
     return sv.Detections.merge([parent_detections, filtered_dependent_detections])
-
-
-def _is_point_within_box(point: np.ndarray, box: np.ndarray) -> bool:
-    px, py = point
-    x1, y1, x2, y2 = box
-    return x1 <= px <= x2 and y1 <= py <= y2
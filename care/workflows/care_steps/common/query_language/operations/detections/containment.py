@@ -0,0 +1,104 @@
+"""Assignment of points (detections anchors) to boxes containing them.
+
+For small inputs all point / box pairs are checked at once with broadcasting. For large
+ones (crowded scenes, where N x M matrix would be big) points are sorted by `x` and each
+box is matched only against the contiguous range of points within its horizontal span.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import supervision as sv
+from supervision import Position
+
+# above this number of point / box pairs, sort & sweep is used instead of broadcasting
+BROADCAST_MAX_PAIRS = 65536
+
+NO_PARENT = -1
+
+
+def assign_points_to_boxes(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Finds box containing each point (boundaries included).
+
+    Args:
+        points (np.ndarray): Array of shape (N, 2) with (x, y) coordinates.
+        boxes (np.ndarray): Array of shape (M, 4) with (x_min, y_min, x_max, y_max).
+
+    Returns:
+        np.ndarray: Array of shape (N, ) with index of the first box (in order of `boxes`)
+            containing the point, or `NO_PARENT` if there is none.
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    if len(points) == 0 or len(boxes) == 0:
+        return np.full(len(points), NO_PARENT, dtype=int)
+    if len(points) * len(boxes) <= BROADCAST_MAX_PAIRS:
+        return _assign_by_broadcasting(points=points, boxes=boxes)
+    return _assign_by_sweep(points=points, boxes=boxes)
+
+
+def assign_detections_to_parents(
+    detections: sv.Detections,
+    parent_class: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Associates detections with parent class detections containing their centers.
+
+    Args:
+        detections (sv.Detections): Detections with `class_name` in `data`.
+        parent_class (str): Name of parents class.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Boolean mask of parent detections and, for each
+            other detection (in order), index of its parent within `detections[parent_mask]`
+            or `NO_PARENT`.
+    """
+    class_names = detections.data.get("class_name")
+    if class_names is None:
+        class_names = []
+    parent_mask = np.asarray(class_names) == parent_class
+    if parent_mask.shape != (len(detections),):
+        parent_mask = np.zeros(len(detections), dtype=bool)
+    dependent_centers = detections[~parent_mask].get_anchors_coordinates(
+        anchor=Position.CENTER
+    )
+    parent_indices = assign_points_to_boxes(
+        points=dependent_centers, boxes=detections.xyxy[parent_mask]
+    )
+    return parent_mask, parent_indices
+
+
+def _assign_by_broadcasting(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    x, y = points[:, 0, None], points[:, 1, None]
+    contained = (
+        (boxes[None, :, 0] <= x)
+        & (x <= boxes[None, :, 2])
+        & (boxes[None, :, 1] <= y)
+        & (y <= boxes[None, :, 3])
+    )
+    has_parent = contained.any(axis=1)
+    return np.where(has_parent, contained.argmax(axis=1), NO_PARENT)
+
+
+def _assign_by_sweep(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    order = np.argsort(points[:, 0], kind="stable")
+    sorted_x = points[order, 0]
+    sorted_y = points[order, 1]
+    range_starts = np.searchsorted(sorted_x, boxes[:, 0], side="left")
+    range_ends = np.searchsorted(sorted_x, boxes[:, 2], side="right")
+    assigned = np.full(len(points), NO_PARENT, dtype=int)
+    # boxes visited in original order and only unassigned points are taken - the first
+    # containing box wins, as in broadcasting variant
+    for box_index, (start, end) in enumerate(zip(range_starts, range_ends)):
+        if start >= end:
+            continue
+        candidates_y = sorted_y[start:end]
+        candidates_assignment = assigned[start:end]
+        matched = (
+            (boxes[box_index, 1] <= candidates_y)
+            & (candidates_y <= boxes[box_index, 3])
+            & (candidates_assignment == NO_PARENT)
+        )
+        candidates_assignment[matched] = box_index
+    result = np.empty_like(assigned)
+    result[order] = assigned
+    return result
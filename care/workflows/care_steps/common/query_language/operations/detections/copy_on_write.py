@@ -0,0 +1,63 @@
+"""Copy-on-write transformations of `sv.Detections`.
+
+Operations of query language must not modify their input - it is the output of upstream
+step, which may be consumed by other steps as well. Deep copy of the whole object satisfies
+that, but duplicates masks (N x H x W) and all `data` arrays even when only `xyxy` or
+`class_name` changes. Instead, new object is created with the modified fields only, while
+untouched arrays are shared as read-only views - so that accidental in-place modification
+downstream fails loudly instead of corrupting outputs of other steps.
+"""
+
+import dataclasses
+from typing import Any, Dict, Optional
+
+import numpy as np
+import supervision as sv
+
+DATA_FIELD = "data"
+METADATA_FIELD = "metadata"
+
+
+def read_only_view(value: Any) -> Any:
+    """Returns read-only view of numpy array (any other value is returned as is).
+
+    Only the view is flagged - the original array stays writeable for its owner.
+    """
+    if not isinstance(value, np.ndarray) or not value.flags.writeable:
+        return value
+    view = value.view()
+    view.flags.writeable = False
+    return view
+
+
+def copy_detections_on_write(
+    detections: sv.Detections,
+    data: Optional[Dict[str, Any]] = None,
+    **fields: Any,
+) -> sv.Detections:
+    """Creates new `sv.Detections` with given fields replaced, sharing the rest read-only.
+
+    Args:
+        detections (sv.Detections): Source detections, never modified.
+        data (Optional[Dict[str, Any]]): Entries of `data` to be added or replaced, other
+            entries are shared.
+        **fields: Replaced fields of `sv.Detections` (like `xyxy` or `class_id`).
+
+    Returns:
+        sv.Detections: New detections object.
+    """
+    new_fields = {}
+    for field in dataclasses.fields(detections):
+        if field.name in fields:
+            new_fields[field.name] = fields[field.name]
+        elif field.name == DATA_FIELD:
+            new_fields[field.name] = {
+                key: read_only_view(value) for key, value in detections.data.items()
+            }
+        elif field.name == METADATA_FIELD:
+            new_fields[field.name] = dict(detections.metadata)
+        else:
+            new_fields[field.name] = read_only_view(getattr(detections, field.name))
+    if data:
+        new_fields[DATA_FIELD].update(data)
+    return sv.Detections(**new_fields)
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -5,6 +6,11 @@ import cv2
 import numpy as np
 import supervision as sv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from inference.core import logger
 from inference.core.workflows.execution_engine.constants import (
     BOUNDING_RECT_ANGLE_KEY_IN_INFERENCE_RESPONSE,
@@ -55,9 +61,198 @@ from inference.core.workflows.execution_engine.entities.base import (
 
 MIN_SECRET_LENGTH_TO_REVEAL_PREFIX = 8
 MIN_POLYGON_POINT_COUNT = 3
+# data keys serialised by columnar path directly, all the others are handled per detection
+COLUMNAR_DATA_KEYS = {"class_name", DETECTION_ID_KEY, IMAGE_DIMENSIONS_KEY}
 
 
 def serialise_sv_detections(detections: sv.Detections) -> dict:
+    if not _is_columnar_serialisation_possible(detections=detections):
+        return _serialise_sv_detections_per_detection(detections=detections)
+    columns = _extract_detections_columns(detections=detections)
+    polygons = _extract_polygons(detections=detections)
+    optional_data_columns = {
+        key: value
+        for key, value in detections.data.items()
+        if key not in COLUMNAR_DATA_KEYS
+    }
+    serialized_detections = []
+    for i in range(len(detections)):
+        detection_dict = {
+            WIDTH_KEY: columns[WIDTH_KEY][i],
+            HEIGHT_KEY: columns[HEIGHT_KEY][i],
+            X_KEY: columns[X_KEY][i],
+            Y_KEY: columns[Y_KEY][i],
+            CONFIDENCE_KEY: columns[CONFIDENCE_KEY][i],
+            CLASS_ID_KEY: columns[CLASS_ID_KEY][i],
+        }
+        if polygons is not None:
+            if polygons[i] is None:
+                # ignoring the whole instance
+                continue
+            detection_dict[POLYGON_KEY] = _serialise_polygon_points(polygons[i])
+        if TRACKER_ID_KEY in columns:
+            detection_dict[TRACKER_ID_KEY] = columns[TRACKER_ID_KEY][i]
+        detection_dict[CLASS_NAME_KEY] = columns[CLASS_NAME_KEY][i]
+        detection_dict[DETECTION_ID_KEY] = columns[DETECTION_ID_KEY][i]
+        if optional_data_columns:
+            _add_optional_data_fields(
+                detection_dict=detection_dict,
+                data={key: value[i] for key, value in optional_data_columns.items()},
+            )
+        serialized_detections.append(detection_dict)
+    return {
+        "image": _get_image_metadata(detections=detections),
+        "predictions": serialized_detections,
+    }
+
+
+def serialise_sv_detections_columnar(detections: sv.Detections) -> dict:
+    """Serialises detections into compact, columnar format.
+
+    Instead of list of dictionaries (one per detection), `predictions` holds dictionary of
+    equal-length lists (one per field) - which is much smaller once encoded as JSON and cheap
+    to load into data frames by consumers. Instances rejected by `serialise_sv_detections(...)`
+    (masks without polygon) are rejected here as well. Fields absent for some detections are
+    filled with None.
+    """
+    if not _is_columnar_serialisation_possible(detections=detections):
+        serialised = _serialise_sv_detections_per_detection(detections=detections)
+        return {
+            "image": serialised["image"],
+            "predictions": _transpose_predictions(serialised["predictions"]),
+        }
+    columns = _extract_detections_columns(detections=detections)
+    polygons = _extract_polygons(detections=detections)
+    if polygons is not None:
+        to_keep = [i for i, polygon in enumerate(polygons) if polygon is not None]
+        columns = {key: [value[i] for i in to_keep] for key, value in columns.items()}
+        columns[POLYGON_KEY] = [
+            np.asarray(polygons[i]).astype(float).tolist() for i in to_keep
+        ]
+    else:
+        to_keep = list(range(len(detections)))
+    optional_data_columns = {
+        key: value
+        for key, value in detections.data.items()
+        if key not in COLUMNAR_DATA_KEYS
+    }
+    if optional_data_columns:
+        optional_fields = []
+        for i in to_keep:
+            detection_dict = {}
+            _add_optional_data_fields(
+                detection_dict=detection_dict,
+                data={key: value[i] for key, value in optional_data_columns.items()},
+            )
+            optional_fields.append(detection_dict)
+        columns.update(_transpose_predictions(optional_fields))
+    return {
+        "image": _get_image_metadata(detections=detections),
+        "predictions": columns,
+    }
+
+
+def _is_columnar_serialisation_possible(detections: sv.Detections) -> bool:
+    # anything unusual is left for per-detection path - which defines the output (and errors)
+    if len(detections) == 0:
+        return False
+    if detections.confidence is None or detections.class_id is None:
+        return False
+    if detections.tracker_id is not None and detections.tracker_id.dtype == object:
+        return False
+    if "class_name" not in detections.data or DETECTION_ID_KEY not in detections.data:
+        return False
+    return all(
+        isinstance(value, np.ndarray) and len(value) == len(detections)
+        for value in detections.data.values()
+    )
+
+
+def _extract_detections_columns(detections: sv.Detections) -> Dict[str, list]:
+    xyxy = detections.xyxy.astype(float)
+    width = np.abs(xyxy[:, 2] - xyxy[:, 0])
+    height = np.abs(xyxy[:, 3] - xyxy[:, 1])
+    columns = {
+        WIDTH_KEY: width.tolist(),
+        HEIGHT_KEY: height.tolist(),
+        X_KEY: (xyxy[:, 0] + width / 2).tolist(),
+        Y_KEY: (xyxy[:, 1] + height / 2).tolist(),
+        CONFIDENCE_KEY: detections.confidence.astype(float).tolist(),
+        CLASS_ID_KEY: detections.class_id.astype(int).tolist(),
+    }
+    if detections.tracker_id is not None:
+        columns[TRACKER_ID_KEY] = detections.tracker_id.astype(int).tolist()
+    columns[CLASS_NAME_KEY] = [str(e) for e in detections.data["class_name"]]
+    columns[DETECTION_ID_KEY] = [str(e) for e in detections.data[DETECTION_ID_KEY]]
+    return columns
+
+
+def _extract_polygons(detections: sv.Detections) -> Optional[List[Optional[np.ndarray]]]:
+    if detections.mask is None:
+        return None
+    cached_polygons = detections.data.get(POLYGON_KEY_IN_SV_DETECTIONS)
+    polygons = []
+    for i, mask in enumerate(detections.mask):
+        if (
+            cached_polygons is not None
+            and cached_polygons[i] is not None
+            and len(cached_polygons[i]) > 2
+        ):
+            polygons.append(cached_polygons[i])
+        else:
+            polygons.append(_mask_to_polygon_within_bounding_rect(mask=mask))
+    return polygons
+
+
+def _mask_to_polygon_within_bounding_rect(mask: np.ndarray) -> Optional[np.ndarray]:
+    # contours are searched only within (1px padded) bounding rect of the mask, instead of
+    # the whole frame - the result is the same, as there is nothing but background outside
+    if mask.dtype != bool:
+        mask = mask.astype(np.uint8)
+    occupied_rows = np.flatnonzero(mask.any(axis=1))
+    if len(occupied_rows) == 0:
+        return None
+    occupied_columns = np.flatnonzero(mask.any(axis=0))
+    top = max(occupied_rows[0] - 1, 0)
+    left = max(occupied_columns[0] - 1, 0)
+    bottom = min(occupied_rows[-1] + 2, mask.shape[0])
+    right = min(occupied_columns[-1] + 2, mask.shape[1])
+    polygon = mask_to_polygon(mask=mask[top:bottom, left:right])
+    if polygon is None:
+        return None
+    return polygon + np.array([left, top], dtype=polygon.dtype)
+
+
+def _serialise_polygon_points(polygon: Any) -> List[Dict[str, float]]:
+    return [
+        {X_KEY: x, Y_KEY: y} for x, y in np.asarray(polygon).astype(float).tolist()
+    ]
+
+
+def _get_image_metadata(detections: sv.Detections) -> Dict[str, Any]:
+    image_dimensions = None
+    if IMAGE_DIMENSIONS_KEY in detections.data and len(detections) > 0:
+        # per-detection path reports dimensions of the last detection
+        image_dimensions = detections.data[IMAGE_DIMENSIONS_KEY][-1]
+    if image_dimensions is None:
+        return {
+            "width": None,
+            "height": None,
+        }
+    return {
+        "width": image_dimensions[1].item(),
+        "height": image_dimensions[0].item(),
+    }
+
+
+def _transpose_predictions(predictions: List[dict]) -> Dict[str, list]:
+    keys = []
+    for prediction in predictions:
+        keys.extend(k for k in prediction if k not in keys)
+    return {key: [p.get(key) for p in predictions] for key in keys}
+
+
+def _serialise_sv_detections_per_detection(detections: sv.Detections) -> dict:
     serialized_detections = []
     image_dimensions = None
     for xyxy, mask, confidence, class_id, tracker_id, data in detections:
@@ -97,86 +292,7 @@ def serialise_sv_detections(detections: sv.Detections) -> dict:
             detection_dict[TRACKER_ID_KEY] = int(tracker_id)
         detection_dict[CLASS_NAME_KEY] = str(data["class_name"])
         detection_dict[DETECTION_ID_KEY] = str(data[DETECTION_ID_KEY])
-        if PATH_DEVIATION_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[PATH_DEVIATION_KEY_IN_INFERENCE_RESPONSE] = data[
-                PATH_DEVIATION_KEY_IN_SV_DETECTIONS
-            ]
-        if TIME_IN_ZONE_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[TIME_IN_ZONE_KEY_IN_INFERENCE_RESPONSE] = data[
-                TIME_IN_ZONE_KEY_IN_SV_DETECTIONS
-            ]
-        if POLYGON_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[POLYGON_KEY_IN_INFERENCE_RESPONSE] = (
-                data[POLYGON_KEY_IN_SV_DETECTIONS]
-                .astype(float)
-                .round()
-                .astype(int)
-                .tolist()
-            )
-        if (
-            BOUNDING_RECT_ANGLE_KEY_IN_SV_DETECTIONS in data
-            and BOUNDING_RECT_RECT_KEY_IN_SV_DETECTIONS in data
-            and BOUNDING_RECT_HEIGHT_KEY_IN_SV_DETECTIONS in data
-            and BOUNDING_RECT_WIDTH_KEY_IN_SV_DETECTIONS in data
-        ):
-            detection_dict[BOUNDING_RECT_ANGLE_KEY_IN_INFERENCE_RESPONSE] = data[
-                BOUNDING_RECT_ANGLE_KEY_IN_SV_DETECTIONS
-            ]
-            detection_dict[BOUNDING_RECT_RECT_KEY_IN_INFERENCE_RESPONSE] = data[
-                BOUNDING_RECT_RECT_KEY_IN_SV_DETECTIONS
-            ]
-            detection_dict[BOUNDING_RECT_HEIGHT_KEY_IN_INFERENCE_RESPONSE] = data[
-                BOUNDING_RECT_HEIGHT_KEY_IN_SV_DETECTIONS
-            ]
-            detection_dict[BOUNDING_RECT_WIDTH_KEY_IN_INFERENCE_RESPONSE] = data[
-                BOUNDING_RECT_WIDTH_KEY_IN_SV_DETECTIONS
-            ]
-        if PARENT_ID_KEY in data:
-            detection_dict[PARENT_ID_KEY] = str(data[PARENT_ID_KEY])
-        if (
-            KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_XY_KEY_IN_SV_DETECTIONS in data
-        ):
-            kp_class_id = data[KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS]
-            kp_class_name = data[KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS]
-            kp_confidence = data[KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS]
-            kp_xy = data[KEYPOINTS_XY_KEY_IN_SV_DETECTIONS]
-            detection_dict[KEYPOINTS_KEY_IN_INFERENCE_RESPONSE] = []
-            for (
-                keypoint_class_id,
-                keypoint_class_name,
-                keypoint_confidence,
-                (x, y),
-            ) in zip(kp_class_id, kp_class_name, kp_confidence, kp_xy):
-                detection_dict[KEYPOINTS_KEY_IN_INFERENCE_RESPONSE].append(
-                    {
-                        "class_id": int(keypoint_class_id),
-                        "class": str(keypoint_class_name),
-                        "confidence": float(keypoint_confidence),
-                        "x": float(x),
-                        "y": float(y),
-                    }
-                )
-        if DETECTED_CODE_KEY in data:
-            detection_dict[DETECTED_CODE_KEY] = data[DETECTED_CODE_KEY]
-        if VELOCITY_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[VELOCITY_KEY_IN_INFERENCE_RESPONSE] = data[
-                VELOCITY_KEY_IN_SV_DETECTIONS
-            ].tolist()
-        if SPEED_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[SPEED_KEY_IN_INFERENCE_RESPONSE] = data[
-                SPEED_KEY_IN_SV_DETECTIONS
-            ].astype(float)
-        if SMOOTHED_VELOCITY_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[SMOOTHED_VELOCITY_KEY_IN_INFERENCE_RESPONSE] = data[
-                SMOOTHED_VELOCITY_KEY_IN_SV_DETECTIONS
-            ].tolist()
-        if SMOOTHED_SPEED_KEY_IN_SV_DETECTIONS in data:
-            detection_dict[SMOOTHED_SPEED_KEY_IN_INFERENCE_RESPONSE] = data[
-                SMOOTHED_SPEED_KEY_IN_SV_DETECTIONS
-            ].astype(float)
+        _add_optional_data_fields(detection_dict=detection_dict, data=data)
         serialized_detections.append(detection_dict)
     image_metadata = {
         "width": None,
@@ -192,6 +308,89 @@ def serialise_sv_detections(detections: sv.Detections) -> dict:
     return {"image": image_metadata, "predictions": serialized_detections}
 
 
+def _add_optional_data_fields(detection_dict: dict, data: Dict[str, Any]) -> None:
+    if PATH_DEVIATION_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[PATH_DEVIATION_KEY_IN_INFERENCE_RESPONSE] = data[
+            PATH_DEVIATION_KEY_IN_SV_DETECTIONS
+        ]
+    if TIME_IN_ZONE_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[TIME_IN_ZONE_KEY_IN_INFERENCE_RESPONSE] = data[
+            TIME_IN_ZONE_KEY_IN_SV_DETECTIONS
+        ]
+    if POLYGON_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[POLYGON_KEY_IN_INFERENCE_RESPONSE] = (
+            data[POLYGON_KEY_IN_SV_DETECTIONS]
+            .astype(float)
+            .round()
+            .astype(int)
+            .tolist()
+        )
+    if (
+        BOUNDING_RECT_ANGLE_KEY_IN_SV_DETECTIONS in data
+        and BOUNDING_RECT_RECT_KEY_IN_SV_DETECTIONS in data
+        and BOUNDING_RECT_HEIGHT_KEY_IN_SV_DETECTIONS in data
+        and BOUNDING_RECT_WIDTH_KEY_IN_SV_DETECTIONS in data
+    ):
+        detection_dict[BOUNDING_RECT_ANGLE_KEY_IN_INFERENCE_RESPONSE] = data[
+            BOUNDING_RECT_ANGLE_KEY_IN_SV_DETECTIONS
+        ]
+        detection_dict[BOUNDING_RECT_RECT_KEY_IN_INFERENCE_RESPONSE] = data[
+            BOUNDING_RECT_RECT_KEY_IN_SV_DETECTIONS
+        ]
+        detection_dict[BOUNDING_RECT_HEIGHT_KEY_IN_INFERENCE_RESPONSE] = data[
+            BOUNDING_RECT_HEIGHT_KEY_IN_SV_DETECTIONS
+        ]
+        detection_dict[BOUNDING_RECT_WIDTH_KEY_IN_INFERENCE_RESPONSE] = data[
+            BOUNDING_RECT_WIDTH_KEY_IN_SV_DETECTIONS
+        ]
+    if PARENT_ID_KEY in data:
+        detection_dict[PARENT_ID_KEY] = str(data[PARENT_ID_KEY])
+    if (
+        KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_XY_KEY_IN_SV_DETECTIONS in data
+    ):
+        kp_class_id = data[KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS]
+        kp_class_name = data[KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS]
+        kp_confidence = data[KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS]
+        kp_xy = data[KEYPOINTS_XY_KEY_IN_SV_DETECTIONS]
+        detection_dict[KEYPOINTS_KEY_IN_INFERENCE_RESPONSE] = []
+        for (
+            keypoint_class_id,
+            keypoint_class_name,
+            keypoint_confidence,
+            (x, y),
+        ) in zip(kp_class_id, kp_class_name, kp_confidence, kp_xy):
+            detection_dict[KEYPOINTS_KEY_IN_INFERENCE_RESPONSE].append(
+                {
+                    "class_id": int(keypoint_class_id),
+                    "class": str(keypoint_class_name),
+                    "confidence": float(keypoint_confidence),
+                    "x": float(x),
+                    "y": float(y),
+                }
+            )
+    if DETECTED_CODE_KEY in data:
+        detection_dict[DETECTED_CODE_KEY] = data[DETECTED_CODE_KEY]
+    if VELOCITY_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[VELOCITY_KEY_IN_INFERENCE_RESPONSE] = data[
+            VELOCITY_KEY_IN_SV_DETECTIONS
+        ].tolist()
+    if SPEED_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[SPEED_KEY_IN_INFERENCE_RESPONSE] = data[
+            SPEED_KEY_IN_SV_DETECTIONS
+        ].astype(float)
+    if SMOOTHED_VELOCITY_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[SMOOTHED_VELOCITY_KEY_IN_INFERENCE_RESPONSE] = data[
+            SMOOTHED_VELOCITY_KEY_IN_SV_DETECTIONS
+        ].tolist()
+    if SMOOTHED_SPEED_KEY_IN_SV_DETECTIONS in data:
+        detection_dict[SMOOTHED_SPEED_KEY_IN_INFERENCE_RESPONSE] = data[
+            SMOOTHED_SPEED_KEY_IN_SV_DETECTIONS
+        ].astype(float)
+
+
 def mask_to_polygon(mask: np.ndarray) -> Optional[np.ndarray]:
     # masks here should be predicted by instance segmentation
     # model and in theory can only present SINGLE!!! shape
@@ -276,3 +475,31 @@ def serialize_secret(secret: str) -> str:
 
 def serialize_timestamp(timestamp: datetime) -> str:
     return timestamp.isoformat()
+
+
+def dumps_to_json_bytes(value: Any) -> bytes:
+    """Encodes serialised workflow output directly into compact JSON bytes.
+
+    `orjson` is used when installed (numpy arrays and scalars are encoded natively, without
+    conversion into Python objects), standard `json` module otherwise. Output has no
+    whitespace between tokens, so it is not byte-equal to `json.dumps(...)` with defaults.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=_to_json_compatible,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        value, default=_to_json_compatible, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _to_json_compatible(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, datetime):
+        return serialize_timestamp(timestamp=value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
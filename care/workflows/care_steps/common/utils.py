@@ -2,7 +2,18 @@ import logging
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import supervision as sv
@@ -448,6 +459,24 @@ def post_process_ocr_result(
     return predictions
 
 
+def get_video_sources_keys(
+    batch: Batch,
+    images: Optional[Batch[WorkflowImageData]] = None,
+) -> List[Hashable]:
+    """Identifies video source of each batch element, so that stateful blocks processing
+    whole batch can keep state per source.
+
+    Video identifiers of `images` are used if provided, otherwise batch indices - which are
+    stable only as long as every source delivers frame for each batch.
+    """
+    if images is not None:
+        return [image.video_metadata.video_identifier for image in images]
+    indices = batch.indices
+    if indices is None:
+        return list(range(len(batch)))
+    return indices
+
+
 def run_in_parallel(tasks: List[Callable[[], T]], max_workers: int = 1) -> List[T]:
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         return list(executor.map(_run, tasks))
@@ -124,6 +124,7 @@ class AlarmEngine:
         combine_with: str = "AND",
         cooldown_seconds: float = 5.0,
         message_template: str = "Alarm triggered",
+        current_time: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """
         Evalúa todas las condiciones y actualiza state machine.
@@ -133,11 +134,13 @@ class AlarmEngine:
             combine_with: "AND" o "OR" para combinar múltiples condiciones
             cooldown_seconds: Segundos mínimos entre alarmas
             message_template: Template de mensaje con placeholders
+            current_time: Instante de la evaluación (por defecto, ahora)
 
         Returns:
             Dict con alarm_active, alarm_message, state, alarm_count
         """
-        current_time = datetime.now()
+        if current_time is None:
+            current_time = datetime.now()
 
         # Evaluar todas las condiciones
         condition_results = {
@@ -0,0 +1,226 @@
+"""
+Persistent Modbus TCP client with coalesced register I/O.
+
+Requested addresses are sorted and contiguous ranges are transferred with single
+`read_holding_registers(start, count)` / `write_registers(start, values)` requests, split
+so that protocol limits on the number of registers per request are respected. Writes of
+values equal to the last value successfully written to a register are skipped.
+
+Dropped connections are re-established on later calls, with exponential backoff between
+failed attempts - while backing off, calls fail fast without touching the network.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+from inference.core.logger import logger
+
+# Modbus application protocol specification v1.1b3, sections 6.3 and 6.12
+MAX_REGISTERS_PER_READ = 125
+MAX_REGISTERS_PER_WRITE = 123
+
+READ_FAILURE = "ReadFailure"
+WRITE_FAILURE = "WriteFailure"
+WRITE_SUCCESS = "WriteSuccess"
+
+CONNECTION_ERRORS = (ConnectionException, ModbusIOException, OSError)
+
+
+def coalesce_addresses(
+    addresses: Iterable[int], max_count: int
+) -> List[Tuple[int, int]]:
+    """Groups addresses into contiguous ranges.
+
+    Args:
+        addresses (Iterable[int]): Register addresses, duplicates are allowed.
+        max_count (int): Maximum number of registers in a single range.
+
+    Returns:
+        List[Tuple[int, int]]: Sorted `(start, count)` ranges covering all addresses.
+    """
+    ranges = []
+    for address in sorted(set(addresses)):
+        if ranges:
+            start, count = ranges[-1]
+            if address == start + count and count < max_count:
+                ranges[-1] = (start, count + 1)
+                continue
+        ranges.append((address, 1))
+    return ranges
+
+
+class ModbusRegistersClient:
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        timeout: float = 3.0,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Holding registers client reconnecting on failures.
+
+        Args:
+            host (str): PLC address.
+            port (int): Modbus TCP port.
+            timeout (float): Timeout of a single request in seconds.
+            initial_backoff (float): Delay after first failed connection attempt.
+            max_backoff (float): Upper bound of delay between connection attempts.
+            clock (Callable[[], float]): Source of monotonic time in seconds.
+        """
+        self.host = host
+        self.port = port
+        self._timeout = timeout
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._client: Optional[ModbusTcpClient] = None
+        self._backoff = 0.0
+        self._next_attempt_at = 0.0
+        self._last_written: Dict[int, int] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None and bool(self._client.connected)
+
+    def connect(self) -> bool:
+        """Ensures connection is open, respecting backoff after failed attempts.
+
+        Returns:
+            bool: True if client is connected.
+        """
+        if self.connected:
+            return True
+        now = self._clock()
+        if now < self._next_attempt_at:
+            return False
+        self._drop_connection()
+        client = ModbusTcpClient(self.host, port=self.port, timeout=self._timeout)
+        try:
+            connected = client.connect()
+        except CONNECTION_ERRORS as error:
+            logger.warning("Modbus connection to %s failed: %s", self.host, error)
+            connected = False
+        if not connected:
+            client.close()
+            self._backoff = min(
+                max(self._backoff * 2, self._initial_backoff), self._max_backoff
+            )
+            self._next_attempt_at = now + self._backoff
+            logger.warning(
+                "Could not connect to PLC %s:%s, retrying in %.1fs",
+                self.host,
+                self.port,
+                self._backoff,
+            )
+            return False
+        self._client = client
+        self._backoff = 0.0
+        self._next_attempt_at = 0.0
+        # PLC may have been restarted while we were disconnected
+        self._last_written.clear()
+        return True
+
+    def close(self) -> None:
+        self._drop_connection()
+
+    def read_registers(self, addresses: List[int]) -> Dict[int, Union[int, str]]:
+        """Reads holding registers.
+
+        Args:
+            addresses (List[int]): Addresses to read.
+
+        Returns:
+            Dict[int, Union[int, str]]: Value of each address, or `"ReadFailure"`.
+        """
+        results = {}
+        for start, count in coalesce_addresses(addresses, MAX_REGISTERS_PER_READ):
+            values = self._read_range(start=start, count=count)
+            if values is None and count > 1 and self.connected:
+                # error response for the range, isolate addresses causing it
+                values = [self._read_single(start + i) for i in range(count)]
+            for i in range(count):
+                results[start + i] = values[i] if values is not None else READ_FAILURE
+        return {address: results[address] for address in addresses}
+
+    def write_registers(self, values: Dict[int, int]) -> Dict[int, str]:
+        """Writes holding registers that changed since the last successful write.
+
+        Args:
+            values (Dict[int, int]): Mapping of addresses to values.
+
+        Returns:
+            Dict[int, str]: `"WriteSuccess"` or `"WriteFailure"` for each address.
+        """
+        results = {}
+        changed = {}
+        for address, value in values.items():
+            if self._last_written.get(address) == value:
+                results[address] = WRITE_SUCCESS
+            else:
+                changed[address] = value
+        for start, count in coalesce_addresses(changed, MAX_REGISTERS_PER_WRITE):
+            addresses = range(start, start + count)
+            block = [changed[address] for address in addresses]
+            succeeded = self._write_range(start=start, values=block)
+            if not succeeded and count > 1 and self.connected:
+                succeeded = [
+                    self._write_range(start=address, values=[changed[address]])
+                    for address in addresses
+                ]
+            else:
+                succeeded = [succeeded] * count
+            for address, success in zip(addresses, succeeded):
+                results[address] = WRITE_SUCCESS if success else WRITE_FAILURE
+                if success:
+                    self._last_written[address] = changed[address]
+                else:
+                    self._last_written.pop(address, None)
+        return {address: results[address] for address in values}
+
+    def _read_single(self, address: int) -> Union[int, str]:
+        values = self._read_range(start=address, count=1)
+        return values[0] if values else READ_FAILURE
+
+    def _read_range(self, start: int, count: int) -> Optional[List[int]]:
+        if not self.connected:
+            return None
+        try:
+            response = self._client.read_holding_registers(start, count=count)
+        except CONNECTION_ERRORS as error:
+            logger.warning("Connection lost reading registers at %s: %s", start, error)
+            self._drop_connection()
+            return None
+        if response.isError() or len(response.registers) < count:
+            logger.warning("Error reading %s registers at %s: %s", count, start, response)
+            return None
+        return list(response.registers[:count])
+
+    def _write_range(self, start: int, values: List[int]) -> bool:
+        if not self.connected:
+            return False
+        try:
+            response = self._client.write_registers(start, values)
+        except CONNECTION_ERRORS as error:
+            logger.warning("Connection lost writing registers at %s: %s", start, error)
+            self._drop_connection()
+            return False
+        if response.isError():
+            logger.warning(
+                "Error writing %s registers at %s: %s", len(values), start, response
+            )
+            return False
+        return True
+
+    def _drop_connection(self) -> None:
+        if self._client is None:
+            return None
+        try:
+            self._client.close()
+        except Exception as error:
+            logger.debug("Failed to release modbus client: %s", error)
+        self._client = None
@@ -1,10 +1,8 @@
 from typing import Dict, List, Optional, Type, Union
 
 from pydantic import ConfigDict, Field
-from pymodbus.client import ModbusTcpClient as ModbusClient
 from typing_extensions import Literal
 
-from inference.core.logger import logger
 from inference.core.workflows.execution_engine.entities.base import (
     OutputDefinition,
     VideoMetadata,
@@ -21,6 +19,8 @@ from inference.core.workflows.prototypes.block import (
     WorkflowBlockManifest,
 )
 
+from care.workflows.care_steps.sinks.PLC_modbus.client import ModbusRegistersClient
+
 LONG_DESCRIPTION = """
 This **Modbus TCP** block integrates a Roboflow Workflow with a PLC using Modbus TCP.
 It can:
@@ -32,7 +32,11 @@ It can:
 - If `mode='read'` or `mode='read_and_write'`, `registers_to_read` must be provided as a list of register addresses.
 - If `mode='write'` or `mode='read_and_write'`, `registers_to_write` must be provided as a dictionary mapping register addresses to values.
 
-If a read or write operation fails, an error message is printed to the terminal, 
+Contiguous register addresses are read and written with single requests, and values
+equal to the last successful write are not sent again. A dropped connection is
+re-established on later runs, with backoff between failed attempts.
+
+If a read or write operation fails, an error is logged
 and the corresponding entry in the output dictionary is set to "ReadFailure" or "WriteFailure".
 """
 
@@ -106,18 +110,19 @@ class ModbusTCPBlockV1(WorkflowBlock):
     - 'write': Writes values to specified registers.
     - 'read_and_write': Reads and writes in one execution.
 
-    On failures, errors are printed and marked as "ReadFailure" or "WriteFailure".
+    Contiguous registers are transferred in single requests and values equal to the
+    last successful write are not sent again. Connection is kept between runs and
+    re-established with backoff when it drops.
+
+    On failures, errors are logged and marked as "ReadFailure" or "WriteFailure".
     """
 
     def __init__(self):
-        self.client: Optional[ModbusClient] = None
+        self.client: Optional[ModbusRegistersClient] = None
 
     def __del__(self):
         if self.client:
-            try:
-                self.client.close()
-            except Exception as exc:
-                logger.debug("Failed to release modbus client: %s", exc)
+            self.client.close()
 
     @classmethod
     def get_manifest(cls) -> Type[WorkflowBlockManifest]:
@@ -134,53 +139,21 @@ class ModbusTCPBlockV1(WorkflowBlock):
         image: Optional[WorkflowImageData] = None,
         metadata: Optional[VideoMetadata] = None,
     ) -> dict:
-        read_results = {}
-        write_results = {}
-
+        if self.client and (self.client.host, self.client.port) != (plc_ip, plc_port):
+            self.client.close()
+            self.client = None
         if not self.client:
-            self.client: ModbusClient = ModbusClient(plc_ip, port=plc_port)
-            if not self.client.connect():
-                print("Failed to connect to PLC")
-                return {"modbus_results": [{"error": "ConnectionFailure"}]}
-
-        # If mode involves reading
-        if mode in ["read", "read_and_write"]:
-            for address in registers_to_read:
-                try:
-                    response = self.client.read_holding_registers(address)
-                    if not response.isError():
-                        read_results[address] = (
-                            response.registers[0] if response.registers else None
-                        )
-                    else:
-                        print(f"Error reading register {address}: {response}")
-                        read_results[address] = "ReadFailure"
-                except Exception as e:
-                    print(f"Exception reading register {address}: {e}")
-                    read_results[address] = "ReadFailure"
-
-        # If mode involves writing
-        if mode in ["write", "read_and_write"]:
-            for address, value in registers_to_write.items():
-                try:
-                    response = self.client.write_register(address, value)
-                    if not response.isError():
-                        write_results[address] = "WriteSuccess"
-                    else:
-                        print(
-                            f"Error writing register {address} with value {value}: {response}"
-                        )
-                        write_results[address] = "WriteFailure"
-                except Exception as e:
-                    print(
-                        f"Exception writing register {address} with value {value}: {e}"
-                    )
-                    write_results[address] = "WriteFailure"
+            self.client = ModbusRegistersClient(plc_ip, port=plc_port)
+        if not self.client.connect():
+            return {"modbus_results": [{"error": "ConnectionFailure"}]}
 
         modbus_output = {}
-        if read_results:
-            modbus_output["read"] = read_results
-        if write_results:
-            modbus_output["write"] = write_results
-
+        if mode in ["read", "read_and_write"] and registers_to_read:
+            modbus_output["read"] = self.client.read_registers(
+                [int(address) for address in registers_to_read]
+            )
+        if mode in ["write", "read_and_write"] and registers_to_write:
+            modbus_output["write"] = self.client.write_registers(
+                {int(address): value for address, value in registers_to_write.items()}
+            )
         return {"modbus_results": [modbus_output]}
@@ -0,0 +1,223 @@
+"""
+EtherNet/IP sessions shared by PLC blocks.
+
+Opening `pylogix.PLC()` costs TCP connect, CIP session registration and forward open, so
+sessions are cached per `(PLC IP, processor slot)` and shared across block instances and
+pipelines running in the same process. Tags are read and written with list-form
+`Read([...])` / `Write([...])`, which pylogix packs into multi-service requests. Writes of
+values equal to the last value successfully written to a tag are skipped.
+
+Session is closed after connection failure and re-opened on later calls, with exponential
+backoff between failed attempts. Sessions unused for longer than idle timeout are closed.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pylogix
+
+from care.env import ETHERNET_IP_SESSION_IDLE_TIMEOUT
+from inference.core.logger import logger
+
+READ_FAILURE = "ReadFailure"
+WRITE_FAILURE = "WriteFailure"
+WRITE_SUCCESS = "WriteSuccess"
+
+
+class EthernetIPSession:
+    def __init__(
+        self,
+        plc_ip: str,
+        slot: int = 0,
+        plc_factory: Callable[..., pylogix.PLC] = pylogix.PLC,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Single EtherNet/IP session, calls are serialised with a lock.
+
+        Args:
+            plc_ip (str): PLC address.
+            slot (int): Processor slot.
+            plc_factory (Callable[..., pylogix.PLC]): Factory of pylogix PLC objects.
+            initial_backoff (float): Delay after first connection failure.
+            max_backoff (float): Upper bound of delay between connection attempts.
+            clock (Callable[[], float]): Source of monotonic time in seconds.
+        """
+        self.plc_ip = plc_ip
+        self.slot = slot
+        self._plc_factory = plc_factory
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._plc: Optional[pylogix.PLC] = None
+        self._backoff = 0.0
+        self._next_attempt_at = 0.0
+        self._last_written: Dict[str, Tuple[type, Any]] = {}
+        self.last_used_at = clock()
+
+    def read_tags(self, tags: List[str]) -> Dict[str, Any]:
+        """Reads tags with single multi-service request.
+
+        Args:
+            tags (List[str]): Names of tags.
+
+        Returns:
+            Dict[str, Any]: Value of each tag, or `"ReadFailure"`.
+        """
+        if not tags:
+            return {}
+        with self._lock:
+            responses = self._call(lambda plc: plc.Read(list(tags)), len(tags))
+        results = {}
+        for tag, response in zip(tags, responses):
+            if response is not None and response.Status == "Success":
+                results[tag] = response.Value
+            else:
+                logger.error(
+                    "Error reading tag '%s': %s",
+                    tag,
+                    response.Status if response is not None else "ConnectionFailure",
+                )
+                results[tag] = READ_FAILURE
+        return results
+
+    def write_tags(self, values: Dict[str, Any]) -> Dict[str, str]:
+        """Writes tags that changed since the last successful write.
+
+        Args:
+            values (Dict[str, Any]): Mapping of tags to values.
+
+        Returns:
+            Dict[str, str]: `"WriteSuccess"` or `"WriteFailure"` for each tag.
+        """
+        results = {}
+        with self._lock:
+            changed = [
+                (tag, value)
+                for tag, value in values.items()
+                if self._last_written.get(tag) != (type(value), value)
+            ]
+            responses = []
+            if changed:
+                responses = self._call(lambda plc: plc.Write(changed), len(changed))
+            for (tag, value), response in zip(changed, responses):
+                if response is not None and response.Status == "Success":
+                    self._last_written[tag] = (type(value), value)
+                    results[tag] = WRITE_SUCCESS
+                    continue
+                self._last_written.pop(tag, None)
+                logger.error(
+                    "Error writing tag '%s' with value '%s': %s",
+                    tag,
+                    value,
+                    response.Status if response is not None else "ConnectionFailure",
+                )
+                results[tag] = WRITE_FAILURE
+        return {tag: results.get(tag, WRITE_SUCCESS) for tag in values}
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_connection()
+
+    def _call(self, operation: Callable[[pylogix.PLC], list], size: int) -> list:
+        self.last_used_at = self._clock()
+        plc = self._get_plc()
+        if plc is None:
+            return [None] * size
+        try:
+            responses = operation(plc)
+        except Exception as error:
+            logger.error("EtherNet/IP request to %s failed: %s", self.plc_ip, error)
+            responses = None
+        if responses is None or not plc.conn.SocketConnected:
+            self._register_failure()
+            return [None] * size
+        if not isinstance(responses, list):
+            responses = [responses]
+        self._backoff = 0.0
+        return responses + [None] * (size - len(responses))
+
+    def _get_plc(self) -> Optional[pylogix.PLC]:
+        if self._plc is not None:
+            return self._plc
+        if self._clock() < self._next_attempt_at:
+            return None
+        self._plc = self._plc_factory(ip_address=self.plc_ip, slot=self.slot)
+        # PLC program may have changed while we were disconnected
+        self._last_written.clear()
+        return self._plc
+
+    def _register_failure(self) -> None:
+        self._drop_connection()
+        self._backoff = min(
+            max(self._backoff * 2, self._initial_backoff), self._max_backoff
+        )
+        self._next_attempt_at = self._clock() + self._backoff
+        logger.warning(
+            "Lost connection to PLC %s (slot %s), retrying in %.1fs",
+            self.plc_ip,
+            self.slot,
+            self._backoff,
+        )
+
+    def _drop_connection(self) -> None:
+        if self._plc is None:
+            return None
+        try:
+            self._plc.Close()
+        except Exception as error:
+            logger.debug("Failed to close EtherNet/IP session: %s", error)
+        self._plc = None
+
+
+class EthernetIPSessionsPool:
+    def __init__(
+        self,
+        idle_timeout: float = ETHERNET_IP_SESSION_IDLE_TIMEOUT,
+        session_factory: Callable[..., EthernetIPSession] = EthernetIPSession,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Sessions keyed by `(PLC IP, processor slot)`.
+
+        Args:
+            idle_timeout (float): Seconds after which unused sessions are closed.
+            session_factory (Callable[..., EthernetIPSession]): Factory of sessions.
+            clock (Callable[[], float]): Source of monotonic time in seconds.
+        """
+        self._idle_timeout = idle_timeout
+        self._session_factory = session_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, int], EthernetIPSession] = {}
+
+    def get(self, plc_ip: str, slot: int = 0) -> EthernetIPSession:
+        with self._lock:
+            self._close_idle_sessions()
+            session = self._sessions.get((plc_ip, slot))
+            if session is None:
+                session = self._session_factory(plc_ip=plc_ip, slot=slot)
+                self._sessions[(plc_ip, slot)] = session
+            return session
+
+    def close_all(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _close_idle_sessions(self) -> None:
+        # PLC may have already dropped idle connection on its side - requested session
+        # is re-opened rather than failing on first call
+        now = self._clock()
+        for key, session in list(self._sessions.items()):
+            if now - session.last_used_at > self._idle_timeout:
+                logger.debug("Closing idle EtherNet/IP session to %s", key)
+                session.close()
+                del self._sessions[key]
+
+
+ETHERNET_IP_SESSIONS = EthernetIPSessionsPool()
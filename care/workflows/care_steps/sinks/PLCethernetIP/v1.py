@@ -1,10 +1,8 @@
 from typing import Dict, List, Optional, Type, Union
 
-import pylogix
 from pydantic import ConfigDict, Field
 from typing_extensions import Literal
 
-from inference.core.logger import logger
 from inference.core.workflows.execution_engine.entities.base import (
     OutputDefinition,
     VideoMetadata,
@@ -21,6 +19,8 @@ from inference.core.workflows.prototypes.block import (
     WorkflowBlockManifest,
 )
 
+from care.workflows.care_steps.sinks.PLCethernetIP.client import ETHERNET_IP_SESSIONS
+
 LONG_DESCRIPTION = """
 This **PLC Communication** block integrates a Roboflow Workflow with a PLC using Ethernet/IP communication.
 It can:
@@ -32,7 +32,11 @@ It can:
 - If `mode='read'` or `mode='read_and_write'`, `tags_to_read` must be provided.
 - If `mode='write'` or `mode='read_and_write'`, `tags_to_write` must be provided.
 
-If a read or write operation fails, an error message is printed to the terminal, 
+EtherNet/IP sessions are kept open between runs and shared by all blocks talking to the
+same PLC. All tags are read with a single multi-service request, and the same applies
+to writes - tags whose value did not change since the last successful write are skipped.
+
+If a read or write operation fails, an error is logged
 and the corresponding entry in the output dictionary is set to a generic "ReadFailure" or "WriteFailure" message.
 """
 
@@ -72,6 +76,12 @@ class PLCBlockManifest(WorkflowBlockManifest):
         description="IP address of the target PLC.", examples=["192.168.1.10"]
     )
 
+    processor_slot: int = Field(
+        default=0,
+        description="Slot of the PLC processor in the chassis.",
+        examples=[0],
+    )
+
     mode: Literal["read", "write", "read_and_write"] = Field(
         description="Mode of operation: 'read', 'write', or 'read_and_write'.",
         examples=["read", "write", "read_and_write"],
@@ -121,40 +131,13 @@ class PLCBlockV1(WorkflowBlock):
     - 'write': Writes provided values to specified tags.
     - 'read_and_write': Reads and writes in one go.
 
-    In case of failures, errors are printed to terminal and the corresponding tag entry in the output is set to "ReadFailure" or "WriteFailure".
+    In case of failures, errors are logged and the corresponding tag entry in the output is set to "ReadFailure" or "WriteFailure".
     """
 
     @classmethod
     def get_manifest(cls) -> Type[WorkflowBlockManifest]:
         return PLCBlockManifest
 
-    def _read_single_tag(self, comm, tag):
-        try:
-            response = comm.Read(tag)
-            if response.Status == "Success":
-                return response.Value
-            logger.error(f"Error reading tag '%s': %s", tag, response.Status)
-            return "ReadFailure"
-        except Exception as e:
-            logger.error(f"Unhandled error reading tag '%s': %s", tag, e)
-            return "ReadFailure"
-
-    def _write_single_tag(self, comm, tag, value):
-        try:
-            response = comm.Write(tag, value)
-            if response.Status == "Success":
-                return "WriteSuccess"
-            logger.error(
-                "Error writing tag '%s' with value '%s': %s",
-                tag,
-                value,
-                response.Status,
-            )
-            return "WriteFailure"
-        except Exception as e:
-            logger.error(f"Unhandled error writing tag '%s': %s", tag, e)
-            return "WriteFailure"
-
     def run(
         self,
         plc_ip: str,
@@ -164,6 +147,7 @@ class PLCBlockV1(WorkflowBlock):
         depends_on: any,
         image: Optional[WorkflowImageData] = None,
         metadata: Optional[VideoMetadata] = None,
+        processor_slot: int = 0,
     ) -> dict:
         """Run PLC read/write operations using pylogix over Ethernet/IP.
 
@@ -175,26 +159,20 @@ class PLCBlockV1(WorkflowBlock):
             depends_on (any): The step output this block depends on.
             image (Optional[WorkflowImageData]): Not required for this block.
             metadata (Optional[VideoMetadata]): Not required for this block.
+            processor_slot (int): Slot of the PLC processor.
 
         Returns:
             dict: A dictionary with `plc_results` as a list containing one dictionary. That dictionary has 'read' and/or 'write' keys.
         """
         read_results = {}
         write_results = {}
+        session = ETHERNET_IP_SESSIONS.get(plc_ip=plc_ip, slot=processor_slot)
 
-        with pylogix.PLC() as comm:
-            comm.IPAddress = plc_ip
-
-            if mode in ["read", "read_and_write"]:
-                read_results = {
-                    tag: self._read_single_tag(comm, tag) for tag in tags_to_read
-                }
+        if mode in ["read", "read_and_write"]:
+            read_results = session.read_tags(list(tags_to_read))
 
-            if mode in ["write", "read_and_write"]:
-                write_results = {
-                    tag: self._write_single_tag(comm, tag, value)
-                    for tag, value in tags_to_write.items()
-                }
+        if mode in ["write", "read_and_write"]:
+            write_results = session.write_tags(dict(tags_to_write))
 
         plc_output = {}
         if read_results:
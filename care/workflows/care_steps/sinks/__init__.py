@@ -1,3 +1,6 @@
-from care.workflows.care_steps.sinks.mqtt_writer import MQTTWriterSinkBlockV1
+from care.workflows.care_steps.sinks.mqtt_writer import (
+    MQTTWriterSinkBlockV1,
+    MQTTWriterSinkBlockV2,
+)
 
-__all__ = ["MQTTWriterSinkBlockV1"]
+__all__ = ["MQTTWriterSinkBlockV1", "MQTTWriterSinkBlockV2"]
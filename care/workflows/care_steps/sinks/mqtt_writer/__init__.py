@@ -1,3 +1,4 @@
 from care.workflows.care_steps.sinks.mqtt_writer.v1 import MQTTWriterSinkBlockV1
+from care.workflows.care_steps.sinks.mqtt_writer.v2 import MQTTWriterSinkBlockV2
 
-__all__ = ["MQTTWriterSinkBlockV1"]
+__all__ = ["MQTTWriterSinkBlockV1", "MQTTWriterSinkBlockV2"]
@@ -135,6 +135,41 @@ class MQTTWriterSinkBlockV1(WorkflowBlock):
         retain: bool = False,
         timeout: float = 0.5,
     ) -> BlockResult:
+        connection_error = self._ensure_connection(
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            timeout=timeout,
+        )
+        if connection_error is not None:
+            return connection_error
+
+        try:
+            res: mqtt.MQTTMessageInfo = self.mqtt_client.publish(
+                topic, message, qos=qos, retain=retain
+            )
+            # TODO: this is blocking
+            res.wait_for_publish(timeout=timeout)
+            if res.is_published():
+                return {
+                    "error_status": False,
+                    "message": "Message published successfully",
+                }
+            else:
+                return {"error_status": True, "message": "Failed to publish payload"}
+        except Exception as e:
+            logger.error("Failed to publish message: %s", e)
+            return {"error_status": True, "message": f"Unhandled error - {e}"}
+
+    def _ensure_connection(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        timeout: float,
+    ) -> Optional[dict]:
         if self.mqtt_client is None:
             self.mqtt_client = mqtt.Client()
             if username and password:
@@ -172,23 +207,7 @@ class MQTTWriterSinkBlockV1(WorkflowBlock):
                     "error_status": True,
                     "message": f"Failed to connect to MQTT broker: {e}",
                 }
-
-        try:
-            res: mqtt.MQTTMessageInfo = self.mqtt_client.publish(
-                topic, message, qos=qos, retain=retain
-            )
-            # TODO: this is blocking
-            res.wait_for_publish(timeout=timeout)
-            if res.is_published():
-                return {
-                    "error_status": False,
-                    "message": "Message published successfully",
-                }
-            else:
-                return {"error_status": True, "message": "Failed to publish payload"}
-        except Exception as e:
-            logger.error("Failed to publish message: %s", e)
-            return {"error_status": True, "message": f"Unhandled error - {e}"}
+        return None
 
     def mqtt_on_connect(self, client, userdata, flags, reason_code, properties=None):
         logger.info("Connected with result code %s", reason_code)
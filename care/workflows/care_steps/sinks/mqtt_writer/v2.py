@@ -0,0 +1,131 @@
+import time
+from typing import List, Literal, Optional, Type, Union
+
+import paho.mqtt.client as mqtt
+from pydantic import ConfigDict
+
+from inference.core.logger import logger
+from inference.core.workflows.execution_engine.entities.base import Batch
+from inference.core.workflows.prototypes.block import (
+    BlockResult,
+    WorkflowBlockManifest,
+)
+
+from care.workflows.care_steps.sinks.mqtt_writer.v1 import (
+    BlockManifest as BlockManifestV1,
+)
+from care.workflows.care_steps.sinks.mqtt_writer.v1 import MQTTWriterSinkBlockV1
+
+LONG_DESCRIPTION = """
+Batch-oriented version of `care/mqtt_writer@v1`.
+
+Messages of all video sources in a batch are published in a single call: connection is
+checked once, all messages are handed to the client at once and acknowledgements are
+awaited together (`timeout` applies to the whole group), instead of one blocking
+publish per source.
+
+Outputs (per batch element):
+    - error_status (bool): Indicates if an error occurred during the MQTT publishing process.
+    - message (str): Status message describing the result of the operation.
+"""
+
+
+class BlockManifest(BlockManifestV1):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "name": "MQTT Writer",
+            "version": "v2",
+            "short_description": "Publishes messages of all sources to an MQTT broker.",
+            "long_description": LONG_DESCRIPTION,
+            "license": "Roboflow Enterprise License",
+            "block_type": "sink",
+            "ui_manifest": {
+                "section": "industrial",
+                "icon": "fal fa-network-wired",
+                "blockPriority": 10,
+                "enterprise_only": True,
+                "local_only": True,
+            },
+        }
+    )
+    type: Literal["care/mqtt_writer@v2"]
+
+    @classmethod
+    def get_parameters_accepting_batches_and_scalars(cls) -> List[str]:
+        return ["message"]
+
+    @classmethod
+    def get_execution_engine_compatibility(cls) -> Optional[str]:
+        return ">=1.4.0,<2.0.0"
+
+
+class MQTTWriterSinkBlockV2(MQTTWriterSinkBlockV1):
+
+    @classmethod
+    def get_manifest(cls) -> Type[WorkflowBlockManifest]:
+        return BlockManifest
+
+    def run(
+        self,
+        host: str,
+        port: int,
+        topic: str,
+        message: Union[str, Batch[str]],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        qos: int = 0,
+        retain: bool = False,
+        timeout: float = 0.5,
+    ) -> BlockResult:
+        if not isinstance(message, Batch):
+            return super().run(
+                host=host,
+                port=port,
+                topic=topic,
+                message=message,
+                username=username,
+                password=password,
+                qos=qos,
+                retain=retain,
+                timeout=timeout,
+            )
+        connection_error = self._ensure_connection(
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            timeout=timeout,
+        )
+        if connection_error is not None:
+            return [dict(connection_error) for _ in message]
+        deadline = time.monotonic() + timeout
+        pending = []
+        for element in message:
+            try:
+                pending.append(
+                    self.mqtt_client.publish(topic, element, qos=qos, retain=retain)
+                )
+            except Exception as e:
+                pending.append(e)
+        return [
+            self._await_publication(info=info, deadline=deadline) for info in pending
+        ]
+
+    @staticmethod
+    def _await_publication(
+        info: Union[mqtt.MQTTMessageInfo, Exception],
+        deadline: float,
+    ) -> dict:
+        try:
+            if isinstance(info, Exception):
+                raise info
+            info.wait_for_publish(timeout=max(deadline - time.monotonic(), 0.0))
+            if info.is_published():
+                return {
+                    "error_status": False,
+                    "message": "Message published successfully",
+                }
+            return {"error_status": True, "message": "Failed to publish payload"}
+        except Exception as e:
+            logger.error("Failed to publish message: %s", e)
+            return {"error_status": True, "message": f"Unhandled error - {e}"}
@@ -0,0 +1,324 @@
+"""
+OPC UA writer service keeping long-lived sessions.
+
+Connecting to OPC UA server, resolving namespace index and browsing to the target variable
+take several round trips plus session negotiation. `OPCUAWriterService` keeps one session
+per endpoint (URL and credentials) and caches resolved node ids, so steady-state writes cost
+a single `Write` service call.
+
+Writes are queued and flushed by a worker thread owned by the endpoint. Writes queued while
+previous flush is in flight are sent together with `write_values(...)`, and writes to the
+same node are coalesced - the last value wins and all callers receive its result.
+
+On connection errors, session is re-opened and the flush retried once. Session is closed
+after being unused for idle timeout, worker thread exits with it.
+"""
+
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from asyncua import ua
+from asyncua.sync import Client, ThreadLoopNotRunning
+from asyncua.ua.uaerrors import (
+    BadConnectionClosed,
+    BadNoMatch,
+    BadNodeIdUnknown,
+    BadSessionClosed,
+    BadSessionIdInvalid,
+    BadTypeMismatch,
+    BadUserAccessDenied,
+)
+
+from care.env import OPC_UA_SESSION_IDLE_TIMEOUT
+from inference.core.logger import logger
+
+# namespace, object name, variable name
+NodeKey = Tuple[str, str, str]
+
+CONNECTION_ERRORS = (
+    OSError,
+    TimeoutError,
+    FutureTimeoutError,
+    ThreadLoopNotRunning,
+    BadConnectionClosed,
+    BadSessionClosed,
+    BadSessionIdInvalid,
+)
+
+
+class OPCUAWriteError(Exception):
+    pass
+
+
+@dataclass
+class _PendingWrite:
+    value: Any
+    futures: List[Future] = field(default_factory=list)
+
+
+class OPCUAEndpointWriter:
+    def __init__(
+        self,
+        url: str,
+        user_name: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 2,
+        idle_timeout: float = OPC_UA_SESSION_IDLE_TIMEOUT,
+        client_factory: Callable[..., Client] = Client,
+    ):
+        """Writer owning single session to OPC UA endpoint.
+
+        Args:
+            url (str): URL of OPC UA server.
+            user_name (Optional[str]): User name, used together with password.
+            password (Optional[str]): Password, used together with user name.
+            timeout (float): Timeout of a single OPC UA call in seconds.
+            idle_timeout (float): Seconds after which unused session is closed.
+            client_factory (Callable[..., Client]): Factory of sync asyncua clients.
+        """
+        self.url = url
+        self._user_name = user_name
+        self._password = password
+        self._timeout = timeout
+        self._idle_timeout = idle_timeout
+        self._client_factory = client_factory
+        self._condition = threading.Condition()
+        self._pending: Dict[NodeKey, _PendingWrite] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        # owned by worker thread
+        self._client: Optional[Client] = None
+        self._namespaces: Dict[str, int] = {}
+        self._node_ids: Dict[NodeKey, ua.NodeId] = {}
+
+    def submit(
+        self, namespace: str, object_name: str, variable_name: str, value: Any
+    ) -> Future:
+        """Queues write of the variable.
+
+        Returns:
+            Future: Resolved with None once value is written, or with `OPCUAWriteError`.
+                If newer value is queued for the same variable before the flush, both
+                futures receive result of writing the newer value.
+        """
+        future = Future()
+        key = (namespace, object_name, variable_name)
+        with self._condition:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingWrite(value=value)
+            pending.value = value
+            pending.futures.append(future)
+            if self._worker is None:
+                self._closed = False
+                self._worker = threading.Thread(
+                    target=self._run_worker, name=f"opc-ua-writer-{self.url}", daemon=True
+                )
+                self._worker.start()
+            self._condition.notify()
+        return future
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=self._timeout * 4)
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending and not self._closed:
+                    self._condition.wait(timeout=self._idle_timeout)
+                batch, self._pending = self._pending, {}
+                if not batch:
+                    # next worker must not see session being closed by this one
+                    client, self._client = self._client, None
+                    self._worker = None
+                    break
+            self._flush(batch=batch)
+        if client is not None:
+            _disconnect_client(client)
+
+    def _flush(self, batch: Dict[NodeKey, _PendingWrite]) -> None:
+        errors = {}
+        for _ in range(2):
+            try:
+                errors = self._write(batch=batch)
+                break
+            except OPCUAWriteError as error:
+                errors = {key: error for key in batch}
+                break
+            except CONNECTION_ERRORS as error:
+                logger.warning("OPC UA connection to %s lost: %s", self.url, error)
+                self._disconnect()
+                errors = {key: OPCUAWriteError(f"NETWORK ERROR: {error}") for key in batch}
+            except Exception as error:
+                self._disconnect()
+                errors = {
+                    key: OPCUAWriteError(f"UNHANDLED ERROR: {type(error)} {error}")
+                    for key in batch
+                }
+                break
+        for key, error in errors.items():
+            logger.warning("Failed to write %s in %s: %s", ":".join(key), self.url, error)
+        for key, pending in batch.items():
+            for future in pending.futures:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if key in errors:
+                    future.set_exception(errors[key])
+                else:
+                    future.set_result(None)
+
+    def _write(
+        self, batch: Dict[NodeKey, _PendingWrite]
+    ) -> Dict[NodeKey, OPCUAWriteError]:
+        client = self._connect()
+        errors = {}
+        nodes, keys = [], []
+        for key in batch:
+            try:
+                nodes.append(client.get_node(self._resolve_node_id(client, key)))
+                keys.append(key)
+            except OPCUAWriteError as error:
+                errors[key] = error
+        if not nodes:
+            return errors
+        statuses = client.write_values(
+            nodes, [batch[key].value for key in keys], raise_on_partial_error=False
+        )
+        for key, status in zip(keys, statuses):
+            try:
+                status.check()
+            except BadTypeMismatch as error:
+                errors[key] = OPCUAWriteError(f"WRONG TYPE ERROR: {error}")
+            except BadNodeIdUnknown as error:
+                self._node_ids.pop(key, None)
+                errors[key] = OPCUAWriteError(f"WRONG OBJECT OR PROPERTY ERROR: {error}")
+            except Exception as error:
+                errors[key] = OPCUAWriteError(f"UNHANDLED ERROR: {type(error)} {error}")
+        return errors
+
+    def _resolve_node_id(self, client: Client, key: NodeKey) -> ua.NodeId:
+        node_id = self._node_ids.get(key)
+        if node_id is not None:
+            return node_id
+        namespace, object_name, variable_name = key
+        nsidx = self._namespaces.get(namespace)
+        if nsidx is None:
+            try:
+                nsidx = (
+                    int(namespace)
+                    if namespace.isdigit()
+                    else client.get_namespace_index(namespace)
+                )
+            except ValueError as error:
+                raise OPCUAWriteError(f"WRONG NAMESPACE ERROR: {error}")
+            self._namespaces[namespace] = nsidx
+        try:
+            node = client.nodes.root.get_child(
+                f"0:Objects/{nsidx}:{object_name}/{nsidx}:{variable_name}"
+            )
+        except BadNoMatch as error:
+            raise OPCUAWriteError(f"WRONG OBJECT OR PROPERTY ERROR: {error}")
+        self._node_ids[key] = node.nodeid
+        return node.nodeid
+
+    def _connect(self) -> Client:
+        if self._client is not None:
+            return self._client
+        client = self._client_factory(url=self.url, sync_wrapper_timeout=self._timeout)
+        if self._user_name and self._password:
+            client.set_user(self._user_name)
+            client.set_password(self._password)
+        try:
+            client.connect()
+        except BadUserAccessDenied as error:
+            _disconnect_client(client)
+            raise OPCUAWriteError(f"AUTH ERROR: {error}")
+        except OSError as error:
+            _disconnect_client(client)
+            raise OPCUAWriteError(f"NETWORK ERROR: {error}")
+        except Exception as error:
+            _disconnect_client(client)
+            raise OPCUAWriteError(f"UNHANDLED ERROR: {type(error)} {error}")
+        # namespace array may have changed if server was restarted
+        self._namespaces.clear()
+        self._node_ids.clear()
+        self._client = client
+        return client
+
+    def _disconnect(self) -> None:
+        if self._client is not None:
+            _disconnect_client(self._client)
+            self._client = None
+
+
+class OPCUAWriterService:
+    def __init__(
+        self,
+        idle_timeout: float = OPC_UA_SESSION_IDLE_TIMEOUT,
+        client_factory: Callable[..., Client] = Client,
+    ):
+        """Endpoint writers keyed by URL and credentials.
+
+        Args:
+            idle_timeout (float): Seconds after which unused sessions are closed.
+            client_factory (Callable[..., Client]): Factory of sync asyncua clients.
+        """
+        self._idle_timeout = idle_timeout
+        self._client_factory = client_factory
+        self._lock = threading.Lock()
+        self._writers: Dict[Tuple[str, Optional[str], Optional[str]], OPCUAEndpointWriter] = {}
+
+    def write(
+        self,
+        url: str,
+        namespace: str,
+        user_name: Optional[str],
+        password: Optional[str],
+        object_name: str,
+        variable_name: str,
+        value: Any,
+        timeout: float = 2,
+    ) -> Future:
+        with self._lock:
+            writer = self._writers.get((url, user_name, password))
+            if writer is None:
+                writer = OPCUAEndpointWriter(
+                    url=url,
+                    user_name=user_name,
+                    password=password,
+                    timeout=timeout,
+                    idle_timeout=self._idle_timeout,
+                    client_factory=self._client_factory,
+                )
+                self._writers[(url, user_name, password)] = writer
+        return writer.submit(
+            namespace=namespace,
+            object_name=object_name,
+            variable_name=variable_name,
+            value=value,
+        )
+
+    def close_all(self) -> None:
+        with self._lock:
+            writers = list(self._writers.values())
+            self._writers.clear()
+        for writer in writers:
+            writer.close()
+
+
+def _disconnect_client(client: Client) -> None:
+    try:
+        client.disconnect()
+    except Exception as error:
+        logger.debug("Failed to disconnect OPC UA client: %s", error)
+
+
+OPC_UA_WRITER = OPCUAWriterService()
@@ -1,12 +1,9 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
-from functools import partial
 from typing import List, Literal, Optional, Tuple, Type, Union
 
-from asyncua.client import Client as AsyncClient
-from asyncua.sync import Client, sync_async_client_method
-from asyncua.ua.uaerrors import BadNoMatch, BadTypeMismatch, BadUserAccessDenied
 from fastapi import BackgroundTasks
 from pydantic import ConfigDict, Field
 
@@ -30,6 +27,8 @@ from inference.core.workflows.prototypes.block import (
     WorkflowBlockManifest,
 )
 
+from care.workflows.care_steps.sinks.opc_writer.client import OPC_UA_WRITER
+
 BLOCK_TYPE = "roboflow_enterprise/opc_writer_sink@v1"
 LONG_DESCRIPTION = """
 The **OPC UA Writer** block enables you to write data to a variable on an OPC UA server, leveraging the 
@@ -60,6 +59,11 @@ The block provides a `fire_and_forget` property for asynchronous execution:
 - **When `fire_and_forget=False`**: The block waits for confirmation before proceeding, ensuring errors 
   are captured in the `error_status` output.
 
+### Connection Reuse
+Sessions to OPC UA servers are kept open between executions and shared by all blocks writing
+to the same server, and resolved variables are cached. Values written to the same variable
+while previous write is still in flight are coalesced - only the latest one is sent.
+
 ### Disabling the Block Dynamically
 You can disable the **OPC UA Writer** block during execution by linking the `disable_sink` parameter 
 to a Workflow input. By providing a specific input value, you can dynamically prevent the block from 
@@ -280,8 +284,27 @@ class OPCWriterSinkBlockV1(WorkflowBlock):
                 "message": f"Failed to convert value: {exc}",
             }
 
-        opc_writer_handler = partial(
-            opc_connect_and_write_value,
+        self._last_notification_fired = datetime.now()
+        if fire_and_forget and (self._background_tasks or self._thread_pool_executor):
+            # writes are queued to long-lived session owned by the writer service,
+            # which performs them off the workflow thread
+            OPC_UA_WRITER.write(
+                url=url,
+                namespace=namespace,
+                user_name=user_name,
+                password=password,
+                object_name=object_name,
+                variable_name=variable_name,
+                value=decoded_value,
+                timeout=timeout,
+            )
+            return {
+                "disabled": False,
+                "error_status": False,
+                "throttling_status": False,
+                "message": "Writing to the OPC UA server in the background task",
+            }
+        error_status, message = opc_connect_and_write_value(
             url=url,
             namespace=namespace,
             user_name=user_name,
@@ -291,24 +314,6 @@ class OPCWriterSinkBlockV1(WorkflowBlock):
             value=decoded_value,
             timeout=timeout,
         )
-        self._last_notification_fired = datetime.now()
-        if fire_and_forget and self._background_tasks:
-            self._background_tasks.add_task(opc_writer_handler)
-            return {
-                "disabled": False,
-                "error_status": False,
-                "throttling_status": False,
-                "message": "Writing to the OPC UA server in the background task",
-            }
-        if fire_and_forget and self._thread_pool_executor:
-            self._thread_pool_executor.submit(opc_writer_handler)
-            return {
-                "disabled": False,
-                "error_status": False,
-                "throttling_status": False,
-                "message": "Writing to the OPC UA server in the background task",
-            }
-        error_status, message = opc_writer_handler()
         return {
             "disabled": False,
             "error_status": error_status,
@@ -327,84 +332,24 @@ def opc_connect_and_write_value(
     value: Union[bool, float, int, str],
     timeout: int,
 ) -> Tuple[bool, str]:
+    future = OPC_UA_WRITER.write(
+        url=url,
+        namespace=namespace,
+        user_name=user_name,
+        password=password,
+        object_name=object_name,
+        variable_name=variable_name,
+        value=value,
+        timeout=timeout,
+    )
     try:
-        _opc_connect_and_write_value(
-            url=url,
-            namespace=namespace,
-            user_name=user_name,
-            password=password,
-            object_name=object_name,
-            variable_name=variable_name,
-            value=value,
-            timeout=timeout,
-        )
+        # connection, namespace and node resolution and the write itself may all time out
+        future.result(timeout=4 * timeout)
         return False, "Value set successfully"
     except Exception as exc:
+        if isinstance(exc, FutureTimeoutError):
+            exc = f"TIMEOUT ERROR: no response within {4 * timeout}s"
         return (
             True,
             f"Failed to write {value} to {object_name}:{variable_name} in {url}. Internal error details: {exc}.",
         )
-
-
-def _opc_connect_and_write_value(
-    url: str,
-    namespace: str,
-    user_name: Optional[str],
-    password: Optional[str],
-    object_name: str,
-    variable_name: str,
-    value: Union[bool, float, int, str],
-    timeout: int,
-):
-    client = Client(url=url, sync_wrapper_timeout=timeout)
-    if user_name and password:
-        client.set_user(user_name)
-        client.set_password(password)
-    try:
-        client.connect()
-    except BadUserAccessDenied as exc:
-        client.disconnect()
-        raise Exception(f"AUTH ERROR: {exc}")
-    except OSError as exc:
-        client.disconnect()
-        raise Exception(f"NETWORK ERROR: {exc}")
-    except Exception as exc:
-        client.disconnect()
-        raise Exception(f"UNHANDLED ERROR: {type(exc)} {exc}")
-    get_namespace_index = sync_async_client_method(AsyncClient.get_namespace_index)(
-        client
-    )
-
-    try:
-        if namespace.isdigit():
-            nsidx = int(namespace)
-        else:
-            nsidx = get_namespace_index(namespace)
-    except ValueError as exc:
-        client.disconnect()
-        raise Exception(f"WRONG NAMESPACE ERROR: {exc}")
-    except Exception as exc:
-        client.disconnect()
-        raise Exception(f"UNHANDLED ERROR: {type(exc)} {exc}")
-
-    try:
-        var = client.nodes.root.get_child(
-            f"0:Objects/{nsidx}:{object_name}/{nsidx}:{variable_name}"
-        )
-    except BadNoMatch as exc:
-        client.disconnect()
-        raise Exception(f"WRONG OBJECT OR PROPERTY ERROR: {exc}")
-    except Exception as exc:
-        client.disconnect()
-        raise Exception(f"UNHANDLED ERROR: {type(exc)} {exc}")
-
-    try:
-        var.write_value(value)
-    except BadTypeMismatch as exc:
-        client.disconnect()
-        raise Exception(f"WRONG TYPE ERROR: {exc}")
-    except Exception as exc:
-        client.disconnect()
-        raise Exception(f"UNHANDLED ERROR: {type(exc)} {exc}")
-
-    client.disconnect()
@@ -1,11 +1,25 @@
 from care.workflows.care_steps.transformations.detections_count import (
     DetectionsCountBlockV1,
+    DetectionsCountBlockV2,
 )
 from care.workflows.care_steps.transformations.prediction_alarm.v1 import (
     PredictionAlarmBlockV1,
 )
+from care.workflows.care_steps.transformations.prediction_alarm.v2 import (
+    PredictionAlarmBlockV2,
+)
 from care.workflows.care_steps.transformations.conditional_alarm.v1 import (
     ConditionalAlarmBlockV1,
 )
+from care.workflows.care_steps.transformations.conditional_alarm.v2 import (
+    ConditionalAlarmBlockV2,
+)
 
-__all__ = ["DetectionsCountBlockV1", "PredictionAlarmBlockV1", "ConditionalAlarmBlockV1"]
+__all__ = [
+    "DetectionsCountBlockV1",
+    "DetectionsCountBlockV2",
+    "PredictionAlarmBlockV1",
+    "PredictionAlarmBlockV2",
+    "ConditionalAlarmBlockV1",
+    "ConditionalAlarmBlockV2",
+]
@@ -7,9 +7,6 @@ from inference.core.logger import logger
 from inference.core.workflows.core_steps.common.query_language.entities.operations import (
     StatementGroup,
 )
-from inference.core.workflows.core_steps.common.query_language.evaluation_engine.core import (
-    build_eval_function,
-)
 from inference.core.workflows.execution_engine.entities.base import OutputDefinition
 from inference.core.workflows.execution_engine.entities.types import (
     BOOLEAN_KIND,
@@ -24,6 +21,9 @@ from inference.core.workflows.prototypes.block import (
     WorkflowBlockManifest,
 )
 
+from care.workflows.care_steps.common.query_language.evaluation_engine.compiler import (
+    compile_statement,
+)
 from care.workflows.care_steps.core.alarm_engine import (
     AlarmEngine,
     ConditionWithHysteresis,
@@ -277,7 +277,7 @@ class ConditionalAlarmBlockV1(WorkflowBlock):
         
         # Build evaluation function (cache en primera ejecución)
         if self._eval_function is None:
-            self._eval_function = build_eval_function(definition=condition_statement)
+            self._eval_function = compile_statement(definition=condition_statement)
 
         # Evaluar condición actual (sin hysteresis, evaluación cruda)
         current_condition_met = self._eval_function(evaluation_parameters)
@@ -0,0 +1,255 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional, Type, Union
+
+from pydantic import ConfigDict, Field
+
+from inference.core.logger import logger
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    StatementGroup,
+)
+from inference.core.workflows.execution_engine.entities.base import (
+    Batch,
+    OutputDefinition,
+    WorkflowImageData,
+)
+from inference.core.workflows.execution_engine.entities.types import (
+    BOOLEAN_KIND,
+    FLOAT_KIND,
+    IMAGE_KIND,
+    INTEGER_KIND,
+    STRING_KIND,
+    Selector,
+)
+from inference.core.workflows.prototypes.block import (
+    BlockResult,
+    WorkflowBlock,
+    WorkflowBlockManifest,
+)
+
+from care.cache.lru_cache import LRUCache
+from care.env import CARE_STEPS_MAX_SOURCES_STATES, CARE_STEPS_SOURCE_STATE_TTL
+from care.workflows.care_steps.common.query_language.evaluation_engine.compiler import (
+    compile_statement,
+)
+from care.workflows.care_steps.common.utils import get_video_sources_keys
+from care.workflows.care_steps.core.alarm_engine import (
+    AlarmEngine,
+    ConditionWithHysteresis,
+)
+
+SHORT_DESCRIPTION = (
+    "Trigger alarms based on flexible UQL conditions with hysteresis, for all sources at once."
+)
+
+LONG_DESCRIPTION = """
+Conditional Alarm v2 - versión batch-oriented de `care/conditional_alarm@v1`.
+
+Todas las fuentes de vídeo del lote se evalúan en una sola llamada: la condición UQL se
+compila una vez y cada fuente avanza su propio AlarmEngine (IDLE → FIRING → COOLDOWN),
+con el mismo resultado que un block v1 dedicado a esa fuente.
+
+Los `evaluation_parameters` pueden mezclar valores por fuente (lotes) y valores comunes
+(escalares). Las fuentes se identifican por el `video_identifier` de `image` (si se indica)
+o por el índice en el lote. El estado de una fuente que no aparece durante
+`CARE_STEPS_SOURCE_STATE_TTL` segundos se descarta, y se mantienen como mucho
+`CARE_STEPS_MAX_SOURCES_STATES` fuentes.
+"""
+
+
+class BlockManifest(WorkflowBlockManifest):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "name": "Conditional Alarm",
+            "version": "v2",
+            "short_description": SHORT_DESCRIPTION,
+            "long_description": LONG_DESCRIPTION,
+            "license": "Apache-2.0",
+            "block_type": "transformation",
+            "ui_manifest": {
+                "section": "analytics",
+                "icon": "far fa-bell-exclamation",
+                "blockPriority": 2,
+            },
+        }
+    )
+    type: Literal["care/conditional_alarm@v2"]
+
+    condition_statement: StatementGroup = Field(
+        title="Conditional Statement",
+        description="UQL statement group defining alarm conditions.",
+        examples=[
+            {
+                "type": "StatementGroup",
+                "statements": [
+                    {
+                        "type": "BinaryStatement",
+                        "left_operand": {"type": "DynamicOperand", "operand_name": "count"},
+                        "comparator": {"type": "(Number) >"},
+                        "right_operand": {"type": "StaticOperand", "value": 10},
+                    }
+                ],
+            }
+        ],
+    )
+
+    evaluation_parameters: Dict[str, Selector()] = Field(
+        description="Parameters to be used in the conditional logic.",
+        examples=[{"count": "$steps.count.count", "temp": "$steps.temp.value"}],
+        default_factory=lambda: {},
+    )
+
+    hysteresis_default: Union[float, Selector(kind=[FLOAT_KIND, INTEGER_KIND])] = Field(
+        default=1.0,
+        description="Default hysteresis for statements without explicit hysteresis field.",
+        examples=[1.0, 2.0, 5.0],
+    )
+
+    cooldown_seconds: Union[float, Selector(kind=[FLOAT_KIND, INTEGER_KIND])] = Field(
+        default=5.0,
+        description="Minimum seconds between alarm activations.",
+        examples=[5.0, 10.0, 60.0],
+    )
+
+    alarm_message_template: Union[str, Selector(kind=[STRING_KIND])] = Field(
+        default="Alarm triggered",
+        description="Message template with placeholders matching evaluation_parameters keys.",
+        examples=["Alert: count={count}"],
+    )
+
+    combine_operator: Literal["AND", "OR"] = Field(
+        default="AND",
+        description="How to combine multiple statements: 'AND' (all must be true) or 'OR' (at least one true).",
+        examples=["AND", "OR"],
+    )
+
+    image: Optional[Selector(kind=[IMAGE_KIND])] = Field(
+        default=None,
+        description="Images the parameters refer to, used to keep separate alarm state per video source.",
+        examples=["$inputs.image"],
+    )
+
+    @classmethod
+    def get_parameters_accepting_batches(cls) -> List[str]:
+        return ["image"]
+
+    @classmethod
+    def get_parameters_accepting_batches_and_scalars(cls) -> List[str]:
+        return ["evaluation_parameters"]
+
+    @classmethod
+    def describe_outputs(cls) -> List[OutputDefinition]:
+        return [
+            OutputDefinition(name="alarm_active", kind=[BOOLEAN_KIND]),
+            OutputDefinition(name="alarm_message", kind=[STRING_KIND]),
+            OutputDefinition(name="state", kind=[STRING_KIND]),
+            OutputDefinition(name="alarm_count", kind=[INTEGER_KIND]),
+        ]
+
+    @classmethod
+    def get_execution_engine_compatibility(cls) -> Optional[str]:
+        return ">=1.4.0,<2.0.0"
+
+
+class ConditionalAlarmBlockV2(WorkflowBlock):
+    """
+    Conditional Alarm block evaluando todas las fuentes del lote en una llamada,
+    con un AlarmEngine por fuente.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # engines of sources which are no longer processed expire
+        self._engines = LRUCache(
+            capacity=CARE_STEPS_MAX_SOURCES_STATES, ttl=CARE_STEPS_SOURCE_STATE_TTL
+        )
+        self._eval_function: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+    @classmethod
+    def get_manifest(cls) -> Type[WorkflowBlockManifest]:
+        return BlockManifest
+
+    def run(
+        self,
+        condition_statement: StatementGroup,
+        evaluation_parameters: Dict[str, Any],
+        hysteresis_default: float = 1.0,
+        cooldown_seconds: float = 5.0,
+        alarm_message_template: str = "Alarm triggered",
+        combine_operator: str = "AND",
+        image: Optional[Batch[WorkflowImageData]] = None,
+    ) -> BlockResult:
+        if hysteresis_default < 0:
+            raise ValueError(f"hysteresis_default must be >= 0, got {hysteresis_default}")
+        if cooldown_seconds < 0:
+            raise ValueError(f"cooldown_seconds must be >= 0, got {cooldown_seconds}")
+        if self._eval_function is None:
+            self._eval_function = compile_statement(definition=condition_statement)
+        current_time = datetime.now()
+        evaluation_kwargs = dict(
+            hysteresis_default=hysteresis_default,
+            cooldown_seconds=cooldown_seconds,
+            alarm_message_template=alarm_message_template,
+            combine_operator=combine_operator,
+            current_time=current_time,
+        )
+        batches = {
+            name: value
+            for name, value in evaluation_parameters.items()
+            if isinstance(value, Batch)
+        }
+        reference_batch = next(iter(batches.values()), image)
+        if reference_batch is None:
+            return self._evaluate(
+                key=None, params=evaluation_parameters, **evaluation_kwargs
+            )
+        keys = get_video_sources_keys(batch=reference_batch, images=image)
+        results = []
+        for index, key in enumerate(keys):
+            params = {
+                name: value[index] if name in batches else value
+                for name, value in evaluation_parameters.items()
+            }
+            results.append(self._evaluate(key=key, params=params, **evaluation_kwargs))
+        return results
+
+    def _evaluate(
+        self,
+        key: Hashable,
+        params: Dict[str, Any],
+        hysteresis_default: float,
+        cooldown_seconds: float,
+        alarm_message_template: str,
+        combine_operator: str,
+        current_time: datetime,
+    ) -> dict:
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = AlarmEngine()
+            engine.register_condition(
+                "main_condition",
+                ConditionWithHysteresis(
+                    evaluate_activation=lambda p: self._eval_function(p),
+                    evaluate_deactivation=lambda p: not self._eval_function(p),
+                    hysteresis=hysteresis_default,
+                ),
+            )
+        # re-inserted to refresh expiry of the engine
+        self._engines[key] = engine
+        result = engine.evaluate(
+            params=params,
+            combine_with=combine_operator,
+            cooldown_seconds=cooldown_seconds,
+            message_template=alarm_message_template,
+            current_time=current_time,
+        )
+        if result["alarm_active"]:
+            logger.info(
+                f"Conditional Alarm FIRED [{key}]: {result['alarm_message']} "
+                f"(count: {result['alarm_count']}, state: {result['state']})"
+            )
+        return {
+            "alarm_active": result["alarm_active"],
+            "alarm_message": result["alarm_message"],
+            "state": result["state"],
+            "alarm_count": result["alarm_count"],
+        }
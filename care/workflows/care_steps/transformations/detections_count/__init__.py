@@ -1,5 +1,8 @@
 from care.workflows.care_steps.transformations.detections_count.v1 import (
     DetectionsCountBlockV1,
 )
+from care.workflows.care_steps.transformations.detections_count.v2 import (
+    DetectionsCountBlockV2,
+)
 
-__all__ = ["DetectionsCountBlockV1"]
+__all__ = ["DetectionsCountBlockV1", "DetectionsCountBlockV2"]
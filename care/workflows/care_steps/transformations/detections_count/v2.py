@@ -0,0 +1,94 @@
+"""
+Detections Count Block v2 - conteo de detecciones para lotes completos.
+
+Misma semántica que v1, pero el block recibe el lote de predicciones de todas las
+fuentes de vídeo en una única llamada, en lugar de una llamada por fuente y frame.
+"""
+
+from typing import List, Literal, Optional, Type
+
+import supervision as sv
+from pydantic import ConfigDict, Field
+
+from inference.core.workflows.execution_engine.entities.base import (
+    Batch,
+    OutputDefinition,
+)
+from inference.core.workflows.execution_engine.entities.types import (
+    INTEGER_KIND,
+    INSTANCE_SEGMENTATION_PREDICTION_KIND,
+    KEYPOINT_DETECTION_PREDICTION_KIND,
+    OBJECT_DETECTION_PREDICTION_KIND,
+    Selector,
+)
+from inference.core.workflows.prototypes.block import (
+    BlockResult,
+    WorkflowBlock,
+    WorkflowBlockManifest,
+)
+
+LONG_DESCRIPTION = """
+Cuenta el número de detecciones de cada elemento del lote.
+
+Versión batch-oriented de `care/detections_count@v1`: el resultado para cada fuente
+de vídeo es idéntico al de v1, pero todas las fuentes se procesan en una sola llamada.
+"""
+
+
+class BlockManifest(WorkflowBlockManifest):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "name": "Detections Count",
+            "version": "v2",
+            "short_description": "Cuenta el número de detecciones (lote completo).",
+            "long_description": LONG_DESCRIPTION,
+            "license": "Apache-2.0",
+            "block_type": "transformation",
+            "ui_manifest": {
+                "section": "analytics",
+                "icon": "far fa-hashtag",
+            },
+        }
+    )
+    type: Literal["care/detections_count@v2"]
+
+    predictions: Selector(
+        kind=[
+            OBJECT_DETECTION_PREDICTION_KIND,
+            INSTANCE_SEGMENTATION_PREDICTION_KIND,
+            KEYPOINT_DETECTION_PREDICTION_KIND,
+        ]
+    ) = Field(
+        description="Predicciones de detección para contar.",
+        examples=["$steps.object_detection_model.predictions"],
+    )
+
+    @classmethod
+    def get_parameters_accepting_batches(cls) -> List[str]:
+        return ["predictions"]
+
+    @classmethod
+    def describe_outputs(cls) -> List[OutputDefinition]:
+        return [
+            OutputDefinition(name="count", kind=[INTEGER_KIND]),
+        ]
+
+    @classmethod
+    def get_execution_engine_compatibility(cls) -> Optional[str]:
+        return ">=1.3.0,<2.0.0"
+
+
+class DetectionsCountBlockV2(WorkflowBlock):
+
+    @classmethod
+    def get_manifest(cls) -> Type[WorkflowBlockManifest]:
+        return BlockManifest
+
+    def run(
+        self,
+        predictions: Batch[Optional[sv.Detections]],
+    ) -> BlockResult:
+        return [
+            {"count": len(detections) if detections is not None else 0}
+            for detections in predictions
+        ]
@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from dataclasses import dataclass
 from typing import List, Literal, Optional, Type, Union
 
 from pydantic import ConfigDict, Field
@@ -50,6 +51,15 @@ class AlarmState(str, Enum):
     COOLDOWN = "cooldown"
 
 
+@dataclass
+class PredictionAlarmState:
+    """State of alarm state machine for single video source."""
+
+    current_state: AlarmState = AlarmState.IDLE
+    last_alarm_at: Optional[datetime] = None
+    alarm_count: int = 0
+
+
 class BlockManifest(WorkflowBlockManifest):
     model_config = ConfigDict(
         json_schema_extra={
@@ -117,9 +127,7 @@ class PredictionAlarmBlockV1(WorkflowBlock):
 
     def __init__(self):
         super().__init__()
-        self._current_state: AlarmState = AlarmState.IDLE
-        self._last_alarm_at: Optional[datetime] = None
-        self._alarm_count: int = 0
+        self._state = PredictionAlarmState()
 
     @classmethod
     def get_manifest(cls) -> Type[WorkflowBlockManifest]:
@@ -146,82 +154,125 @@ class PredictionAlarmBlockV1(WorkflowBlock):
         Returns:
             BlockResult with alarm_active, alarm_message, count_value, state
         """
-        # Runtime validation
-        if threshold <= 0:
-            raise ValueError(f"threshold must be greater than 0, got {threshold}")
-        if hysteresis < 0:
-            raise ValueError(f"hysteresis must be >= 0, got {hysteresis}")
-        if cooldown_seconds < 0:
-            raise ValueError(f"cooldown_seconds must be >= 0, got {cooldown_seconds}")
-        
-        current_time = datetime.now()
-
-        # Calculate thresholds
-        activation_threshold = threshold
-        deactivation_threshold = max(0, threshold - hysteresis)
-
-        # Check if cooldown period has elapsed
-        cooldown_elapsed = True
-        if self._last_alarm_at is not None:
-            time_since_last_alarm = (current_time - self._last_alarm_at).total_seconds()
-            cooldown_elapsed = time_since_last_alarm >= cooldown_seconds
-
-        # State machine logic
-        alarm_active = False
-        alarm_message = ""
-
-        if self._current_state == AlarmState.IDLE:
-            # Transition: IDLE → FIRING
-            if count >= activation_threshold and cooldown_elapsed:
-                self._current_state = AlarmState.FIRING
-                self._last_alarm_at = current_time
-                self._alarm_count += 1
-                alarm_active = True
-                alarm_message = alarm_message_template.format(
-                    count=count, threshold=threshold, hysteresis=hysteresis
-                )
-                logger.info(
-                    f"Alarm FIRED: count={count}, threshold={threshold}, "
-                    f"alarm_count={self._alarm_count}"
-                )
+        validate_prediction_alarm_parameters(
+            threshold=threshold,
+            hysteresis=hysteresis,
+            cooldown_seconds=cooldown_seconds,
+        )
+        return advance_prediction_alarm(
+            state=self._state,
+            count=count,
+            threshold=threshold,
+            hysteresis=hysteresis,
+            cooldown_seconds=cooldown_seconds,
+            alarm_message_template=alarm_message_template,
+            current_time=datetime.now(),
+        )
+
+
+def validate_prediction_alarm_parameters(
+    threshold: int,
+    hysteresis: int,
+    cooldown_seconds: float,
+) -> None:
+    if threshold <= 0:
+        raise ValueError(f"threshold must be greater than 0, got {threshold}")
+    if hysteresis < 0:
+        raise ValueError(f"hysteresis must be >= 0, got {hysteresis}")
+    if cooldown_seconds < 0:
+        raise ValueError(f"cooldown_seconds must be >= 0, got {cooldown_seconds}")
+
+
+def advance_prediction_alarm(
+    state: PredictionAlarmState,
+    count: int,
+    threshold: int,
+    hysteresis: int,
+    cooldown_seconds: float,
+    alarm_message_template: str,
+    current_time: datetime,
+) -> BlockResult:
+    """
+    Advances alarm state machine by one observation.
 
-        elif self._current_state == AlarmState.FIRING:
-            # Stay in FIRING state (alarm remains active)
+    Args:
+        state: State of the alarm, updated in place
+        count: Current detection count
+        threshold: Activation threshold
+        hysteresis: Deactivation offset
+        cooldown_seconds: Minimum time between alarms
+        alarm_message_template: Message template with placeholders
+        current_time: Time of the observation
+
+    Returns:
+        BlockResult with alarm_active, alarm_message, count_value, state
+    """
+    # Calculate thresholds
+    activation_threshold = threshold
+    deactivation_threshold = max(0, threshold - hysteresis)
+
+    # Check if cooldown period has elapsed
+    cooldown_elapsed = True
+    if state.last_alarm_at is not None:
+        time_since_last_alarm = (current_time - state.last_alarm_at).total_seconds()
+        cooldown_elapsed = time_since_last_alarm >= cooldown_seconds
+
+    # State machine logic
+    alarm_active = False
+    alarm_message = ""
+
+    if state.current_state == AlarmState.IDLE:
+        # Transition: IDLE → FIRING
+        if count >= activation_threshold and cooldown_elapsed:
+            state.current_state = AlarmState.FIRING
+            state.last_alarm_at = current_time
+            state.alarm_count += 1
             alarm_active = True
             alarm_message = alarm_message_template.format(
                 count=count, threshold=threshold, hysteresis=hysteresis
             )
+            logger.info(
+                f"Alarm FIRED: count={count}, threshold={threshold}, "
+                f"alarm_count={state.alarm_count}"
+            )
+
+    elif state.current_state == AlarmState.FIRING:
+        # Stay in FIRING state (alarm remains active)
+        alarm_active = True
+        alarm_message = alarm_message_template.format(
+            count=count, threshold=threshold, hysteresis=hysteresis
+        )
 
-            # Transition: FIRING → COOLDOWN (after emitting alarm)
-            self._current_state = AlarmState.COOLDOWN
+        # Transition: FIRING → COOLDOWN (after emitting alarm)
+        state.current_state = AlarmState.COOLDOWN
 
-        elif self._current_state == AlarmState.COOLDOWN:
-            # Transition: COOLDOWN → IDLE
-            if count < deactivation_threshold:
-                self._current_state = AlarmState.IDLE
+    elif state.current_state == AlarmState.COOLDOWN:
+        # Transition: COOLDOWN → IDLE
+        if count < deactivation_threshold:
+            state.current_state = AlarmState.IDLE
+            logger.info(
+                f"Alarm RESET: count={count} < deactivation_threshold={deactivation_threshold}"
+            )
+        elif cooldown_elapsed:
+            # Cooldown expired, check if we should fire again
+            if count >= activation_threshold:
+                state.current_state = AlarmState.FIRING
+                state.last_alarm_at = current_time
+                state.alarm_count += 1
+                alarm_active = True
+                alarm_message = alarm_message_template.format(
+                    count=count, threshold=threshold, hysteresis=hysteresis
+                )
                 logger.info(
-                    f"Alarm RESET: count={count} < deactivation_threshold={deactivation_threshold}"
+                    f"Alarm RE-FIRED: count={count}, threshold={threshold}, "
+                    f"alarm_count={state.alarm_count}"
                 )
-            elif cooldown_elapsed:
-                # Cooldown expired, check if we should fire again
-                if count >= activation_threshold:
-                    self._current_state = AlarmState.FIRING
-                    self._last_alarm_at = current_time
-                    self._alarm_count += 1
-                    alarm_active = True
-                    alarm_message = alarm_message_template.format(
-                        count=count, threshold=threshold, hysteresis=hysteresis
-                    )
-                    logger.info(
-                        f"Alarm RE-FIRED: count={count}, threshold={threshold}, "
-                        f"alarm_count={self._alarm_count}"
-                    )
-                else:
-                    self._current_state = AlarmState.IDLE
-
-        return {
-            "alarm_active": alarm_active,
-            "alarm_message": alarm_message,
-            "count_value": count,
-            "state": self._current_state.value,
-        }
+            else:
+                state.current_state = AlarmState.IDLE
+
+    return {
+        "alarm_active": alarm_active,
+        "alarm_message": alarm_message,
+        "count_value": count,
+        "state": state.current_state.value,
+    }
@@ -0,0 +1,206 @@
+from datetime import datetime
+from typing import Hashable, List, Literal, Optional, Type, Union
+
+from pydantic import ConfigDict, Field
+
+from inference.core.workflows.execution_engine.entities.base import (
+    Batch,
+    OutputDefinition,
+    WorkflowImageData,
+)
+from inference.core.workflows.execution_engine.entities.types import (
+    BOOLEAN_KIND,
+    IMAGE_KIND,
+    INTEGER_KIND,
+    STRING_KIND,
+    Selector,
+)
+from inference.core.workflows.prototypes.block import (
+    BlockResult,
+    WorkflowBlock,
+    WorkflowBlockManifest,
+)
+
+from care.cache.lru_cache import LRUCache
+from care.env import CARE_STEPS_MAX_SOURCES_STATES, CARE_STEPS_SOURCE_STATE_TTL
+from care.workflows.care_steps.common.utils import get_video_sources_keys
+from care.workflows.care_steps.transformations.prediction_alarm.v1 import (
+    PredictionAlarmState,
+    advance_prediction_alarm,
+    validate_prediction_alarm_parameters,
+)
+
+LONG_DESCRIPTION = """
+Batch-oriented version of `care/prediction_alarm@v1`.
+
+All video sources of a batch are processed in a single call - parameters are validated
+once and every source advances its own alarm state machine (IDLE → FIRING → COOLDOWN),
+exactly as separate v1 block would do for that source alone.
+
+Sources are identified by `video_identifier` of `image` (if given) or by batch index
+otherwise - provide `image` when sources may skip frames. State of source not seen for
+`CARE_STEPS_SOURCE_STATE_TTL` seconds is dropped (the alarm starts over as idle), at most
+`CARE_STEPS_MAX_SOURCES_STATES` sources are tracked.
+
+Outputs (per batch element):
+    - alarm_active (bool): TRUE when alarm is firing
+    - alarm_message (str): Formatted message (only when alarm_active=True)
+    - count_value (int): Pass-through of the input count
+    - state (str): Current state for debugging ("idle", "firing", "cooldown")
+"""
+
+SHORT_DESCRIPTION = "Monitor and trigger alarms based on detection counts of all sources."
+
+
+class BlockManifest(WorkflowBlockManifest):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "name": "Prediction Alarm",
+            "version": "v2",
+            "short_description": SHORT_DESCRIPTION,
+            "long_description": LONG_DESCRIPTION,
+            "license": "Apache-2.0",
+            "block_type": "transformation",
+            "ui_manifest": {
+                "section": "analytics",
+                "icon": "far fa-bell",
+                "blockPriority": 3,
+            },
+        }
+    )
+    type: Literal["care/prediction_alarm@v2"]
+    count: Union[int, Selector(kind=[INTEGER_KIND])] = Field(
+        description="Detection count to monitor (typically from detections_count block).",
+        examples=[0, "$steps.count.count"],
+    )
+    threshold: Union[int, Selector(kind=[INTEGER_KIND])] = Field(
+        description="Threshold value to trigger alarm. Alarm activates when count >= threshold.",
+        examples=[1, 5, "$inputs.alarm_threshold"],
+    )
+    hysteresis: Union[int, Selector(kind=[INTEGER_KIND])] = Field(
+        default=0,
+        description="Hysteresis offset for deactivation. Alarm deactivates when count < (threshold - hysteresis).",
+        examples=[0, 1, 2],
+    )
+    cooldown_seconds: Union[float, Selector(kind=[INTEGER_KIND])] = Field(
+        default=5.0,
+        description="Minimum seconds between alarm activations. Prevents alarm spam.",
+        examples=[5.0, 10.0, 30.0],
+    )
+    alarm_message_template: Union[str, Selector(kind=[STRING_KIND])] = Field(
+        default="Alert: {count} detection(s) (threshold: {threshold})",
+        description="Message template with placeholders: {count}, {threshold}, {hysteresis}.",
+        examples=[
+            "Alert: {count} person(s) detected!",
+            "Warning: {count} objects exceed threshold {threshold}",
+        ],
+    )
+    image: Optional[Selector(kind=[IMAGE_KIND])] = Field(
+        default=None,
+        description="Images the counts refer to, used to keep separate alarm state per video source.",
+        examples=["$inputs.image"],
+    )
+
+    @classmethod
+    def get_parameters_accepting_batches(cls) -> List[str]:
+        return ["image"]
+
+    @classmethod
+    def get_parameters_accepting_batches_and_scalars(cls) -> List[str]:
+        return ["count"]
+
+    @classmethod
+    def describe_outputs(cls) -> List[OutputDefinition]:
+        return [
+            OutputDefinition(name="alarm_active", kind=[BOOLEAN_KIND]),
+            OutputDefinition(name="alarm_message", kind=[STRING_KIND]),
+            OutputDefinition(name="count_value", kind=[INTEGER_KIND]),
+            OutputDefinition(name="state", kind=[STRING_KIND]),
+        ]
+
+    @classmethod
+    def get_execution_engine_compatibility(cls) -> Optional[str]:
+        return ">=1.4.0,<2.0.0"
+
+
+class PredictionAlarmBlockV2(WorkflowBlock):
+    """
+    Prediction Alarm block processing whole batch at once, with state per video source.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # states of sources which are no longer processed expire
+        self._states = LRUCache(
+            capacity=CARE_STEPS_MAX_SOURCES_STATES, ttl=CARE_STEPS_SOURCE_STATE_TTL
+        )
+
+    @classmethod
+    def get_manifest(cls) -> Type[WorkflowBlockManifest]:
+        return BlockManifest
+
+    def run(
+        self,
+        count: Union[int, Batch[int]],
+        threshold: int,
+        hysteresis: int = 0,
+        cooldown_seconds: float = 5.0,
+        alarm_message_template: str = "Alert: {count} detection(s) (threshold: {threshold})",
+        image: Optional[Batch[WorkflowImageData]] = None,
+    ) -> BlockResult:
+        validate_prediction_alarm_parameters(
+            threshold=threshold,
+            hysteresis=hysteresis,
+            cooldown_seconds=cooldown_seconds,
+        )
+        current_time = datetime.now()
+        if not isinstance(count, Batch) and image is None:
+            return self._advance(
+                key=None,
+                count=count,
+                threshold=threshold,
+                hysteresis=hysteresis,
+                cooldown_seconds=cooldown_seconds,
+                alarm_message_template=alarm_message_template,
+                current_time=current_time,
+            )
+        reference_batch = count if isinstance(count, Batch) else image
+        counts = count if isinstance(count, Batch) else [count] * len(image)
+        keys = get_video_sources_keys(batch=reference_batch, images=image)
+        return [
+            self._advance(
+                key=key,
+                count=element_count,
+                threshold=threshold,
+                hysteresis=hysteresis,
+                cooldown_seconds=cooldown_seconds,
+                alarm_message_template=alarm_message_template,
+                current_time=current_time,
+            )
+            for key, element_count in zip(keys, counts)
+        ]
+
+    def _advance(
+        self,
+        key: Hashable,
+        count: int,
+        threshold: int,
+        hysteresis: int,
+        cooldown_seconds: float,
+        alarm_message_template: str,
+        current_time: datetime,
+    ) -> dict:
+        state = self._states.get(key)
+        if state is None:
+            state = PredictionAlarmState()
+        # re-inserted to refresh expiry of the state
+        self._states[key] = state
+        return advance_prediction_alarm(
+            state=state,
+            count=count,
+            threshold=threshold,
+            hysteresis=hysteresis,
+            cooldown_seconds=cooldown_seconds,
+            alarm_message_template=alarm_message_template,
+            current_time=current_time,
+        )
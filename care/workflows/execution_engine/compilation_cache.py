@@ -0,0 +1,189 @@
+"""Cache of compiled workflows.
+
+Compilation of workflow (parsing manifests, building and validating execution graph,
+initialising steps) is repeated by every `ExecutionEngine.init(...)` call. Compiled engines
+are kept here, keyed by canonical hash of:
+
+* workflow definition (JSON with sorted keys),
+* selected Execution Engine version,
+* set of workflows plugins,
+* init parameters - primitives are compared by value, other objects (model managers,
+  thread pools, ...) by type, as `ExecutionEngine` re-initialises steps of leased engine
+  with init parameters of its new user,
+* engine options, except for profiler and executor bound anew to leased engine -
+  primitives are compared by value, other objects (e.g. step error handler) by identity.
+  Idle engine keeps strong references to its options, so their ids are not reused while
+  it is cached.
+
+Compiled engine holds initialised steps, which may be stateful (trackers, timers, alarms).
+That is why engines are leased - `acquire(...)` hands an idle engine out exclusively and
+`release(...)` puts it back once its user (pipeline, request) is done with it. Two users
+running the same definition at the same time never share steps, and `ExecutionEngine`
+drops steps of released engine, so that state of steps is not carried into the next lease.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from care.cache.lru_cache import LRUCache
+from care.env import (
+    WORKFLOWS_COMPILATION_CACHE_MAX_IDLE_ENGINES,
+    WORKFLOWS_COMPILATION_CACHE_SIZE,
+)
+from care.workflows.execution_engine.entities.engine import BaseExecutionEngine
+from care.workflows.execution_engine.introspection.blocks_loader import (
+    get_plugin_modules,
+)
+
+PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True)
+class CompiledWorkflowsCacheStats:
+    hits: int
+    misses: int
+    definitions: int
+    idle_engines: int
+
+
+@dataclass
+class _IdleEngine:
+    engine: BaseExecutionEngine
+    # strong references keep objects alive, so their ids cannot be reused while engine is cached
+    engine_options: Dict[str, Any]
+
+
+def compute_compilation_key(
+    workflow_definition: dict,
+    engine_version: str,
+    init_parameters: Optional[Dict[str, Any]],
+    engine_options: Dict[str, Any],
+    plugins: Optional[List[str]] = None,
+) -> Optional[str]:
+    """Computes canonical hash identifying compiled workflow.
+
+    Args:
+        workflow_definition (dict): Workflow definition.
+        engine_version (str): Version of Execution Engine selected for definition.
+        init_parameters (Optional[Dict[str, Any]]): Init parameters of workflow steps.
+        engine_options (Dict[str, Any]): Remaining `ExecutionEngine.init(...)` arguments.
+        plugins (Optional[List[str]]): Workflows plugins, by default taken from environment.
+
+    Returns:
+        Optional[str]: Hex digest, or None if definition cannot be canonically serialised
+            (in such case workflow should not be cached).
+    """
+    if plugins is None:
+        plugins = get_plugin_modules()
+    try:
+        serialised_definition = json.dumps(
+            workflow_definition, sort_keys=True, separators=(",", ":")
+        )
+    except (TypeError, ValueError):
+        return None
+    key_payload = json.dumps(
+        {
+            "definition": serialised_definition,
+            "engine_version": engine_version,
+            "plugins": sorted(set(plugins)),
+            "init_parameters": _describe_identities(
+                init_parameters or {}, by_identity=False
+            ),
+            "engine_options": _describe_identities(engine_options, by_identity=True),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_payload.encode("utf-8")).hexdigest()
+
+
+def _describe_identities(values: Dict[str, Any], by_identity: bool) -> Dict[str, str]:
+    return {
+        str(name): _describe_identity(value, by_identity=by_identity)
+        for name, value in values.items()
+    }
+
+
+def _describe_identity(value: Any, by_identity: bool) -> str:
+    value_type = type(value)
+    type_name = f"{value_type.__module__}.{value_type.__qualname__}"
+    if isinstance(value, PRIMITIVE_TYPES):
+        return f"{type_name}:{value!r}"
+    if not by_identity:
+        return type_name
+    return f"{type_name}@{id(value)}"
+
+
+class CompiledWorkflowsCache:
+    def __init__(
+        self,
+        capacity: int = WORKFLOWS_COMPILATION_CACHE_SIZE,
+        max_idle_engines: int = WORKFLOWS_COMPILATION_CACHE_MAX_IDLE_ENGINES,
+    ):
+        """Pool of idle compiled engines, grouped by compilation key.
+
+        Args:
+            capacity (int): Max number of distinct compilation keys, 0 disables the cache.
+            max_idle_engines (int): Max number of idle engines kept for single key.
+        """
+        self.capacity = capacity
+        self.max_idle_engines = max_idle_engines
+        # compilation key -> list of idle engines
+        self._idle_engines = LRUCache(capacity=max(capacity, 1))
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0 and self.max_idle_engines > 0
+
+    def acquire(self, key: str) -> Optional[BaseExecutionEngine]:
+        with self._lock:
+            idle_engines = self._idle_engines.get(key)
+            if not idle_engines:
+                self._misses += 1
+                return None
+            idle_engine = idle_engines.pop()
+            if not idle_engines:
+                self._idle_engines.pop(key)
+            self._hits += 1
+            return idle_engine.engine
+
+    def release(
+        self,
+        key: str,
+        engine: BaseExecutionEngine,
+        engine_options: Dict[str, Any],
+    ) -> None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            idle_engines = self._idle_engines.get(key)
+            if idle_engines is None:
+                idle_engines = []
+            if len(idle_engines) >= self.max_idle_engines:
+                return None
+            idle_engines.append(
+                _IdleEngine(engine=engine, engine_options=engine_options)
+            )
+            self._idle_engines.set(key, idle_engines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle_engines.clear()
+
+    def stats(self) -> CompiledWorkflowsCacheStats:
+        with self._lock:
+            idle_engines = self._idle_engines.items()
+            return CompiledWorkflowsCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                definitions=len(idle_engines),
+                idle_engines=sum(len(engines) for _, engines in idle_engines),
+            )
+
+
+COMPILED_WORKFLOWS_CACHE = CompiledWorkflowsCache()
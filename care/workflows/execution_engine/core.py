@@ -1,9 +1,23 @@
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
+from care.env import WORKFLOWS_STEPS_DEDUPLICATION_ENABLED
+from care.logger import logger
+from care.workflows.execution_engine.compilation_cache import (
+    COMPILED_WORKFLOWS_CACHE,
+    compute_compilation_key,
+)
+from care.workflows.execution_engine.introspection.blocks_loader import (
+    load_initializers,
+)
+from care.workflows.execution_engine.optimization import (
+    WorkflowOptimizationReport,
+    eliminate_common_steps,
+)
 from inference.core.workflows.errors import (
     NotSupportedExecutionEngineError,
     WorkflowDefinitionError,
@@ -12,7 +26,13 @@ from inference.core.workflows.errors import (
 from inference.core.workflows.execution_engine.entities.engine import (
     BaseExecutionEngine,
 )
-from inference.core.workflows.execution_engine.profiling.core import WorkflowsProfiler
+from inference.core.workflows.execution_engine.profiling.core import (
+    NullWorkflowsProfiler,
+    WorkflowsProfiler,
+)
+from inference.core.workflows.execution_engine.v1.compiler.steps_initialiser import (
+    initialise_step,
+)
 from inference.core.workflows.execution_engine.v1.core import (
     DEFAULT_WORKFLOWS_STEP_ERROR_HANDLER,
     EXECUTION_ENGINE_V1_VERSION,
@@ -22,6 +42,8 @@ from inference.core.workflows.execution_engine.v1.core import (
 REGISTERED_ENGINES = {
     EXECUTION_ENGINE_V1_VERSION: ExecutionEngineV1,
 }
+# engine options bound anew to engine leased from compilation cache
+REBOUND_ENGINE_OPTIONS = ("profiler", "executor")
 
 
 def get_available_versions() -> List[str]:
@@ -50,23 +72,103 @@ class ExecutionEngine(BaseExecutionEngine):
         engine_type = _select_execution_engine(
             requested_engine_version=requested_engine_version
         )
+        init_parameters = dict(init_parameters or {})
+        init_parameters.setdefault(
+            "dynamic_workflows_blocks.api_key", init_parameters.get("workflows_core.api_key")
+        )
+        optimization_report = None
+        if WORKFLOWS_STEPS_DEDUPLICATION_ENABLED:
+            workflow_definition, optimization_report = eliminate_common_steps(
+                workflow_definition=workflow_definition
+            )
+            if optimization_report.eliminated_steps > 0:
+                logger.info(
+                    f"Workflow `{workflow_id}` - merged duplicated steps: "
+                    f"{optimization_report.merged_steps} "
+                    f"({optimization_report.steps_before} -> "
+                    f"{optimization_report.steps_after} steps)"
+                )
+        engine_options = {
+            "max_concurrent_steps": max_concurrent_steps,
+            "prevent_local_images_loading": prevent_local_images_loading,
+            "workflow_id": workflow_id,
+            "profiler": profiler,
+            "executor": executor,
+            "step_error_handler": step_error_handler,
+        }
+        cached_engine_options = {
+            name: value
+            for name, value in engine_options.items()
+            if name not in REBOUND_ENGINE_OPTIONS
+        }
+        compilation_key = None
+        if COMPILED_WORKFLOWS_CACHE.enabled and engine_type is ExecutionEngineV1:
+            compilation_key = compute_compilation_key(
+                workflow_definition=workflow_definition,
+                engine_version=f"{engine_type.__module__}.{engine_type.__qualname__}:"
+                f"{requested_engine_version}",
+                init_parameters=init_parameters,
+                engine_options=cached_engine_options,
+            )
+        if compilation_key is not None:
+            engine = COMPILED_WORKFLOWS_CACHE.acquire(key=compilation_key)
+            if engine is not None:
+                _bind_leased_engine(
+                    engine=engine,
+                    init_parameters=init_parameters,
+                    profiler=profiler,
+                    executor=executor,
+                )
+                return cls(
+                    engine=engine,
+                    compilation_key=compilation_key,
+                    engine_options=cached_engine_options,
+                    optimization_report=optimization_report,
+                )
         engine = engine_type.init(
             workflow_definition=workflow_definition,
             init_parameters=init_parameters,
-            max_concurrent_steps=max_concurrent_steps,
-            prevent_local_images_loading=prevent_local_images_loading,
-            workflow_id=workflow_id,
-            profiler=profiler,
-            executor=executor,
-            step_error_handler=step_error_handler,
+            **engine_options,
+        )
+        return cls(
+            engine=engine,
+            compilation_key=compilation_key,
+            engine_options=cached_engine_options,
+            optimization_report=optimization_report,
         )
-        return cls(engine=engine)
 
     def __init__(
         self,
         engine: BaseExecutionEngine,
+        compilation_key: Optional[str] = None,
+        engine_options: Optional[Dict[str, Any]] = None,
+        optimization_report: Optional[WorkflowOptimizationReport] = None,
     ):
         self._engine = engine
+        self._compilation_key = compilation_key
+        self._engine_options = engine_options or {}
+        self._optimization_report = optimization_report
+
+    @property
+    def optimization_report(self) -> Optional[WorkflowOptimizationReport]:
+        """Savings of optimisation passes applied to the compiled definition."""
+        return self._optimization_report
+
+    def release(self) -> None:
+        """Returns compiled engine to the cache, so that next `init(...)` with the same
+        definition can reuse it. Steps are dropped, so that their state and references to
+        init parameters (model manager, thread pool) do not outlive the pipeline - next
+        user of the engine gets steps initialised anew. Engine must not be used afterwards.
+        """
+        if self._compilation_key is None:
+            return None
+        _unbind_released_engine(engine=self._engine)
+        COMPILED_WORKFLOWS_CACHE.release(
+            key=self._compilation_key,
+            engine=self._engine,
+            engine_options=self._engine_options,
+        )
+        self._compilation_key = None
 
     def run(
         self,
@@ -83,6 +185,41 @@ class ExecutionEngine(BaseExecutionEngine):
         )
 
 
+def _bind_leased_engine(
+    engine: ExecutionEngineV1,
+    init_parameters: Dict[str, Any],
+    profiler: Optional[WorkflowsProfiler],
+    executor: Optional[ThreadPoolExecutor],
+) -> None:
+    compiled_workflow = engine._compiled_workflow
+    initializers = load_initializers()
+    steps = {
+        step_name: initialise_step(
+            step_manifest=step.manifest,
+            block_specification=step.block_specification,
+            explicit_init_parameters=init_parameters,
+            initializers=initializers,
+        )
+        for step_name, step in compiled_workflow.steps.items()
+    }
+    engine._compiled_workflow = replace(
+        compiled_workflow, steps=steps, init_parameters=init_parameters
+    )
+    engine._profiler = profiler if profiler is not None else NullWorkflowsProfiler.init()
+    engine._executor = executor
+
+
+def _unbind_released_engine(engine: ExecutionEngineV1) -> None:
+    compiled_workflow = engine._compiled_workflow
+    steps = {
+        step_name: replace(step, step=None)
+        for step_name, step in compiled_workflow.steps.items()
+    }
+    engine._compiled_workflow = replace(compiled_workflow, steps=steps, init_parameters={})
+    engine._profiler = None
+    engine._executor = None
+
+
 def retrieve_requested_execution_engine_version(workflow_definition: dict) -> Version:
     raw_version = workflow_definition.get("version")
     if raw_version:
@@ -0,0 +1,199 @@
+"""Workflow-level optimisation passes applied before compilation.
+
+`eliminate_common_steps(...)` performs common subexpression elimination over workflow
+steps: steps of the same type, with identical parameters and identical input selectors,
+compute the same outputs - so only one of them is kept and selectors pointing at the
+others are redirected to it. Pass is repeated until fixed point, as merging upstream steps
+makes their consumers identical.
+
+Steps are merged only if that cannot be observed in workflow results, so only steps of
+explicitly listed block types are considered - blocks which are stateless, deterministic
+and do not mint new detections ids. In particular:
+
+* model steps are never merged - each of them gives its predictions unique `detection_id`,
+  and merged steps would share them,
+* steps with side effects (sinks, notifications, uploads), stateful steps (trackers,
+  alarms, timers) and non-deterministic ones (LLM / VLM calls, `RandomNumber` operation)
+  are never merged,
+* steps being targets of flow-control (referenced as whole, e.g. `next_steps` of
+  `continue_if`) are never merged, as their execution depends on the branch.
+
+Workflow outputs keep their names, only selectors are rewritten.
+"""
+
+import json
+import re
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+# types of stateless, deterministic blocks not creating new detections ids
+MERGEABLE_STEP_TYPES = frozenset(
+    {
+        "care/detections_count@v1",
+        "care/detections_count@v2",
+        "roboflow_core/bounding_rect@v1",
+        "roboflow_core/detections_filter@v1",
+        "DetectionsFilter",
+        "roboflow_core/detections_transformation@v1",
+        "DetectionsTransformation",
+        "roboflow_core/dimension_collapse@v1",
+        "DimensionCollapse",
+        "roboflow_core/expression@v1",
+        "Expression",
+        "roboflow_core/first_non_empty_or_default@v1",
+        "FirstNonEmptyOrDefault",
+        "roboflow_core/json_parser@v1",
+        "roboflow_core/property_definition@v1",
+        "PropertyDefinition",
+        "PropertyExtraction",
+    }
+)
+# UQL operations giving different result on each evaluation
+NON_DETERMINISTIC_OPERATIONS = frozenset({"RandomNumber"})
+STEP_SELECTOR_PATTERN = re.compile(r"^\$steps\.([^.]+)(\..*)?$")
+
+
+@dataclass(frozen=True)
+class WorkflowOptimizationReport:
+    steps_before: int
+    steps_after: int
+    # name of eliminated step -> name of step computing its outputs
+    merged_steps: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def eliminated_steps(self) -> int:
+        return self.steps_before - self.steps_after
+
+    def to_dict(self) -> dict:
+        return {
+            "steps_before": self.steps_before,
+            "steps_after": self.steps_after,
+            "eliminated_steps": self.eliminated_steps,
+            "merged_steps": dict(self.merged_steps),
+        }
+
+
+def eliminate_common_steps(
+    workflow_definition: dict,
+) -> Tuple[dict, WorkflowOptimizationReport]:
+    """Merges duplicated steps of workflow definition.
+
+    Args:
+        workflow_definition (dict): Workflow definition, it is not modified.
+
+    Returns:
+        Tuple[dict, WorkflowOptimizationReport]: Optimised definition (the input definition
+            itself if nothing could be merged) and report of the savings.
+    """
+    steps = workflow_definition.get("steps")
+    if not isinstance(steps, list):
+        return workflow_definition, WorkflowOptimizationReport(
+            steps_before=0, steps_after=0
+        )
+    flow_control_targets = _find_whole_step_references(steps)
+    merged_steps = {}
+    while True:
+        kept_steps = []
+        steps_by_signature = {}
+        for step in steps:
+            signature = None
+            if _is_step_mergeable(step=step, flow_control_targets=flow_control_targets):
+                signature = _compute_step_signature(step=step)
+            if signature is None:
+                kept_steps.append(step)
+            elif signature in steps_by_signature:
+                merged_steps[step["name"]] = steps_by_signature[signature]
+            else:
+                steps_by_signature[signature] = step["name"]
+                kept_steps.append(step)
+        if len(kept_steps) == len(steps):
+            break
+        steps = [
+            _rename_selectors(value=step, merged_steps=merged_steps)
+            for step in kept_steps
+        ]
+    report = WorkflowOptimizationReport(
+        steps_before=len(workflow_definition["steps"]),
+        steps_after=len(steps),
+        merged_steps={
+            name: _resolve_step_name(name=name, merged_steps=merged_steps)
+            for name in merged_steps
+        },
+    )
+    if not merged_steps:
+        return workflow_definition, report
+    optimised_definition = {
+        key: value for key, value in workflow_definition.items() if key != "steps"
+    }
+    optimised_definition["steps"] = steps
+    if "outputs" in workflow_definition:
+        optimised_definition["outputs"] = _rename_selectors(
+            value=deepcopy(workflow_definition["outputs"]),
+            merged_steps=merged_steps,
+        )
+    return optimised_definition, report
+
+
+def _find_whole_step_references(value: Any) -> Set[str]:
+    if isinstance(value, str):
+        match = STEP_SELECTOR_PATTERN.match(value)
+        if match is not None and match.group(2) is None:
+            return {match.group(1)}
+        return set()
+    if isinstance(value, dict):
+        return set().union(*(_find_whole_step_references(v) for v in value.values()))
+    if isinstance(value, list):
+        return set().union(*(_find_whole_step_references(v) for v in value))
+    return set()
+
+
+def _is_step_mergeable(step: Any, flow_control_targets: Set[str]) -> bool:
+    if not isinstance(step, dict):
+        return False
+    step_type, step_name = step.get("type"), step.get("name")
+    if not isinstance(step_type, str) or not isinstance(step_name, str):
+        return False
+    if step_type not in MERGEABLE_STEP_TYPES or step_name in flow_control_targets:
+        return False
+    return not _uses_non_deterministic_operations(value=step)
+
+
+def _uses_non_deterministic_operations(value: Any) -> bool:
+    if isinstance(value, dict):
+        if value.get("type") in NON_DETERMINISTIC_OPERATIONS:
+            return True
+        return any(_uses_non_deterministic_operations(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_uses_non_deterministic_operations(v) for v in value)
+    return False
+
+
+def _compute_step_signature(step: dict) -> Optional[str]:
+    try:
+        return json.dumps(
+            {key: value for key, value in step.items() if key != "name"},
+            sort_keys=True,
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def _rename_selectors(value: Any, merged_steps: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        match = STEP_SELECTOR_PATTERN.match(value)
+        if match is None or match.group(1) not in merged_steps:
+            return value
+        step_name = _resolve_step_name(name=match.group(1), merged_steps=merged_steps)
+        return f"$steps.{step_name}{match.group(2) or ''}"
+    if isinstance(value, dict):
+        return {k: _rename_selectors(v, merged_steps) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rename_selectors(v, merged_steps) for v in value]
+    return value
+
+
+def _resolve_step_name(name: str, merged_steps: Dict[str, str]) -> str:
+    while name in merged_steps:
+        name = merged_steps[name]
+    return name
@@ -1,11 +1,16 @@
 import functools
+import glob
+import json
 import os
 import threading
 import time
 from abc import ABC, abstractmethod
 from collections import deque
 from contextlib import contextmanager
-from typing import Any, Deque, Dict, Generator, List, Optional, Union
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Generator, List, Optional, Union
+
+TRACE_FILE_PREFIX = "workflows_trace_"
 
 
 class WorkflowsProfiler(ABC):
@@ -128,6 +133,7 @@ class BaseWorkflowsProfiler(WorkflowsProfiler):
     def __init__(self, runs_buffer: Deque[List[dict]]):
         self._runs_buffer = runs_buffer
         self._current_run_events = []
+        self._pid = os.getpid()
 
     def start_workflow_run(self) -> None:
         if self._current_run_events:
@@ -153,7 +159,7 @@ class BaseWorkflowsProfiler(WorkflowsProfiler):
         categories: Optional[List[str]] = None,
         metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
     ) -> Generator[None, None, None]:
-        start_ts = round(time.monotonic() * 10**6)
+        start_ts = time.monotonic_ns() // 1000
         try:
             yield None
         except Exception as e:
@@ -162,7 +168,7 @@ class BaseWorkflowsProfiler(WorkflowsProfiler):
             )
             raise e
         finally:
-            duration = round(time.monotonic() * 10**6) - start_ts
+            duration = time.monotonic_ns() // 1000 - start_ts
             self._add_event(
                 name=name,
                 event_type="X",
@@ -218,16 +224,35 @@ class BaseWorkflowsProfiler(WorkflowsProfiler):
         extra_event_fields: Optional[Dict[str, Any]] = None,
         timestamp: Optional[int] = None,
     ) -> None:
+        event = self._create_event(
+            name=name,
+            event_type=event_type,
+            categories=categories,
+            metadata=metadata,
+            extra_event_fields=extra_event_fields,
+            timestamp=timestamp,
+        )
+        self._current_run_events.append(event)
+
+    def _create_event(
+        self,
+        name: str,
+        event_type: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+        extra_event_fields: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[int] = None,
+    ) -> dict:
         event = {
             "name": name,
             "ph": event_type,
-            "pid": os.getpid(),
+            "pid": self._pid,
             "tid": threading.get_native_id(),
         }
         if timestamp is not None:
             event["ts"] = timestamp
         else:
-            event["ts"] = round(time.monotonic() * 10**6)
+            event["ts"] = time.monotonic_ns() // 1000
         if categories:
             event["cat"] = ",".join(categories)
         if metadata:
@@ -235,7 +260,362 @@ class BaseWorkflowsProfiler(WorkflowsProfiler):
         if extra_event_fields:
             for k, v in extra_event_fields.items():
                 event[k] = v
-        self._current_run_events.append(event)
+        return event
+
+
+class SamplingWorkflowsProfiler(BaseWorkflowsProfiler):
+
+    @classmethod
+    def init(
+        cls,
+        max_runs_in_buffer: int = 32,
+        sample_every_n_runs: int = 1,
+        min_sampling_interval: float = 0.0,
+        traces_directory: Optional[str] = None,
+        runs_per_trace_file: int = 0,
+        max_trace_files: int = 10,
+        **kwargs,
+    ) -> "SamplingWorkflowsProfiler":
+        """Profiler recording only selected workflow runs.
+
+        Run is sampled if it is the `sample_every_n_runs`-th run and at least
+        `min_sampling_interval` seconds passed since start of previously sampled run. Outside of
+        sampled runs every profiler method returns immediately, so the profiler can stay enabled
+        in production pipelines. Spans recorded by `profile_detached_phase(...)` (pipeline sinks,
+        running on dispatching thread when run of their frames is already over) are sampled
+        on their own, by the same rules, and kept as separate entries of the runs buffer.
+
+        Args:
+            max_runs_in_buffer (int): Max number of sampled runs kept in memory.
+            sample_every_n_runs (int): Sampling period in workflow runs (frames).
+            min_sampling_interval (float): Min time (in seconds) between sampled runs.
+            traces_directory (Optional[str]): Directory for Chrome Trace Event files.
+            runs_per_trace_file (int): Number of sampled runs written into single trace file,
+                0 disables periodic flushing (trace may still be saved with `flush_trace()`).
+            max_trace_files (int): Max number of trace files kept in `traces_directory`,
+                the oldest are removed.
+        """
+        runs_buffer = deque(maxlen=max_runs_in_buffer)
+        return cls(
+            runs_buffer=runs_buffer,
+            sample_every_n_runs=sample_every_n_runs,
+            min_sampling_interval=min_sampling_interval,
+            traces_directory=traces_directory,
+            runs_per_trace_file=runs_per_trace_file,
+            max_trace_files=max_trace_files,
+        )
+
+    def __init__(
+        self,
+        runs_buffer: Deque[List[dict]],
+        sample_every_n_runs: int = 1,
+        min_sampling_interval: float = 0.0,
+        traces_directory: Optional[str] = None,
+        runs_per_trace_file: int = 0,
+        max_trace_files: int = 10,
+    ):
+        super().__init__(runs_buffer=runs_buffer)
+        self._sample_every_n_runs = max(sample_every_n_runs, 1)
+        self._min_sampling_interval_ns = int(min_sampling_interval * 10**9)
+        self._traces_directory = traces_directory
+        self._runs_per_trace_file = runs_per_trace_file
+        self._max_trace_files = max_trace_files
+        self._runs_counter = 0
+        self._sampled_runs_counter = 0
+        self._runs_since_flush = 0
+        self._last_sample_ts: Optional[int] = None
+        self._detached_phases_counter = 0
+        self._last_detached_sample_ts: Optional[int] = None
+        # events of sampled run in progress, None if the run is not sampled - spans capture
+        # the run they started in, so they never end up in events of another run
+        self._current_run: Optional[List[dict]] = None
+        # shared by recording of events and flushing of the runs buffer
+        self._lock = threading.Lock()
+
+    @property
+    def is_sampling(self) -> bool:
+        return self._current_run is not None
+
+    @property
+    def traces_directory(self) -> Optional[str]:
+        return self._traces_directory
+
+    def start_workflow_run(self) -> None:
+        with self._lock:
+            self._runs_counter += 1
+            if not self._should_sample(
+                calls_counter=self._runs_counter, last_sample_ts=self._last_sample_ts
+            ):
+                self._current_run = None
+                return None
+            self._last_sample_ts = time.monotonic_ns()
+            self._sampled_runs_counter += 1
+            self._current_run = [
+                self._create_event(name="workflow_run", event_type="B")
+            ]
+
+    def end_workflow_run(self) -> None:
+        with self._lock:
+            run = self._current_run
+            if run is None:
+                return None
+            self._current_run = None
+            run.append(self._create_event(name="workflow_run", event_type="E"))
+            self._runs_buffer.append(run)
+            self._runs_since_flush += 1
+            flush_needed = (
+                self._traces_directory
+                and self._runs_per_trace_file > 0
+                and self._runs_since_flush >= self._runs_per_trace_file
+            )
+        if flush_needed:
+            self.flush_trace()
+
+    @contextmanager
+    def profile_execution_phase(
+        self,
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> Generator[None, None, None]:
+        run = self._current_run
+        if run is None:
+            yield None
+            return None
+        with self._record_span(
+            run=run, name=name, categories=categories, metadata=metadata
+        ):
+            yield None
+
+    @contextmanager
+    def profile_detached_phase(
+        self,
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> Generator[None, None, None]:
+        """Records span of work done outside of workflow runs, e.g. pipeline sink."""
+        with self._lock:
+            self._detached_phases_counter += 1
+            sampled = self._should_sample(
+                calls_counter=self._detached_phases_counter,
+                last_sample_ts=self._last_detached_sample_ts,
+            )
+            if sampled:
+                self._last_detached_sample_ts = time.monotonic_ns()
+        if not sampled:
+            yield None
+            return None
+        events = []
+        try:
+            with self._record_span(
+                run=events, name=name, categories=categories, metadata=metadata
+            ):
+                yield None
+        finally:
+            with self._lock:
+                self._runs_buffer.append(events)
+
+    def start_execution_phase(
+        self,
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> None:
+        self._record_event(
+            run=self._current_run,
+            name=name,
+            event_type="B",
+            categories=categories,
+            metadata=metadata,
+        )
+
+    def end_execution_phase(
+        self,
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> None:
+        self._record_event(
+            run=self._current_run,
+            name=name,
+            event_type="E",
+            categories=categories,
+            metadata=metadata,
+        )
+
+    def notify_event(
+        self,
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> None:
+        self._record_event(
+            run=self._current_run,
+            name=name,
+            event_type="I",
+            categories=categories,
+            metadata=metadata,
+        )
+
+    def export_trace(self) -> List[dict]:
+        with self._lock:
+            return [event for run in self._runs_buffer for event in run]
+
+    def export_chrome_trace(self) -> dict:
+        return to_chrome_trace(
+            events=self.export_trace(), metadata=self._describe_sampling()
+        )
+
+    def flush_trace(self) -> Optional[str]:
+        """Writes sampled runs into new trace file and clears the buffer.
+
+        Returns:
+            Optional[str]: Path of the trace file, None if there was nothing to save or
+                traces directory is not configured.
+        """
+        if not self._traces_directory:
+            return None
+        with self._lock:
+            events = [event for run in self._runs_buffer for event in run]
+            self._runs_buffer.clear()
+            self._runs_since_flush = 0
+            metadata = self._describe_sampling()
+        if not events:
+            return None
+        return save_chrome_trace(
+            directory=self._traces_directory,
+            trace=to_chrome_trace(events=events, metadata=metadata),
+            max_trace_files=self._max_trace_files,
+        )
+
+    @contextmanager
+    def _record_span(
+        self,
+        run: List[dict],
+        name: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+    ) -> Generator[None, None, None]:
+        start_ts = time.monotonic_ns() // 1000
+        try:
+            yield None
+        except Exception as e:
+            self._record_event(run=run, name=f"{name}_error", event_type="I")
+            raise e
+        finally:
+            duration = time.monotonic_ns() // 1000 - start_ts
+            self._record_event(
+                run=run,
+                name=name,
+                event_type="X",
+                categories=categories,
+                metadata=metadata,
+                extra_event_fields={"dur": duration},
+                timestamp=start_ts,
+            )
+
+    def _record_event(
+        self,
+        run: Optional[List[dict]],
+        name: str,
+        event_type: str,
+        categories: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Union[str, int, float, bool, list, dict]]] = None,
+        extra_event_fields: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[int] = None,
+    ) -> None:
+        if run is None:
+            return None
+        event = self._create_event(
+            name=name,
+            event_type=event_type,
+            categories=categories,
+            metadata=metadata,
+            extra_event_fields=extra_event_fields,
+            timestamp=timestamp,
+        )
+        with self._lock:
+            run.append(event)
+
+    def _describe_sampling(self) -> Dict[str, Any]:
+        return {
+            "workflow_runs": self._runs_counter,
+            "sampled_workflow_runs": self._sampled_runs_counter,
+            "sample_every_n_runs": self._sample_every_n_runs,
+            "min_sampling_interval_ns": self._min_sampling_interval_ns,
+        }
+
+    def _should_sample(self, calls_counter: int, last_sample_ts: Optional[int]) -> bool:
+        if (calls_counter - 1) % self._sample_every_n_runs != 0:
+            return False
+        if self._min_sampling_interval_ns <= 0 or last_sample_ts is None:
+            return True
+        return time.monotonic_ns() - last_sample_ts >= self._min_sampling_interval_ns
+
+
+def to_chrome_trace(
+    events: List[dict],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> dict:
+    """Wraps profiler events into Chrome Trace Event (JSON Object Format) document,
+    which can be opened in `chrome://tracing` or Perfetto UI."""
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": metadata or {},
+    }
+
+
+def save_chrome_trace(
+    directory: str,
+    trace: dict,
+    max_trace_files: int = 10,
+) -> str:
+    directory = os.path.abspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    formatted_time = datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f")
+    trace_path = os.path.join(directory, f"{TRACE_FILE_PREFIX}{formatted_time}.json")
+    tmp_path = f"{trace_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(trace, f)
+    os.replace(tmp_path, trace_path)
+    if max_trace_files > 0:
+        rotate_trace_files(directory=directory, max_trace_files=max_trace_files)
+    return trace_path
+
+
+def rotate_trace_files(directory: str, max_trace_files: int) -> None:
+    trace_files = sorted(
+        glob.glob(os.path.join(directory, f"{TRACE_FILE_PREFIX}*.json"))
+    )
+    for path in trace_files[: max(len(trace_files) - max_trace_files, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def profiled(
+    func: Callable,
+    profiler: WorkflowsProfiler,
+    name: str,
+    categories: Optional[List[str]] = None,
+) -> Callable:
+    """Wraps callable (e.g. pipeline sink), so that its calls are recorded as spans.
+    Sampling profiler records them apart from workflow runs, as callable is expected to run
+    outside of them (sink is called on dispatching thread, while the next run is ongoing)."""
+    if isinstance(profiler, SamplingWorkflowsProfiler):
+        profile_phase = profiler.profile_detached_phase
+    else:
+        profile_phase = profiler.profile_execution_phase
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_phase(name=name, categories=categories):
+            return func(*args, **kwargs)
+
+    return wrapper
 
 
 def execution_phase(
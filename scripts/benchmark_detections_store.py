@@ -0,0 +1,135 @@
+"""Benchmark of append and query throughput of `DetectionsStore`.
+
+Appends `--days` of synthetic 30 FPS per-frame summaries (total detections and detections
+of a few classes) of `--sources` sources, in batches of `--batch-seconds` of frames - as
+`DetectionsStoreSink` writes them - and reports appended frames per second and size of
+the database file. Then measures latency of range queries:
+* `hour rollups / whole range` - hour buckets of one metric over the whole range,
+* `minute rollups / day` - minute buckets of one metric over the last day,
+* `raw / minute` - per-frame values of all metrics over one minute,
+* `alarms / whole range` - alarm transitions over the whole range.
+
+Usage:
+    python scripts/benchmark_detections_store.py --days 7 --fps 30 --sources 1
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from care.stream.detections_store import DetectionsStore
+
+START = 1_699_999_200.0
+CLASSES = ["person", "car", "truck", "bicycle"]
+SECONDS_PER_DAY = 24 * 3600
+
+
+def synthetic_batch(
+    rng: np.random.Generator, start: float, seconds: float, fps: float
+) -> Dict[str, np.ndarray]:
+    frames = int(seconds * fps)
+    metrics = {
+        f"detections/{class_name}": rng.poisson(lam=2.0, size=frames).astype(np.float32)
+        for class_name in CLASSES
+    }
+    metrics["detections"] = np.sum(list(metrics.values()), axis=0)
+    metrics["max_confidence"] = rng.random(frames, dtype=np.float32)
+    return {"timestamps": start + np.arange(frames) / fps, **metrics}
+
+
+def append_range(
+    store: DetectionsStore, days: float, fps: float, sources: int, batch_seconds: float
+) -> int:
+    rng = np.random.default_rng(42)
+    frames = 0
+    batches = int(days * SECONDS_PER_DAY / batch_seconds)
+    for i in range(batches):
+        batch_start = START + i * batch_seconds
+        for source in range(sources):
+            batch = synthetic_batch(rng=rng, start=batch_start, seconds=batch_seconds, fps=fps)
+            timestamps = batch.pop("timestamps")
+            store.append(source_id=str(source), timestamps=timestamps, metrics=batch)
+            if i % 60 == 0:
+                store.append_alarm_transitions(
+                    source_id=str(source),
+                    alarm="crowd",
+                    timestamps=[batch_start, batch_start + batch_seconds / 2],
+                    active=[True, False],
+                )
+            frames += timestamps.size
+    return frames
+
+
+def measure_latency(query: Callable[[], object], repeats: int) -> List[float]:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        query()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--sources", type=int, default=1)
+    parser.add_argument("--batch-seconds", type=float, default=60)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        db_file_path = os.path.join(directory, "detections.db")
+        # keeps all raw data, so that range queries run against the full week
+        store = DetectionsStore(
+            db_file_path=db_file_path, raw_retention=None, minute_rollups_retention=None
+        )
+        start = time.perf_counter()
+        frames = append_range(
+            store=store,
+            days=args.days,
+            fps=args.fps,
+            sources=args.sources,
+            batch_seconds=args.batch_seconds,
+        )
+        duration = time.perf_counter() - start
+        size_mb = sum(
+            os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+        ) / 2**20
+        print(
+            f"append: {frames} frames in {duration:.1f} s - "
+            f"{frames / duration:,.0f} frames/s, {size_mb:.1f} MiB on disk"
+        )
+        end = START + args.days * SECONDS_PER_DAY
+        queries = {
+            "hour rollups / whole range": lambda: store.query_rollups(
+                source_id="0", metric="detections", start=START, end=end, resolution="hour"
+            ),
+            "minute rollups / day": lambda: store.query_rollups(
+                source_id="0",
+                metric="detections",
+                start=end - SECONDS_PER_DAY,
+                end=end,
+                resolution="minute",
+            ),
+            "raw / minute": lambda: store.query_raw(
+                source_id="0", start=end - 3600, end=end - 3540
+            ),
+            "alarms / whole range": lambda: store.query_alarm_transitions(
+                source_id="0", start=START, end=end
+            ),
+        }
+        for name, query in queries.items():
+            durations = measure_latency(query=query, repeats=args.repeats)
+            print(
+                f"{name:>28}: median {np.median(durations) * 1000:8.2f} ms, "
+                f"max {np.max(durations) * 1000:8.2f} ms"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of CoalescingPredictor - throughput vs. added tail latency.
+
+Simulates model which `predict(...)` has fixed per-call cost (kernel launch, session.run
+overhead) and per-image cost, called concurrently by many threads - like workflow steps
+run with WORKFLOWS_MAX_CONCURRENT_STEPS > 1 or many pipelines sharing model.
+
+Usage:
+    python scripts/benchmark_micro_batching.py --threads 8 --requests 200
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, List
+
+import numpy as np
+
+from care.models.utils.micro_batching import CoalescingPredictor
+
+
+class SimulatedModel:
+    def __init__(self, call_overhead: float, per_image_cost: float):
+        self._call_overhead = call_overhead
+        self._per_image_cost = per_image_cost
+        self._session_lock = Lock()
+        self.calls = 0
+
+    def predict(self, img_in: np.ndarray) -> tuple:
+        with self._session_lock:
+            self.calls += 1
+            time.sleep(self._call_overhead + self._per_image_cost * img_in.shape[0])
+        return (np.zeros((img_in.shape[0], 84, 100), dtype=np.float32),)
+
+
+def run_scenario(
+    predict: Callable[[np.ndarray], tuple], threads: int, requests: int
+) -> dict:
+    image = np.zeros((1, 3, 64, 64), dtype=np.float32)
+    latencies: List[float] = []
+    latencies_lock = Lock()
+
+    def client() -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            predict(image)
+            with latencies_lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(threads):
+            executor.submit(client)
+    duration = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "throughput": len(latencies) / duration,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--call-overhead", type=float, default=0.004)
+    parser.add_argument("--per-image-cost", type=float, default=0.001)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument(
+        "--max-wait", type=float, nargs="+", default=[0.0, 0.002, 0.005, 0.01]
+    )
+    args = parser.parse_args()
+    model = SimulatedModel(
+        call_overhead=args.call_overhead, per_image_cost=args.per_image_cost
+    )
+    baseline = run_scenario(
+        predict=model.predict, threads=args.threads, requests=args.requests
+    )
+    print(
+        f"{'scenario':<24}{'req/s':>10}{'p50 [ms]':>12}{'p99 [ms]':>12}{'calls':>8}"
+    )
+    print(
+        f"{'no coalescing':<24}{baseline['throughput']:>10.1f}"
+        f"{baseline['p50_ms']:>12.2f}{baseline['p99_ms']:>12.2f}{model.calls:>8}"
+    )
+    for max_wait in args.max_wait:
+        model.calls = 0
+        predictor = CoalescingPredictor(
+            predict=model.predict,
+            max_batch_size=args.max_batch_size,
+            max_wait=max_wait,
+        )
+        try:
+            result = run_scenario(
+                predict=predictor.predict, threads=args.threads, requests=args.requests
+            )
+        finally:
+            predictor.close()
+        print(
+            f"{f'max_wait={max_wait * 1000:.0f}ms':<24}{result['throughput']:>10.1f}"
+            f"{result['p50_ms']:>12.2f}{result['p99_ms']:>12.2f}{model.calls:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark of ONNX session creation with cache of ORT-optimised graphs.
+
+Builds synthetic model of `--blocks` Conv + BatchNormalization + Relu blocks (the pattern
+fused by ORT graph optimiser, as found in YOLO-like models) and compares creation time of
+`onnxruntime.InferenceSession` on CPU:
+* `no cache` - graph optimised on every load, as models were loaded before,
+* `first load` - graph optimised and serialised into empty cache,
+* `cached` - optimised graph loaded from cache with optimisations disabled (restart of
+  the process with warm model cache).
+
+Reports median and max of `--repeats` loads, each creating a new session.
+
+Usage:
+    python scripts/benchmark_onnx_optimized_cache.py --blocks 60 --channels 64 --repeats 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+import numpy as np
+import onnx
+import onnxruntime
+
+import care.cache.model_artifacts as model_artifacts
+from care.cache.model_artifacts import create_onnx_session_with_optimized_model_cache
+
+PROVIDERS = ["CPUExecutionProvider"]
+
+
+def save_model(path: str, blocks: int, channels: int) -> None:
+    rng = np.random.default_rng(0)
+    nodes, initializers = [], []
+    previous_output, previous_channels = "images", 3
+    for block in range(blocks):
+        names = {
+            name: f"{name}_{block}"
+            for name in ["w", "b", "scale", "bias", "mean", "var", "conv", "bn", "relu"]
+        }
+        initializers.extend(
+            [
+                onnx.numpy_helper.from_array(
+                    rng.standard_normal(
+                        (channels, previous_channels, 3, 3), dtype=np.float32
+                    ),
+                    names["w"],
+                ),
+                onnx.numpy_helper.from_array(
+                    rng.standard_normal(channels, dtype=np.float32), names["b"]
+                ),
+                onnx.numpy_helper.from_array(
+                    rng.random(channels, dtype=np.float32), names["scale"]
+                ),
+                onnx.numpy_helper.from_array(
+                    rng.random(channels, dtype=np.float32), names["bias"]
+                ),
+                onnx.numpy_helper.from_array(
+                    rng.random(channels, dtype=np.float32), names["mean"]
+                ),
+                onnx.numpy_helper.from_array(
+                    rng.random(channels, dtype=np.float32) + 1, names["var"]
+                ),
+            ]
+        )
+        nodes.extend(
+            [
+                onnx.helper.make_node(
+                    "Conv",
+                    [previous_output, names["w"], names["b"]],
+                    [names["conv"]],
+                    pads=[1, 1, 1, 1],
+                ),
+                onnx.helper.make_node(
+                    "BatchNormalization",
+                    [
+                        names["conv"],
+                        names["scale"],
+                        names["bias"],
+                        names["mean"],
+                        names["var"],
+                    ],
+                    [names["bn"]],
+                ),
+                onnx.helper.make_node("Relu", [names["bn"]], [names["relu"]]),
+            ]
+        )
+        previous_output, previous_channels = names["relu"], channels
+    graph = onnx.helper.make_graph(
+        nodes,
+        "benchmark",
+        [
+            onnx.helper.make_tensor_value_info(
+                "images", onnx.TensorProto.FLOAT, [1, 3, 64, 64]
+            )
+        ],
+        [
+            onnx.helper.make_tensor_value_info(
+                previous_output, onnx.TensorProto.FLOAT, [1, channels, 64, 64]
+            )
+        ],
+        initializer=initializers,
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 17)]
+    )
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def create_session(weights_path: str) -> onnxruntime.InferenceSession:
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    return create_onnx_session_with_optimized_model_cache(
+        weights_path=weights_path,
+        providers=PROVIDERS,
+        session_options=session_options,
+        model_id="benchmark/1",
+    )
+
+
+def measure(load: Callable[[], None], repeats: int) -> List[float]:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=60)
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        weights_path = os.path.join(directory, "weights.onnx")
+        save_model(path=weights_path, blocks=args.blocks, channels=args.channels)
+        cache_dirs = iter(range(args.repeats + 1))
+
+        def load_into_empty_cache() -> None:
+            model_artifacts.MODEL_CACHE_DIR = os.path.join(
+                directory, f"cache_{next(cache_dirs)}"
+            )
+            create_session(weights_path)
+
+        model_artifacts.ORT_OPTIMIZED_MODELS_CACHE_ENABLED = False
+        scenarios = {"no cache": measure(lambda: create_session(weights_path), args.repeats)}
+        model_artifacts.ORT_OPTIMIZED_MODELS_CACHE_ENABLED = True
+        scenarios["first load"] = measure(load_into_empty_cache, args.repeats)
+        # the last cache directory holds complete entry
+        scenarios["cached"] = measure(lambda: create_session(weights_path), args.repeats)
+        for name, durations in scenarios.items():
+            print(
+                f"{name:>10}: median {np.median(durations) * 1000:8.1f} ms, "
+                f"max {np.max(durations) * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
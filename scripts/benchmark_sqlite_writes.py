@@ -0,0 +1,119 @@
+"""Benchmark of SQLite inserts from many writer threads.
+
+Compares:
+* `legacy` - new connection per row, rollback journal, `timeout=1` and `BEGIN EXCLUSIVE`,
+  as `SQLiteWrapper.insert(...)` used to work,
+* `pooled` - `SQLiteWrapper.insert(..., with_exclusive=True)` on thread-confined WAL
+  connections,
+* `buffered` - `BufferedSQLiteWriter`, rows inserted in batches with `executemany`.
+
+Reports throughput and number of inserts failed with "database is locked".
+
+Usage:
+    python scripts/benchmark_sqlite_writes.py --threads 8 --rows 2000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable
+
+from care.utils.sqlite_wrapper import (
+    BufferedSQLiteWriter,
+    SQLiteWrapper,
+    get_connection_pool,
+)
+
+PAYLOAD = json.dumps(
+    {"api_key_hash": "0" * 32, "resource_id": "workflow", "processed_frames": 1}
+)
+
+
+def legacy_insert(db_file_path: str, table_name: str) -> Callable[[dict], None]:
+    def insert(row: dict) -> None:
+        connection = sqlite3.connect(db_file_path, timeout=1)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN EXCLUSIVE")
+            cursor.execute(
+                f"INSERT INTO {table_name} (payload) VALUES (?)", [row["payload"]]
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+    return insert
+
+
+def run_scenario(name: str, threads: int, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file_path = os.path.join(tmp_dir, "usage.db")
+        wrapper = SQLiteWrapper(
+            db_file_path=db_file_path,
+            table_name="usage",
+            columns={"payload": "TEXT NOT NULL"},
+        )
+        writer = None
+        if name == "legacy":
+            get_connection_pool(db_file_path).close_all()
+            with sqlite3.connect(db_file_path) as connection:
+                connection.execute("PRAGMA journal_mode=DELETE")
+            insert = legacy_insert(db_file_path=db_file_path, table_name="usage")
+        elif name == "pooled":
+
+            def insert(row: dict) -> None:
+                wrapper.insert(row=row, with_exclusive=True)
+
+        else:
+            writer = BufferedSQLiteWriter(wrapper=wrapper)
+            insert = writer.put
+
+        failures = 0
+        failures_lock = Lock()
+
+        def client() -> None:
+            nonlocal failures
+            for _ in range(rows):
+                try:
+                    insert({"payload": PAYLOAD})
+                except sqlite3.OperationalError:
+                    with failures_lock:
+                        failures += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for _ in range(threads):
+                executor.submit(client)
+        if writer is not None:
+            writer.close()
+        duration = time.perf_counter() - start
+        stored = wrapper.count()
+        get_connection_pool(db_file_path).close_all()
+    return {
+        "scenario": name,
+        "rows_per_s": stored / duration,
+        "stored": stored,
+        "locked_failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=2000, help="rows per thread")
+    args = parser.parse_args()
+    for name in ["legacy", "pooled", "buffered"]:
+        result = run_scenario(name=name, threads=args.threads, rows=args.rows)
+        print(
+            f"{result['scenario']:>8}: {result['rows_per_s']:10.0f} rows/s, "
+            f"stored {result['stored']}, locked failures {result['locked_failures']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Benchmark of UQL evaluation - closures tree (`build_eval_function`) vs. compiled function.
+
+Measures both the evaluation time (what `conditional_alarm` and detections filters pay on
+every frame) and the time to build the evaluator (first build and memoized re-builds, as
+done when many blocks share the same expression).
+
+Usage:
+    python scripts/benchmark_uql_compiler.py --iterations 100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from care.workflows.care_steps.common.query_language.evaluation_engine.compiler import (
+    clear_compiled_expressions_cache,
+    compile_statement,
+)
+from care.workflows.care_steps.common.query_language.evaluation_engine.core import (
+    build_eval_function,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    StatementGroup,
+)
+
+
+def _binary(left: dict, comparator: str, right: dict) -> dict:
+    return {
+        "type": "BinaryStatement",
+        "left_operand": left,
+        "comparator": {"type": comparator},
+        "right_operand": right,
+    }
+
+
+def _parameter(name: str, operations: list = None) -> dict:
+    return {
+        "type": "DynamicOperand",
+        "operand_name": name,
+        "operations": operations or [],
+    }
+
+
+def _static(value: Any, operations: list = None) -> dict:
+    return {"type": "StaticOperand", "value": value, "operations": operations or []}
+
+
+SCENARIOS = {
+    "alarm_condition": (
+        {
+            "type": "StatementGroup",
+            "operator": "and",
+            "statements": [
+                _binary(_parameter("people"), "(Number) >", _static(0)),
+                _binary(_parameter("beds"), "(Number) >=", _static(1)),
+                _binary(
+                    _parameter("zone_name", [{"type": "StringToLowerCase"}]),
+                    "==",
+                    _static("ROOM_1", [{"type": "StringToLowerCase"}]),
+                ),
+            ],
+        },
+        {"people": 2, "beds": 1, "zone_name": "Room_1"},
+    ),
+    "short_circuit_or": (
+        {
+            "type": "StatementGroup",
+            "operator": "or",
+            "statements": [
+                _binary(
+                    _parameter("labels", [{"type": "SequenceLength"}]),
+                    "(Number) >",
+                    _static(100),
+                ),
+                _binary(_parameter("fall_detected"), "==", _static(True)),
+            ],
+        },
+        {"labels": ["person"] * 50, "fall_detected": True},
+    ),
+    "constant_statements": (
+        {
+            "type": "StatementGroup",
+            "operator": "and",
+            "statements": [
+                _binary(_static(3), "(Number) >", _static(1)),
+                _binary(_static("a,b"), "(String) contains", _static("b")),
+                _binary(_parameter("confidence"), "(Number) >=", _static(0.5)),
+            ],
+        },
+        {"confidence": 0.7},
+    ),
+}
+
+
+def measure(function: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_scenario(definition: dict, values: Dict[str, Any], iterations: int) -> dict:
+    parsed = StatementGroup.model_validate(definition)
+    closures = build_eval_function(definition=parsed)
+    clear_compiled_expressions_cache()
+    start = time.perf_counter()
+    compiled = compile_statement(definition=parsed)
+    first_compilation_us = (time.perf_counter() - start) * 1e6
+    assert closures(values) == compiled(values)
+    build_iterations = max(iterations // 100, 10)
+    return {
+        "eval_closures_us": measure(lambda: closures(values), iterations),
+        "eval_compiled_us": measure(lambda: compiled(values), iterations),
+        "build_closures_us": measure(
+            lambda: build_eval_function(definition=parsed), build_iterations
+        ),
+        "compile_first_us": first_compilation_us,
+        "compile_memoized_us": measure(
+            lambda: compile_statement(definition=parsed), build_iterations
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    print(
+        f"{'scenario':<22}{'eval tree [us]':>16}{'eval compiled [us]':>20}"
+        f"{'build tree [us]':>17}{'compile [us]':>14}{'memoized [us]':>15}"
+    )
+    for name, (definition, values) in SCENARIOS.items():
+        result = run_scenario(
+            definition=definition, values=values, iterations=args.iterations
+        )
+        print(
+            f"{name:<22}{result['eval_closures_us']:>16.2f}{result['eval_compiled_us']:>20.2f}"
+            f"{result['build_closures_us']:>17.1f}{result['compile_first_us']:>14.1f}"
+            f"{result['compile_memoized_us']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Microbenchmark of per-call overhead of usage accounting.
+
+Compares:
+* `locked` - shared usage dict updated under a lock, with API key hash and resource hash
+  (`sha256` of `json.dumps(..., sort_keys=True)`) and `json.dumps` of resource details
+  computed on every call, as `UsageCollector.record_usage(...)` used to work,
+* `counters` - memoized resource hash and per-thread `UsageCounters`, serialization
+  deferred to harvest.
+
+Reports nanoseconds per recorded call, for given number of recording threads. Collector
+thread harvests counters every `--flush-interval` seconds during the run.
+
+Usage:
+    python scripts/benchmark_usage_tracking.py --threads 1 4 --calls 50000
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Tuple
+
+from care.usage_tracking.accounting import UsageCounters, freeze
+
+API_KEY = "a" * 32
+RESOURCE_DETAILS = {
+    "billable": True,
+    "source": "workflow-builder",
+    "steps": [f"roboflow_core/object_detection_model@v1:{i}" for i in range(8)],
+    "is_preview": False,
+}
+
+
+def sha256_hash(payload: str, length: int = 5) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()[:length]
+
+
+def locked_recorder() -> Tuple[Callable[[Dict[str, Any]], None], Callable[[], None]]:
+    lock = threading.Lock()
+    usage = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+
+    def record(resource_details: Dict[str, Any]) -> None:
+        api_key_hash = sha256_hash(API_KEY)
+        resource_id = sha256_hash(json.dumps(resource_details, sort_keys=True))
+        with lock:
+            source_usage = usage[api_key_hash][f"workflows:{resource_id}"]
+            source_usage["timestamp_stop"] = time.time_ns()
+            source_usage["processed_frames"] += 1
+            source_usage["resource_details"] = json.dumps(resource_details)
+            source_usage["execution_duration"] += 0.01
+
+    return record, lambda: None
+
+
+def counters_recorder() -> Tuple[Callable[[Dict[str, Any]], None], Callable[[], None]]:
+    counters = UsageCounters()
+    resource_hashes = {}
+
+    def record(resource_details: Dict[str, Any]) -> None:
+        frozen_details = freeze(resource_details)
+        resource_id = resource_hashes.get(frozen_details)
+        if resource_id is None:
+            resource_id = sha256_hash(json.dumps(resource_details, sort_keys=True))
+            resource_hashes[frozen_details] = resource_id
+        counters.add(
+            key=(API_KEY, "workflows", resource_id),
+            frames=1,
+            source_duration=0,
+            execution_duration=0.01,
+            fps=0,
+            resource_details=resource_details,
+        )
+
+    def harvest() -> None:
+        for delta in counters.harvest().values():
+            json.dumps(delta.resource_details)
+
+    return record, harvest
+
+
+def run_scenario(name: str, threads: int, calls: int, flush_interval: float) -> float:
+    record, harvest = locked_recorder() if name == "locked" else counters_recorder()
+    stop = threading.Event()
+
+    def collector() -> None:
+        while not stop.wait(flush_interval):
+            harvest()
+        harvest()
+
+    def client() -> None:
+        for _ in range(calls):
+            # details are built per call by the usage decorator
+            record(dict(RESOURCE_DETAILS))
+
+    collector_thread = threading.Thread(target=collector)
+    collector_thread.start()
+    clients = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter_ns()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    duration = time.perf_counter_ns() - start
+    stop.set()
+    collector_thread.join()
+    return duration / (threads * calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--calls", type=int, default=50000, help="calls per thread")
+    parser.add_argument("--flush-interval", type=float, default=0.1)
+    args = parser.parse_args()
+    for threads in args.threads:
+        for name in ["locked", "counters"]:
+            ns_per_call = run_scenario(
+                name=name,
+                threads=threads,
+                calls=args.calls,
+                flush_interval=args.flush_interval,
+            )
+            print(f"{name:>8} x{threads}: {ns_per_call:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
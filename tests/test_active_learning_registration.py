@@ -0,0 +1,236 @@
+"""
+Tests del registro de datapoints de Active Learning fuera del hilo de inferencia, contra un
+servidor HTTP local que imita la API de Roboflow.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Queue
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+import pytest
+
+import care.active_learning.core as active_learning_core
+import care.roboflow_api as roboflow_api
+from care.active_learning.entities import (
+    ActiveLearningConfiguration,
+    BatchReCreationInterval,
+    ImageDimensions,
+    RegistrationTask,
+    SamplingMethod,
+)
+from care.active_learning.middlewares import ThreadingActiveLearningMiddleware
+from care.active_learning.registration import DatapointRegistrationPool
+from care.cache.memory import MemoryCache
+
+PREDICTION = {
+    "image": {"width": 256, "height": 128},
+    "predictions": [
+        {
+            "x": 100.0,
+            "y": 50.0,
+            "width": 20.0,
+            "height": 10.0,
+            "confidence": 0.9,
+            "class": "car",
+            "class_id": 0,
+        }
+    ],
+}
+
+
+class RoboflowAPIStandIn:
+    """Servidor local con los endpoints de subida, anotación y batches de etiquetado."""
+
+    def __init__(self):
+        self.uploads = []
+        self.annotations = []
+        self.batches = []
+        self.batches_requests = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stand_in._lock:
+                    stand_in.batches_requests += 1
+                self._respond({"batches": stand_in.batches})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if "/upload" in url.path:
+                    stand_in.gate.wait(timeout=10)
+                    with stand_in._lock:
+                        stand_in.uploads.append((parse_qs(url.query), body))
+                        image_id = f"image-{len(stand_in.uploads)}"
+                    self._respond({"success": True, "id": image_id})
+                else:
+                    with stand_in._lock:
+                        stand_in.annotations.append(json.loads(body))
+                    self._respond({"success": True})
+
+            def _respond(self, payload):
+                content = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+    def start(self) -> "RoboflowAPIStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.gate.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def roboflow_api_stand_in(monkeypatch):
+    stand_in = RoboflowAPIStandIn().start()
+    monkeypatch.setattr(roboflow_api, "API_BASE_URL", stand_in.url)
+    yield stand_in
+    stand_in.stop()
+
+
+def make_configuration(max_batch_images=None) -> ActiveLearningConfiguration:
+    return ActiveLearningConfiguration(
+        max_image_size=ImageDimensions(height=64, width=64),
+        jpeg_compression_level=75,
+        persist_predictions=True,
+        sampling_methods=[SamplingMethod(name="always", sample=lambda *args: True)],
+        batches_name_prefix="al_batch",
+        batch_recreation_interval=BatchReCreationInterval.NEVER,
+        max_batch_images=max_batch_images,
+        workspace_id="workspace",
+        dataset_id="dataset",
+        model_id="dataset/1",
+        strategies_limits={"always": []},
+        tags=[],
+        strategies_tags={"always": []},
+    )
+
+
+def make_task() -> RegistrationTask:
+    return RegistrationTask(
+        image=np.zeros((128, 256, 3), dtype=np.uint8),
+        prediction=json.loads(json.dumps(PREDICTION)),
+        prediction_type="object-detection",
+        matching_strategies=["always"],
+        batch_name="al_batch",
+    )
+
+
+class TestThreadingActiveLearningMiddleware:
+    """Tests del middleware usado por los streams."""
+
+    def test_frames_are_encoded_by_workers(self, roboflow_api_stand_in, monkeypatch):
+        """Test de que el redimensionado y la codificación no ocurren en el hilo llamante."""
+        encoding_threads = []
+        encode = active_learning_core.encode_image_to_jpeg_bytes
+
+        def recording_encode(*args, **kwargs):
+            encoding_threads.append(threading.current_thread())
+            return encode(*args, **kwargs)
+
+        monkeypatch.setattr(
+            active_learning_core, "encode_image_to_jpeg_bytes", recording_encode
+        )
+        middleware = ThreadingActiveLearningMiddleware(
+            api_key="api-key",
+            configuration=make_configuration(),
+            cache=MemoryCache(),
+            task_queue=Queue(16),
+            workers=2,
+        )
+
+        with middleware:
+            for _ in range(6):
+                middleware.register(
+                    inference_input=np.zeros((128, 256, 3), dtype=np.uint8),
+                    prediction=json.loads(json.dumps(PREDICTION)),
+                    prediction_type="object-detection",
+                )
+
+        assert len(encoding_threads) == 6
+        assert threading.current_thread() not in encoding_threads
+        assert len(roboflow_api_stand_in.uploads) == 6
+        assert len(roboflow_api_stand_in.annotations) == 6
+        statistics = middleware.registration_statistics
+        assert (statistics.submitted, statistics.registered, statistics.dropped) == (6, 6, 0)
+
+    def test_drops_under_backpressure(self, roboflow_api_stand_in):
+        """Test de descarte y contabilidad cuando la cola está llena."""
+        roboflow_api_stand_in.gate.clear()
+        middleware = ThreadingActiveLearningMiddleware(
+            api_key="api-key",
+            configuration=make_configuration(),
+            cache=MemoryCache(),
+            task_queue=Queue(2),
+            workers=1,
+            max_batch_size=1,
+        )
+
+        with middleware:
+            for _ in range(10):
+                middleware.register(
+                    inference_input=np.zeros((128, 256, 3), dtype=np.uint8),
+                    prediction=json.loads(json.dumps(PREDICTION)),
+                    prediction_type="object-detection",
+                )
+            dropped = middleware.registration_statistics.dropped
+            roboflow_api_stand_in.gate.set()
+
+        statistics = middleware.registration_statistics
+        assert dropped >= 7
+        assert statistics.submitted + statistics.dropped == 10
+        assert statistics.registered == statistics.submitted
+        assert len(roboflow_api_stand_in.uploads) == statistics.submitted
+
+
+class TestDatapointRegistrationPool:
+    """Tests del pool de registro."""
+
+    def test_batch_capacity_is_checked_once_per_batch(self, roboflow_api_stand_in):
+        """Test de una sola consulta de capacidad por lote de tareas del mismo batch."""
+        roboflow_api_stand_in.batches = [
+            {"name": "al_batch", "id": "b1", "images": 1, "numJobs": 0}
+        ]
+        pool = DatapointRegistrationPool(
+            api_key="api-key",
+            configuration=make_configuration(max_batch_images=3),
+            cache=MemoryCache(),
+            workers=1,
+            max_batch_size=8,
+        )
+        for _ in range(5):
+            assert pool.submit(make_task())
+
+        pool.start()
+        pool.stop()
+
+        statistics = pool.statistics
+        assert (statistics.registered, statistics.rejected) == (2, 3)
+        assert roboflow_api_stand_in.batches_requests == 1
+        query, body = roboflow_api_stand_in.uploads[0]
+        assert query["batch"] == ["al_batch"]
+        jpeg = body[body.index(b"\xff\xd8") : body.rindex(b"\xff\xd9") + 2]
+        image = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        assert image.shape[:2] == (32, 64)
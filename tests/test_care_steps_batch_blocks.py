@@ -0,0 +1,211 @@
+"""
+Tests de equivalencia de los blocks v2 (por lotes) con los blocks v1 ejecutados por fuente.
+"""
+
+import time
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.care_steps.sinks.mqtt_writer import (
+    MQTTWriterSinkBlockV1,
+    MQTTWriterSinkBlockV2,
+)
+from care.workflows.care_steps.transformations import (
+    ConditionalAlarmBlockV1,
+    ConditionalAlarmBlockV2,
+    DetectionsCountBlockV1,
+    DetectionsCountBlockV2,
+    PredictionAlarmBlockV1,
+    PredictionAlarmBlockV2,
+)
+from care.workflows.care_steps.transformations.prediction_alarm import (
+    v2 as prediction_alarm_v2,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    StatementGroup,
+)
+from inference.core.workflows.execution_engine.entities.base import Batch
+
+SOURCES = 3
+
+# conteos por frame (filas) y fuente (columnas)
+COUNTS = [
+    [0, 5, 9],
+    [2, 6, 9],
+    [4, 1, 9],
+    [5, 0, 2],
+    [7, 8, 1],
+    [1, 9, 0],
+    [6, 9, 7],
+]
+
+
+def make_batch(content: list) -> Batch:
+    return Batch(content=content, indices=[(i,) for i in range(len(content))])
+
+
+def make_detections(n: int) -> sv.Detections:
+    return sv.Detections(xyxy=np.zeros((n, 4)), class_id=np.zeros(n, dtype=int))
+
+
+class TestDetectionsCount:
+    """Tests de DetectionsCountBlockV2."""
+
+    def test_counts_match_v1(self):
+        """Test de que el conteo de cada fuente coincide con v1."""
+        predictions = [make_detections(n) for n in COUNTS[0]]
+
+        result = DetectionsCountBlockV2().run(predictions=make_batch(predictions))
+
+        assert result == [DetectionsCountBlockV1().run(predictions=p) for p in predictions]
+
+
+class TestPredictionAlarm:
+    """Tests de PredictionAlarmBlockV2."""
+
+    @pytest.mark.parametrize("cooldown_seconds", [0.0, 3600.0])
+    def test_per_source_outputs_match_v1(self, cooldown_seconds):
+        """Test de que cada fuente evoluciona como un block v1 dedicado."""
+        parameters = dict(
+            threshold=5,
+            hysteresis=2,
+            cooldown_seconds=cooldown_seconds,
+            alarm_message_template="{count}/{threshold}",
+        )
+        v1_blocks = [PredictionAlarmBlockV1() for _ in range(SOURCES)]
+        v2_block = PredictionAlarmBlockV2()
+
+        for frame_counts in COUNTS:
+            expected = [
+                block.run(count=count, **parameters)
+                for block, count in zip(v1_blocks, frame_counts)
+            ]
+
+            result = v2_block.run(count=make_batch(frame_counts), **parameters)
+
+            assert result == expected
+
+    def test_scalar_input(self):
+        """Test de ejecución sin lotes."""
+        v1_block, v2_block = PredictionAlarmBlockV1(), PredictionAlarmBlockV2()
+
+        for count in [1, 5, 5, 0]:
+            assert v2_block.run(count=count, threshold=3) == v1_block.run(
+                count=count, threshold=3
+            )
+
+    def test_invalid_parameters(self):
+        """Test de validación de parámetros."""
+        with pytest.raises(ValueError):
+            PredictionAlarmBlockV2().run(count=make_batch([1]), threshold=0)
+
+    def test_state_of_absent_source_expires(self, monkeypatch):
+        """Test de que el estado de una fuente que deja de aparecer se descarta."""
+        monkeypatch.setattr(prediction_alarm_v2, "CARE_STEPS_SOURCE_STATE_TTL", 0.2)
+        block = PredictionAlarmBlockV2()
+        parameters = dict(threshold=5, cooldown_seconds=3600.0)
+
+        first = block.run(count=make_batch([5]), **parameters)
+        second = block.run(count=make_batch([5]), **parameters)
+        time.sleep(0.3)
+        after_expiry = block.run(count=make_batch([5]), **parameters)
+
+        assert [r["state"] for r in first + second] == ["firing", "cooldown"]
+        assert after_expiry[0]["state"] == "firing"
+
+    def test_number_of_states_is_bounded(self, monkeypatch):
+        """Test de que se guarda estado de un número limitado de fuentes."""
+        monkeypatch.setattr(prediction_alarm_v2, "CARE_STEPS_MAX_SOURCES_STATES", 2)
+        block = PredictionAlarmBlockV2()
+
+        block.run(count=make_batch([1, 2, 3]), threshold=5)
+
+        assert len(block._states) == 2
+
+
+CONDITION = StatementGroup.model_validate(
+    {
+        "type": "StatementGroup",
+        "statements": [
+            {
+                "type": "BinaryStatement",
+                "left_operand": {"type": "DynamicOperand", "operand_name": "count"},
+                "comparator": {"type": "(Number) >="},
+                "right_operand": {"type": "DynamicOperand", "operand_name": "limit"},
+            }
+        ],
+    }
+)
+
+
+class TestConditionalAlarm:
+    """Tests de ConditionalAlarmBlockV2."""
+
+    def test_per_source_outputs_match_v1(self):
+        """Test con parámetros por fuente (lotes) y comunes (escalares)."""
+        parameters = dict(
+            condition_statement=CONDITION,
+            cooldown_seconds=0.0,
+            alarm_message_template="{count} >= {limit}",
+        )
+        v1_blocks = [ConditionalAlarmBlockV1() for _ in range(SOURCES)]
+        v2_block = ConditionalAlarmBlockV2()
+
+        for frame_counts in COUNTS:
+            expected = [
+                block.run(
+                    evaluation_parameters={"count": count, "limit": 5}, **parameters
+                )
+                for block, count in zip(v1_blocks, frame_counts)
+            ]
+
+            result = v2_block.run(
+                evaluation_parameters={"count": make_batch(frame_counts), "limit": 5},
+                **parameters,
+            )
+
+            assert result == expected
+
+
+class FakeMessageInfo:
+    def __init__(self, published: bool):
+        self._published = published
+
+    def wait_for_publish(self, timeout=None):
+        pass
+
+    def is_published(self) -> bool:
+        return self._published
+
+
+class FakeMQTTClient:
+    def __init__(self):
+        self.published = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        if payload == "broken":
+            raise ValueError("payload rejected")
+        self.published.append((topic, payload))
+        return FakeMessageInfo(published=payload != "lost")
+
+
+class TestMQTTWriter:
+    """Tests de MQTTWriterSinkBlockV2."""
+
+    def test_grouped_publication_matches_v1(self):
+        """Test de que se publican todos los mensajes con el resultado de v1."""
+        messages = ["a", "lost", "broken", ""]
+        parameters = dict(host="localhost", port=1883, topic="care/alarms")
+        v1_block, v2_block = MQTTWriterSinkBlockV1(), MQTTWriterSinkBlockV2()
+        v1_block.mqtt_client, v2_block.mqtt_client = FakeMQTTClient(), FakeMQTTClient()
+
+        expected = [v1_block.run(message=m, **parameters) for m in messages]
+        result = v2_block.run(message=make_batch(messages), **parameters)
+
+        assert result == expected
+        assert v2_block.mqtt_client.published == v1_block.mqtt_client.published
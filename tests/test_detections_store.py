@@ -0,0 +1,306 @@
+"""
+Tests del almacén embebido de series temporales de resúmenes de detecciones y del sink del
+pipeline que escribe en él.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from care.camera.entities import VideoFrame
+from care.stream.detections_store import DetectionsStore
+from care.stream.sinks import DetectionsStoreSink, summarise_detections
+
+START = 1_699_999_200.0  # múltiplo de una hora
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DetectionsStore(
+        db_file_path=str(tmp_path / "detections.db"),
+        raw_retention=None,
+        minute_rollups_retention=None,
+    )
+    yield store
+    store.close()
+
+
+def make_video_frame(timestamp: float, source_id: int = 0) -> VideoFrame:
+    return VideoFrame(
+        image=np.zeros((4, 4, 3), dtype=np.uint8),
+        frame_id=int(timestamp),
+        frame_timestamp=datetime.fromtimestamp(timestamp, tz=timezone.utc),
+        source_id=source_id,
+    )
+
+
+def make_prediction(classes: list) -> dict:
+    return {
+        "predictions": [
+            {"class": class_name, "confidence": 0.5 + 0.1 * i}
+            for i, class_name in enumerate(classes)
+        ]
+    }
+
+
+class TestDetectionsStore:
+    """Tests de escritura y consultas del almacén."""
+
+    def test_raw_range_query(self, store):
+        """Test de consulta por rango de los valores por fotograma."""
+        timestamps = START + np.arange(100) / 10
+        store.append(
+            source_id="cam",
+            timestamps=timestamps,
+            metrics={"detections": np.arange(100)},
+        )
+
+        series = store.query_raw(source_id="cam", start=START + 2, end=START + 3)
+
+        assert np.allclose(series.timestamps, timestamps[20:31])
+        assert np.array_equal(series.metrics["detections"], np.arange(20, 31))
+        assert store.query_raw(source_id="other", start=START, end=START + 10).timestamps.size == 0
+
+    def test_missing_metric_in_segment_is_zero(self, store):
+        """Test de que la métrica ausente en un lote se devuelve como ceros."""
+        store.append(source_id="cam", timestamps=[START], metrics={"detections": [1]})
+        store.append(
+            source_id="cam",
+            timestamps=[START + 1],
+            metrics={"detections": [2], "detections/car": [2]},
+        )
+
+        series = store.query_raw(source_id="cam", start=START, end=START + 1)
+
+        assert np.array_equal(series.metrics["detections/car"], [0, 2])
+
+    def test_unsorted_batch_is_sorted(self, store):
+        """Test de que los lotes desordenados se guardan ordenados por tiempo."""
+        store.append(
+            source_id="cam",
+            timestamps=[START + 2, START, START + 1],
+            metrics={"detections": [2, 0, 1]},
+        )
+
+        series = store.query_raw(source_id="cam", start=START, end=START + 2)
+
+        assert np.array_equal(series.metrics["detections"], [0, 1, 2])
+
+    def test_invalid_batch_is_rejected(self, store):
+        """Test de rechazo de métricas con distinta longitud que los tiempos."""
+        with pytest.raises(ValueError):
+            store.append(
+                source_id="cam", timestamps=[START, START + 1], metrics={"detections": [1]}
+            )
+
+    def test_minute_and_hour_rollups(self, store):
+        """Test de agregados por minuto y hora, fusionando lotes del mismo intervalo."""
+        timestamps = START + np.arange(0, 7200, 0.5)
+        values = (np.arange(timestamps.size) % 10).astype(np.float32)
+        half = timestamps.size // 2 + 7
+        store.append(
+            source_id="cam", timestamps=timestamps[:half], metrics={"detections": values[:half]}
+        )
+        store.append(
+            source_id="cam", timestamps=timestamps[half:], metrics={"detections": values[half:]}
+        )
+
+        minutes = store.query_rollups(
+            source_id="cam", metric="detections", start=START, end=START + 7199
+        )
+        hours = store.query_rollups(
+            source_id="cam",
+            metric="detections",
+            start=START,
+            end=START + 7199,
+            resolution="hour",
+        )
+
+        assert minutes.buckets.tolist() == [int(START) + 60 * i for i in range(120)]
+        assert minutes.count.tolist() == [120] * 120
+        assert hours.count.tolist() == [7200, 7200]
+        assert np.isclose(hours.sum.sum(), values.sum())
+        assert np.isclose(minutes.sum.sum(), values.sum())
+        assert hours.min.tolist() == [0, 0]
+        assert hours.max.tolist() == [9, 9]
+        assert np.allclose(hours.mean, values.mean())
+
+    def test_rollups_of_sparse_metric(self, store):
+        """Test de agregados de una métrica ausente en algunos lotes del intervalo."""
+        store.append(source_id="cam", timestamps=[START, START + 1], metrics={})
+        store.append(
+            source_id="cam",
+            timestamps=[START + 2, START + 3],
+            metrics={"detections/person": [2, 1]},
+        )
+
+        minutes = store.query_rollups(
+            source_id="cam", metric="detections/person", start=START, end=START + 59
+        )
+        missing = store.query_rollups(
+            source_id="cam", metric="detections/car", start=START, end=START + 59
+        )
+
+        assert minutes.count.tolist() == [4]
+        assert minutes.sum.tolist() == [3]
+        assert minutes.min.tolist() == [0]
+        assert minutes.max.tolist() == [2]
+        assert minutes.mean.tolist() == [0.75]
+        assert missing.count.tolist() == [4]
+        assert missing.max.tolist() == [0]
+
+    def test_reserved_metric_is_rejected(self, store):
+        """Test de rechazo del nombre de métrica reservado para el número de fotogramas."""
+        with pytest.raises(ValueError):
+            store.append(source_id="cam", timestamps=[START], metrics={"_frames": [1]})
+
+    def test_unknown_resolution_is_rejected(self, store):
+        """Test de rechazo de una resolución sin agregados."""
+        with pytest.raises(ValueError):
+            store.query_rollups(
+                source_id="cam", metric="detections", start=START, end=START, resolution=300
+            )
+
+    def test_retention(self, tmp_path):
+        """Test de borrado de datos en bruto y agregados por minuto antiguos."""
+        store = DetectionsStore(
+            db_file_path=str(tmp_path / "detections.db"),
+            raw_retention=3600,
+            minute_rollups_retention=2 * 3600,
+        )
+        store.append(source_id="cam", timestamps=[START], metrics={"detections": [1]})
+        store.append(
+            source_id="cam", timestamps=[START + 3 * 3600], metrics={"detections": [2]}
+        )
+        store.enforce_retention()
+
+        raw = store.query_raw(source_id="cam", start=START, end=START + 4 * 3600)
+        minutes = store.query_rollups(
+            source_id="cam", metric="detections", start=START, end=START + 4 * 3600
+        )
+        hours = store.query_rollups(
+            source_id="cam",
+            metric="detections",
+            start=START,
+            end=START + 4 * 3600,
+            resolution="hour",
+        )
+        store.close()
+
+        assert raw.timestamps.tolist() == [START + 3 * 3600]
+        assert minutes.buckets.tolist() == [int(START) + 3 * 3600]
+        assert hours.count.tolist() == [1, 1]
+
+    def test_alarm_transitions(self, store):
+        """Test de registro y consulta de transiciones de alarmas."""
+        store.append_alarm_transitions(
+            source_id="cam",
+            alarm="crowd",
+            timestamps=[START + 10, START + 20],
+            active=[True, False],
+        )
+        store.append_alarm_transitions(
+            source_id="cam", alarm="intrusion", timestamps=[START + 15], active=[True]
+        )
+
+        transitions = store.query_alarm_transitions(
+            source_id="cam", start=START, end=START + 30
+        )
+        crowd = store.query_alarm_transitions(
+            source_id="cam", start=START, end=START + 30, alarm="crowd"
+        )
+
+        assert [(t.alarm, t.active) for t in transitions] == [
+            ("crowd", True),
+            ("intrusion", True),
+            ("crowd", False),
+        ]
+        assert [t.timestamp for t in crowd] == [START + 10, START + 20]
+        assert store.list_sources() == []
+
+
+class TestDetectionsStoreSink:
+    """Tests del sink que resume las predicciones del pipeline."""
+
+    def test_summarise_detections(self):
+        """Test del resumen de detecciones por clase."""
+        summary = summarise_detections(make_prediction(["car", "person", "car"]))
+
+        assert summary == {
+            "detections": 3.0,
+            "detections/car": 2.0,
+            "detections/person": 1.0,
+            "max_confidence": pytest.approx(0.7),
+        }
+        assert summarise_detections({"other": 1}) == {}
+
+    def test_frames_are_written_in_batches(self, store):
+        """Test de escritura por lotes y de las transiciones de alarmas."""
+        sink = DetectionsStoreSink(
+            store=store,
+            predictions_field="predictions",
+            alarms={"crowd": lambda summary: summary.get("detections/person", 0) >= 2},
+            batch_size=4,
+        )
+        classes = [[], ["person"], ["person", "person"], ["car"], ["person"] * 3]
+        for i, frame_classes in enumerate(classes):
+            sink.on_prediction(
+                make_prediction(frame_classes), make_video_frame(START + i)
+            )
+
+        written = store.query_raw(source_id="0", start=START, end=START + 10)
+        assert written.timestamps.size == 4
+
+        sink.close()
+
+        series = store.query_raw(source_id="0", start=START, end=START + 10)
+        transitions = store.query_alarm_transitions(
+            source_id="0", start=START, end=START + 10
+        )
+        assert series.metrics["detections"].tolist() == [0, 1, 2, 1, 3]
+        assert series.metrics["detections/person"].tolist() == [0, 1, 2, 0, 3]
+        assert series.metrics["detections/car"].tolist() == [0, 0, 0, 1, 0]
+        assert [(t.timestamp, t.active) for t in transitions] == [
+            (START + 2, True),
+            (START + 3, False),
+            (START + 4, True),
+        ]
+        assert store.list_sources() == ["0"]
+
+    def test_rollups_do_not_depend_on_batches(self, store):
+        """Test de que los agregados por clase no dependen de los límites de los lotes."""
+        sink = DetectionsStoreSink(
+            store=store, predictions_field="predictions", alarms=None, batch_size=2
+        )
+        for i, frame_classes in enumerate([[], [], ["person"], []]):
+            sink.on_prediction(
+                make_prediction(frame_classes), make_video_frame(START + i)
+            )
+        sink.close()
+
+        minutes = store.query_rollups(
+            source_id="0", metric="detections/person", start=START, end=START + 59
+        )
+
+        assert minutes.count.tolist() == [4]
+        assert minutes.mean.tolist() == [0.25]
+        assert minutes.min.tolist() == [0]
+
+    def test_multiple_sources_and_empty_predictions(self, store):
+        """Test de predicciones de varias fuentes, ignorando las vacías."""
+        sink = DetectionsStoreSink(
+            store=store, predictions_field="predictions", alarms=None, batch_size=100
+        )
+
+        sink.on_prediction(
+            [make_prediction(["car"]), None, make_prediction([])],
+            [
+                make_video_frame(START, source_id=0),
+                make_video_frame(START, source_id=1),
+                make_video_frame(START, source_id=2),
+            ],
+        )
+        sink.flush()
+
+        assert store.list_sources() == ["0", "2"]
@@ -0,0 +1,190 @@
+"""
+Tests de las sesiones EtherNet/IP compartidas por los blocks PLC, contra un PLC CIP simulado.
+"""
+
+from types import SimpleNamespace
+
+from pylogix.lgx_response import Response
+
+from care.workflows.care_steps.sinks.PLCethernetIP.client import (
+    EthernetIPSession,
+    EthernetIPSessionsPool,
+)
+
+CIP_SUCCESS = 0
+CIP_PATH_DESTINATION_UNKNOWN = 5
+CONNECTION_FAILURE = 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCIPController:
+    """Controlador simulado: etiquetas en memoria y registro de peticiones multi-servicio."""
+
+    def __init__(self, tags: dict):
+        self.tags = dict(tags)
+        self.online = True
+        self.sessions_opened = 0
+        self.requests = []
+
+    def plc_factory(self, ip_address: str, slot: int = 0) -> "FakePLC":
+        self.sessions_opened += 1
+        return FakePLC(controller=self)
+
+
+class FakePLC:
+    """Imita la interfaz de `pylogix.PLC` usada por las sesiones."""
+
+    def __init__(self, controller: FakeCIPController):
+        self._controller = controller
+        self.conn = SimpleNamespace(SocketConnected=True)
+        self.closed = False
+
+    def Read(self, tags):
+        self._controller.requests.append(("read", list(tags)))
+        return [self._read(tag) for tag in tags]
+
+    def Write(self, tags):
+        self._controller.requests.append(("write", list(tags)))
+        return [self._write(tag, value) for tag, value in tags]
+
+    def Close(self):
+        self.closed = True
+
+    def _read(self, tag):
+        if not self._controller.online:
+            self.conn.SocketConnected = False
+            return Response(tag, None, CONNECTION_FAILURE)
+        if tag not in self._controller.tags:
+            return Response(tag, None, CIP_PATH_DESTINATION_UNKNOWN)
+        return Response(tag, self._controller.tags[tag], CIP_SUCCESS)
+
+    def _write(self, tag, value):
+        if not self._controller.online:
+            self.conn.SocketConnected = False
+            return Response(tag, None, CONNECTION_FAILURE)
+        if tag not in self._controller.tags:
+            return Response(tag, None, CIP_PATH_DESTINATION_UNKNOWN)
+        self._controller.tags[tag] = value
+        return Response(tag, value, CIP_SUCCESS)
+
+
+def make_session(controller: FakeCIPController, clock=None) -> EthernetIPSession:
+    return EthernetIPSession(
+        plc_ip="10.0.0.1",
+        plc_factory=controller.plc_factory,
+        initial_backoff=1.0,
+        clock=clock or FakeClock(),
+    )
+
+
+class TestEthernetIPSession:
+    """Tests de lecturas y escrituras agrupadas."""
+
+    def test_single_request_per_operation(self):
+        """Test de una petición multi-servicio por lectura y por escritura."""
+        controller = FakeCIPController(tags={"a": 1, "b": 2, "c": 3})
+        session = make_session(controller)
+
+        read_results = session.read_tags(["a", "b", "missing"])
+        write_results = session.write_tags({"a": 10, "c": 30})
+
+        assert read_results == {"a": 1, "b": 2, "missing": "ReadFailure"}
+        assert write_results == {"a": "WriteSuccess", "c": "WriteSuccess"}
+        assert controller.requests == [
+            ("read", ["a", "b", "missing"]),
+            ("write", [("a", 10), ("c", 30)]),
+        ]
+        assert controller.sessions_opened == 1
+
+    def test_unchanged_values_are_not_written(self):
+        """Test de que sólo se escriben los valores modificados."""
+        controller = FakeCIPController(tags={"a": 0, "b": 0})
+        session = make_session(controller)
+
+        session.write_tags({"a": 1, "b": 2})
+        results = session.write_tags({"a": 1, "b": 3})
+        session.write_tags({"a": 1, "b": 3})
+
+        assert results == {"a": "WriteSuccess", "b": "WriteSuccess"}
+        assert [r[1] for r in controller.requests] == [[("a", 1), ("b", 2)], [("b", 3)]]
+
+    def test_value_type_change_is_written(self):
+        """Test de que `True` y `1` se consideran valores distintos."""
+        controller = FakeCIPController(tags={"flag": 0})
+        session = make_session(controller)
+
+        session.write_tags({"flag": 1})
+        session.write_tags({"flag": True})
+
+        assert len(controller.requests) == 2
+
+    def test_failed_writes_are_retried(self):
+        """Test de que una escritura fallida no se memoriza."""
+        controller = FakeCIPController(tags={})
+        session = make_session(controller)
+
+        assert session.write_tags({"a": 1}) == {"a": "WriteFailure"}
+        controller.tags["a"] = 0
+        assert session.write_tags({"a": 1}) == {"a": "WriteSuccess"}
+
+    def test_reconnects_with_backoff(self):
+        """Test de reapertura de la sesión tras perder la conexión."""
+        controller = FakeCIPController(tags={"a": 0})
+        clock = FakeClock()
+        session = make_session(controller, clock=clock)
+        session.write_tags({"a": 1})
+
+        controller.online = False
+        assert session.read_tags(["a"]) == {"a": "ReadFailure"}
+        controller.online = True
+        assert session.read_tags(["a"]) == {"a": "ReadFailure"}
+        assert controller.sessions_opened == 1
+
+        clock.now = 1.0
+        assert session.read_tags(["a"]) == {"a": 1}
+        assert controller.sessions_opened == 2
+        # tras reconectar se vuelve a escribir aunque el valor no haya cambiado
+        session.write_tags({"a": 1})
+        assert controller.requests[-1] == ("write", [("a", 1)])
+
+
+class TestEthernetIPSessionsPool:
+    """Tests del pool de sesiones por (IP, slot)."""
+
+    def test_sessions_are_shared(self):
+        """Test de que una misma IP y slot comparten sesión."""
+        pool = EthernetIPSessionsPool(session_factory=EthernetIPSession)
+
+        assert pool.get("10.0.0.1") is pool.get("10.0.0.1", slot=0)
+        assert pool.get("10.0.0.1") is not pool.get("10.0.0.1", slot=1)
+        assert pool.get("10.0.0.1") is not pool.get("10.0.0.2")
+
+    def test_idle_sessions_are_closed(self):
+        """Test de cierre de sesiones sin uso."""
+        controller = FakeCIPController(tags={"a": 0})
+        clock = FakeClock()
+        pool = EthernetIPSessionsPool(
+            idle_timeout=10.0,
+            session_factory=lambda plc_ip, slot: EthernetIPSession(
+                plc_ip=plc_ip, slot=slot, plc_factory=controller.plc_factory, clock=clock
+            ),
+            clock=clock,
+        )
+        session = pool.get("10.0.0.1")
+        session.read_tags(["a"])
+
+        clock.now = 5.0
+        assert pool.get("10.0.0.1") is session
+        clock.now = 20.0
+        new_session = pool.get("10.0.0.1")
+
+        assert new_session is not session
+        assert new_session.read_tags(["a"]) == {"a": 0}
+        assert controller.sessions_opened == 2
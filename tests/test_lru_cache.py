@@ -0,0 +1,225 @@
+"""
+Tests de la caché LRU acotada por número de entradas y por bytes, con caducidad.
+"""
+
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from care.cache.lru_cache import LRUCache, estimate_size_in_bytes
+
+
+class FakeTensor:
+    """Tensor con la interfaz de torch usada para medir su tamaño."""
+
+    def __init__(self, numel: int, element_size: int = 4):
+        self._numel = numel
+        self._element_size = element_size
+
+    def element_size(self) -> int:
+        return self._element_size
+
+    def nelement(self) -> int:
+        return self._numel
+
+
+class TestEviction:
+    """Tests de expulsión de entradas por número y por tamaño."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test de que se expulsa la entrada usada hace más tiempo."""
+        cache = LRUCache(capacity=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1
+
+        cache["c"] = 3
+
+        assert cache.keys() == ["a", "c"]
+        assert "b" not in cache
+
+    def test_capacity_can_be_reduced(self):
+        """Test de que reducir la capacidad expulsa las entradas sobrantes."""
+        cache = LRUCache(capacity=None)
+        for i in range(10):
+            cache[i] = i
+
+        cache.set_max_size(3)
+
+        assert cache.keys() == [7, 8, 9]
+        assert cache.stats().evictions == 7
+
+    def test_size_in_bytes_is_bounded(self):
+        """Test de expulsión por bytes, contabilizando el tamaño de los arrays."""
+        cache = LRUCache(capacity=None, max_size_bytes=2500)
+        for i in range(4):
+            cache[i] = np.zeros(250, dtype=np.float32)
+
+        assert cache.keys() == [2, 3]
+        assert cache.size_bytes == 2000
+
+    def test_replacing_entry_updates_size(self):
+        """Test de que sobrescribir una clave no cuenta dos veces su tamaño."""
+        cache = LRUCache(capacity=None, max_size_bytes=10_000)
+        cache["a"] = np.zeros(100, dtype=np.uint8)
+        cache["a"] = np.zeros(300, dtype=np.uint8)
+        del cache["a"]
+
+        assert cache.size_bytes == 0
+        assert len(cache) == 0
+
+    def test_custom_sizer(self):
+        """Test de la función de medida proporcionada por el llamante."""
+        cache = LRUCache(capacity=None, max_size_bytes=5, sizer=len)
+        cache["a"] = "abc"
+        cache["b"] = "de"
+        cache["c"] = "f"
+
+        assert cache.keys() == ["b", "c"]
+        assert cache.size_bytes == 3
+
+    def test_too_large_entry_is_not_kept(self):
+        """Test de que una entrada mayor que el límite no se queda en la caché."""
+        cache = LRUCache(capacity=None, max_size_bytes=100)
+        cache["small"] = np.zeros(10, dtype=np.uint8)
+
+        cache["large"] = np.zeros(1000, dtype=np.uint8)
+
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+
+class TestSizeEstimation:
+    """Tests de la estimación del tamaño de los valores cacheados."""
+
+    def test_sam_embedding_tuple(self):
+        """Test de que la tupla (embedding, forma) de SAM cuenta el buffer del array."""
+        embedding = np.zeros((1, 256, 64, 64), dtype=np.float32)
+        value = (embedding, (1024, 768))
+
+        size = estimate_size_in_bytes(value)
+
+        assert size >= embedding.nbytes
+        assert size - embedding.nbytes < 1024
+
+    def test_sam2_features_dict(self):
+        """Test de que el diccionario de tensores de SAM2 se mide recursivamente."""
+        features = {
+            "image_embed": FakeTensor(256 * 64 * 64),
+            "high_res_feats": [FakeTensor(32 * 256 * 256), FakeTensor(64 * 128 * 128)],
+        }
+        tensors_bytes = 4 * (256 * 64 * 64 + 32 * 256 * 256 + 64 * 128 * 128)
+
+        size = estimate_size_in_bytes((features, (1024, 1024)))
+
+        assert size >= tensors_bytes
+        assert size - tensors_bytes < 4096
+
+    def test_sam_embeddings_are_bounded_by_bytes(self):
+        """Test de que la caché de embeddings de SAM respeta el límite en bytes."""
+        embedding_bytes = 256 * 64 * 64 * 4
+        cache = LRUCache(capacity=None, max_size_bytes=int(2.5 * embedding_bytes))
+        for image_id in range(5):
+            cache[image_id] = (
+                np.zeros((1, 256, 64, 64), dtype=np.float32),
+                (1024, 1024),
+            )
+
+        assert cache.keys() == [3, 4]
+        assert cache.size_bytes <= cache.max_size_bytes
+
+    def test_objects_without_buffer(self):
+        """Test de que el resto de objetos se mide con sys.getsizeof."""
+        assert estimate_size_in_bytes("abc") == sys.getsizeof("abc")
+
+
+class TestExpiration:
+    """Tests de caducidad de las entradas."""
+
+    def test_entry_expires_after_ttl(self):
+        """Test de que una entrada caducada no se devuelve y se elimina."""
+        cache = LRUCache(capacity=None, max_size_bytes=10_000, ttl=0.05)
+        cache["a"] = np.zeros(100, dtype=np.uint8)
+        assert cache.get("a") is not None
+
+        time.sleep(0.1)
+
+        assert cache.get("a") is None
+        assert "a" not in cache
+        assert cache.size_bytes == 0
+        assert cache.stats().expirations == 1
+
+    def test_setting_entry_refreshes_expiry(self):
+        """Test de que volver a guardar una clave renueva su caducidad."""
+        cache = LRUCache(ttl=0.2)
+        cache["a"] = 1
+        time.sleep(0.15)
+        cache["a"] = 1
+        time.sleep(0.1)
+
+        assert cache.get("a") == 1
+
+    def test_expired_entries_are_not_listed(self):
+        """Test de que keys() y len() no incluyen entradas caducadas."""
+        cache = LRUCache(ttl=0.05)
+        cache["a"] = 1
+        time.sleep(0.1)
+        cache["b"] = 2
+
+        assert cache.keys() == ["b"]
+        assert len(cache) == 1
+
+
+class TestStats:
+    """Tests de los contadores de la caché."""
+
+    def test_hits_misses_and_evictions(self):
+        """Test de los contadores de aciertos, fallos y expulsiones."""
+        cache = LRUCache(capacity=1)
+        cache["a"] = 1
+        cache.get("a")
+        cache.get("b")
+        with pytest.raises(KeyError):
+            cache["b"]
+        cache["b"] = 2
+
+        stats = cache.stats()
+
+        assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 1)
+        assert stats.entries == 1
+        assert stats.expirations == 0
+
+
+class TestConcurrency:
+    """Tests de acceso concurrente desde varios hilos."""
+
+    def test_concurrent_access_keeps_bounds_and_size(self):
+        """Test de que el acceso concurrente respeta los límites y la contabilidad."""
+        cache = LRUCache(capacity=50, max_size_bytes=40 * 80)
+        errors = []
+
+        def worker(worker_id: int) -> None:
+            try:
+                for i in range(500):
+                    key = (worker_id, i % 70)
+                    cache[key] = np.zeros(80, dtype=np.uint8)
+                    cache.get((worker_id, (i * 7) % 70))
+                    if i % 11 == 0:
+                        cache.pop(key)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert errors == []
+        assert stats.entries <= 40
+        assert stats.size_bytes == 80 * stats.entries
+        assert stats.hits + stats.misses == 8 * 500
@@ -0,0 +1,188 @@
+"""
+Tests de la agrupación de predicciones concurrentes en ejecuciones por lotes del modelo.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from care.managers.base import ModelManager
+from care.managers.decorators.micro_batching import WithMicroBatching
+from care.models.utils.micro_batching import CoalescingPredictor, micro_batching_client
+from care.registries.base import ModelRegistry
+from care.stream.utils import on_pipeline_end
+
+
+class RecordingPredict:
+    """Función de predicción que registra los lotes recibidos y puede bloquearse."""
+
+    def __init__(self, error: Exception = None):
+        self.batches = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.error = error
+
+    def __call__(self, img_in: np.ndarray, **kwargs):
+        self.started.set()
+        self.gate.wait(timeout=10)
+        self.batches.append(img_in[:, 0].tolist())
+        if self.error is not None:
+            raise self.error
+        return img_in * 2, np.array([7])
+
+
+class BatchingFakeModel:
+    batching_enabled = True
+
+    def __init__(self, model_id, api_key, countinference=None, service_secret=None):
+        self.model_id = model_id
+
+    def predict(self, img_in: np.ndarray, **kwargs):
+        return (img_in,)
+
+    def clear_cache(self, delete_from_disk: bool = True) -> None:
+        pass
+
+
+class FakeRegistry(ModelRegistry):
+    def get_model(self, model_id, api_key, **kwargs):
+        return BatchingFakeModel
+
+
+def predict_as(predictor: CoalescingPredictor, client_id: str, value: float):
+    with micro_batching_client(client_id):
+        return predictor.predict(np.full((1, 2), value, dtype=np.float32))
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert condition()
+
+
+@pytest.fixture
+def make_predictor():
+    predictors = []
+
+    def make(predict, max_batch_size: int = 4, max_wait: float = 0.0):
+        predictor = CoalescingPredictor(
+            predict=predict, max_batch_size=max_batch_size, max_wait=max_wait
+        )
+        predictors.append(predictor)
+        return predictor
+
+    yield make
+    for predictor in predictors:
+        predictor.close()
+
+
+class TestCoalescingPredictor:
+    """Tests de agrupación, reparto entre clientes y propagación de errores."""
+
+    def test_concurrent_predictions_are_coalesced(self, make_predictor):
+        """Test de que predicciones concurrentes se ejecutan en un solo lote."""
+        predict = RecordingPredict()
+        predictor = make_predictor(predict, max_batch_size=4, max_wait=5.0)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(lambda i: predict_as(predictor, f"client-{i}", i), range(4))
+            )
+
+        assert len(predict.batches) == 1
+        assert sorted(predict.batches[0]) == [0, 1, 2, 3]
+        for i, (scores, shared) in enumerate(results):
+            assert np.array_equal(scores, np.full((1, 2), 2 * i))
+            assert np.array_equal(shared, [7])
+
+    def test_clients_are_served_round_robin(self, make_predictor):
+        """Test de que un cliente con muchas peticiones no acapara el lote."""
+        predict = RecordingPredict()
+        predictor = make_predictor(predict, max_batch_size=4)
+        predict.gate.clear()
+        with ThreadPoolExecutor(max_workers=9) as pool:
+            blocker = pool.submit(predict_as, predictor, "other", -1)
+            wait_until(predict.started.is_set)
+            busy = [pool.submit(predict_as, predictor, "busy", i) for i in range(6)]
+            wait_until(lambda: predictor._queued_elements() == 6)
+            quiet = [pool.submit(predict_as, predictor, "quiet", 100 + i) for i in range(2)]
+            wait_until(lambda: predictor._queued_elements() == 8)
+            predict.gate.set()
+            for future in [blocker, *busy, *quiet]:
+                future.result(timeout=10)
+
+        assert predict.batches[0] == [-1]
+        assert predict.batches[1] == [0, 100, 1, 101]
+        assert predict.batches[2] == [2, 3, 4, 5]
+
+    def test_error_is_propagated_to_all_callers(self, make_predictor):
+        """Test de que el error del lote llega a todas las peticiones agrupadas."""
+        predict = RecordingPredict(error=ValueError("model failed"))
+        predictor = make_predictor(predict, max_batch_size=3, max_wait=5.0)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(predict_as, predictor, f"client-{i}", i) for i in range(3)
+            ]
+            for future in futures:
+                with pytest.raises(ValueError, match="model failed"):
+                    future.result(timeout=10)
+
+        assert len(predict.batches) == 1
+        predict.error = None
+        scores, _ = predict_as(predictor, "client-0", 1)
+        assert np.array_equal(scores, np.full((1, 2), 2))
+
+    def test_closed_predictor_runs_predictions_directly(self, make_predictor):
+        """Test de que tras close() las predicciones no pasan por el hilo del predictor."""
+        predict = RecordingPredict()
+        predictor = make_predictor(predict)
+
+        predictor.close()
+        scores, _ = predict_as(predictor, "client", 3)
+
+        assert not predictor._worker.is_alive()
+        assert np.array_equal(scores, np.full((1, 2), 6))
+
+
+class TestWithMicroBatching:
+    """Tests del ciclo de vida de los predictores instalados por el decorador."""
+
+    def test_dispose_stops_predictors_and_restores_predict(self):
+        """Test de que dispose() para los hilos y restaura predict() de los modelos."""
+        manager = WithMicroBatching(
+            ModelManager(model_registry=FakeRegistry(registry_dict={}))
+        )
+        manager.add_model(model_id="project/1", api_key="key")
+        model = manager["project/1"]
+        predictor = manager._predictors["project/1"]
+        assert "predict" in vars(model)
+
+        manager.dispose()
+
+        assert "predict" not in vars(model)
+        assert not predictor._worker.is_alive()
+        assert manager._predictors == {}
+
+    def test_pipeline_end_disposes_micro_batching(self):
+        """Test de que al terminar el pipeline se liberan los predictores."""
+        micro_batching_manager = mock.MagicMock()
+        shared_models_manager = mock.MagicMock()
+
+        on_pipeline_end(
+            thread_pool_executor=ThreadPoolExecutor(max_workers=1),
+            cancel_thread_pool_tasks_on_exit=True,
+            profiler=mock.MagicMock(),
+            profiling_directory="",
+            shared_models_manager=shared_models_manager,
+            micro_batching_manager=micro_batching_manager,
+        )
+
+        micro_batching_manager.dispose.assert_called_once_with()
+        shared_models_manager.dispose.assert_called_once_with()
@@ -0,0 +1,257 @@
+"""
+Tests del cliente Modbus TCP con lecturas/escrituras agrupadas contra un servidor pymodbus local.
+"""
+
+import asyncio
+import socket
+import threading
+from collections import Counter
+
+import pytest
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext
+from pymodbus.server import ModbusTcpServer
+
+try:
+    # pymodbus >= 3.10
+    from pymodbus.datastore import ModbusDeviceContext
+
+    SERVER_CONTEXT_DEVICES_PARAMETER = "devices"
+except ImportError:
+    # pymodbus < 3.10, pinned by inference
+    from pymodbus.datastore import ModbusSlaveContext as ModbusDeviceContext
+
+    SERVER_CONTEXT_DEVICES_PARAMETER = "slaves"
+
+from care.workflows.care_steps.sinks.PLC_modbus.client import (
+    MAX_REGISTERS_PER_READ,
+    ModbusRegistersClient,
+    coalesce_addresses,
+)
+from care.workflows.care_steps.sinks.PLC_modbus.v1 import ModbusTCPBlockV1
+
+READ_HOLDING_REGISTERS = 3
+WRITE_MULTIPLE_REGISTERS = 16
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class CountingDataBlock(ModbusSequentialDataBlock):
+    """Bloque de registros que cuenta las lecturas y escrituras recibidas."""
+
+    def __init__(self, requests: Counter, address: int, values: list):
+        super().__init__(address, values)
+        self.requests = requests
+
+    def getValues(self, address, count=1):  # noqa: N802
+        self.requests[READ_HOLDING_REGISTERS] += 1
+        return super().getValues(address, count)
+
+    def setValues(self, address, values):  # noqa: N802
+        self.requests[WRITE_MULTIPLE_REGISTERS] += 1
+        return super().setValues(address, values)
+
+
+class PLCSimulator:
+    """Servidor Modbus TCP en un hilo, cuenta las peticiones recibidas por código de función."""
+
+    def __init__(self, port: int, registers: int = 400):
+        self.port = port
+        self.requests = Counter()
+        self._registers = registers
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self) -> "PLCSimulator":
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        async def serve():
+            device = ModbusDeviceContext(
+                hr=CountingDataBlock(self.requests, 1, [0] * self._registers)
+            )
+            self._server = ModbusTcpServer(
+                ModbusServerContext(
+                    **{SERVER_CONTEXT_DEVICES_PARAMETER: {1: device}}, single=False
+                ),
+                address=("127.0.0.1", self.port),
+            )
+            await self._server.serve_forever(background=True)
+            started.set()
+
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop).result(timeout=5)
+        assert started.wait(timeout=5)
+        return self
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._server.shutdown(), self._loop).result(
+            timeout=5
+        )
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture
+def plc():
+    simulator = PLCSimulator(port=get_free_port()).start()
+    yield simulator
+    simulator.stop()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCoalesceAddresses:
+    """Tests de agrupación de direcciones en rangos contiguos."""
+
+    def test_contiguous_ranges(self):
+        """Test de rangos ordenados sin duplicados."""
+        assert coalesce_addresses([7, 1, 2, 3, 9, 8, 2, 20], max_count=125) == [
+            (1, 3),
+            (7, 3),
+            (20, 1),
+        ]
+
+    def test_protocol_limit(self):
+        """Test de división de rangos que superan el límite del protocolo."""
+        ranges = coalesce_addresses(range(300), max_count=MAX_REGISTERS_PER_READ)
+
+        assert ranges == [(0, 125), (125, 125), (250, 50)]
+
+
+class TestModbusRegistersClient:
+    """Tests del cliente contra el simulador."""
+
+    def test_writes_and_reads_are_coalesced(self, plc):
+        """Test de una petición por rango contiguo."""
+        client = ModbusRegistersClient("127.0.0.1", port=plc.port)
+        assert client.connect()
+        values = {address: address * 2 for address in [10, 11, 12, 13, 50, 51]}
+
+        write_results = client.write_registers(values)
+        read_results = client.read_registers([13, 10, 11, 12, 50, 51, 52])
+
+        assert set(write_results.values()) == {"WriteSuccess"}
+        assert read_results == {**values, 52: 0}
+        assert list(read_results) == [13, 10, 11, 12, 50, 51, 52]
+        assert plc.requests[WRITE_MULTIPLE_REGISTERS] == 2
+        assert plc.requests[READ_HOLDING_REGISTERS] == 2
+        client.close()
+
+    def test_large_read_respects_protocol_limit(self, plc):
+        """Test de lectura de más registros de los permitidos en una petición."""
+        client = ModbusRegistersClient("127.0.0.1", port=plc.port)
+        assert client.connect()
+
+        results = client.read_registers(list(range(300)))
+
+        assert len(results) == 300
+        assert plc.requests[READ_HOLDING_REGISTERS] == 3
+        client.close()
+
+    def test_unchanged_values_are_not_written(self, plc):
+        """Test de que sólo se envían los valores modificados."""
+        client = ModbusRegistersClient("127.0.0.1", port=plc.port)
+        assert client.connect()
+
+        client.write_registers({1: 5, 2: 6, 3: 7})
+        results = client.write_registers({1: 5, 2: 60, 3: 7})
+
+        assert results == {1: "WriteSuccess", 2: "WriteSuccess", 3: "WriteSuccess"}
+        assert plc.requests[WRITE_MULTIPLE_REGISTERS] == 2
+        assert client.read_registers([1, 2, 3]) == {1: 5, 2: 60, 3: 7}
+        client.close()
+
+    def test_failed_range_is_isolated_per_register(self, plc):
+        """Test de que un rango con direcciones inválidas no afecta al resto."""
+        client = ModbusRegistersClient("127.0.0.1", port=plc.port)
+        assert client.connect()
+        client.write_registers({398: 1, 399: 2})
+
+        results = client.read_registers([398, 399, 400, 401])
+
+        assert results == {398: 1, 399: 2, 400: "ReadFailure", 401: "ReadFailure"}
+        assert client.connected
+        client.close()
+
+    def test_reconnects_with_backoff(self):
+        """Test de reconexión tras caída del PLC respetando el backoff."""
+        port = get_free_port()
+        clock = FakeClock()
+        client = ModbusRegistersClient(
+            "127.0.0.1", port=port, timeout=0.5, initial_backoff=1.0, clock=clock
+        )
+
+        assert not client.connect()
+        plc = PLCSimulator(port=port).start()
+        try:
+            assert not client.connect()
+            clock.now = 1.0
+            assert client.connect()
+            assert client.write_registers({5: 1}) == {5: "WriteSuccess"}
+        finally:
+            plc.stop()
+
+        assert client.read_registers([5]) == {5: "ReadFailure"}
+        assert not client.connected
+        plc = PLCSimulator(port=port).start()
+        try:
+            assert client.connect()
+            # tras reconectar se vuelve a escribir aunque el valor no haya cambiado
+            assert client.write_registers({5: 1}) == {5: "WriteSuccess"}
+            assert plc.requests[WRITE_MULTIPLE_REGISTERS] == 1
+        finally:
+            plc.stop()
+            client.close()
+
+
+class TestModbusTCPBlock:
+    """Tests del block ModbusTCP v1."""
+
+    def test_read_and_write(self, plc):
+        """Test de lectura y escritura en una ejecución."""
+        block = ModbusTCPBlockV1()
+
+        result = block.run(
+            plc_ip="127.0.0.1",
+            plc_port=plc.port,
+            mode="read_and_write",
+            registers_to_read=[100, 101],
+            registers_to_write={100: 7, 101: 8},
+            depends_on=None,
+        )
+
+        assert result == {
+            "modbus_results": [
+                {
+                    "read": {100: 0, 101: 0},
+                    "write": {100: "WriteSuccess", 101: "WriteSuccess"},
+                }
+            ]
+        }
+
+    def test_connection_failure(self):
+        """Test de error de conexión."""
+        block = ModbusTCPBlockV1()
+
+        result = block.run(
+            plc_ip="127.0.0.1",
+            plc_port=get_free_port(),
+            mode="read",
+            registers_to_read=[1],
+            registers_to_write={},
+            depends_on=None,
+        )
+
+        assert result == {"modbus_results": [{"error": "ConnectionFailure"}]}
@@ -0,0 +1,280 @@
+"""
+Tests de la descarga de artefactos de modelos a la caché contra un servidor HTTP local que
+sirve un artefacto grande con soporte de peticiones Range.
+"""
+
+import base64
+import hashlib
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import care.cache.model_artifacts as model_artifacts
+import care.roboflow_api as roboflow_api
+from care.exceptions import (
+    RoboflowAPINotNotFoundError,
+    RoboflowAPIUnsuccessfulRequestError,
+)
+from care.utils.http_client import close_http_session
+
+ARTIFACT_SIZE = 8 * 1024 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d+)-$")
+
+
+class ArtifactServer:
+    """Servidor que sirve un artefacto con ETag, x-goog-hash y rangos de bytes."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.etag = '"v1"'
+        self.md5 = hashlib.md5(content).digest()
+        self.requests = []
+        self.bytes_sent = 0
+        self.truncate_next_responses_at = []
+        self.statuses_of_next_responses = []
+        self.etags_after_response = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/weights.onnx"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(dict(self.headers))
+                    truncate_at = (
+                        server.truncate_next_responses_at.pop(0)
+                        if server.truncate_next_responses_at
+                        else None
+                    )
+                    status = (
+                        server.statuses_of_next_responses.pop(0)
+                        if server.statuses_of_next_responses
+                        else None
+                    )
+                server.gate.wait(timeout=10)
+                if status is not None:
+                    self.send_response(status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start = 0
+                match = RANGE_PATTERN.match(self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match is not None and (if_range is None or if_range == server.etag):
+                    start = int(match.group(1))
+                if start >= len(server.content) > 0:
+                    self.send_response(416)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.content[start:]
+                self.send_response(206 if start else 200)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", server.etag)
+                self.send_header(
+                    "x-goog-hash",
+                    f"crc32c=AAAAAA==,md5={base64.b64encode(server.md5).decode()}",
+                )
+                if start:
+                    self.send_header(
+                        "Content-Range",
+                        f"bytes {start}-{len(server.content) - 1}/{len(server.content)}",
+                    )
+                self.end_headers()
+                if truncate_at is not None:
+                    body = body[:truncate_at]
+                    self.close_connection = True
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+                    if server.etags_after_response:
+                        server.etag = server.etags_after_response.pop(0)
+
+        return Handler
+
+    def start(self) -> "ArtifactServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.gate.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def artifact_server(monkeypatch, tmp_path):
+    server = ArtifactServer(content=os.urandom(ARTIFACT_SIZE)).start()
+    monkeypatch.setattr(model_artifacts, "MODEL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(roboflow_api, "MD5_VERIFICATION_ENABLED", True)
+    close_http_session()
+    yield server
+    close_http_session()
+    server.stop()
+
+
+def download(server: ArtifactServer) -> str:
+    return model_artifacts.download_file_to_cache(
+        url=server.url, file="weights.onnx", model_id="project/1"
+    )
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestDownloadFileToCache:
+    """Tests de la descarga compartida por peticiones concurrentes."""
+
+    def test_file_is_downloaded(self, artifact_server, tmp_path):
+        """Test de descarga completa a la ruta de caché del modelo."""
+        path = download(artifact_server)
+
+        assert path == os.path.join(str(tmp_path), "project/1", "weights.onnx")
+        assert read_bytes(path) == artifact_server.content
+        assert sorted(os.listdir(os.path.dirname(path))) == ["weights.onnx"]
+        assert os.listdir(os.path.join(str(tmp_path), "_file_locks"))
+
+    def test_concurrent_requests_share_download(self, artifact_server):
+        """Test de que las peticiones concurrentes esperan a una única descarga."""
+        artifact_server.gate.clear()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(download(artifact_server)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        while not artifact_server.requests:
+            time.sleep(0.01)
+        # gives remaining threads time to join in-flight download
+        time.sleep(0.2)
+        artifact_server.gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8
+        assert len(set(results)) == 1
+        assert len(artifact_server.requests) == 1
+        assert read_bytes(results[0]) == artifact_server.content
+
+    def test_error_is_shared_with_waiting_requests(self, artifact_server):
+        """Test de que el error de la descarga en curso llega a todos los que esperan."""
+        artifact_server.md5 = hashlib.md5(b"other content").digest()
+        artifact_server.gate.clear()
+        errors = []
+
+        def download_expecting_error():
+            try:
+                download(artifact_server)
+            except RoboflowAPIUnsuccessfulRequestError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=download_expecting_error) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while not artifact_server.requests:
+            time.sleep(0.01)
+        # gives remaining threads time to join in-flight download
+        time.sleep(0.2)
+        artifact_server.gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
+        assert len(artifact_server.requests) == 1
+
+
+class TestDownloadFileFromUrl:
+    """Tests de la descarga en streaming con reanudación y verificación."""
+
+    def test_interrupted_download_is_resumed(self, artifact_server, tmp_path):
+        """Test de reanudación con Range tras un corte a mitad de la transferencia."""
+        artifact_server.truncate_next_responses_at = [ARTIFACT_SIZE // 2]
+        path = str(tmp_path / "weights.onnx")
+
+        roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert read_bytes(path) == artifact_server.content
+        assert len(artifact_server.requests) == 2
+        assert "Range" not in artifact_server.requests[0]
+        assert artifact_server.requests[1]["Range"] == f"bytes={ARTIFACT_SIZE // 2}-"
+        assert artifact_server.requests[1]["If-Range"] == '"v1"'
+        assert artifact_server.bytes_sent == ARTIFACT_SIZE
+        assert os.listdir(str(tmp_path)) == ["weights.onnx"]
+
+    def test_partial_file_is_resumed_by_next_call(
+        self, artifact_server, tmp_path, monkeypatch
+    ):
+        """Test de que el fichero parcial se conserva y se completa en la siguiente llamada."""
+        monkeypatch.setattr(roboflow_api, "MODEL_ARTIFACT_DOWNLOAD_RESUME_ATTEMPTS", 0)
+        artifact_server.truncate_next_responses_at = [ARTIFACT_SIZE // 4]
+        path = str(tmp_path / "weights.onnx")
+
+        with pytest.raises(Exception):
+            roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+        assert not os.path.exists(path)
+        roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert read_bytes(path) == artifact_server.content
+        assert artifact_server.bytes_sent == ARTIFACT_SIZE
+
+    def test_changed_file_is_downloaded_from_scratch(self, artifact_server, tmp_path):
+        """Test de descarga completa cuando el ETag cambia entre intentos."""
+        artifact_server.truncate_next_responses_at = [ARTIFACT_SIZE // 2]
+        artifact_server.etags_after_response = ['"v2"']
+        path = str(tmp_path / "weights.onnx")
+
+        roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert read_bytes(path) == artifact_server.content
+        assert len(artifact_server.requests) == 2
+        assert artifact_server.requests[1]["If-Range"] == '"v1"'
+        assert artifact_server.bytes_sent == ARTIFACT_SIZE + ARTIFACT_SIZE // 2
+
+    def test_transient_error_is_retried(self, artifact_server, tmp_path, monkeypatch):
+        """Test de reintento de la descarga tras un estado HTTP transitorio."""
+        monkeypatch.setattr(roboflow_api, "TRANSIENT_ROBOFLOW_API_ERRORS", {503})
+        artifact_server.statuses_of_next_responses = [503]
+        path = str(tmp_path / "weights.onnx")
+
+        roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert read_bytes(path) == artifact_server.content
+        assert len(artifact_server.requests) == 2
+
+    def test_non_transient_error_is_not_retried(self, artifact_server, tmp_path):
+        """Test de que un estado HTTP no transitorio falla sin reintentos."""
+        artifact_server.statuses_of_next_responses = [404]
+        path = str(tmp_path / "weights.onnx")
+
+        with pytest.raises(RoboflowAPINotNotFoundError):
+            roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert len(artifact_server.requests) == 1
+
+    def test_checksum_mismatch_is_rejected(self, artifact_server, tmp_path):
+        """Test de rechazo del fichero cuyo MD5 no coincide con x-goog-hash."""
+        artifact_server.md5 = hashlib.md5(b"other content").digest()
+        path = str(tmp_path / "weights.onnx")
+
+        with pytest.raises(RoboflowAPIUnsuccessfulRequestError):
+            roboflow_api.download_file_from_url(url=artifact_server.url, path=path)
+
+        assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,176 @@
+"""
+Tests de la precarga y el calentamiento de los modelos referenciados por los workflows.
+"""
+
+import numpy as np
+import pytest
+
+import care.managers.preloading as preloading
+from care.managers.base import ModelManager
+from care.managers.preloading import (
+    find_models_in_workflow_definition,
+    preload_models,
+    warm_up_model,
+)
+from care.registries.base import ModelRegistry
+
+
+class FakeModel:
+    """Modelo que registra los tamaños de lote y de imagen de las inferencias."""
+
+    batching_enabled = True
+    img_size_h = 32
+    img_size_w = 48
+
+    def __init__(self, model_id, api_key, countinference=None, service_secret=None):
+        self.model_id = model_id
+        self.calls = []
+
+    def infer(self, image, **kwargs):
+        images = image if isinstance(image, list) else [image]
+        self.calls.append((len(images), images[0].shape))
+        if self.model_id == "broken/1":
+            raise RuntimeError("inference failed")
+
+    def clear_cache(self, delete_from_disk: bool = True) -> None:
+        pass
+
+
+class StaticBatchFakeModel(FakeModel):
+    batching_enabled = False
+
+
+class FakeRegistry(ModelRegistry):
+    def get_model(self, model_id, api_key, **kwargs):
+        if model_id == "missing/1":
+            raise ValueError("model not found")
+        return FakeModel
+
+
+@pytest.fixture
+def model_manager():
+    return ModelManager(model_registry=FakeRegistry(registry_dict={}))
+
+
+class TestFindModelsInWorkflowDefinition:
+    """Tests del descubrimiento de modelos en la definición del workflow."""
+
+    def test_literal_and_input_model_ids(self):
+        """Test de identificadores literales y resueltos desde las entradas."""
+        definition = {
+            "inputs": [
+                {"type": "WorkflowImage", "name": "image"},
+                {"type": "WorkflowParameter", "name": "model", "default_value": "beds/2"},
+                {"type": "WorkflowParameter", "name": "other"},
+            ],
+            "steps": [
+                {"type": "ObjectDetectionModel", "name": "a", "model_id": "people/1"},
+                {"type": "ObjectDetectionModel", "name": "b", "model_id": "$inputs.model"},
+                {"type": "ObjectDetectionModel", "name": "c", "model_id": "people/1"},
+                {"type": "ObjectDetectionModel", "name": "d", "model_id": "$inputs.other"},
+                {"type": "ObjectDetectionModel", "name": "e", "model_id": "$steps.x.id"},
+                {"type": "DetectionsFilter", "name": "f"},
+            ],
+        }
+
+        assert find_models_in_workflow_definition(definition) == ["people/1", "beds/2"]
+
+    def test_runtime_parameters_override_defaults(self):
+        """Test de que los parámetros de ejecución prevalecen sobre los valores por defecto."""
+        definition = {
+            "inputs": [{"name": "model", "default_value": "beds/2"}],
+            "steps": [{"name": "a", "model_id": "$inputs.model"}],
+        }
+
+        model_ids = find_models_in_workflow_definition(
+            definition, workflows_parameters={"model": "beds/3"}
+        )
+
+        assert model_ids == ["beds/3"]
+
+
+class TestPreloadModels:
+    """Tests de la carga de los modelos y del informe de resultados."""
+
+    def test_models_are_loaded_and_warmed_up(self, model_manager):
+        """Test de que los modelos quedan cargados en el gestor y calentados."""
+        report = preload_models(
+            model_manager=model_manager,
+            model_ids=["people/1", "beds/2"],
+            api_key="key",
+            warmup_iterations=2,
+            warmup_batch_sizes=[4, 1, 4],
+        )
+
+        assert report.ready
+        assert set(model_manager.keys()) == {"people/1", "beds/2"}
+        assert [r.warmed_up_batch_sizes for r in report.results] == [[1, 4], [1, 4]]
+        assert [n for n, _ in model_manager["people/1"].calls] == [1, 1, 4, 4]
+
+    def test_errors_are_reported(self, model_manager):
+        """Test de que los fallos de carga y de calentamiento se informan sin lanzarse."""
+        report = preload_models(
+            model_manager=model_manager,
+            model_ids=["people/1", "missing/1", "broken/1"],
+            api_key="key",
+            warmup_iterations=1,
+        )
+
+        results = {result.model_id: result for result in report.results}
+        assert not report.ready
+        assert report.failed_models == ["missing/1"]
+        assert results["missing/1"].error == "ValueError: model not found"
+        assert results["broken/1"].loaded
+        assert results["broken/1"].warmup_error == "RuntimeError: inference failed"
+        assert report.to_dict()["models"][1]["error"] == "ValueError: model not found"
+
+    def test_warm_up_can_be_disabled(self, model_manager):
+        """Test de que sin iteraciones de calentamiento no se ejecuta inferencia."""
+        report = preload_models(
+            model_manager=model_manager,
+            model_ids=["people/1"],
+            api_key="key",
+            warmup_iterations=0,
+        )
+
+        assert report.ready
+        assert model_manager["people/1"].calls == []
+
+    def test_no_models(self, model_manager):
+        """Test de informe vacío cuando el workflow no usa modelos."""
+        report = preload_models(model_manager=model_manager, model_ids=[], api_key="key")
+
+        assert report.ready
+        assert report.results == []
+
+
+class TestWarmUpModel:
+    """Tests de los tamaños de lote y de imagen usados en el calentamiento."""
+
+    def test_input_size_of_model_is_used(self):
+        """Test de que las imágenes sintéticas tienen el tamaño de entrada del modelo."""
+        model = FakeModel(model_id="people/1", api_key="key")
+
+        warm_up_model(model=model, batch_sizes=[1], iterations=1)
+
+        assert model.calls == [(1, (32, 48, 3))]
+
+    def test_static_batch_models_are_warmed_up_with_single_image(self):
+        """Test de que los modelos sin batching dinámico se calientan con una imagen."""
+        model = StaticBatchFakeModel(model_id="people/1", api_key="key")
+
+        batch_sizes = warm_up_model(model=model, batch_sizes=[1, 8], iterations=1)
+
+        assert batch_sizes == [1]
+        assert [n for n, _ in model.calls] == [1]
+
+    def test_batch_sizes_are_capped(self, monkeypatch):
+        """Test de que los lotes se limitan a MAX_BATCH_SIZE y se ignoran los no positivos."""
+        monkeypatch.setattr(preloading, "MAX_BATCH_SIZE", 4)
+        model = FakeModel(model_id="people/1", api_key="key")
+
+        batch_sizes = warm_up_model(model=model, batch_sizes=[0, 2, 16], iterations=1)
+
+        assert batch_sizes == [2, 4]
+        assert [n for n, _ in model.calls] == [2, 4]
+        assert all(np.prod(shape) == 32 * 48 * 3 for _, shape in model.calls)
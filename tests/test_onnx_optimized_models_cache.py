@@ -0,0 +1,204 @@
+"""
+Tests de la caché de grafos ONNX optimizados por onnxruntime, con un modelo ONNX mínimo.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import care.cache.model_artifacts as model_artifacts
+from care.cache.model_artifacts import (
+    FILE_HASH_SUFFIX,
+    ORT_OPTIMIZED_MODELS_DIR,
+    create_onnx_session_with_optimized_model_cache,
+)
+
+onnx = pytest.importorskip("onnx")
+onnxruntime = pytest.importorskip("onnxruntime")
+
+MODEL_ID = "project/1"
+
+
+def save_tiny_model(path: str) -> None:
+    """Guarda un MLP de dos capas, cuyos MatMul + Add fusiona el optimizador de ORT."""
+    rng = np.random.default_rng(0)
+    initializers = [
+        onnx.numpy_helper.from_array(rng.random((8, 16), dtype=np.float32), "w1"),
+        onnx.numpy_helper.from_array(rng.random(16, dtype=np.float32), "b1"),
+        onnx.numpy_helper.from_array(rng.random((16, 4), dtype=np.float32), "w2"),
+        onnx.numpy_helper.from_array(rng.random(4, dtype=np.float32), "b2"),
+    ]
+    nodes = [
+        onnx.helper.make_node("MatMul", ["x", "w1"], ["h1"]),
+        onnx.helper.make_node("Add", ["h1", "b1"], ["h2"]),
+        onnx.helper.make_node("Relu", ["h2"], ["h3"]),
+        onnx.helper.make_node("MatMul", ["h3", "w2"], ["h4"]),
+        onnx.helper.make_node("Add", ["h4", "b2"], ["y"]),
+    ]
+    graph = onnx.helper.make_graph(
+        nodes,
+        "tiny",
+        [onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [1, 8])],
+        [onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [1, 4])],
+        initializer=initializers,
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 17)]
+    )
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+class RecordingInferenceSession(onnxruntime.InferenceSession):
+    """Sesión de ORT que registra el fichero y el nivel de optimización de cada carga."""
+
+    loads = []
+
+    def __init__(self, path, sess_options=None, providers=None, **kwargs):
+        RecordingInferenceSession.loads.append(
+            (path, sess_options.graph_optimization_level)
+        )
+        super().__init__(path, sess_options=sess_options, providers=providers, **kwargs)
+
+
+@pytest.fixture
+def weights_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_artifacts, "MODEL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(model_artifacts, "ORT_OPTIMIZED_MODELS_CACHE_ENABLED", True)
+    monkeypatch.setattr(onnxruntime, "InferenceSession", RecordingInferenceSession)
+    RecordingInferenceSession.loads = []
+    path = str(tmp_path / "weights.onnx")
+    save_tiny_model(path)
+    return path
+
+
+def create_session(weights_path: str, providers=("CPUExecutionProvider",)):
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    return create_onnx_session_with_optimized_model_cache(
+        weights_path=weights_path,
+        providers=list(providers),
+        session_options=session_options,
+        model_id=MODEL_ID,
+    )
+
+
+def get_cache_entries(tmp_path) -> list:
+    directory = tmp_path / "cache" / MODEL_ID / ORT_OPTIMIZED_MODELS_DIR
+    if not directory.exists():
+        return []
+    return sorted(str(directory / name) for name in os.listdir(directory))
+
+
+def run(session) -> np.ndarray:
+    return session.run(None, {"x": np.ones((1, 8), dtype=np.float32)})[0]
+
+
+class TestOptimizedModelsCache:
+    """Tests de escritura, reutilización y reconstrucción de la caché."""
+
+    def test_first_load_writes_cache_entry(self, weights_path, tmp_path):
+        """Test de que la primera carga guarda el grafo optimizado en caché."""
+        session = create_session(weights_path)
+
+        entries = get_cache_entries(tmp_path)
+        assert len(entries) == 1
+        assert entries[0].endswith(".onnx")
+        assert RecordingInferenceSession.loads == [
+            (weights_path, onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        ]
+        assert run(session).shape == (1, 4)
+
+    def test_second_load_uses_cache_without_optimisations(self, weights_path, tmp_path):
+        """Test de que la segunda carga usa la entrada con ORT_DISABLE_ALL."""
+        expected = run(create_session(weights_path))
+        [entry] = get_cache_entries(tmp_path)
+        RecordingInferenceSession.loads = []
+
+        session = create_session(weights_path)
+
+        assert RecordingInferenceSession.loads == [
+            (entry, onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL)
+        ]
+        assert np.allclose(run(session), expected)
+
+    def test_corrupted_entry_is_rebuilt(self, weights_path, tmp_path):
+        """Test de que una entrada corrupta se descarta y se vuelve a generar."""
+        expected = run(create_session(weights_path))
+        [entry] = get_cache_entries(tmp_path)
+        with open(entry, "wb") as f:
+            f.write(b"not an onnx model")
+
+        session = create_session(weights_path)
+
+        assert np.allclose(run(session), expected)
+        assert get_cache_entries(tmp_path) == [entry]
+        assert onnx.load(entry) is not None
+        RecordingInferenceSession.loads = []
+        create_session(weights_path)
+        assert RecordingInferenceSession.loads == [
+            (entry, onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL)
+        ]
+
+    def test_compiling_providers_bypass_cache(self, weights_path, tmp_path):
+        """Test de que los EPs que compilan el grafo (TensorRT) no usan la caché."""
+        # ORT ignora (con aviso) los EPs no disponibles
+        create_session(
+            weights_path, providers=["TensorrtExecutionProvider", "CPUExecutionProvider"]
+        )
+
+        assert get_cache_entries(tmp_path) == []
+        assert [path for path, _ in RecordingInferenceSession.loads] == [weights_path]
+
+    def test_session_options_do_not_keep_cache_path(self, weights_path):
+        """Test de que las opciones de sesión no quedan apuntando al fichero temporal."""
+        session_options = onnxruntime.SessionOptions()
+
+        create_onnx_session_with_optimized_model_cache(
+            weights_path=weights_path,
+            providers=["CPUExecutionProvider"],
+            session_options=session_options,
+            model_id=MODEL_ID,
+        )
+
+        assert session_options.optimized_model_filepath == ""
+
+    def test_lock_file_is_left_in_place(self, weights_path, tmp_path):
+        """Test de que el fichero de bloqueo no se borra al terminar."""
+        create_session(weights_path)
+
+        assert os.listdir(str(tmp_path / "cache" / "_file_locks"))
+
+    def test_weights_hash_is_memoized(self, weights_path, monkeypatch):
+        """Test de que las cargas con la caché no vuelven a calcular el hash de los pesos."""
+        create_session(weights_path)
+        hashed_paths = []
+        get_file_hash = model_artifacts.get_file_hash
+
+        def recording_get_file_hash(path):
+            hashed_paths.append(path)
+            return get_file_hash(path=path)
+
+        monkeypatch.setattr(model_artifacts, "get_file_hash", recording_get_file_hash)
+        RecordingInferenceSession.loads = []
+
+        create_session(weights_path)
+
+        assert hashed_paths == []
+        assert len(RecordingInferenceSession.loads) == 1
+        assert os.path.isfile(f"{weights_path}{FILE_HASH_SUFFIX}")
+
+    def test_changed_weights_are_hashed_again(self, weights_path):
+        """Test de que el hash memorizado se descarta cuando cambian los pesos."""
+        create_session(weights_path)
+        stat = os.stat(weights_path)
+        with open(weights_path, "ab") as f:
+            f.write(b"\0")
+        os.utime(weights_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert model_artifacts.get_memoized_file_hash(
+            path=weights_path
+        ) == model_artifacts.get_file_hash(path=weights_path)
@@ -0,0 +1,193 @@
+"""
+Tests del servicio de escritura OPC UA con sesiones persistentes contra un servidor asyncua local.
+"""
+
+import socket
+import threading
+
+import pytest
+from asyncua import ua
+from asyncua.sync import Client, Server
+
+from care.workflows.care_steps.sinks.opc_writer.client import (
+    OPCUAWriteError,
+    OPCUAWriterService,
+)
+
+NAMESPACE = "http://care.test/opc"
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class OPCServer:
+    """Servidor OPC UA con un objeto `Line1` y variables `Count` (Int64) y `Status` (String)."""
+
+    def __init__(self, port: int):
+        self.url = f"opc.tcp://127.0.0.1:{port}/care/"
+        self._server = None
+        self.variables = {}
+
+    def start(self) -> "OPCServer":
+        self._server = Server()
+        self._server.set_endpoint(self.url)
+        idx = self._server.register_namespace(NAMESPACE)
+        line = self._server.nodes.objects.add_object(idx, "Line1")
+        for name, value in [("Count", 0), ("Status", "idle")]:
+            variable = line.add_variable(idx, name, value)
+            variable.set_writable()
+            self.variables[name] = variable
+        self._server.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.stop()
+
+    def read(self, name: str):
+        return self.variables[name].read_value()
+
+
+@pytest.fixture
+def opc_server():
+    server = OPCServer(port=get_free_port()).start()
+    yield server
+    server.stop()
+
+
+class RecordingClient(Client):
+    """Cliente asyncua que registra conexiones y llamadas `write_values`."""
+
+    connections = 0
+    writes = []
+    gate = None
+
+    def connect(self) -> None:
+        type(self).connections += 1
+        super().connect()
+
+    def write_values(self, nodes, values, raise_on_partial_error=True):
+        type(self).writes.append(list(values))
+        if type(self).gate is not None:
+            type(self).gate.wait(timeout=5)
+        return super().write_values(nodes, values, raise_on_partial_error)
+
+
+@pytest.fixture
+def recording_client():
+    class Recording(RecordingClient):
+        connections = 0
+        writes = []
+        gate = None
+
+    return Recording
+
+
+def write(service, server, variable_name, value, object_name="Line1", namespace=NAMESPACE):
+    return service.write(
+        url=server.url,
+        namespace=namespace,
+        user_name=None,
+        password=None,
+        object_name=object_name,
+        variable_name=variable_name,
+        value=value,
+        timeout=5,
+    )
+
+
+class TestOPCUAWriterService:
+    """Tests de escritura con sesión persistente."""
+
+    def test_session_is_reused(self, opc_server, recording_client):
+        """Test de que escrituras sucesivas reutilizan la sesión."""
+        service = OPCUAWriterService(client_factory=recording_client)
+        try:
+            for value in range(5):
+                write(service, opc_server, "Count", value).result(timeout=10)
+
+            assert opc_server.read("Count") == 4
+            assert recording_client.connections == 1
+            assert len(recording_client.writes) == 5
+        finally:
+            service.close_all()
+
+    def test_pending_writes_are_coalesced(self, opc_server, recording_client):
+        """Test de agrupación de escrituras pendientes, gana el último valor por nodo."""
+        recording_client.gate = threading.Event()
+        service = OPCUAWriterService(client_factory=recording_client)
+        try:
+            first = write(service, opc_server, "Count", 1)
+            while not recording_client.writes:
+                threading.Event().wait(0.01)
+            pending = [write(service, opc_server, "Count", value) for value in (2, 3, 4)]
+            pending.append(write(service, opc_server, "Status", "running"))
+            recording_client.gate.set()
+
+            for future in [first] + pending:
+                assert future.result(timeout=10) is None
+            assert recording_client.writes == [[1], [4, "running"]]
+            assert opc_server.read("Count") == 4
+            assert opc_server.read("Status") == "running"
+        finally:
+            service.close_all()
+
+    def test_errors_are_reported_per_variable(self, opc_server):
+        """Test de que un error en una variable no afecta al resto del lote."""
+        service = OPCUAWriterService()
+        try:
+            wrong_type = write(service, opc_server, "Count", "not a number")
+            missing = write(service, opc_server, "Missing", 1)
+            wrong_namespace = write(service, opc_server, "Count", 1, namespace="urn:x")
+            ok = write(service, opc_server, "Status", "ok")
+
+            assert ok.result(timeout=10) is None
+            with pytest.raises(OPCUAWriteError, match="WRONG TYPE ERROR"):
+                wrong_type.result(timeout=10)
+            with pytest.raises(OPCUAWriteError, match="WRONG OBJECT OR PROPERTY ERROR"):
+                missing.result(timeout=10)
+            with pytest.raises(OPCUAWriteError, match="WRONG NAMESPACE ERROR"):
+                wrong_namespace.result(timeout=10)
+        finally:
+            service.close_all()
+
+    def test_reconnects_after_server_restart(self, recording_client):
+        """Test de reconexión transparente tras reinicio del servidor."""
+        port = get_free_port()
+        server = OPCServer(port=port).start()
+        service = OPCUAWriterService(client_factory=recording_client)
+        try:
+            write(service, server, "Count", 1).result(timeout=10)
+            server.stop()
+            server = OPCServer(port=port).start()
+
+            write(service, server, "Count", 2).result(timeout=30)
+
+            assert server.read("Count") == 2
+            assert recording_client.connections == 2
+        finally:
+            service.close_all()
+            server.stop()
+
+    def test_connection_failure(self):
+        """Test de error de red sin servidor."""
+        service = OPCUAWriterService()
+        url = f"opc.tcp://127.0.0.1:{get_free_port()}/care/"
+        try:
+            future = service.write(
+                url=url,
+                namespace="2",
+                user_name=None,
+                password=None,
+                object_name="Line1",
+                variable_name="Count",
+                value=ua.Variant(1, ua.VariantType.Int64),
+                timeout=2,
+            )
+
+            with pytest.raises(OPCUAWriteError):
+                future.result(timeout=10)
+        finally:
+            service.close_all()
@@ -0,0 +1,143 @@
+"""
+Tests del decodificador de máscaras de instancia por caja frente al post-procesado denso.
+"""
+
+import numpy as np
+import pytest
+
+from care.utils.postprocess import (
+    box_mask_to_rle,
+    decode_instance_masks,
+    decode_instance_masks_batch,
+    process_mask_accurate,
+    process_mask_fast,
+    process_mask_tradeoff,
+)
+
+SHAPE = (320, 416)
+
+
+def make_inputs(seed: int, n: int = 6):
+    rng = np.random.default_rng(seed)
+    protos = rng.normal(size=(32, 80, 104)).astype(np.float32)
+    masks_in = rng.normal(size=(n, 32)).astype(np.float32)
+    xy_min = rng.uniform(0, 250, size=(n, 2))
+    wh = rng.uniform(20, 150, size=(n, 2))
+    bboxes = np.concatenate([xy_min, xy_min + wh], axis=1).astype(np.float32)
+    bboxes[:, [0, 2]] = np.clip(bboxes[:, [0, 2]], 0, SHAPE[1])
+    bboxes[:, [1, 3]] = np.clip(bboxes[:, [1, 3]], 0, SHAPE[0])
+    return protos, masks_in, bboxes
+
+
+def dense_reference(mode: str, protos, masks_in, bboxes, tradeoff_factor=0.5):
+    if mode == "accurate":
+        masks = process_mask_accurate(protos, masks_in, bboxes.copy(), SHAPE)
+    elif mode == "tradeoff":
+        masks = process_mask_tradeoff(
+            protos, masks_in, bboxes.copy(), SHAPE, tradeoff_factor
+        )
+    else:
+        masks = process_mask_fast(protos, masks_in, bboxes.copy(), SHAPE)
+    return masks > 0
+
+
+def rle_to_mask(rle: dict) -> np.ndarray:
+    h, w = rle["size"]
+    flat = np.zeros(h * w, dtype=bool)
+    position = 0
+    for i, count in enumerate(rle["counts"]):
+        if i % 2 == 1:
+            flat[position : position + count] = True
+        position += count
+    return flat.reshape((w, h)).T
+
+
+class TestDecodeInstanceMasks:
+    """Tests de equivalencia con process_mask_*."""
+
+    @pytest.mark.parametrize("mode", ["accurate", "tradeoff", "fast"])
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_masks_match_dense_post_processing(self, mode, seed):
+        """Test de que las máscaras coinciden salvo en píxeles del borde."""
+        protos, masks_in, bboxes = make_inputs(seed=seed)
+        expected = dense_reference(mode, protos, masks_in, bboxes)
+
+        masks, output_shape = decode_instance_masks(
+            protos=protos,
+            masks_in=masks_in,
+            bboxes=bboxes,
+            shape=SHAPE,
+            mask_decode_mode=mode,
+            tradeoff_factor=0.5,
+            output_format="mask",
+        )
+
+        assert masks.shape == expected.shape
+        assert output_shape == expected.shape[1:]
+        mismatch = np.logical_xor(masks, expected).sum()
+        assert mismatch <= 0.001 * expected.size
+
+    def test_rle_and_polygons_describe_the_same_masks(self):
+        """Test de que RLE y polígonos se generan a partir de las mismas máscaras."""
+        protos, masks_in, bboxes = make_inputs(seed=3)
+        arguments = dict(
+            protos=protos, masks_in=masks_in, bboxes=bboxes, shape=SHAPE
+        )
+
+        dense, _ = decode_instance_masks(**arguments, output_format="mask")
+        rles, _ = decode_instance_masks(**arguments, output_format="rle")
+        polygons, _ = decode_instance_masks(**arguments, output_format="polygon")
+
+        for mask, rle, polygon in zip(dense, rles, polygons):
+            assert np.array_equal(rle_to_mask(rle), mask)
+            assert polygon.dtype == np.float32
+            if mask.any():
+                xs, ys = polygon[:, 0], polygon[:, 1]
+                assert mask[ys.astype(int), xs.astype(int)].all()
+            else:
+                assert polygon.shape == (0, 2)
+
+    def test_batch_matches_single_image_decoding(self):
+        """Test de que el procesado por lotes equivale al procesado imagen a imagen."""
+        inputs = [make_inputs(seed=seed) for seed in (4, 5)]
+        protos = np.stack([i[0] for i in inputs])
+
+        batch = decode_instance_masks_batch(
+            protos=protos,
+            masks_in=[i[1] for i in inputs],
+            bboxes=[i[2] for i in inputs],
+            shape=SHAPE,
+            output_format="mask",
+        )
+
+        for (image_protos, masks_in, bboxes), (masks, _) in zip(inputs, batch):
+            single, _ = decode_instance_masks(
+                protos=image_protos,
+                masks_in=masks_in,
+                bboxes=bboxes,
+                shape=SHAPE,
+                output_format="mask",
+            )
+            assert np.array_equal(masks, single)
+
+
+class TestBoxMaskToRLE:
+    """Tests de la codificación RLE a partir de la región de la caja."""
+
+    def test_runs_spanning_columns_are_joined(self):
+        """Test de una caja que ocupa toda la altura de la imagen."""
+        mask = np.zeros((4, 5), dtype=bool)
+        mask[:, 1:3] = True
+
+        rle = box_mask_to_rle(
+            box_mask=mask[:, 1:4], box_window=(0, 4, 1, 4), shape=(4, 5)
+        )
+
+        assert rle == {"size": [4, 5], "counts": [4, 8, 8]}
+        assert np.array_equal(rle_to_mask(rle), mask)
+
+    def test_empty_mask(self):
+        """Test de máscara vacía."""
+        rle = box_mask_to_rle(box_mask=None, box_window=None, shape=(3, 3))
+
+        assert rle == {"size": [3, 3], "counts": [9]}
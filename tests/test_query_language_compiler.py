@@ -0,0 +1,204 @@
+"""
+Tests del compilador de expresiones UQL frente al evaluador basado en closures.
+"""
+
+import pytest
+
+from care.workflows.care_steps.common.query_language.evaluation_engine.compiler import (
+    MAX_GENERATED_CODE_DEPTH,
+    clear_compiled_expressions_cache,
+    compile_statement,
+)
+from care.workflows.care_steps.common.query_language.evaluation_engine.core import (
+    build_eval_function,
+)
+from care.workflows.care_steps.common.query_language.operations import (
+    core as operations_core,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    StatementGroup,
+)
+from inference.core.workflows.core_steps.common.query_language.errors import (
+    EvaluationEngineError,
+    UndeclaredSymbolError,
+)
+
+
+def static(value, operations=None) -> dict:
+    return {"type": "StaticOperand", "value": value, "operations": operations or []}
+
+
+def parameter(name: str, operations=None) -> dict:
+    return {"type": "DynamicOperand", "operand_name": name, "operations": operations or []}
+
+
+def binary(left: dict, comparator: str, right: dict, negate: bool = False) -> dict:
+    return {
+        "type": "BinaryStatement",
+        "left_operand": left,
+        "comparator": {"type": comparator},
+        "right_operand": right,
+        "negate": negate,
+    }
+
+
+def unary(operand: dict, operator: str, negate: bool = False) -> dict:
+    return {
+        "type": "UnaryStatement",
+        "operand": operand,
+        "operator": {"type": operator},
+        "negate": negate,
+    }
+
+
+def group(*statements: dict, operator: str = "and") -> dict:
+    return {
+        "type": "StatementGroup",
+        "operator": operator,
+        "statements": list(statements),
+    }
+
+
+DEFINITIONS = {
+    "number_comparison": group(binary(parameter("a"), "(Number) >", static(3))),
+    "negated": group(binary(parameter("a"), "(Number) <=", static(3), negate=True)),
+    "strings": group(
+        binary(parameter("name"), "(String) startsWith", static("ro")),
+        binary(parameter("name"), "(String) contains", static("om")),
+        binary(parameter("name"), "(String) endsWith", static("1"), negate=True),
+        operator="or",
+    ),
+    "sequences": group(
+        binary(parameter("name"), "in (Sequence)", parameter("names")),
+        binary(parameter("names"), "any in (Sequence)", static(["room", "bed"])),
+        unary(parameter("names"), "(Sequence) is not empty"),
+    ),
+    "operations": group(
+        binary(
+            parameter("name", [{"type": "StringToUpperCase"}]),
+            "==",
+            static("room", [{"type": "StringToUpperCase"}]),
+        ),
+        binary(
+            parameter("names", [{"type": "SequenceLength"}]),
+            "(Number) >=",
+            static(2),
+        ),
+    ),
+    "constants": group(
+        binary(static(1), "(Number) <", static(2)),
+        group(
+            binary(static("a"), "==", static("b")),
+            unary(parameter("flag"), "(Boolean) is True"),
+            operator="or",
+        ),
+    ),
+    "unary": group(
+        unary(parameter("flag"), "(Boolean) is False", negate=True),
+        unary(parameter("missing_value"), "DoesNotExist"),
+        unary(parameter("a"), "Exists"),
+    ),
+}
+
+VALUES = [
+    {"a": 5, "name": "room", "names": ["room", "bed"], "flag": True, "missing_value": None},
+    {"a": 1, "name": "hall_1", "names": [], "flag": False, "missing_value": 3},
+    {"a": 3, "name": "room", "names": ["room"], "flag": True, "missing_value": None},
+]
+
+
+class TestCompiledStatementsEquivalence:
+    """Tests de equivalencia entre el evaluador compilado y el de referencia."""
+
+    @pytest.mark.parametrize("name", sorted(DEFINITIONS.keys()))
+    @pytest.mark.parametrize("values_id", range(len(VALUES)))
+    def test_compiled_statement_matches_reference(self, name, values_id):
+        """Test de que el resultado compilado coincide con build_eval_function."""
+        parsed = StatementGroup.model_validate(DEFINITIONS[name])
+        values = VALUES[values_id]
+
+        expected = build_eval_function(definition=parsed)(values)
+        result = compile_statement(definition=parsed)(values)
+
+        assert result == expected
+
+    def test_identical_definitions_share_compiled_function(self):
+        """Test de memoización por hash estructural de la definición."""
+        clear_compiled_expressions_cache()
+        first = StatementGroup.model_validate(DEFINITIONS["strings"])
+        second = StatementGroup.model_validate(DEFINITIONS["strings"])
+
+        assert compile_statement(definition=first) is compile_statement(
+            definition=second
+        )
+
+    def test_expensive_statement_is_skipped_when_result_is_known(self):
+        """Test de cortocircuito: no se evalúa lo que no cambia el resultado."""
+        definition = group(
+            binary(parameter("names", [{"type": "SequenceLength"}]), "(Number) >", static(0)),
+            binary(parameter("flag"), "==", static(True)),
+            operator="or",
+        )
+        compiled = compile_statement(
+            definition=StatementGroup.model_validate(definition)
+        )
+
+        # `names` no está definido, pero la sentencia más barata ya decide el resultado
+        assert compiled({"flag": True}) is True
+
+    def test_statement_too_deep_uses_care_operations(self, monkeypatch):
+        """Test de que la evaluación sin compilar usa las mismas operaciones de care."""
+        calls = []
+
+        def to_upper(value, execution_context, **kwargs):
+            calls.append(value)
+            return value.upper()
+
+        monkeypatch.setitem(
+            operations_core.REGISTERED_SIMPLE_OPERATIONS, "StringToUpperCase", to_upper
+        )
+        clear_compiled_expressions_cache()
+        definition = binary(
+            parameter("name", [{"type": "StringToUpperCase"}]), "==", static("ROOM")
+        )
+        for level in range(MAX_GENERATED_CODE_DEPTH + 1):
+            # alternated operators, so that groups are not flattened
+            if level % 2:
+                definition = group(
+                    unary(parameter("flag"), "(Boolean) is False"), definition, operator="or"
+                )
+            else:
+                definition = group(
+                    unary(parameter("flag"), "(Boolean) is True"), definition, operator="and"
+                )
+        compiled = compile_statement(definition=StatementGroup.model_validate(definition))
+
+        assert compiled({"name": "room", "flag": True}) is True
+        assert calls == ["room"]
+        clear_compiled_expressions_cache()
+
+
+class TestCompiledStatementsErrors:
+    """Tests de que los errores se reportan igual que en el evaluador de referencia."""
+
+    def test_undeclared_symbol(self):
+        """Test de símbolo no declarado."""
+        parsed = StatementGroup.model_validate(DEFINITIONS["number_comparison"])
+
+        with pytest.raises(UndeclaredSymbolError) as reference_error:
+            build_eval_function(definition=parsed)({})
+        with pytest.raises(UndeclaredSymbolError) as compiled_error:
+            compile_statement(definition=parsed)({})
+
+        assert compiled_error.value.public_message == reference_error.value.public_message
+
+    def test_type_error(self):
+        """Test de error de evaluación por tipos incompatibles."""
+        parsed = StatementGroup.model_validate(DEFINITIONS["number_comparison"])
+
+        with pytest.raises(EvaluationEngineError) as reference_error:
+            build_eval_function(definition=parsed)({"a": "text"})
+        with pytest.raises(EvaluationEngineError) as compiled_error:
+            compile_statement(definition=parsed)({"a": "text"})
+
+        assert compiled_error.value.public_message == reference_error.value.public_message
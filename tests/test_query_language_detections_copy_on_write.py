@@ -0,0 +1,146 @@
+"""
+Tests de las transformaciones copy-on-write de sv.Detections en el lenguaje de consultas.
+"""
+
+from copy import deepcopy
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.care_steps.common.query_language.operations.detections.base import (
+    offset_detections,
+    rename_detections,
+    select_first_detection,
+    select_last_detection,
+    select_top_confidence_detection,
+    shift_detections,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.copy_on_write import (
+    copy_detections_on_write,
+)
+
+
+def make_detections(n: int = 4) -> sv.Detections:
+    xyxy = (
+        np.array([[10, 20, 50, 60]] * n, dtype=np.float32).reshape(-1, 4)
+        + np.arange(n, dtype=np.float32)[:, None]
+    )
+    return sv.Detections(
+        xyxy=xyxy,
+        mask=np.zeros((n, 32, 32), dtype=bool),
+        confidence=np.linspace(0.2, 0.9, n).astype(np.float32),
+        class_id=np.arange(n) % 2,
+        data={
+            "class_name": np.array([("person", "bed")[i % 2] for i in range(n)], dtype=str),
+            "detection_id": np.array([f"id-{i}" for i in range(n)], dtype=str),
+        },
+    )
+
+
+def assert_detections_equal(a: sv.Detections, b: sv.Detections) -> None:
+    assert np.array_equal(a.xyxy, b.xyxy)
+    assert np.array_equal(a.mask, b.mask)
+    assert np.array_equal(a.confidence, b.confidence)
+    assert np.array_equal(a.class_id, b.class_id)
+    assert a.data.keys() == b.data.keys()
+    for key in a.data:
+        assert np.array_equal(a.data[key], b.data[key])
+
+
+OPERATIONS = {
+    "offset": lambda d: offset_detections(d, offset_x=10, offset_y=4),
+    "shift": lambda d: shift_detections(d, shift_x=5, shift_y=-3),
+    "rename": lambda d: rename_detections(
+        d,
+        class_map={"person": "patient"},
+        strict=False,
+        new_classes_id_offset=10,
+        global_parameters={},
+    ),
+    "top_confidence": select_top_confidence_detection,
+    "first": select_first_detection,
+    "last": select_last_detection,
+}
+
+
+class TestUpstreamOutputsAreNotMutated:
+    """Tests de que las salidas de pasos anteriores nunca se modifican."""
+
+    @pytest.mark.parametrize("name", sorted(OPERATIONS.keys()))
+    @pytest.mark.parametrize("n", [0, 3, 4])
+    def test_operation_does_not_mutate_input(self, name, n):
+        """Test de que la operación deja intacta la entrada."""
+        detections = make_detections(n=n)
+        snapshot = deepcopy(detections)
+
+        OPERATIONS[name](detections)
+
+        assert_detections_equal(detections, snapshot)
+        assert detections.xyxy.flags.writeable
+        assert detections.mask.flags.writeable
+
+    @pytest.mark.parametrize("name", ["offset", "shift", "rename"])
+    def test_modifying_result_in_place_is_rejected(self, name):
+        """Test de que los arrays compartidos no pueden modificarse desde la salida."""
+        detections = make_detections()
+        snapshot = deepcopy(detections)
+
+        result = OPERATIONS[name](detections)
+
+        with pytest.raises(ValueError):
+            result.mask[0, 0, 0] = True
+        with pytest.raises(ValueError):
+            result.confidence[0] = 1.0
+        assert_detections_equal(detections, snapshot)
+
+    def test_chained_operations_do_not_mutate_input(self):
+        """Test de una cadena de operaciones sobre la misma entrada."""
+        detections = make_detections()
+        snapshot = deepcopy(detections)
+
+        result = shift_detections(
+            offset_detections(detections, offset_x=2, offset_y=2),
+            shift_x=1,
+            shift_y=1,
+        )
+
+        assert_detections_equal(detections, snapshot)
+        assert np.allclose(result.xyxy, snapshot.xyxy + [0, 0, 2, 2])
+
+
+class TestCopyOnWrite:
+    """Tests de la capa copy-on-write."""
+
+    def test_untouched_fields_are_shared(self):
+        """Test de que los campos no modificados no se copian."""
+        detections = make_detections()
+        new_xyxy = detections.xyxy + 1
+
+        result = copy_detections_on_write(detections, xyxy=new_xyxy)
+
+        assert result.xyxy is new_xyxy
+        assert np.shares_memory(result.mask, detections.mask)
+        assert np.shares_memory(
+            result.data["detection_id"], detections.data["detection_id"]
+        )
+        assert result.data is not detections.data
+
+    def test_data_entries_are_replaced(self):
+        """Test de sustitución de entradas de data sin afectar a la original."""
+        detections = make_detections()
+        new_names = np.array(["a", "b", "c", "d"], dtype=object)
+
+        result = copy_detections_on_write(detections, data={"class_name": new_names})
+
+        assert result.data["class_name"] is new_names
+        assert list(detections.data["class_name"]) == ["person", "bed", "person", "bed"]
+
+    def test_offset_keeps_coordinates_dtype(self):
+        """Test de que offset conserva el tipo de las coordenadas."""
+        detections = make_detections()
+
+        result = offset_detections(detections, offset_x=10, offset_y=10)
+
+        assert result.xyxy.dtype == detections.xyxy.dtype
+        assert np.allclose(result.xyxy, detections.xyxy + [-5, -5, 5, 5])
@@ -0,0 +1,147 @@
+"""
+Tests de la asignación vectorizada de detecciones hijas a detecciones padre.
+"""
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.care_steps.common.query_language.operations.detections import (
+    containment,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.base import (
+    _pick_detections_by_parent_class,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.containment import (
+    NO_PARENT,
+    assign_detections_to_parents,
+    assign_points_to_boxes,
+)
+
+
+def naive_assignment(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    result = []
+    for x, y in points:
+        parent = NO_PARENT
+        for index, (x1, y1, x2, y2) in enumerate(boxes):
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                parent = index
+                break
+        result.append(parent)
+    return np.array(result, dtype=int)
+
+
+def random_boxes(rng: np.random.Generator, n: int) -> np.ndarray:
+    xy_min = rng.uniform(0, 900, size=(n, 2))
+    wh = rng.uniform(5, 150, size=(n, 2))
+    return np.concatenate([xy_min, xy_min + wh], axis=1)
+
+
+@pytest.fixture(params=["broadcasting", "sweep"])
+def strategy(request, monkeypatch):
+    if request.param == "sweep":
+        monkeypatch.setattr(containment, "BROADCAST_MAX_PAIRS", 0)
+    return request.param
+
+
+class TestAssignPointsToBoxes:
+    """Tests de equivalencia con la búsqueda punto a punto."""
+
+    @pytest.mark.parametrize("n_points, n_boxes", [(1, 1), (30, 10), (500, 200)])
+    def test_matches_naive_assignment(self, strategy, n_points, n_boxes):
+        """Test de que ambas estrategias devuelven el primer padre que contiene el punto."""
+        rng = np.random.default_rng(7)
+        points = rng.uniform(0, 1000, size=(n_points, 2))
+        boxes = random_boxes(rng, n_boxes)
+
+        result = assign_points_to_boxes(points=points, boxes=boxes)
+
+        assert np.array_equal(result, naive_assignment(points, boxes))
+
+    def test_box_boundaries_are_inclusive(self, strategy):
+        """Test de puntos sobre el borde de la caja."""
+        boxes = np.array([[10, 10, 20, 20], [0, 0, 100, 100]], dtype=float)
+        points = np.array([[10, 10], [20, 20], [20.5, 20], [150, 0]], dtype=float)
+
+        result = assign_points_to_boxes(points=points, boxes=boxes)
+
+        assert result.tolist() == [0, 0, 1, NO_PARENT]
+
+    def test_empty_inputs(self, strategy):
+        """Test de entradas vacías."""
+        assert assign_points_to_boxes(np.empty((0, 2)), np.ones((3, 4))).shape == (0,)
+        assert assign_points_to_boxes(np.ones((3, 2)), np.empty((0, 4))).tolist() == [
+            NO_PARENT
+        ] * 3
+
+
+def make_scene(seed: int, n_people: int, n_beds: int) -> sv.Detections:
+    rng = np.random.default_rng(seed)
+    xyxy = np.concatenate(
+        [random_boxes(rng, n_beds) * 1.5, random_boxes(rng, n_people) / 3 + 200]
+    ).astype(np.float32)
+    class_name = np.array(["bed"] * n_beds + ["person"] * n_people, dtype=object)
+    order = rng.permutation(len(xyxy))
+    return sv.Detections(
+        xyxy=xyxy[order],
+        confidence=rng.uniform(0, 1, size=len(xyxy)).astype(np.float32)[order],
+        class_id=(class_name == "person").astype(int)[order],
+        data={"class_name": class_name[order]},
+    )
+
+
+class TestPickDetectionsByParentClass:
+    """Tests de la operación PickDetectionsByParentClass."""
+
+    @pytest.mark.parametrize("n_people, n_beds", [(3, 2), (60, 40), (400, 300)])
+    def test_keeps_parents_and_contained_children(self, strategy, n_people, n_beds):
+        """Test de equivalencia con la implementación punto a punto."""
+        detections = make_scene(seed=n_people, n_people=n_people, n_beds=n_beds)
+        parent_mask = detections.data["class_name"] == "bed"
+        children = detections[~parent_mask]
+        expected_children = naive_assignment(
+            children.get_anchors_coordinates(anchor=sv.Position.CENTER),
+            detections.xyxy[parent_mask],
+        )
+
+        result = _pick_detections_by_parent_class(
+            detections=detections, parent_class="bed"
+        )
+
+        expected = sv.Detections.merge(
+            [detections[parent_mask], children[expected_children != NO_PARENT]]
+        )
+        assert np.array_equal(result.xyxy, expected.xyxy)
+        assert np.array_equal(result.data["class_name"], expected.data["class_name"])
+
+    def test_parent_index_per_child(self):
+        """Test de que se devuelve el índice del padre de cada hija."""
+        detections = sv.Detections(
+            xyxy=np.array(
+                [[0, 0, 100, 100], [5, 5, 15, 15], [200, 200, 300, 300], [210, 210, 220, 220], [500, 500, 510, 510]],
+                dtype=np.float32,
+            ),
+            class_id=np.array([0, 1, 0, 1, 1]),
+            data={
+                "class_name": np.array(
+                    ["bed", "person", "bed", "person", "person"], dtype=object
+                )
+            },
+        )
+
+        parent_mask, parent_indices = assign_detections_to_parents(
+            detections=detections, parent_class="bed"
+        )
+
+        assert parent_mask.tolist() == [True, False, True, False, False]
+        assert parent_indices.tolist() == [0, 1, NO_PARENT]
+
+    def test_no_parents(self):
+        """Test de escena sin detecciones padre."""
+        detections = make_scene(seed=1, n_people=5, n_beds=0)
+
+        result = _pick_detections_by_parent_class(
+            detections=detections, parent_class="bed"
+        )
+
+        assert len(result) == 0
@@ -0,0 +1,285 @@
+"""
+Tests de equivalencia entre el filtrado vectorizado de detecciones y el filtrado por detección.
+"""
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.care_steps.common.query_language.evaluation_engine.core import (
+    build_eval_function,
+)
+from care.workflows.care_steps.common.query_language.evaluation_engine.vectorized import (
+    build_detections_mask_function,
+)
+from care.workflows.care_steps.common.query_language.operations import (
+    core as operations_core,
+)
+from care.workflows.care_steps.common.query_language.operations.detections.base import (
+    filter_detections,
+)
+from inference.core.workflows.core_steps.common.query_language.entities.operations import (
+    StatementGroup,
+)
+from inference.core.workflows.core_steps.common.query_language.errors import (
+    EvaluationEngineError,
+)
+
+CLASS_NAMES = ["person", "bed", "chair", "wheelchair", "personal_item"]
+
+
+def detection_property(property_name: str) -> dict:
+    return {
+        "type": "DynamicOperand",
+        "operand_name": "_",
+        "operations": [
+            {"type": "ExtractDetectionProperty", "property_name": property_name}
+        ],
+    }
+
+
+def static(value) -> dict:
+    return {"type": "StaticOperand", "value": value}
+
+
+def parameter(name: str) -> dict:
+    return {"type": "DynamicOperand", "operand_name": name}
+
+
+def binary(left: dict, comparator: str, right: dict, negate: bool = False) -> dict:
+    return {
+        "type": "BinaryStatement",
+        "left_operand": left,
+        "comparator": {"type": comparator},
+        "right_operand": right,
+        "negate": negate,
+    }
+
+
+def group(*statements: dict, operator: str = "and") -> dict:
+    return {
+        "type": "StatementGroup",
+        "operator": operator,
+        "statements": list(statements),
+    }
+
+
+def make_detections(n: int, seed: int = 42) -> sv.Detections:
+    rng = np.random.default_rng(seed)
+    xy_min = rng.uniform(0, 500, size=(n, 2))
+    wh = rng.uniform(1, 200, size=(n, 2))
+    xyxy = np.concatenate([xy_min, xy_min + wh], axis=1).astype(np.float32)
+    confidence = rng.uniform(0, 1, size=n).astype(np.float32)
+    # valores en el límite, donde la comparación en float32 difiere de la de Python
+    confidence[: min(n, 5)] = np.float32(0.3)
+    class_id = rng.integers(0, len(CLASS_NAMES), size=n)
+    # "<U" como en las salidas de los modelos
+    class_name = np.array([CLASS_NAMES[i] for i in class_id], dtype=str)
+    return sv.Detections(
+        xyxy=xyxy,
+        confidence=confidence,
+        class_id=class_id,
+        data={"class_name": class_name},
+    )
+
+
+def filter_per_detection(detections: sv.Detections, definition: dict, parameters: dict):
+    parsed = StatementGroup.model_validate(definition)
+    return filter_detections(
+        detections=detections,
+        filtering_fun=build_eval_function(parsed),
+        global_parameters=parameters,
+    )
+
+
+def filter_vectorized(detections: sv.Detections, definition: dict, parameters: dict):
+    parsed = StatementGroup.model_validate(definition)
+    mask_fun = build_detections_mask_function(parsed)
+    assert mask_fun is not None, "La definición debería compilarse a una máscara"
+    return filter_detections(
+        detections=detections,
+        filtering_fun=build_eval_function(parsed),
+        global_parameters=parameters,
+        mask_fun=mask_fun,
+    )
+
+
+ZONE = [(100, 100), (400, 100), (400, 400), (100, 400)]
+
+VECTORIZABLE_DEFINITIONS = {
+    "confidence_greater": group(
+        binary(detection_property("confidence"), "(Number) >", static(0.5))
+    ),
+    "confidence_boundary": group(
+        binary(detection_property("confidence"), "(Number) >=", static(0.3))
+    ),
+    "class_name_equals": group(
+        binary(detection_property("class_name"), "==", static("person"))
+    ),
+    "class_name_equals_reversed": group(
+        binary(static("bed"), "==", detection_property("class_name"))
+    ),
+    "class_name_in": group(
+        binary(detection_property("class_name"), "in (Sequence)", static(["bed", "chair"]))
+    ),
+    "class_name_starts_with": group(
+        binary(detection_property("class_name"), "(String) startsWith", static("person"))
+    ),
+    "class_name_contains": group(
+        binary(detection_property("class_name"), "(String) contains", static("chair"))
+    ),
+    "class_id_not_equals": group(
+        binary(detection_property("class_id"), "(Number) !=", static(1))
+    ),
+    "size_from_parameter": group(
+        binary(detection_property("size"), "(Number) <", parameter("max_size"))
+    ),
+    "columns_comparison": group(
+        binary(detection_property("x_min"), "(Number) <", detection_property("y_max"))
+    ),
+    "negated": group(
+        binary(detection_property("confidence"), "(Number) <=", static(0.7), negate=True)
+    ),
+    "nested_groups": group(
+        group(
+            binary(detection_property("class_name"), "==", static("person")),
+            binary(detection_property("class_name"), "==", static("bed")),
+            operator="or",
+        ),
+        binary(detection_property("confidence"), "(Number) >", static(0.2)),
+        binary(detection_property("size"), "(Number) >=", static(1000)),
+        operator="and",
+    ),
+    "center_in_zone": group(
+        binary(detection_property("center"), "(Detection) in zone", static(ZONE))
+    ),
+    "top_left_in_zone_from_parameter": group(
+        binary(
+            detection_property("top_left"),
+            "(Detection) in zone",
+            parameter("zone"),
+            negate=True,
+        )
+    ),
+}
+
+
+class TestVectorizedFiltersEquivalence:
+    """Tests de equivalencia entre ambos caminos de evaluación."""
+
+    @pytest.mark.parametrize("name", sorted(VECTORIZABLE_DEFINITIONS.keys()))
+    @pytest.mark.parametrize("n", [1, 7, 200])
+    def test_vectorized_filter_matches_per_detection_filter(self, name, n):
+        """Test de que el filtro vectorizado devuelve las mismas detecciones."""
+        detections = make_detections(n=n)
+        parameters = {"max_size": 5000.0, "zone": ZONE}
+        definition = VECTORIZABLE_DEFINITIONS[name]
+
+        expected = filter_per_detection(detections, definition, parameters)
+        result = filter_vectorized(detections, definition, parameters)
+
+        assert len(result) == len(expected)
+        assert np.array_equal(result.xyxy, expected.xyxy)
+        assert np.array_equal(result.class_id, expected.class_id)
+        assert np.array_equal(
+            result.data["class_name"], expected.data["class_name"]
+        )
+
+    def test_empty_detections(self):
+        """Test de filtrado de un conjunto vacío de detecciones."""
+        detections = make_detections(n=0)
+        definition = VECTORIZABLE_DEFINITIONS["confidence_greater"]
+
+        result = filter_vectorized(detections, definition, {})
+
+        assert len(result) == 0
+
+
+class TestVectorizedFiltersFallback:
+    """Tests del uso del camino por detección cuando no es posible vectorizar."""
+
+    def test_unary_statement_is_not_compiled(self):
+        """Test de que las sentencias unarias no se compilan a máscara."""
+        definition = group(
+            {
+                "type": "UnaryStatement",
+                "operand": detection_property("class_name"),
+                "operator": {"type": "Exists"},
+            }
+        )
+
+        mask_fun = build_detections_mask_function(
+            StatementGroup.model_validate(definition)
+        )
+
+        assert mask_fun is None
+
+    def test_unsupported_property_is_not_compiled(self):
+        """Test de que las propiedades sin equivalente columnar no se compilan."""
+        definition = group(
+            binary(detection_property("tracker_id"), "==", static(1))
+        )
+
+        mask_fun = build_detections_mask_function(
+            StatementGroup.model_validate(definition)
+        )
+
+        assert mask_fun is None
+
+    def test_missing_column_falls_back_to_per_detection_path(self):
+        """Test de filtrado cuando falta la columna class_name."""
+        detections = make_detections(n=10)
+        detections.data = {}
+        definition = group(
+            binary(detection_property("class_name"), "==", static("person"))
+        )
+        parsed = StatementGroup.model_validate(definition)
+
+        with pytest.raises(EvaluationEngineError):
+            filter_detections(
+                detections=detections,
+                filtering_fun=build_eval_function(parsed),
+                global_parameters={},
+                mask_fun=build_detections_mask_function(parsed),
+            )
+
+    def test_type_mismatch_raises_the_same_error(self):
+        """Test de que los errores de tipo se reportan igual que antes."""
+        detections = make_detections(n=10)
+        definition = group(
+            binary(detection_property("class_name"), "(Number) >", static(3))
+        )
+
+        with pytest.raises(EvaluationEngineError):
+            filter_per_detection(detections, definition, {})
+        with pytest.raises(EvaluationEngineError):
+            filter_vectorized(detections, definition, {})
+
+    def test_constant_operand_uses_care_operations(self, monkeypatch):
+        """Test de que la máscara resuelve los operandos con las operaciones de care."""
+        calls = []
+
+        def to_lower(value, execution_context, **kwargs):
+            calls.append(value)
+            return value.lower()
+
+        monkeypatch.setitem(
+            operations_core.REGISTERED_SIMPLE_OPERATIONS, "StringToLowerCase", to_lower
+        )
+        detections = make_detections(n=50)
+        definition = group(
+            binary(
+                detection_property("class_name"),
+                "==",
+                {
+                    "type": "DynamicOperand",
+                    "operand_name": "name",
+                    "operations": [{"type": "StringToLowerCase"}],
+                },
+            )
+        )
+
+        filtered = filter_vectorized(detections, definition, {"name": "PERSON"})
+
+        assert calls == ["PERSON"]
+        assert set(filtered.data["class_name"]) == {"person"}
@@ -0,0 +1,182 @@
+"""
+Tests de la sesión HTTP compartida de la API de Roboflow contra un servidor local que cuenta
+conexiones y peticiones condicionales.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import care.roboflow_api as roboflow_api
+from care.utils.http_client import ETagCache, close_http_session, get_http_session
+
+WORKFLOW_RESPONSE = {
+    "workflow": {
+        "id": "workflow-id",
+        "config": json.dumps({"specification": {"version": "1.0", "steps": []}}),
+    }
+}
+
+
+class CountingServer:
+    """Servidor HTTP/1.1 con keep-alive que cuenta conexiones, peticiones y respuestas 304."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+        self.etag = '"v1"'
+        self.payload = WORKFLOW_RESPONSE
+        self.connections_to_drop = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    drop = server.connections_to_drop > 0
+                    if drop:
+                        server.connections_to_drop -= 1
+                if drop:
+                    # connection closed without response
+                    self.close_connection = True
+                    return
+                if_none_match = self.headers.get("If-None-Match")
+                if if_none_match is not None:
+                    with server._lock:
+                        server.conditional_requests += 1
+                if if_none_match is not None and if_none_match == server.etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                content = json.dumps(server.payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                if server.etag:
+                    self.send_header("ETag", server.etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+    def start(self) -> "CountingServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def counting_server(monkeypatch):
+    server = CountingServer().start()
+    monkeypatch.setattr(roboflow_api, "API_BASE_URL", server.url)
+    monkeypatch.setattr(roboflow_api, "ROBOFLOW_API_ETAG_CACHE", ETagCache())
+    close_http_session()
+    yield server
+    close_http_session()
+    server.stop()
+
+
+def get_workflow_specification() -> dict:
+    return roboflow_api.get_workflow_specification(
+        api_key="api-key",
+        workspace_id="workspace",
+        workflow_id="workflow",
+        use_cache=False,
+    )
+
+
+class TestHTTPSession:
+    """Tests de la sesión compartida."""
+
+    def test_connection_is_reused(self, counting_server):
+        """Test de que varias peticiones comparten una conexión keep-alive."""
+        for _ in range(5):
+            roboflow_api.get_from_url(url=f"{counting_server.url}/resource")
+
+        assert counting_server.requests == 5
+        assert counting_server.connections == 1
+
+    def test_dropped_connection_is_retried(self, counting_server):
+        """Test de reintento de un GET cuya conexión se cierra sin respuesta."""
+        counting_server.connections_to_drop = 1
+
+        response = roboflow_api.get_from_url(url=f"{counting_server.url}/resource")
+
+        assert response == WORKFLOW_RESPONSE
+        assert counting_server.requests == 2
+
+    def test_session_is_shared(self, counting_server):
+        """Test de que todos los hilos usan la misma sesión."""
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_http_session()))
+        thread.start()
+        thread.join()
+
+        assert sessions[0] is get_http_session()
+
+
+class TestETagRevalidation:
+    """Tests de revalidación condicional con ETag."""
+
+    def test_workflow_specification_is_revalidated(self, counting_server):
+        """Test de que las descargas repetidas se resuelven con 304 Not Modified."""
+        results = [get_workflow_specification() for _ in range(3)]
+
+        assert results[0] == {"version": "1.0", "steps": [], "id": "workflow-id"}
+        assert results[1] == results[2] == results[0]
+        assert results[1] is not results[0]
+        assert counting_server.conditional_requests == 2
+        assert counting_server.not_modified == 2
+
+    def test_changed_resource_is_downloaded(self, counting_server):
+        """Test de descarga completa cuando el ETag cambia en el servidor."""
+        get_workflow_specification()
+        counting_server.etag = '"v2"'
+        counting_server.payload = {
+            "workflow": {
+                "id": "workflow-id",
+                "config": json.dumps({"specification": {"version": "2.0"}}),
+            }
+        }
+
+        assert get_workflow_specification()["version"] == "2.0"
+        assert get_workflow_specification()["version"] == "2.0"
+        assert counting_server.conditional_requests == 2
+        assert counting_server.not_modified == 1
+
+    def test_responses_without_etag_are_not_cached(self, counting_server):
+        """Test de que sin ETag no se envían peticiones condicionales."""
+        counting_server.etag = None
+
+        get_workflow_specification()
+        get_workflow_specification()
+
+        assert counting_server.conditional_requests == 0
+        assert counting_server.requests == 2
@@ -0,0 +1,119 @@
+"""
+Tests de compatibilidad del serializador columnar de sv.Detections con el serializador por detección.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.care_steps.common.serializers import (
+    _serialise_sv_detections_per_detection,
+    dumps_to_json_bytes,
+    serialise_sv_detections,
+    serialise_sv_detections_columnar,
+)
+
+
+def make_detections(
+    n: int,
+    with_masks: bool = False,
+    with_tracker: bool = False,
+    with_extra_data: bool = False,
+    seed: int = 3,
+) -> sv.Detections:
+    rng = np.random.default_rng(seed)
+    xy_min = rng.uniform(0, 200, size=(n, 2))
+    wh = rng.uniform(1, 100, size=(n, 2))
+    xyxy = np.concatenate([xy_min, xy_min + wh], axis=1).astype(np.float32)
+    data = {
+        "class_name": np.array(["person", "bed", "chair"] * n, dtype=object)[:n],
+        "detection_id": np.array([f"det-{i}" for i in range(n)]),
+        "image_dimensions": np.array([[320, 480]] * n),
+    }
+    if with_extra_data:
+        data["parent_id"] = np.array(["image"] * n)
+        data["time_in_zone"] = rng.uniform(0, 10, size=n)
+        data["velocity"] = rng.uniform(-1, 1, size=(n, 2))
+        data["speed"] = rng.uniform(0, 2, size=n)
+    mask = None
+    if with_masks:
+        mask = np.zeros((n, 320, 480), dtype=bool)
+        for i, (x1, y1, x2, y2) in enumerate(xyxy.astype(int)):
+            mask[i, y1:y2, x1:x2] = True
+        if n > 1:
+            # instancia sin píxeles - debe descartarse en ambos caminos
+            mask[1] = False
+        if n > 2:
+            # instancia pegada al borde de la imagen
+            mask[2, 300:, 400:] = True
+    return sv.Detections(
+        xyxy=xyxy,
+        mask=mask,
+        confidence=rng.uniform(0, 1, size=n).astype(np.float32),
+        class_id=rng.integers(0, 3, size=n),
+        tracker_id=np.arange(n) + 100 if with_tracker else None,
+        data=data,
+    )
+
+
+SCENARIOS = {
+    "boxes": {},
+    "tracked": {"with_tracker": True},
+    "extra_data": {"with_extra_data": True, "with_tracker": True},
+    "masks": {"with_masks": True},
+    "masks_and_extra_data": {"with_masks": True, "with_extra_data": True},
+}
+
+
+class TestColumnarSerialisationCompatibility:
+    """Tests de que la salida por defecto no cambia ni un byte."""
+
+    @pytest.mark.parametrize("name", sorted(SCENARIOS.keys()))
+    @pytest.mark.parametrize("n", [0, 1, 5])
+    def test_output_is_byte_compatible(self, name, n):
+        """Test de igualdad byte a byte de la salida codificada en JSON."""
+        detections = make_detections(n=n, **SCENARIOS[name])
+
+        expected = _serialise_sv_detections_per_detection(detections=detections)
+        result = serialise_sv_detections(detections=detections)
+
+        assert json.dumps(result, default=float) == json.dumps(expected, default=float)
+
+    def test_detections_without_detection_id_fall_back(self):
+        """Test de que los casos no soportados usan el camino por detección."""
+        detections = make_detections(n=3)
+        del detections.data["detection_id"]
+
+        with pytest.raises(KeyError):
+            serialise_sv_detections(detections=detections)
+
+
+class TestCompactFormats:
+    """Tests del formato columnar compacto y del codificador a bytes."""
+
+    def test_columnar_format_matches_per_detection_output(self):
+        """Test de que el formato columnar contiene los mismos valores."""
+        detections = make_detections(n=5, with_masks=True, with_tracker=True)
+
+        rows = serialise_sv_detections(detections=detections)["predictions"]
+        columns = serialise_sv_detections_columnar(detections=detections)[
+            "predictions"
+        ]
+
+        for key in ["x", "y", "width", "height", "confidence", "class", "tracker_id"]:
+            assert columns[key] == [row[key] for row in rows]
+        assert columns["points"] == [
+            [[p["x"], p["y"]] for p in row["points"]] for row in rows
+        ]
+
+    def test_json_bytes_encoder(self):
+        """Test de que el codificador produce JSON equivalente."""
+        detections = make_detections(n=4, with_extra_data=True)
+        serialised = serialise_sv_detections(detections=detections)
+
+        encoded = dumps_to_json_bytes(serialised)
+
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == json.loads(json.dumps(serialised, default=float))
@@ -0,0 +1,225 @@
+"""
+Tests de la caché de resultados de modelos compartida entre pipelines que procesan los
+mismos fotogramas.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from care.cache.memory import MemoryCache
+from care.cache.shared_results import SharedResultsCache
+from care.entities.requests.inference import ObjectDetectionInferenceRequest
+from care.entities.responses.inference import (
+    InferenceResponseImage,
+    ObjectDetectionInferenceResponse,
+)
+from care.managers.decorators.shared_results import (
+    FramesFingerprints,
+    WithSharedResults,
+    build_shared_results_key,
+)
+
+
+class CountingModelManager:
+    """Gestor de modelos que cuenta las inferencias y puede bloquearlas."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def infer_from_request_sync(self, model_id, request, **kwargs):
+        with self._lock:
+            self.calls += 1
+        self.gate.wait(timeout=10)
+        return ObjectDetectionInferenceResponse(
+            predictions=[],
+            image=InferenceResponseImage(width=64, height=48),
+        )
+
+
+def make_request(frame: np.ndarray, confidence: float = 0.4, api_key: str = "key"):
+    return ObjectDetectionInferenceRequest(
+        model_id="project/1",
+        image={"type": "numpy_object", "value": frame},
+        api_key=api_key,
+        confidence=confidence,
+    )
+
+
+def make_frame(value: int = 0) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestSharedResultsCache:
+    """Tests de la caché de resultados con vuelo único."""
+
+    def test_concurrent_callers_wait_for_single_computation(self):
+        """Test de que las peticiones concurrentes esperan a un único cálculo."""
+        results_cache = SharedResultsCache(cache=MemoryCache(), ttl=10, max_bytes=1024)
+        gate = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(threading.current_thread())
+            gate.wait(timeout=10)
+            return {"predictions": [1, 2, 3]}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    results_cache.get_or_compute(key="frame", compute=compute)
+                )
+            )
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_until(lambda: len(calls) == 1)
+        time.sleep(0.1)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"predictions": [1, 2, 3]}] * 6
+        assert len({id(result) for result in results}) == 6
+
+    def test_error_is_propagated_and_not_cached(self):
+        """Test de que el error llega a quienes esperan y no queda en caché."""
+        results_cache = SharedResultsCache(cache=MemoryCache(), ttl=10, max_bytes=1024)
+
+        def failing_compute():
+            raise RuntimeError("model failure")
+
+        with pytest.raises(RuntimeError):
+            results_cache.get_or_compute(key="frame", compute=failing_compute)
+
+        assert results_cache.get_or_compute(key="frame", compute=lambda: 1) == 1
+        assert results_cache.get_or_compute(key="frame", compute=lambda: 2) == 1
+
+    def test_results_expire(self):
+        """Test de caducidad de los resultados tras el TTL."""
+        cache = MemoryCache()
+        results_cache = SharedResultsCache(cache=cache, ttl=1, max_bytes=1024)
+
+        results_cache.get_or_compute(key="frame", compute=lambda: 1)
+        cache.expires["frame"] = time.time() - 1
+
+        assert results_cache.get_or_compute(key="frame", compute=lambda: 2) == 2
+
+    def test_oldest_results_are_evicted_over_bytes_limit(self):
+        """Test de expulsión de los resultados más antiguos al superar el límite de bytes."""
+        cache = MemoryCache()
+        results_cache = SharedResultsCache(cache=cache, ttl=10, max_bytes=2500)
+
+        for i in range(5):
+            results_cache.get_or_compute(key=f"frame-{i}", compute=lambda: b"x" * 1000)
+
+        assert results_cache.size_bytes <= 2500
+        assert cache.get("frame-0") is None
+        assert cache.get("frame-4") is not None
+
+    def test_too_large_results_are_not_shared(self):
+        """Test de que los resultados mayores que el límite no se guardan."""
+        cache = MemoryCache()
+        results_cache = SharedResultsCache(cache=cache, ttl=10, max_bytes=100)
+
+        result = results_cache.get_or_compute(key="frame", compute=lambda: b"x" * 1000)
+
+        assert result == b"x" * 1000
+        assert cache.get("frame") is None
+        assert results_cache.size_bytes == 0
+
+
+class TestWithSharedResults:
+    """Tests del decorador del gestor de modelos."""
+
+    def test_pipelines_share_result_of_identical_frame(self):
+        """Test de que dos pipelines con fotogramas idénticos ejecutan el modelo una vez."""
+        model_manager = CountingModelManager()
+        model_manager.gate.clear()
+        results_cache = SharedResultsCache(cache=MemoryCache(), ttl=10, max_bytes=2**20)
+        pipelines = [
+            WithSharedResults(model_manager, results_cache=results_cache)
+            for _ in range(2)
+        ]
+        # each pipeline decodes its own copy of the frame
+        frames = [make_frame(), make_frame()]
+        responses = []
+        threads = [
+            threading.Thread(
+                target=lambda pipeline=pipeline, frame=frame: responses.append(
+                    pipeline.infer_from_request_sync(
+                        "project/1", make_request(frame=frame)
+                    )
+                )
+            )
+            for pipeline, frame in zip(pipelines, frames)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_until(lambda: model_manager.calls == 1)
+        time.sleep(0.1)
+        model_manager.gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert model_manager.calls == 1
+        assert len(responses) == 2
+        assert responses[0] == responses[1]
+
+    def test_different_frames_and_parameters_are_not_shared(self):
+        """Test de que otro fotograma u otros parámetros no comparten resultado."""
+        model_manager = CountingModelManager()
+        results_cache = SharedResultsCache(cache=MemoryCache(), ttl=10, max_bytes=2**20)
+        decorated = WithSharedResults(model_manager, results_cache=results_cache)
+
+        decorated.infer_from_request_sync("project/1", make_request(make_frame(0)))
+        decorated.infer_from_request_sync("project/1", make_request(make_frame(1)))
+        decorated.infer_from_request_sync(
+            "project/1", make_request(make_frame(0), confidence=0.9)
+        )
+        decorated.infer_from_request_sync(
+            "project/1", make_request(make_frame(0), api_key="other-key")
+        )
+
+        assert model_manager.calls == 3
+
+    def test_images_given_by_reference_bypass_cache(self):
+        """Test de que las imágenes por URL no usan la caché."""
+        request = ObjectDetectionInferenceRequest(
+            model_id="project/1",
+            image={"type": "url", "value": "https://example.com/image.jpg"},
+            api_key="key",
+        )
+
+        assert build_shared_results_key(model_id="project/1", request=request) is None
+
+
+class TestFramesFingerprints:
+    """Tests de las huellas de fotogramas."""
+
+    def test_fingerprint_is_memoized_while_frame_is_alive(self):
+        """Test de que la huella se calcula una vez y se olvida al liberar el fotograma."""
+        fingerprints = FramesFingerprints()
+        frame = make_frame(3)
+
+        first = fingerprints.get(image=frame)
+        second = fingerprints.get(image=frame)
+        assert first is second
+        assert fingerprints.get(image=make_frame(3)) == first
+        del frame
+
+        assert len(fingerprints) == 0
@@ -0,0 +1,157 @@
+"""
+Tests del hub de modelos compartidos entre pipelines y del decorador que obtiene de él las
+instancias de los modelos.
+"""
+
+import numpy as np
+import pytest
+
+from care.managers.base import ModelManager
+from care.managers.decorators.fixed_size_cache import WithFixedSizeCache
+from care.managers.decorators.shared_models import WithSharedModels
+from care.managers.hub import ModelHub
+from care.registries.base import ModelRegistry
+
+
+class FakeModel:
+    """Modelo que registra cuántas instancias se crean y si se limpió su caché."""
+
+    instances = []
+
+    def __init__(self, model_id, api_key, countinference=None, service_secret=None):
+        self.model_id = model_id
+        self.cleared = False
+        FakeModel.instances.append(self)
+
+    def clear_cache(self, delete_from_disk: bool = True) -> None:
+        self.cleared = True
+
+
+class BatchingFakeModel(FakeModel):
+    """Modelo con batching dinámico, cuyas predicciones se agrupan en el hub."""
+
+    batching_enabled = True
+
+    def predict(self, img_in: np.ndarray, **kwargs):
+        return (img_in * 2,)
+
+
+class FakeRegistry(ModelRegistry):
+    def __init__(self, model_class=FakeModel):
+        super().__init__(registry_dict={})
+        self._model_class = model_class
+
+    def get_model(self, model_id, api_key, **kwargs):
+        return self._model_class
+
+
+@pytest.fixture
+def hub():
+    FakeModel.instances = []
+    return ModelHub(model_manager=ModelManager(model_registry=FakeRegistry()))
+
+
+def make_shared_manager(hub: ModelHub, client_id: str) -> WithSharedModels:
+    return WithSharedModels(
+        ModelManager(model_registry=FakeRegistry()), hub=hub, client_id=client_id
+    )
+
+
+class TestModelHub:
+    """Tests del recuento de referencias de los modelos del hub."""
+
+    def test_model_is_loaded_once_for_many_clients(self, hub):
+        """Test de que varios clientes reciben la misma instancia del modelo."""
+        first = hub.acquire(model_id="project/1", api_key="key", client_id="a")
+        second = hub.acquire(model_id="project/1", api_key="key", client_id="b")
+        again = hub.acquire(model_id="project/1", api_key="key", client_id="b")
+
+        assert first is second is again
+        assert len(FakeModel.instances) == 1
+        assert hub.reference_count("project/1") == 2
+
+    def test_model_is_removed_when_not_referenced(self, hub):
+        """Test de que el modelo se descarga al liberar la última referencia."""
+        model = hub.acquire(model_id="project/1", api_key="key", client_id="a")
+        hub.acquire(model_id="project/1", api_key="key", client_id="b")
+
+        hub.release(model_id="project/1", client_id="a")
+        assert not model.cleared
+        hub.release(model_id="project/1", client_id="b")
+
+        assert model.cleared
+        assert hub.reference_count("project/1") == 0
+        hub.release(model_id="project/1", client_id="b")
+
+    def test_coalescing_predictor_lifecycle(self):
+        """Test de que el predictor de micro-batching se instala y retira con el modelo."""
+        hub = ModelHub(
+            model_manager=ModelManager(model_registry=FakeRegistry(BatchingFakeModel)),
+            max_batch_size=4,
+            max_wait=0.0,
+        )
+        model = hub.acquire(model_id="project/1", api_key="key", client_id="a")
+        assert "predict" in vars(model)
+        assert np.array_equal(model.predict(np.ones((1, 2)))[0], np.full((1, 2), 2))
+
+        hub.release(model_id="project/1", client_id="a")
+
+        assert "predict" not in vars(model)
+
+
+class TestWithSharedModels:
+    """Tests del decorador que toma los modelos del hub."""
+
+    def test_dispose_releases_models_of_client(self, hub):
+        """Test de que dispose() libera solo las referencias del propio cliente."""
+        first = make_shared_manager(hub=hub, client_id="a")
+        second = make_shared_manager(hub=hub, client_id="b")
+        first.add_model(model_id="project/1", api_key="key")
+        second.add_model(model_id="project/1", api_key="key")
+        assert first["project/1"] is second["project/1"]
+
+        first.dispose()
+
+        assert "project/1" not in first
+        assert "project/1" in second
+        assert hub.reference_count("project/1") == 1
+        assert not second["project/1"].cleared
+        second.dispose()
+        assert FakeModel.instances[0].cleared
+
+    def test_alias_is_used_as_identifier(self, hub):
+        """Test de que el alias identifica el modelo en el gestor y en el hub."""
+        manager = make_shared_manager(hub=hub, client_id="a")
+
+        manager.add_model(model_id="project/1", api_key="key", model_id_alias="alias")
+
+        assert list(manager.keys()) == ["alias"]
+        assert hub.reference_count("alias") == 1
+
+    def test_fixed_size_cache_evicts_shared_models(self, hub):
+        """Test de que la caché LRU expulsa los modelos compartidos liberándolos en el hub."""
+        manager = WithFixedSizeCache(make_shared_manager(hub=hub, client_id="a"), max_size=1)
+        other_client = make_shared_manager(hub=hub, client_id="b")
+        other_client.add_model(model_id="project/1", api_key="key")
+
+        manager.add_model(model_id="project/1", api_key="key")
+        manager.add_model(model_id="project/2", api_key="key")
+
+        assert list(manager.keys()) == ["project/2"]
+        assert list(manager._key_queue) == ["project/2"]
+        assert hub.reference_count("project/1") == 1
+        assert not other_client["project/1"].cleared
+
+    def test_registered_instances_are_tracked_by_fixed_size_cache(self):
+        """Test de que las instancias registradas directamente entran en la cola LRU."""
+        manager = WithFixedSizeCache(ModelManager(model_registry=FakeRegistry()), max_size=1)
+        first = FakeModel(model_id="project/1", api_key="key")
+        manager.register_model_instance("project/1", first)
+
+        manager.register_model_instance("project/2", FakeModel("project/2", api_key="key"))
+
+        assert list(manager.keys()) == ["project/2"]
+        assert list(manager._key_queue) == ["project/2"]
+        assert first.cleared
+        assert manager.detach_model("project/2").model_id == "project/2"
+        assert len(manager._key_queue) == 0
@@ -0,0 +1,220 @@
+"""
+Tests de la capa de persistencia SQLite: conexiones por hilo, WAL e inserciones por lotes.
+"""
+
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from care.usage_tracking.sqlite_queue import SQLiteQueue
+from care.utils.sqlite_wrapper import (
+    BufferedSQLiteWriter,
+    SQLiteWrapper,
+    get_connection_pool,
+)
+
+
+@pytest.fixture
+def db_file_path(tmp_path):
+    path = str(tmp_path / "db" / "test.db")
+    yield path
+    get_connection_pool(path).close_all()
+
+
+def make_wrapper(db_file_path: str) -> SQLiteWrapper:
+    return SQLiteWrapper(
+        db_file_path=db_file_path,
+        table_name="events",
+        columns={"payload": "TEXT NOT NULL", "source": "TEXT"},
+    )
+
+
+class TestConnectionPool:
+    """Tests del pool de conexiones."""
+
+    def test_connections_are_confined_to_threads(self, db_file_path):
+        """Test de una conexión reutilizada por hilo, en modo WAL."""
+        make_wrapper(db_file_path)
+        pool = get_connection_pool(db_file_path)
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(pool.get_connection()))
+        thread.start()
+        thread.join()
+
+        connection = pool.get_connection()
+
+        assert connection is pool.get_connection()
+        assert connection is not connections[0]
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_insert_is_committed(self, db_file_path):
+        """Test de que las inserciones sin transacción exclusiva quedan guardadas."""
+        wrapper = make_wrapper(db_file_path)
+
+        wrapper.insert(row={"payload": "a"})
+        wrapper.insert(row={"payload": "b"}, with_exclusive=True)
+        get_connection_pool(db_file_path).close_all()
+
+        assert [r["payload"] for r in wrapper.select()] == ["a", "b"]
+
+    def test_connections_of_finished_threads_are_closed(self, db_file_path):
+        """Test de que las conexiones de hilos terminados se cierran."""
+        wrapper = make_wrapper(db_file_path)
+        pool = get_connection_pool(db_file_path)
+        threads = [
+            threading.Thread(target=lambda: wrapper.insert(row={"payload": "a"}))
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert wrapper.count() == 20
+        assert pool.open_connections() == 1
+
+
+class TestInsertMany:
+    """Tests de inserción por lotes."""
+
+    def test_rows_with_different_columns(self, db_file_path):
+        """Test de filas con distintas columnas en un mismo lote."""
+        wrapper = make_wrapper(db_file_path)
+
+        wrapper.insert_many(
+            rows=[
+                {"payload": "a", "source": "cam1"},
+                {"payload": "b"},
+                {"payload": "c", "source": "cam2"},
+            ]
+        )
+
+        rows = wrapper.select()
+        assert {(r["payload"], r["source"]) for r in rows} == {
+            ("a", "cam1"),
+            ("b", None),
+            ("c", "cam2"),
+        }
+
+    def test_batch_is_atomic(self, db_file_path):
+        """Test de que un lote con una fila inválida no inserta nada."""
+        wrapper = make_wrapper(db_file_path)
+
+        with pytest.raises(Exception):
+            wrapper.insert_many(rows=[{"payload": "a"}, {"payload": None}])
+
+        assert wrapper.count() == 0
+
+
+class TestBufferedSQLiteWriter:
+    """Tests del escritor con buffer."""
+
+    def test_flush_on_size(self, db_file_path):
+        """Test de volcado al alcanzar el tamaño del buffer."""
+        wrapper = make_wrapper(db_file_path)
+        writer = BufferedSQLiteWriter(wrapper=wrapper, max_rows=3, max_delay=60)
+
+        writer.put({"payload": "a"})
+        writer.put({"payload": "b"})
+        assert wrapper.count() == 0
+        writer.put({"payload": "c"})
+
+        assert [r["payload"] for r in wrapper.select()] == ["a", "b", "c"]
+        writer.close()
+
+    def test_flush_on_time(self, db_file_path):
+        """Test de volcado tras el tiempo máximo de espera."""
+        wrapper = make_wrapper(db_file_path)
+        writer = BufferedSQLiteWriter(wrapper=wrapper, max_rows=100, max_delay=0.05)
+
+        writer.put({"payload": "a"})
+        deadline = time.monotonic() + 5
+        while wrapper.count() == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert wrapper.count() == 1
+        writer.close()
+
+    def test_concurrent_writers(self, db_file_path):
+        """Test de que no se pierden filas con varios hilos escribiendo."""
+        wrapper = make_wrapper(db_file_path)
+        writer = BufferedSQLiteWriter(wrapper=wrapper, max_rows=50, max_delay=0.01)
+
+        def client(i: int):
+            for j in range(200):
+                writer.put({"payload": f"{i}-{j}"})
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        assert wrapper.count() == 1600
+
+    def test_failed_rows_are_capped(self, db_file_path):
+        """Test de que el buffer no crece sin límite si la base de datos falla."""
+        wrapper = make_wrapper(db_file_path)
+        writer = BufferedSQLiteWriter(
+            wrapper=wrapper, max_rows=1, max_delay=60, max_buffered_rows=4
+        )
+        wrapper._tbl_name = "missing"
+
+        for payload in ["a", "b", "c", "d", "e", "f"]:
+            with pytest.raises(sqlite3.OperationalError):
+                writer.put({"payload": payload})
+        wrapper._tbl_name = "events"
+        writer.close()
+
+        assert [r["payload"] for r in wrapper.select()] == ["c", "d", "e", "f"]
+
+    def test_buffered_rows_are_flushed_at_exit(self, db_file_path):
+        """Test de que las filas en el buffer se guardan al terminar el intérprete."""
+        make_wrapper(db_file_path)
+        script = (
+            "from care.utils.sqlite_wrapper import BufferedSQLiteWriter, SQLiteWrapper\n"
+            "wrapper = SQLiteWrapper(\n"
+            f"    db_file_path={db_file_path!r},\n"
+            "    table_name='events',\n"
+            "    columns={'payload': 'TEXT NOT NULL', 'source': 'TEXT'},\n"
+            ")\n"
+            "writer = BufferedSQLiteWriter(wrapper=wrapper, max_rows=100, max_delay=60)\n"
+            "writer.put({'payload': 'a'})\n"
+        )
+
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert make_wrapper(db_file_path).count() == 1
+
+
+class TestSQLiteQueue:
+    """Tests de la cola de uso sobre SQLite."""
+
+    def test_payloads_are_written_through(self, db_file_path):
+        """Test de que `put` guarda el payload antes de terminar el intérprete."""
+        script = (
+            "from care.usage_tracking.sqlite_queue import SQLiteQueue\n"
+            f"SQLiteQueue(db_file_path={db_file_path!r}).put({{'a': 1}})\n"
+        )
+
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert SQLiteQueue(db_file_path=db_file_path).get_nowait() == [{"a": 1}]
+
+    def test_buffered_payloads_are_visible(self, db_file_path):
+        """Test de que `empty` y `get_nowait` ven los payloads aún en el buffer."""
+        queue = SQLiteQueue(db_file_path=db_file_path, buffered_writes=True)
+
+        assert queue.empty()
+        for i in range(3):
+            queue.put({"frames": i})
+
+        assert not queue.empty()
+        assert queue.get_nowait() == [{"frames": 0}, {"frames": 1}, {"frames": 2}]
+        assert queue.empty()
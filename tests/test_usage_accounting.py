@@ -0,0 +1,109 @@
+"""
+Tests de los contadores de uso por hilo que se consolidan en el hilo colector.
+"""
+
+import threading
+
+from care.usage_tracking.accounting import UsageCounters, freeze
+
+KEY = ("api-key", "model", "yolo/1")
+
+
+def add(counters: UsageCounters, key=KEY, frames=1, **kwargs):
+    counters.add(
+        key=key,
+        frames=frames,
+        source_duration=kwargs.get("source_duration", 0.0),
+        execution_duration=kwargs.get("execution_duration", 0.01),
+        fps=kwargs.get("fps", 0),
+        resource_details=kwargs.get("resource_details"),
+        attributes=kwargs.get("attributes"),
+    )
+
+
+class TestUsageCounters:
+    """Tests de acumulación y consolidación de contadores."""
+
+    def test_harvest_reports_deltas(self):
+        """Test de que cada consolidación informa sólo lo acumulado desde la anterior."""
+        counters = UsageCounters()
+        for _ in range(3):
+            add(counters, frames=2, resource_details={"source": "a"})
+
+        first = counters.harvest()
+        assert first[KEY].calls == 3
+        assert first[KEY].frames == 6
+        assert first[KEY].resource_details == {"source": "a"}
+        assert counters.harvest() == {}
+
+        add(counters, frames=5)
+        second = counters.harvest()
+        assert second[KEY].frames == 5
+        assert second[KEY].timestamp_start > first[KEY].timestamp_stop
+        # los detalles se conservan si la llamada no los aporta
+        assert second[KEY].resource_details == {"source": "a"}
+
+    def test_threads_are_merged(self):
+        """Test de que no se pierden llamadas con varios hilos y consolidaciones concurrentes."""
+        counters = UsageCounters()
+        other_key = ("api-key", "workflows", "wf")
+        harvested = {KEY: 0, other_key: 0}
+        stop = threading.Event()
+
+        def collector():
+            while not stop.is_set():
+                for key, delta in counters.harvest().items():
+                    harvested[key] += delta.frames
+
+        def client():
+            for i in range(2000):
+                add(counters, key=KEY if i % 2 else other_key)
+
+        collector_thread = threading.Thread(target=collector)
+        collector_thread.start()
+        clients = [threading.Thread(target=client) for _ in range(8)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        stop.set()
+        collector_thread.join()
+        for key, delta in counters.harvest().items():
+            harvested[key] += delta.frames
+
+        assert harvested == {KEY: 8000, other_key: 8000}
+
+    def test_finished_threads_are_dropped(self):
+        """Test de que los contadores de hilos terminados se eliminan tras consolidarse."""
+        counters = UsageCounters()
+        thread = threading.Thread(target=lambda: add(counters, frames=3))
+        thread.start()
+        thread.join()
+
+        assert counters.harvest()[KEY].frames == 3
+        assert counters._registry == []
+        assert counters.harvest() == {}
+
+    def test_attributes_are_kept(self):
+        """Test de que los atributos de servicio se conservan entre llamadas."""
+        counters = UsageCounters()
+        add(counters, attributes=("service", "secret", None))
+        add(counters)
+
+        assert counters.harvest()[KEY].attributes == ("service", "secret", None)
+
+
+class TestFreeze:
+    """Tests de la clave hashable de los detalles de recurso."""
+
+    def test_equal_details(self):
+        """Test de que el orden de las claves no cambia la clave."""
+        assert freeze({"a": 1, "b": [1, {"c": "d"}]}) == freeze(
+            {"b": [1, {"c": "d"}], "a": 1}
+        )
+
+    def test_values_serialized_differently(self):
+        """Test de que valores iguales en Python pero distintos en JSON no colisionan."""
+        assert freeze({"a": True}) != freeze({"a": 1})
+        assert freeze({"a": 1}) != freeze({"a": 1.0})
+        assert freeze({"a": []}) != freeze({"a": {}})
@@ -0,0 +1,197 @@
+"""
+Tests de la caché de workflows compilados.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import care.workflows.execution_engine.core as execution_engine_core
+from care.stream.utils import on_pipeline_end
+from care.workflows.execution_engine.compilation_cache import (
+    CompiledWorkflowsCache,
+    compute_compilation_key,
+)
+from care.workflows.execution_engine.core import ExecutionEngine
+
+DEFINITION = {
+    "version": "1.0",
+    "inputs": [{"type": "WorkflowImage", "name": "image"}],
+    "steps": [],
+    "outputs": [],
+}
+ALARM_WORKFLOW = {
+    "version": "1.0",
+    "inputs": [{"type": "WorkflowParameter", "name": "count"}],
+    "steps": [
+        {
+            "type": "care/prediction_alarm@v1",
+            "name": "alarm",
+            "count": "$inputs.count",
+            "threshold": 3,
+            "cooldown_seconds": 60.0,
+        }
+    ],
+    "outputs": [
+        {"type": "JsonField", "name": "alarm_active", "selector": "$steps.alarm.alarm_active"}
+    ],
+}
+
+
+def make_key(definition=DEFINITION, init_parameters=None, **engine_options):
+    return compute_compilation_key(
+        workflow_definition=definition,
+        engine_version="1.0.0",
+        init_parameters=init_parameters,
+        engine_options=engine_options,
+        plugins=["care.workflows.care_steps"],
+    )
+
+
+class TestComputeCompilationKey:
+    """Tests de la clave canónica."""
+
+    def test_keys_order_does_not_matter(self):
+        """Test de que el orden de las claves del JSON no cambia el hash."""
+        reordered = dict(reversed(list(DEFINITION.items())))
+
+        assert make_key(definition=reordered) == make_key()
+
+    def test_definition_and_primitives_are_compared_by_value(self):
+        """Test de que los parámetros primitivos se comparan por valor."""
+        changed = {**DEFINITION, "outputs": [{"name": "x", "selector": "$steps.a.*"}]}
+
+        assert make_key(init_parameters={"api_key": "a"}) == make_key(
+            init_parameters={"api_key": "a"}
+        )
+        assert make_key(init_parameters={"api_key": "a"}) != make_key(
+            init_parameters={"api_key": "b"}
+        )
+        assert make_key(definition=changed) != make_key()
+
+    def test_objects_are_compared_by_identity(self):
+        """Test de que los objetos de las opciones del motor se comparan por identidad."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        other_executor = ThreadPoolExecutor(max_workers=1)
+
+        key = make_key(executor=executor)
+
+        assert key == make_key(executor=executor)
+        assert key != make_key(executor=other_executor)
+        executor.shutdown()
+        other_executor.shutdown()
+
+    def test_init_parameters_objects_are_compared_by_type(self):
+        """Test de que los objetos de los parámetros de inicio se comparan por tipo."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        other_executor = ThreadPoolExecutor(max_workers=1)
+
+        key = make_key(init_parameters={"executor": executor})
+
+        assert key == make_key(init_parameters={"executor": other_executor})
+        assert key != make_key(init_parameters={"executor": object()})
+        executor.shutdown()
+        other_executor.shutdown()
+
+    def test_plugins_are_part_of_the_key(self):
+        """Test de que el conjunto de plugins forma parte de la clave."""
+        key = compute_compilation_key(
+            workflow_definition=DEFINITION,
+            engine_version="1.0.0",
+            init_parameters=None,
+            engine_options={},
+            plugins=[],
+        )
+
+        assert key != make_key()
+
+    def test_not_serialisable_definition_is_not_cached(self):
+        """Test de definición que no puede serializarse."""
+        assert make_key(definition={"steps": [object()]}) is None
+
+
+class TestCompiledWorkflowsCache:
+    """Tests de la semántica de préstamo de motores compilados."""
+
+    def test_engine_is_leased_exclusively(self):
+        """Test de que un motor prestado no se entrega dos veces."""
+        cache = CompiledWorkflowsCache(capacity=4, max_idle_engines=2)
+        engine = object()
+
+        assert cache.acquire(key="a") is None
+        cache.release(key="a", engine=engine, engine_options={})
+
+        assert cache.acquire(key="a") is engine
+        assert cache.acquire(key="a") is None
+        assert cache.stats().hits == 1
+        assert cache.stats().misses == 2
+
+    def test_idle_engines_are_bounded(self):
+        """Test de los límites de motores y definiciones en memoria."""
+        cache = CompiledWorkflowsCache(capacity=2, max_idle_engines=2)
+        for key in ["a", "b", "c"]:
+            for _ in range(3):
+                cache.release(key=key, engine=object(), engine_options={})
+
+        stats = cache.stats()
+
+        assert stats.definitions == 2
+        assert stats.idle_engines == 4
+        assert cache.acquire(key="a") is None
+
+    def test_disabled_cache(self):
+        """Test de caché desactivada."""
+        cache = CompiledWorkflowsCache(capacity=0)
+        cache.release(key="a", engine=object(), engine_options={})
+
+        assert not cache.enabled
+        assert cache.acquire(key="a") is None
+
+
+class TestExecutionEngineLeases:
+    """Tests de la reutilización de motores compilados entre pipelines sucesivos."""
+
+    def test_next_pipeline_reuses_compilation_with_fresh_steps(self, monkeypatch):
+        """Test de que el segundo pipeline acierta en la caché sin heredar el estado."""
+        monkeypatch.setenv("WORKFLOWS_PLUGINS", "care.workflows.care_steps")
+        cache = CompiledWorkflowsCache(capacity=4, max_idle_engines=1)
+        monkeypatch.setattr(execution_engine_core, "COMPILED_WORKFLOWS_CACHE", cache)
+        alarms, steps = [], []
+
+        for _ in range(2):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                engine = ExecutionEngine.init(
+                    workflow_definition=ALARM_WORKFLOW,
+                    init_parameters={"workflows_core.thread_pool_executor": executor},
+                )
+                compiled_workflow = engine._engine._compiled_workflow
+                steps.append(compiled_workflow.steps["alarm"].step)
+                assert (
+                    compiled_workflow.init_parameters["workflows_core.thread_pool_executor"]
+                    is executor
+                )
+                alarms.append(
+                    [
+                        engine.run(runtime_parameters={"count": count})[0]["alarm_active"]
+                        for count in [5, 5, 5]
+                    ]
+                )
+                engine.release()
+
+        assert alarms == [[True, True, False], [True, True, False]]
+        assert steps[0] is not steps[1]
+        assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+        assert engine._engine._compiled_workflow.steps["alarm"].step is None
+
+    def test_pipeline_end_releases_engine(self):
+        """Test de que al terminar el pipeline el motor vuelve a la caché."""
+        execution_engine = mock.MagicMock()
+
+        on_pipeline_end(
+            thread_pool_executor=ThreadPoolExecutor(max_workers=1),
+            cancel_thread_pool_tasks_on_exit=True,
+            profiler=mock.MagicMock(),
+            profiling_directory="",
+            execution_engine=execution_engine,
+        )
+
+        execution_engine.release.assert_called_once_with()
@@ -0,0 +1,238 @@
+"""
+Tests de la eliminación de pasos duplicados en definiciones de workflows.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from care.workflows.execution_engine.core import ExecutionEngine
+from care.workflows.execution_engine.optimization import eliminate_common_steps
+from inference.core.workflows.execution_engine.v1.core import ExecutionEngineV1
+
+VERTICALS_DIR = Path(__file__).parent.parent / "data" / "workflows" / "verticals"
+
+
+def filter_step(name: str, predictions: str = "$inputs.predictions") -> dict:
+    return {
+        "type": "roboflow_core/detections_filter@v1",
+        "name": name,
+        "predictions": predictions,
+        "operations": [
+            {
+                "type": "DetectionsFilter",
+                "filter_operation": {
+                    "type": "StatementGroup",
+                    "statements": [
+                        {
+                            "type": "BinaryStatement",
+                            "left_operand": {
+                                "type": "DynamicOperand",
+                                "operations": [
+                                    {
+                                        "type": "ExtractDetectionProperty",
+                                        "property_name": "confidence",
+                                    }
+                                ],
+                            },
+                            "comparator": {"type": "(Number) >="},
+                            "right_operand": {"type": "StaticOperand", "value": 0.5},
+                        }
+                    ],
+                },
+            }
+        ],
+    }
+
+
+def count_step(name: str, predictions: str) -> dict:
+    return {"type": "care/detections_count@v1", "name": name, "predictions": predictions}
+
+
+def alarm_step(name: str, count: str, threshold: int = 3) -> dict:
+    return {
+        "type": "care/prediction_alarm@v1",
+        "name": name,
+        "count": count,
+        "threshold": threshold,
+        "hysteresis": 1,
+        "cooldown_seconds": 0.0,
+    }
+
+
+DUPLICATED_WORKFLOW = {
+    "version": "1.0",
+    "inputs": [
+        {
+            "type": "WorkflowBatchInput",
+            "name": "predictions",
+            "kind": ["object_detection_prediction"],
+        }
+    ],
+    "steps": [
+        filter_step("filter_a"),
+        filter_step("filter_b"),
+        count_step("count_a", "$steps.filter_a.predictions"),
+        count_step("count_b", "$steps.filter_b.predictions"),
+        alarm_step("alarm_a", "$steps.count_a.count"),
+        alarm_step("alarm_b", "$steps.count_b.count"),
+        alarm_step("alarm_other", "$steps.count_b.count", threshold=5),
+    ],
+    "outputs": [
+        {"type": "JsonField", "name": "count_a", "selector": "$steps.count_a.count"},
+        {"type": "JsonField", "name": "count_b", "selector": "$steps.count_b.count"},
+        {"type": "JsonField", "name": "alarm_a", "selector": "$steps.alarm_a.*"},
+        {"type": "JsonField", "name": "alarm_b", "selector": "$steps.alarm_b.*"},
+        {"type": "JsonField", "name": "other", "selector": "$steps.alarm_other.*"},
+    ],
+}
+
+
+class TestEliminateCommonSteps:
+    """Tests del pase de eliminación de subexpresiones comunes."""
+
+    def test_duplicated_chains_are_merged_until_fixed_point(self):
+        """Test de que la fusión de pasos previos hace idénticos a los siguientes."""
+        optimised, report = eliminate_common_steps(DUPLICATED_WORKFLOW)
+
+        assert [s["name"] for s in optimised["steps"]] == [
+            "filter_a",
+            "count_a",
+            "alarm_a",
+            "alarm_b",
+            "alarm_other",
+        ]
+        assert report.merged_steps == {"filter_b": "filter_a", "count_b": "count_a"}
+        assert report.to_dict()["eliminated_steps"] == 2
+        assert optimised["steps"][3]["count"] == "$steps.count_a.count"
+        assert [o["name"] for o in optimised["outputs"]] == [
+            o["name"] for o in DUPLICATED_WORKFLOW["outputs"]
+        ]
+        assert optimised["outputs"][1]["selector"] == "$steps.count_a.count"
+        assert optimised["outputs"][3]["selector"] == "$steps.alarm_b.*"
+
+    def test_input_definition_is_not_modified(self):
+        """Test de que la definición original no se modifica."""
+        snapshot = json.dumps(DUPLICATED_WORKFLOW, sort_keys=True)
+
+        eliminate_common_steps(DUPLICATED_WORKFLOW)
+
+        assert json.dumps(DUPLICATED_WORKFLOW, sort_keys=True) == snapshot
+
+    def test_sinks_and_flow_control_targets_are_not_merged(self):
+        """Test de pasos con efectos laterales y ramas de control de flujo."""
+        workflow = json.loads(
+            (VERTICALS_DIR / "healthcare_sala_espera.json").read_text()
+        )
+        mqtt_step = next(s for s in workflow["steps"] if s["name"] == "mqtt_critico")
+        workflow["steps"].append({**mqtt_step, "name": "mqtt_critico_copy"})
+        workflow["steps"].append(
+            {**count_step("count_copy", "$steps.detector.predictions")}
+        )
+
+        optimised, report = eliminate_common_steps(workflow)
+
+        assert report.merged_steps == {"count_copy": "count_ocupacion"}
+        assert "mqtt_critico_copy" in [s["name"] for s in optimised["steps"]]
+
+    def test_model_steps_are_not_merged(self):
+        """Test de que los pasos de modelos no se fusionan, al generar sus propios ids."""
+        model_step = {
+            "type": "roboflow_core/roboflow_object_detection_model@v1",
+            "image": "$inputs.image",
+            "model_id": "people/1",
+        }
+        workflow = {
+            "version": "1.0",
+            "inputs": [{"type": "WorkflowImage", "name": "image"}],
+            "steps": [
+                {**model_step, "name": "model_a"},
+                {**model_step, "name": "model_b"},
+                count_step("count_a", "$steps.model_a.predictions"),
+                count_step("count_b", "$steps.model_b.predictions"),
+            ],
+            "outputs": [],
+        }
+
+        optimised, report = eliminate_common_steps(workflow)
+
+        assert report.eliminated_steps == 0
+        assert optimised is workflow
+
+    def test_non_deterministic_operations_are_not_merged(self):
+        """Test de que los filtros con operaciones aleatorias no se fusionan."""
+        random_filter = filter_step("random_a")
+        operand = random_filter["operations"][0]["filter_operation"]["statements"][0]
+        operand["left_operand"]["operations"] = [{"type": "RandomNumber"}]
+        workflow = {
+            **DUPLICATED_WORKFLOW,
+            "steps": [random_filter, {**random_filter, "name": "random_b"}],
+        }
+
+        _, report = eliminate_common_steps(workflow)
+
+        assert report.eliminated_steps == 0
+
+    @pytest.mark.parametrize("path", sorted(VERTICALS_DIR.glob("*.json")))
+    def test_verticals_are_valid_input(self, path):
+        """Test de que el pase acepta las definiciones de los verticales."""
+        workflow = json.loads(path.read_text())
+
+        optimised, report = eliminate_common_steps(workflow)
+
+        assert report.steps_after == len(optimised["steps"])
+        assert report.steps_before == len(workflow["steps"])
+
+
+def make_predictions(n: int, seed: int) -> sv.Detections:
+    rng = np.random.default_rng(seed)
+    xy_min = rng.uniform(0, 200, size=(n, 2))
+    xyxy = np.concatenate([xy_min, xy_min + 20], axis=1)
+    return sv.Detections(
+        xyxy=xyxy,
+        confidence=rng.uniform(0, 1, size=n),
+        class_id=np.zeros(n, dtype=int),
+        data={
+            "class_name": np.array(["person"] * n),
+            "detection_id": np.array([f"{seed}-{i}" for i in range(n)]),
+            "parent_id": np.array(["image"] * n),
+            "image_dimensions": np.array([[480, 640]] * n),
+            "prediction_type": np.array(["object-detection"] * n),
+        },
+    )
+
+
+class TestResultsEquivalence:
+    """Tests de equivalencia de resultados entre la definición original y la optimizada."""
+
+    def test_optimised_workflow_produces_the_same_results(self, monkeypatch):
+        """Test de ejecución de ambas definiciones sobre la misma secuencia de frames."""
+        monkeypatch.setenv("WORKFLOWS_PLUGINS", "care.workflows.care_steps")
+        optimised, report = eliminate_common_steps(DUPLICATED_WORKFLOW)
+        assert report.eliminated_steps > 0
+        original_engine = ExecutionEngineV1.init(workflow_definition=DUPLICATED_WORKFLOW)
+        optimised_engine = ExecutionEngineV1.init(workflow_definition=optimised)
+
+        for frame, n in enumerate([0, 4, 9, 12, 7, 2, 10]):
+            runtime_parameters = {"predictions": [make_predictions(n=n, seed=frame)]}
+
+            expected = original_engine.run(runtime_parameters=runtime_parameters)
+            result = optimised_engine.run(runtime_parameters=runtime_parameters)
+
+            assert result == expected
+
+    def test_execution_engine_merges_duplicated_steps(self, monkeypatch):
+        """Test de que el motor usado por los pipelines aplica el pase al compilar."""
+        monkeypatch.setenv("WORKFLOWS_PLUGINS", "care.workflows.care_steps")
+
+        engine = ExecutionEngine.init(workflow_definition=DUPLICATED_WORKFLOW)
+
+        assert engine.optimization_report.merged_steps == {
+            "filter_b": "filter_a",
+            "count_b": "count_a",
+        }
+        result = engine.run(runtime_parameters={"predictions": [make_predictions(n=4, seed=0)]})
+        assert result[0]["count_a"] == result[0]["count_b"]
@@ -0,0 +1,176 @@
+"""
+Tests del profiler de workflows con muestreo y exportación a Chrome Trace.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from care.workflows.execution_engine.profiling.core import (
+    SamplingWorkflowsProfiler,
+    profiled,
+)
+
+
+def run_workflow(profiler: SamplingWorkflowsProfiler, steps: int = 2) -> None:
+    profiler.start_workflow_run()
+    for i in range(steps):
+        with profiler.profile_execution_phase(
+            name="step_execution",
+            categories=["workflow_block_operation"],
+            metadata={"step": f"s{i}"},
+        ):
+            pass
+    profiler.end_workflow_run()
+
+
+class TestSampling:
+    """Tests del muestreo de ejecuciones."""
+
+    def test_every_nth_run_is_recorded(self):
+        """Test de muestreo cada N ejecuciones."""
+        profiler = SamplingWorkflowsProfiler.init(sample_every_n_runs=3)
+
+        for _ in range(7):
+            run_workflow(profiler)
+
+        runs = [e for e in profiler.export_trace() if e["name"] == "workflow_run"]
+        assert len(runs) == 3 * 2
+
+    def test_min_sampling_interval(self):
+        """Test de límite de tiempo entre ejecuciones muestreadas."""
+        profiler = SamplingWorkflowsProfiler.init(min_sampling_interval=3600)
+
+        for _ in range(5):
+            run_workflow(profiler)
+
+        runs = [e for e in profiler.export_trace() if e["ph"] == "B"]
+        assert len(runs) == 1
+
+    def test_not_sampled_runs_do_not_record_events(self):
+        """Test de que fuera de la muestra no se registra nada."""
+        profiler = SamplingWorkflowsProfiler.init(sample_every_n_runs=2)
+        run_workflow(profiler)
+        profiler.start_workflow_run()
+
+        assert not profiler.is_sampling
+        profiler.notify_event(name="event")
+        with pytest.raises(ValueError):
+            with profiler.profile_execution_phase(name="failing"):
+                raise ValueError()
+        profiler.end_workflow_run()
+
+        names = {e["name"] for e in profiler.export_trace()}
+        assert names == {"workflow_run", "step_execution"}
+
+    def test_spans_use_monotonic_microseconds(self):
+        """Test de que los spans tienen duración y marca temporal en microsegundos."""
+        profiler = SamplingWorkflowsProfiler.init()
+        sink = profiled(
+            lambda x: x, profiler=profiler, name="sink", categories=["sink_operation"]
+        )
+
+        profiler.start_workflow_run()
+        assert sink(1) == 1
+        profiler.end_workflow_run()
+
+        span = next(e for e in profiler.export_trace() if e["name"] == "sink")
+        assert span["ph"] == "X"
+        assert isinstance(span["ts"], int) and isinstance(span["dur"], int)
+        assert span["cat"] == "sink_operation"
+
+
+    def test_sink_spans_are_sampled_apart_from_runs(self):
+        """Test de que los spans del sink no se mezclan con la ejecución en curso."""
+        profiler = SamplingWorkflowsProfiler.init(sample_every_n_runs=2)
+        sink = profiled(lambda x: x, profiler=profiler, name="sink")
+
+        profiler.start_workflow_run()
+        sink(1)
+        profiler.end_workflow_run()
+        profiler.start_workflow_run()
+        sink(2)
+        sink(3)
+        profiler.end_workflow_run()
+
+        assert [[e["name"] for e in run] for run in profiler._runs_buffer] == [
+            ["sink"],
+            ["workflow_run", "workflow_run"],
+            ["sink"],
+        ]
+
+    def test_span_is_recorded_in_run_it_started_in(self):
+        """Test de que un span que termina tras el fin de la ejecución no cae en otra."""
+        profiler = SamplingWorkflowsProfiler.init(sample_every_n_runs=2)
+
+        profiler.start_workflow_run()
+        with profiler.profile_execution_phase(name="late"):
+            profiler.end_workflow_run()
+            profiler.start_workflow_run()
+        profiler.notify_event(name="not_sampled")
+        profiler.end_workflow_run()
+
+        assert [[e["name"] for e in run] for run in profiler._runs_buffer] == [
+            ["workflow_run", "workflow_run", "late"]
+        ]
+
+
+class TestChromeTraceExport:
+    """Tests de la exportación y rotación de ficheros de traza."""
+
+    def test_trace_files_are_rotated(self, tmp_path):
+        """Test de que sólo se conservan los últimos ficheros."""
+        profiler = SamplingWorkflowsProfiler.init(
+            traces_directory=str(tmp_path),
+            runs_per_trace_file=2,
+            max_trace_files=3,
+        )
+
+        for _ in range(10):
+            run_workflow(profiler)
+
+        files = sorted(os.listdir(tmp_path))
+        assert len(files) == 3
+        with open(tmp_path / files[-1]) as f:
+            trace = json.load(f)
+        assert trace["displayTimeUnit"] == "ms"
+        assert trace["otherData"]["workflow_runs"] == 10
+        assert len([e for e in trace["traceEvents"] if e["name"] == "workflow_run"]) == 4
+        assert profiler.export_trace() == []
+
+    def test_flush_without_events(self, tmp_path):
+        """Test de que no se escriben ficheros vacíos."""
+        profiler = SamplingWorkflowsProfiler.init(traces_directory=str(tmp_path))
+
+        assert profiler.flush_trace() is None
+        assert os.listdir(tmp_path) == []
+
+    def test_flush_concurrent_with_runs(self, tmp_path):
+        """Test de que vaciar el buffer mientras terminan ejecuciones no pierde ninguna."""
+        profiler = SamplingWorkflowsProfiler.init(
+            max_runs_in_buffer=10_000,
+            traces_directory=str(tmp_path),
+            max_trace_files=0,
+        )
+        done = threading.Event()
+
+        def run_workflows() -> None:
+            for _ in range(500):
+                run_workflow(profiler)
+            done.set()
+
+        worker = threading.Thread(target=run_workflows)
+        worker.start()
+        while not done.is_set():
+            profiler.flush_trace()
+        worker.join()
+        profiler.flush_trace()
+
+        runs = 0
+        for name in os.listdir(tmp_path):
+            with open(tmp_path / name) as f:
+                events = json.load(f)["traceEvents"]
+            runs += len([e for e in events if e["name"] == "workflow_run" and e["ph"] == "B"])
+        assert runs == 500